@@ -1,6 +1,7 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
+from ...domain.entities.consulta import MODO_GENERATIVO, MODOS_CONSULTA
 
 
 class DocumentoResponse(BaseModel):
@@ -30,17 +31,70 @@ class DocumentoPreviewResponse(BaseModel):
         from_attributes = True
 
 
+MAX_TIMEOUT_CONSULTA = 300.0
+
+
 class ConsultaRequest(BaseModel):
     """DTO para petición de consulta."""
     
     pregunta: str
     limite_resultados: int = 5
+    timeout: Optional[float] = None  # segundos; sin él, el plazo por defecto del servidor
+    modo: str = MODO_GENERATIVO  # "extractivo": responde con frases de los documentos, sin LLM
+    adaptativo: Optional[bool] = None  # limite_resultados como máximo; sin él, lo que diga el servidor
     
     def validar(self):
         if not self.pregunta or not self.pregunta.strip():
             raise ValueError('La pregunta no puede estar vacía')
         if self.limite_resultados <= 0 or self.limite_resultados > 20:
             raise ValueError('El límite de resultados debe estar entre 1 y 20')
+        if self.timeout is not None and not 0 < self.timeout <= MAX_TIMEOUT_CONSULTA:
+            raise ValueError(f'El timeout debe estar entre 0 y {MAX_TIMEOUT_CONSULTA:.0f} segundos')
+        if self.modo not in MODOS_CONSULTA:
+            raise ValueError(f'El modo debe ser uno de: {", ".join(MODOS_CONSULTA)}')
+
+
+MAX_PREGUNTAS_BATCH = 1000
+
+
+class BusquedaBatchRequest(BaseModel):
+    """DTO para petición de búsqueda de varias preguntas sin generación."""
+    
+    preguntas: List[str]
+    limite_resultados: int = 5
+    
+    def validar(self):
+        if not self.preguntas:
+            raise ValueError('Debe enviar al menos una pregunta')
+        if len(self.preguntas) > MAX_PREGUNTAS_BATCH:
+            raise ValueError(f'No se pueden enviar más de {MAX_PREGUNTAS_BATCH} preguntas por petición')
+        if any(not pregunta or not pregunta.strip() for pregunta in self.preguntas):
+            raise ValueError('Las preguntas no pueden estar vacías')
+        if self.limite_resultados <= 0 or self.limite_resultados > 20:
+            raise ValueError('El límite de resultados debe estar entre 1 y 20')
+
+
+class SeleccionResponse(BaseModel):
+    """DTO con las decisiones de la selección adaptativa de resultados."""
+    
+    candidatos: int  # resultados recuperados (limite_resultados)
+    seleccionados: int  # resultados que se usaron
+    motivo_corte: str  # limite, caida o similitud_minima
+    posicion_corte: Optional[int] = None  # primer resultado descartado por el corte (desde 0)
+    caida: Optional[float] = None  # salto de similitud en el corte
+    redundantes: List[str] = []  # IDs descartados por casi duplicados (MMR)
+
+
+class CitaResponse(BaseModel):
+    """DTO para una frase citada en una respuesta extractiva."""
+    
+    documento: int  # posición (desde 1) en documentos_relevantes
+    documento_id: str
+    titulo: str
+    texto: str
+    inicio: int  # posición de la frase en el contenido del documento
+    fin: int
+    similitud: float
 
 
 class ConsultaResponse(BaseModel):
@@ -51,6 +105,11 @@ class ConsultaResponse(BaseModel):
     pregunta_original: str
     tiempo_procesamiento: Optional[float] = None
     modelo_usado: Optional[str] = None
+    degradado: bool = False  # True si el LLM no respondió (la respuesta es extractiva o solo hay documentos)
+    tiempos_etapas: Optional[Dict[str, float]] = None  # segundos por etapa (embedding, llm_total...)
+    modo: str = MODO_GENERATIVO  # cómo se obtuvo respuesta_ia
+    citas: Optional[List[CitaResponse]] = None  # frases de la respuesta extractiva
+    seleccion: Optional[SeleccionResponse] = None  # solo con selección adaptativa
     
     @property
     def numero_documentos(self) -> int:
@@ -61,6 +120,23 @@ class ConsultaResponse(BaseModel):
         return self.numero_documentos > 0
 
 
+class BusquedaResponse(BaseModel):
+    """DTO para respuesta de búsqueda semántica sin respuesta de IA."""
+    
+    documentos_relevantes: List[DocumentoResponse]
+    pregunta_original: str
+    tiempo_procesamiento: Optional[float] = None
+    seleccion: Optional[SeleccionResponse] = None  # solo con selección adaptativa
+
+
+class BusquedaBatchResponse(BaseModel):
+    """DTO para respuesta de búsqueda de varias preguntas."""
+    
+    resultados: List[BusquedaResponse]
+    total_preguntas: int
+    tiempo_procesamiento: Optional[float] = None
+
+
 class DocumentoCreateResponse(BaseModel):
     """DTO para respuesta de creación de documento."""
     
@@ -69,6 +145,30 @@ class DocumentoCreateResponse(BaseModel):
     titulo: str
 
 
+class IngestaArchivoResponse(BaseModel):
+    """DTO para respuesta de indexación de un archivo por fragmentos."""
+    
+    mensaje: str
+    documento_id: str
+    titulo: str
+    nombre_archivo: str
+    fragmentos: int
+    tiempo_procesamiento: Optional[float] = None
+
+
+class TrabajoIngestaResponse(BaseModel):
+    """DTO para el estado de un trabajo de ingesta asíncrona."""
+    
+    trabajo_id: str
+    documento_id: str
+    titulo: str
+    estado: str
+    progreso: int
+    error: Optional[str] = None
+    fecha_creacion: Optional[datetime] = None
+    fecha_actualizacion: Optional[datetime] = None
+
+
 class DocumentosListResponse(BaseModel):
     """DTO para respuesta de lista de documentos."""
     
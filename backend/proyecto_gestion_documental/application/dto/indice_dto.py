@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class ParametrosIndiceDTO(BaseModel):
+    """DTO con los parámetros HNSW del índice vectorial."""
+    
+    espacio: str = "cosine"
+    m: int = 16
+    ef_construccion: int = 100
+    ef_busqueda: int = 100
+
+
+class EstadoIndiceResponse(BaseModel):
+    """DTO con los parámetros actuales del índice y el estado de su reconstrucción."""
+    
+    parametros: Optional[ParametrosIndiceDTO] = None
+    total_documentos: int
+    reconstruccion_estado: str  # inactiva, en_curso, completada, error
+    parametros_solicitados: Optional[ParametrosIndiceDTO] = None
+    documentos_copiados: int = 0
+    documentos_totales: int = 0
+    error: Optional[str] = None
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
\ No newline at end of file
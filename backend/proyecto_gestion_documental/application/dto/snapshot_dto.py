@@ -0,0 +1,46 @@
+import re
+from pydantic import BaseModel, validator
+from typing import List, Optional
+from datetime import datetime
+
+
+class SnapshotRequest(BaseModel):
+    """DTO para exportar o importar un snapshot del corpus."""
+    
+    nombre: str
+    
+    @validator('nombre')
+    def validar_nombre(cls, v):
+        if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9._-]{0,99}", v) or v.endswith((".parcial", ".anterior")):
+            raise ValueError("El nombre solo admite letras, números, '.', '_' y '-' (hasta 100 caracteres)")
+        return v
+
+
+class ManifiestoSnapshotDTO(BaseModel):
+    """DTO con la descripción de un snapshot."""
+    
+    nombre: str
+    modelo_embeddings: str
+    dimension: int
+    total_documentos: int
+    partes: int
+    fecha_creacion: datetime
+
+
+class SnapshotsListResponse(BaseModel):
+    """DTO para la respuesta de lista de snapshots."""
+    
+    snapshots: List[ManifiestoSnapshotDTO]
+
+
+class EstadoSnapshotResponse(BaseModel):
+    """DTO con el estado de la última exportación o importación."""
+    
+    operacion: Optional[str] = None  # exportacion o importacion
+    estado: str  # inactiva, en_curso, completada, error
+    nombre: Optional[str] = None
+    documentos_procesados: int = 0
+    documentos_totales: int = 0
+    error: Optional[str] = None
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
\ No newline at end of file
@@ -0,0 +1,104 @@
+import uuid
+from typing import Callable, Optional
+from ..dto.documento_request import DocumentoCreateRequest
+from ..dto.consulta_response import TrabajoIngestaResponse
+from ...domain.entities.documento import Documento
+from ...domain.entities.trabajo_ingesta import TrabajoIngesta
+from ...domain.repositories.trabajo_ingesta_repository import TrabajoIngestaRepository
+
+
+class EnqueueDocumentUseCase:
+    """Caso de uso para encolar un documento y consultar el estado de su ingesta."""
+
+    def __init__(
+        self,
+        trabajo_repository: TrabajoIngestaRepository,
+        al_encolar: Optional[Callable[[], None]] = None
+    ):
+        self.trabajo_repository = trabajo_repository
+        # Aviso al worker del proceso para que no espere a su próxima consulta
+        self.al_encolar = al_encolar
+
+    async def execute(self, request: DocumentoCreateRequest) -> TrabajoIngestaResponse:
+        """
+        Valida el documento y lo deja en la cola de ingesta sin vectorizarlo.
+
+        Args:
+            request: Datos del documento a crear
+
+        Returns:
+            TrabajoIngestaResponse: Trabajo creado, en estado 'pendiente'
+
+        Raises:
+            ValueError: Si los datos del documento no son válidos
+            Exception: Si hay errores al encolar
+        """
+        try:
+            # El ID del documento se asigna ya para que el cliente pueda usarlo
+            documento = Documento(
+                id=self._generar_id_documento(),
+                titulo=request.titulo,
+                contenido=request.contenido,
+                tipo=request.tipo
+            )
+
+            # Validar que el documento sea válido según reglas de dominio
+            if not documento.es_valido():
+                raise ValueError("El documento no cumple con las reglas de validación de dominio")
+
+            trabajo = TrabajoIngesta(
+                id=f"job_{uuid.uuid4().hex}",
+                documento_id=documento.id,
+                titulo=documento.titulo,
+                contenido=documento.contenido,
+                tipo=documento.tipo
+            )
+
+            await self.trabajo_repository.encolar(trabajo)
+            if self.al_encolar is not None:
+                self.al_encolar()
+
+            return self._trabajo_to_response(trabajo)
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al encolar documento: {str(e)}")
+
+    async def obtener_estado(self, trabajo_id: str) -> Optional[TrabajoIngestaResponse]:
+        """
+        Obtiene el estado actual de un trabajo de ingesta.
+
+        Args:
+            trabajo_id: ID del trabajo retornado al encolar
+
+        Returns:
+            TrabajoIngestaResponse: Estado del trabajo o None si no existe
+        """
+        try:
+            trabajo = await self.trabajo_repository.obtener_por_id(trabajo_id)
+
+            if trabajo is None:
+                return None
+
+            return self._trabajo_to_response(trabajo)
+
+        except Exception as e:
+            raise Exception(f"Error al obtener trabajo {trabajo_id}: {str(e)}")
+
+    def _generar_id_documento(self) -> str:
+        """Genera un ID único para el documento."""
+        return f"doc_{uuid.uuid4().hex[:8]}"
+
+    def _trabajo_to_response(self, trabajo: TrabajoIngesta) -> TrabajoIngestaResponse:
+        """Convierte una entidad TrabajoIngesta a TrabajoIngestaResponse."""
+        return TrabajoIngestaResponse(
+            trabajo_id=trabajo.id,
+            documento_id=trabajo.documento_id,
+            titulo=trabajo.titulo,
+            estado=trabajo.estado,
+            progreso=trabajo.progreso,
+            error=trabajo.error,
+            fecha_creacion=trabajo.fecha_creacion,
+            fecha_actualizacion=trabajo.fecha_actualizacion
+        )
\ No newline at end of file
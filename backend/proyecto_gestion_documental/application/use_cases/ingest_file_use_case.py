@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import BinaryIO, Dict, List, Optional
+from ..dto.consulta_response import IngestaArchivoResponse
+from ...domain.entities.documento import Documento
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.services.ejecutor_service import EjecutorService
+from ...domain.services.extractor_texto import ExtractorTexto
+from ...domain.services.fragmentador_texto import FragmentadorTexto
+
+
+logger = logging.getLogger(__name__)
+
+TIPOS_VALIDOS = ['normativo', 'procedimiento', 'manual', 'politica', 'otro']
+
+
+class IngestFileUseCase:
+    """Caso de uso para indexar un archivo (PDF, DOCX, TXT) por fragmentos."""
+
+    def __init__(
+        self,
+        documento_repository: DocumentoRepository,
+        extractores: List[ExtractorTexto],
+        ejecutor: EjecutorService,
+        fragmentador: Optional[FragmentadorTexto] = None,
+        tamano_lote: int = 32
+    ):
+        self.documento_repository = documento_repository
+        self.extractores: Dict[str, ExtractorTexto] = {
+            extension: extractor
+            for extractor in extractores
+            for extension in extractor.extensiones_soportadas()
+        }
+        self.ejecutor = ejecutor
+        self.fragmentador = fragmentador or FragmentadorTexto()
+        self.tamano_lote = tamano_lote
+
+    async def execute(
+        self,
+        archivo: BinaryIO,
+        nombre_archivo: str,
+        titulo: Optional[str] = None,
+        tipo: str = "normativo"
+    ) -> IngestaArchivoResponse:
+        """
+        Extrae, fragmenta, vectoriza e indexa un archivo en streaming.
+
+        La extracción avanza bloque a bloque en los hilos de `ejecutor` y los
+        fragmentos se guardan en lotes de `tamano_lote`, de modo que en
+        memoria solo hay un lote de fragmentos a la vez. Si algo falla a
+        mitad (o se cancela), se eliminan los fragmentos ya guardados: el
+        archivo queda indexado entero o no queda nada de él.
+
+        Args:
+            archivo: Archivo binario posicionable (p. ej. el de un UploadFile)
+            nombre_archivo: Nombre original, usado para elegir el extractor
+            titulo: Título del documento (por defecto, el nombre del archivo)
+            tipo: Tipo de documento
+
+        Returns:
+            IngestaArchivoResponse: ID base y número de fragmentos indexados
+
+        Raises:
+            ValueError: Si el formato no está soportado o el archivo no tiene texto
+            Exception: Si hay errores durante la indexación
+        """
+        inicio_tiempo = time.time()
+
+        extension = os.path.splitext(nombre_archivo or "")[1].lower()
+        extractor = self.extractores.get(extension)
+        if extractor is None:
+            soportadas = ", ".join(sorted(self.extractores))
+            raise ValueError(f"Formato '{extension or nombre_archivo}' no soportado. Use: {soportadas}")
+
+        tipo = (tipo or "normativo").lower()
+        if tipo not in TIPOS_VALIDOS:
+            raise ValueError(f'Tipo debe ser uno de: {", ".join(TIPOS_VALIDOS)}')
+
+        titulo = (titulo or "").strip() or os.path.splitext(os.path.basename(nombre_archivo))[0]
+        documento_id = f"doc_{uuid.uuid4().hex[:8]}"
+        guardados: List[str] = []
+
+        try:
+            fragmentos = self.fragmentador.fragmentar(extractor.extraer_bloques(archivo))
+
+            lote: List[Documento] = []
+            total_fragmentos = 0
+
+            while True:
+                # Extraer y fragmentar fuera del event loop (pypdf es CPU)
+                fragmento = await self.ejecutor.ejecutar(next, fragmentos, None)
+                if fragmento is None:
+                    break
+
+                documento = Documento(
+                    id=f"{documento_id}_{total_fragmentos + 1:05d}",
+                    titulo=f"{titulo} (fragmento {total_fragmentos + 1})",
+                    contenido=fragmento,
+                    tipo=tipo
+                )
+                if not documento.es_valido():
+                    continue
+
+                lote.append(documento)
+                total_fragmentos += 1
+
+                if len(lote) >= self.tamano_lote:
+                    await self._guardar_lote(lote, guardados)
+                    lote = []
+
+            if lote:
+                await self._guardar_lote(lote, guardados)
+
+            if total_fragmentos == 0:
+                raise ValueError("El archivo no contiene texto extraíble")
+
+            return IngestaArchivoResponse(
+                mensaje="Archivo indexado exitosamente",
+                documento_id=documento_id,
+                titulo=titulo,
+                nombre_archivo=nombre_archivo,
+                fragmentos=total_fragmentos,
+                tiempo_procesamiento=time.time() - inicio_tiempo
+            )
+
+        except (ValueError, asyncio.CancelledError) as e:
+            # También al cancelarse (cliente desconectado, plazo agotado)
+            await self._retirar_fragmentos(guardados)
+            raise e
+        except Exception as e:
+            await self._retirar_fragmentos(guardados)
+            raise Exception(f"Error al indexar archivo {nombre_archivo}: {str(e)}")
+
+    async def _guardar_lote(self, lote: List[Documento], guardados: List[str]):
+        # Se anotan antes de guardar: un lote puede quedar guardado a medias
+        guardados.extend(documento.id for documento in lote)
+        await self.documento_repository.guardar_batch(lote)
+
+    async def _retirar_fragmentos(self, documento_ids: List[str]):
+        """Elimina los fragmentos ya guardados de un archivo que no se pudo indexar entero."""
+        for documento_id in documento_ids:
+            try:
+                await self.documento_repository.eliminar(documento_id)
+            except Exception:
+                logger.exception("No se pudo retirar el fragmento %s", documento_id)
\ No newline at end of file
@@ -2,17 +2,20 @@ from application.dto.auth_request import LoginRequest
 from domain.repositories.usuario_repository import UsuarioRepository
 from domain.services.password_service import PasswordService
 from domain.services.jwt_service import JWTService
+from domain.services.ejecutor_service import EjecutorService
 
 class LoginUserUseCase:
     def __init__(
         self,
         usuario_repository: UsuarioRepository,
         password_service: PasswordService,
-        jwt_service: JWTService
+        jwt_service: JWTService,
+        ejecutor: EjecutorService
     ):
         self.usuario_repository = usuario_repository
         self.password_service = password_service
         self.jwt_service = jwt_service
+        self.ejecutor = ejecutor
     
     async def execute(self, request: LoginRequest) -> str:
         # Buscar usuario usando tu método
@@ -20,8 +23,10 @@ class LoginUserUseCase:
         if not user:
             raise ValueError("Credenciales inválidas")
         
-        # Verificar contraseña
-        if not self.password_service.verify_password(request.password, user.hashed_password):
+        # Verificar contraseña (fuera del event loop)
+        if not await self.ejecutor.ejecutar(
+            self.password_service.verify_password, request.password, user.hashed_password
+        ):
             raise ValueError("Credenciales inválidas")
         
         # Verificar si está activo
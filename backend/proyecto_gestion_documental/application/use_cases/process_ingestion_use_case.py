@@ -0,0 +1,105 @@
+from typing import List
+from ...domain.entities.documento import Documento
+from ...domain.entities.trabajo_ingesta import (
+    TrabajoIngesta,
+    ESTADO_PROCESANDO,
+    ESTADO_COMPLETADO,
+    ESTADO_ERROR
+)
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.repositories.trabajo_ingesta_repository import TrabajoIngestaRepository
+
+
+# Progreso de un trabajo reclamado que aún no se ha indexado
+PROGRESO_RECLAMADO = 10
+
+
+class ProcessIngestionUseCase:
+    """Caso de uso para indexar un lote de trabajos de la cola de ingesta."""
+
+    def __init__(
+        self,
+        trabajo_repository: TrabajoIngestaRepository,
+        documento_repository: DocumentoRepository,
+        tamano_sublote: int = 8
+    ):
+        if tamano_sublote < 1:
+            raise ValueError("El sublote de ingesta debe tener al menos un trabajo")
+        self.trabajo_repository = trabajo_repository
+        self.documento_repository = documento_repository
+        # El lote reclamado se indexa en sublotes para publicar el progreso
+        # de los trabajos que aún esperan (lo que ven /ingestas/{id}/eventos)
+        self.tamano_sublote = tamano_sublote
+
+    async def execute(self, tamano_lote: int = 16) -> int:
+        """
+        Reclama hasta `tamano_lote` trabajos pendientes y los indexa en
+        sublotes de `tamano_sublote`.
+
+        Cada trabajo se marca como completado en cuanto se indexa su
+        sublote, y tras cada sublote el progreso de los que siguen
+        esperando avanza en proporción a lo ya indexado. Si un sublote falla
+        se reintenta documento a documento, para que un único documento
+        problemático no haga fallar al resto.
+
+        Args:
+            tamano_lote: Número máximo de trabajos a procesar
+
+        Returns:
+            int: Número de trabajos procesados (0 si la cola estaba vacía)
+        """
+        trabajos = await self.trabajo_repository.reclamar_pendientes(tamano_lote)
+
+        if not trabajos:
+            return 0
+
+        await self.trabajo_repository.actualizar_estados(
+            [trabajo.id for trabajo in trabajos], ESTADO_PROCESANDO, PROGRESO_RECLAMADO
+        )
+
+        for inicio in range(0, len(trabajos), self.tamano_sublote):
+            indexados = inicio + self.tamano_sublote
+            await self._indexar(trabajos[inicio:indexados])
+
+            pendientes = trabajos[indexados:]
+            if pendientes:
+                progreso = PROGRESO_RECLAMADO + (100 - PROGRESO_RECLAMADO) * indexados // len(trabajos)
+                await self.trabajo_repository.actualizar_estados(
+                    [trabajo.id for trabajo in pendientes], ESTADO_PROCESANDO, progreso
+                )
+
+        return len(trabajos)
+
+    async def _indexar(self, trabajos: List[TrabajoIngesta]):
+        """Indexa un sublote de trabajos y marca cada uno como completado o con error."""
+        try:
+            await self.documento_repository.guardar_batch(
+                [self._trabajo_to_documento(trabajo) for trabajo in trabajos]
+            )
+            await self.trabajo_repository.actualizar_estados(
+                [trabajo.id for trabajo in trabajos], ESTADO_COMPLETADO, 100
+            )
+
+        except Exception:
+            for trabajo in trabajos:
+                try:
+                    await self.documento_repository.guardar_batch(
+                        [self._trabajo_to_documento(trabajo)]
+                    )
+                    await self.trabajo_repository.actualizar_estado(
+                        trabajo.id, ESTADO_COMPLETADO, 100
+                    )
+                except Exception as e:
+                    await self.trabajo_repository.actualizar_estado(
+                        trabajo.id, ESTADO_ERROR, 100, str(e)
+                    )
+
+    def _trabajo_to_documento(self, trabajo: TrabajoIngesta) -> Documento:
+        """Convierte un trabajo de ingesta en la entidad Documento a indexar."""
+        return Documento(
+            id=trabajo.documento_id,
+            titulo=trabajo.titulo,
+            contenido=trabajo.contenido,
+            tipo=trabajo.tipo,
+            fecha_creacion=trabajo.fecha_creacion
+        )
\ No newline at end of file
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from ..dto.indice_dto import ParametrosIndiceDTO, EstadoIndiceResponse
+from ...domain.entities.parametros_indice import ParametrosIndice
+from ...domain.repositories.documento_repository import DocumentoRepository
+
+
+logger = logging.getLogger(__name__)
+
+ESTADO_INACTIVA = "inactiva"
+ESTADO_EN_CURSO = "en_curso"
+ESTADO_COMPLETADA = "completada"
+ESTADO_ERROR = "error"
+
+
+class RebuildIndexUseCase:
+    """Caso de uso para reconstruir el índice vectorial en segundo plano."""
+
+    def __init__(self, documento_repository: DocumentoRepository):
+        self.documento_repository = documento_repository
+        self._tarea: Optional[asyncio.Task] = None
+        self._estado = ESTADO_INACTIVA
+        self._parametros_solicitados: Optional[ParametrosIndice] = None
+        self._copiados = 0
+        self._totales = 0
+        self._error: Optional[str] = None
+        self._fecha_inicio: Optional[datetime] = None
+        self._fecha_fin: Optional[datetime] = None
+
+    async def execute(self, request: ParametrosIndiceDTO) -> EstadoIndiceResponse:
+        """
+        Lanza la reconstrucción del índice con nuevos parámetros y retorna sin esperarla.
+
+        Args:
+            request: Parámetros HNSW del nuevo índice
+
+        Returns:
+            EstadoIndiceResponse: Estado con la reconstrucción 'en_curso'
+
+        Raises:
+            ValueError: Si los parámetros no son válidos o ya hay una reconstrucción en curso
+        """
+        parametros = ParametrosIndice(
+            espacio=request.espacio,
+            m=request.m,
+            ef_construccion=request.ef_construccion,
+            ef_busqueda=request.ef_busqueda
+        )
+        parametros.validar()
+
+        if self._tarea is not None and not self._tarea.done():
+            raise ValueError("Ya hay una reconstrucción del índice en curso")
+
+        self._estado = ESTADO_EN_CURSO
+        self._parametros_solicitados = parametros
+        self._copiados = 0
+        self._totales = 0
+        self._error = None
+        self._fecha_inicio = datetime.now()
+        self._fecha_fin = None
+        # La tarea se crea sin esperar nada desde la comprobación anterior:
+        # así una segunda petición concurrente ya la encuentra en curso
+        self._tarea = asyncio.create_task(self._reconstruir(parametros))
+
+        return await self.obtener_estado()
+
+    async def obtener_estado(self) -> EstadoIndiceResponse:
+        """Retorna los parámetros actuales del índice y el estado de la última reconstrucción."""
+        try:
+            parametros = self.documento_repository.obtener_parametros_indice()
+
+            return EstadoIndiceResponse(
+                parametros=self._parametros_to_dto(parametros),
+                total_documentos=await self.documento_repository.contar_documentos(),
+                reconstruccion_estado=self._estado,
+                parametros_solicitados=self._parametros_to_dto(self._parametros_solicitados),
+                documentos_copiados=self._copiados,
+                documentos_totales=self._totales,
+                error=self._error,
+                fecha_inicio=self._fecha_inicio,
+                fecha_fin=self._fecha_fin
+            )
+
+        except Exception as e:
+            raise Exception(f"Error al obtener el estado del índice: {str(e)}")
+
+    async def _reconstruir(self, parametros: ParametrosIndice):
+        try:
+            self._totales = await self.documento_repository.contar_documentos()
+            await self.documento_repository.reconstruir_indice(parametros, self._actualizar_progreso)
+            self._estado = ESTADO_COMPLETADA
+        except Exception as e:
+            logger.exception("Error reconstruyendo el índice")
+            self._estado = ESTADO_ERROR
+            self._error = str(e)
+        finally:
+            self._fecha_fin = datetime.now()
+
+    def _actualizar_progreso(self, copiados: int, totales: int):
+        self._copiados = copiados
+        self._totales = totales
+
+    def _parametros_to_dto(self, parametros: Optional[ParametrosIndice]) -> Optional[ParametrosIndiceDTO]:
+        if parametros is None:
+            return None
+        return ParametrosIndiceDTO(
+            espacio=parametros.espacio,
+            m=parametros.m,
+            ef_construccion=parametros.ef_construccion,
+            ef_busqueda=parametros.ef_busqueda
+        )
\ No newline at end of file
@@ -3,23 +3,26 @@ from application.dto.auth_response import UserResponse
 from domain.entities.usuario import Usuario
 from domain.repositories.usuario_repository import UsuarioRepository
 from domain.services.password_service import PasswordService
+from domain.services.ejecutor_service import EjecutorService
 
 class RegisterUserUseCase:
     def __init__(
         self,
         usuario_repository: UsuarioRepository,
-        password_service: PasswordService
+        password_service: PasswordService,
+        ejecutor: EjecutorService
     ):
         self.usuario_repository = usuario_repository
         self.password_service = password_service
+        self.ejecutor = ejecutor
     
     async def execute(self, request: RegisterRequest) -> UserResponse:
         # Verificar si el usuario ya existe usando tu método
         if await self.usuario_repository.existe_username(request.username):
             raise ValueError("El usuario ya existe")
         
-        # Hashear contraseña
-        hashed_password = self.password_service.hash_password(request.password)
+        # Hashear contraseña (bcrypt es lento a propósito: fuera del event loop)
+        hashed_password = await self.ejecutor.ejecutar(self.password_service.hash_password, request.password)
         
         # Crear usuario
         usuario = Usuario(
@@ -0,0 +1,135 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from ...domain.entities.entrada_registro import EntradaRegistro, OPERACION_ELIMINAR
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.repositories.registro_ingesta_repository import RegistroIngestaRepository
+
+
+TAMANO_LOTE_REPRODUCCION = 500
+PARALELISMO_REPRODUCCION = 4
+
+
+class ReplayIngestLogUseCase:
+    """
+    Caso de uso para reconstruir un índice aplicando el registro de ingesta.
+
+    El registro se aplica por ventanas de `paralelismo × tamano_lote`
+    entradas. Dentro de una ventana solo cuenta la última entrada de cada
+    documento, así que las operaciones que quedan son independientes y se
+    aplican en lotes concurrentes. Las ventanas van en orden y, al terminar
+    cada una, se guarda un checkpoint con su última secuencia: si la
+    reproducción se interrumpe, la siguiente continúa desde ahí.
+
+    Los embeddings registrados se reutilizan si se calcularon con el modelo
+    del índice de destino; si no (o si no se registraron), los documentos se
+    vuelven a vectorizar al guardarlos.
+    """
+
+    def __init__(
+        self,
+        registro: RegistroIngestaRepository,
+        documento_repository: DocumentoRepository,
+        modelo_embeddings: str,
+        tamano_lote: int = TAMANO_LOTE_REPRODUCCION,
+        paralelismo: int = PARALELISMO_REPRODUCCION
+    ):
+        if tamano_lote < 1 or paralelismo < 1:
+            raise ValueError("El tamaño de lote y el paralelismo deben ser al menos 1")
+
+        self.registro = registro
+        self.documento_repository = documento_repository
+        self.modelo_embeddings = modelo_embeddings
+        self.tamano_lote = tamano_lote
+        self.paralelismo = paralelismo
+
+    async def reproducir(
+        self,
+        destino: str,
+        desde_cero: bool = False,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Aplica al índice las entradas posteriores al checkpoint del destino.
+
+        Args:
+            destino: Nombre del checkpoint (uno por índice de destino)
+            desde_cero: Ignorar el checkpoint y aplicar el registro completo
+            progreso: Callback opcional (entradas aplicadas, entradas pendientes al empezar)
+
+        Returns:
+            int: Número de entradas aplicadas
+        """
+        try:
+            desde = 0 if desde_cero else await self.registro.obtener_checkpoint(destino)
+            pendientes = max(await self.registro.ultima_secuencia() - desde, 0)
+            aplicadas = 0
+            ventana: List[EntradaRegistro] = []
+
+            async for lote in self.registro.leer(desde, self.tamano_lote):
+                ventana.extend(lote)
+                if len(ventana) >= self.tamano_lote * self.paralelismo:
+                    aplicadas += await self._aplicar_ventana(destino, ventana)
+                    ventana = []
+                    if progreso is not None:
+                        progreso(aplicadas, max(pendientes, aplicadas))
+            if ventana:
+                aplicadas += await self._aplicar_ventana(destino, ventana)
+                if progreso is not None:
+                    progreso(aplicadas, max(pendientes, aplicadas))
+            return aplicadas
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al reproducir el registro de ingesta: {str(e)}")
+
+    async def _aplicar_ventana(self, destino: str, ventana: List[EntradaRegistro]) -> int:
+        # La última entrada de cada documento decide su estado final
+        ultimas: Dict[str, EntradaRegistro] = {}
+        for entrada in ventana:
+            ultimas[entrada.documento_id] = entrada
+
+        eliminados, con_embeddings, sin_embeddings = [], [], []
+        for entrada in ultimas.values():
+            if entrada.operacion == OPERACION_ELIMINAR:
+                eliminados.append(entrada.documento_id)
+            elif entrada.embedding is not None and entrada.modelo_embeddings == self.modelo_embeddings:
+                con_embeddings.append(entrada)
+            else:
+                sin_embeddings.append(entrada)
+
+        operaciones = [
+            self._guardar_con_embeddings(con_embeddings[i:i + self.tamano_lote])
+            for i in range(0, len(con_embeddings), self.tamano_lote)
+        ] + [
+            self.documento_repository.guardar_batch(
+                [entrada.documento for entrada in sin_embeddings[i:i + self.tamano_lote]]
+            )
+            for i in range(0, len(sin_embeddings), self.tamano_lote)
+        ] + [
+            self._eliminar(eliminados[i:i + self.tamano_lote])
+            for i in range(0, len(eliminados), self.tamano_lote)
+        ]
+
+        semaforo = asyncio.Semaphore(self.paralelismo)
+
+        async def _limitada(operacion):
+            async with semaforo:
+                await operacion
+
+        await asyncio.gather(*(_limitada(operacion) for operacion in operaciones))
+        await self.registro.guardar_checkpoint(destino, ventana[-1].secuencia)
+        return len(ventana)
+
+    async def _guardar_con_embeddings(self, entradas: List[EntradaRegistro]):
+        documentos = [entrada.documento for entrada in entradas]
+        embeddings = np.stack([entrada.embedding for entrada in entradas])
+        try:
+            await self.documento_repository.guardar_con_embeddings(documentos, embeddings)
+        except NotImplementedError:
+            await self.documento_repository.guardar_batch(documentos)
+
+    async def _eliminar(self, documento_ids: List[str]):
+        for documento_id in documento_ids:
+            await self.documento_repository.eliminar(documento_id)
\ No newline at end of file
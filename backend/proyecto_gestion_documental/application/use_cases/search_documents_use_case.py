@@ -1,11 +1,33 @@
+import asyncio
 import time
-from typing import List
-from ..dto.consulta_response import ConsultaRequest, ConsultaResponse, DocumentoResponse
+from typing import List, Optional, Tuple
+import numpy as np
+from ..dto.consulta_response import (
+    ConsultaRequest, 
+    ConsultaResponse, 
+    CitaResponse,
+    DocumentoResponse,
+    SeleccionResponse,
+    BusquedaResponse,
+    BusquedaBatchRequest,
+    BusquedaBatchResponse
+)
 from ...domain.entities.documento import Documento
-from ...domain.entities.consulta import Consulta, ResultadoConsulta
+from ...domain.entities.consulta import Consulta, ResultadoConsulta, MODO_EXTRACTIVO
 from ...domain.repositories.documento_repository import DocumentoRepository
-from ...domain.services.embedding_service import EmbeddingService
-from ...domain.services.llm_service import LLMService
+from ...domain.services.embedding_service import EmbeddingService, Vector, MatrizVectores
+from ...domain.services.llm_service import LLMService, LLMNoDisponibleError, SenalesConsulta
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+from ...domain.services.plazo import Plazo, PlazoAgotadoError, iniciar_plazo
+from ...domain.services.respondedor_extractivo import RespondedorExtractivo
+from ...domain.services.seleccion_adaptativa import SelectorAdaptativo
+from ...domain.services.traza import iniciar_traza, traza_actual
+
+
+RESPUESTA_DEGRADADA = (
+    "El servicio de IA no está disponible en este momento. "
+    "Se muestran únicamente los documentos relevantes encontrados."
+)
 
 
 class SearchDocumentsUseCase:
@@ -15,55 +37,111 @@ class SearchDocumentsUseCase:
         self,
         documento_repository: DocumentoRepository,
         embedding_service: EmbeddingService,
-        llm_service: LLMService
+        llm_service: LLMService,
+        metricas: Optional[MetricasService] = None,
+        timeout_por_defecto: Optional[float] = None,
+        respondedor_extractivo: Optional[RespondedorExtractivo] = None,
+        extractivo_como_respaldo: bool = True,
+        selector_adaptativo: Optional[SelectorAdaptativo] = None,
+        adaptativo_por_defecto: bool = False
     ):
         self.documento_repository = documento_repository
         self.embedding_service = embedding_service
         self.llm_service = llm_service
+        self.metricas = metricas or MetricasNulas()
+        # Plazo de las consultas que no indican `timeout` (None: sin límite)
+        self.timeout_por_defecto = timeout_por_defecto
+        self.respondedor_extractivo = respondedor_extractivo or RespondedorExtractivo(
+            embedding_service, metricas=self.metricas
+        )
+        # Si el LLM no está disponible, responder con frases en vez de solo documentos
+        self.extractivo_como_respaldo = extractivo_como_respaldo
+        self.selector_adaptativo = selector_adaptativo or SelectorAdaptativo()
+        # Selección de las consultas que no indican `adaptativo`
+        self.adaptativo_por_defecto = adaptativo_por_defecto
     
     async def execute(self, request: ConsultaRequest) -> ConsultaResponse:
         """
         Ejecuta una búsqueda con RAG (Retrieval-Augmented Generation).
         
+        Con selección adaptativa, `limite_resultados` es un máximo y al
+        prompt solo llegan los resultados relevantes (ver
+        `SelectorAdaptativo`); la respuesta incluye el porqué del corte.
+        
+        En modo extractivo no se llama al LLM: la respuesta son las frases
+        de los documentos más parecidas a la pregunta. Si el LLM no está
+        disponible (circuito abierto, pool saturado), la respuesta llega
+        degradada y, con `extractivo_como_respaldo`, también extractiva. Si
+        el plazo de la consulta se agota durante la generación, se
+        interrumpe y la respuesta llega degradada (solo documentos).
+        
         Args:
-            request: Petición de consulta con pregunta y límite de resultados
+            request: Petición de consulta con pregunta, límite de resultados y plazo
             
         Returns:
             ConsultaResponse: Respuesta con documentos relevantes y respuesta de IA
+            
+        Raises:
+            PlazoAgotadoError: Si el plazo se agota antes de recuperar los documentos
         """
         inicio_tiempo = time.time()
+        self.metricas.incrementar("peticiones", operacion="consulta")
+        # Normalmente la abre el middleware HTTP; si no, se abre aquí
+        traza = traza_actual() or iniciar_traza()
+        primera_etapa = len(traza.spans)
+        plazo = iniciar_plazo(request.timeout or self.timeout_por_defecto)
         
         try:
-            # Validar request
-            request.validar()
+            consulta = self._crear_consulta(request)
             
-            # Crear entidad de consulta
-            consulta = Consulta(
-                pregunta=request.pregunta,
-                limite_resultados=request.limite_resultados
-            )
-            
-            # Validar consulta según reglas de dominio
-            if not consulta.es_valida():
-                raise ValueError("La consulta no cumple con las reglas de validación")
-            
-            # 1. Generar embedding de la pregunta
-            embedding_pregunta = await self.embedding_service.generar_embedding(
-                consulta.pregunta
+            # 1-2. Generar embedding y buscar documentos similares
+            embedding_pregunta, documentos_similares = await plazo.esperar(
+                self._recuperar_documentos(consulta)
             )
-            
-            # 2. Buscar documentos similares
-            documentos_similares = await self.documento_repository.buscar_por_similitud(
-                embedding_pregunta, 
-                consulta.limite_resultados
+            documentos_similares, seleccion = await plazo.esperar(
+                self._seleccionar(request, embedding_pregunta, documentos_similares)
             )
             
-            # 3. Preparar contexto para LLM
-            contexto = self._preparar_contexto(documentos_similares)
-            
-            # 4. Generar respuesta con LLM
-            prompt = self._construir_prompt(consulta.pregunta, contexto)
-            respuesta_ia = await self.llm_service.generar_respuesta(prompt)
+            modo = consulta.modo
+            citas = None
+            degradado = False
+            modelo_usado = self.llm_service.obtener_modelo_usado()
+            if modo == MODO_EXTRACTIVO:
+                # 3-4. Respuesta con frases de los documentos, sin LLM
+                respuesta_ia, citas = await plazo.esperar(
+                    self._responder_extractivo(embedding_pregunta, documentos_similares)
+                )
+                modelo_usado = self.embedding_service.obtener_modelo_usado()
+            else:
+                # 3. Preparar contexto para LLM
+                with self.metricas.medir("contexto"):
+                    contexto = self._preparar_contexto(documentos_similares)
+                    prompt = self._construir_prompt(consulta.pregunta, contexto)
+                senales = self._calcular_senales(consulta, documentos_similares)
+                
+                # 4. Generar respuesta con LLM (si no está disponible, extractiva o solo recuperación)
+                try:
+                    with self.metricas.medir("llm_total"):
+                        respuesta_llm = await plazo.esperar(
+                            self.llm_service.generar_respuesta_con_modelo(prompt, senales=senales)
+                        )
+                    # Con un router, el modelo de la ruta que respondió (puede ser el de respaldo)
+                    respuesta_ia, modelo_usado = respuesta_llm.texto, respuesta_llm.modelo
+                except LLMNoDisponibleError:
+                    respuesta_ia = RESPUESTA_DEGRADADA
+                    degradado = True
+                    self.metricas.incrementar("consultas_degradadas")
+                    if self.extractivo_como_respaldo:
+                        respuesta_ia, citas = await plazo.esperar(
+                            self._responder_extractivo(embedding_pregunta, documentos_similares)
+                        )
+                        modo = MODO_EXTRACTIVO
+                        modelo_usado = self.embedding_service.obtener_modelo_usado()
+                except PlazoAgotadoError:
+                    respuesta_ia = RESPUESTA_DEGRADADA
+                    degradado = True
+                    self.metricas.incrementar("consultas_degradadas")
+                    self.metricas.incrementar("cancelaciones", operacion="consulta", motivo="plazo")
             
             # 5. Calcular tiempo de procesamiento
             tiempo_procesamiento = time.time() - inicio_tiempo
@@ -78,14 +156,256 @@ class SearchDocumentsUseCase:
                 documentos_relevantes=documentos_response,
                 pregunta_original=consulta.pregunta,
                 tiempo_procesamiento=tiempo_procesamiento,
-                modelo_usado=self.llm_service.obtener_modelo_usado()
+                modelo_usado=modelo_usado,
+                degradado=degradado,
+                tiempos_etapas=traza.duraciones(desde=primera_etapa),
+                modo=modo,
+                citas=citas,
+                seleccion=seleccion
+            )
+            
+        except ValueError as e:
+            raise e
+        except (PlazoAgotadoError, asyncio.CancelledError) as e:
+            self._registrar_cancelacion(plazo, "consulta", e)
+            raise e
+        except Exception as e:
+            self.metricas.incrementar("errores", operacion="consulta")
+            raise Exception(f"Error durante la búsqueda: {str(e)}")
+    
+    async def buscar(self, request: ConsultaRequest) -> BusquedaResponse:
+        """
+        Ejecuta solo la recuperación (embedding + búsqueda), sin generar con LLM.
+        
+        Args:
+            request: Petición de consulta con pregunta, límite de resultados y plazo
+            
+        Returns:
+            BusquedaResponse: Documentos relevantes ordenados por similitud
+            
+        Raises:
+            PlazoAgotadoError: Si el plazo se agota antes de terminar
+        """
+        inicio_tiempo = time.time()
+        self.metricas.incrementar("peticiones", operacion="busqueda")
+        plazo = iniciar_plazo(request.timeout or self.timeout_por_defecto)
+        
+        try:
+            consulta = self._crear_consulta(request)
+            embedding_pregunta, documentos_similares = await plazo.esperar(
+                self._recuperar_documentos(consulta)
+            )
+            documentos_similares, seleccion = await plazo.esperar(
+                self._seleccionar(request, embedding_pregunta, documentos_similares)
+            )
+            
+            return BusquedaResponse(
+                documentos_relevantes=[
+                    self._documento_to_response(doc) for doc in documentos_similares
+                ],
+                pregunta_original=consulta.pregunta,
+                tiempo_procesamiento=time.time() - inicio_tiempo,
+                seleccion=seleccion
             )
             
         except ValueError as e:
             raise e
+        except (PlazoAgotadoError, asyncio.CancelledError) as e:
+            self._registrar_cancelacion(plazo, "busqueda", e)
+            raise e
         except Exception as e:
+            self.metricas.incrementar("errores", operacion="busqueda")
             raise Exception(f"Error durante la búsqueda: {str(e)}")
     
+    async def buscar_batch(self, request: BusquedaBatchRequest) -> BusquedaBatchResponse:
+        """
+        Recupera documentos para varias preguntas con un único cálculo de
+        embeddings en batch y una única consulta multi-vector al repositorio.
+        
+        Args:
+            request: Petición con la lista de preguntas y el límite de resultados
+            
+        Returns:
+            BusquedaBatchResponse: Resultados en el mismo orden que las preguntas
+        """
+        inicio_tiempo = time.time()
+        self.metricas.incrementar("peticiones", operacion="busqueda_batch")
+        plazo = iniciar_plazo(self.timeout_por_defecto)
+        
+        try:
+            request.validar()
+            preguntas = [pregunta.strip() for pregunta in request.preguntas]
+            
+            # 1. Un solo encode para todas las preguntas
+            with self.metricas.medir("embedding_batch"):
+                embeddings = await plazo.esperar(self.embedding_service.generar_embeddings_batch(preguntas))
+            
+            # 2. Una sola consulta al índice con todos los vectores
+            with self.metricas.medir("recuperacion_batch"):
+                documentos_por_pregunta = await plazo.esperar(
+                    self.documento_repository.buscar_por_similitud_batch(
+                        embeddings, 
+                        request.limite_resultados
+                    )
+                )
+            
+            resultados = [
+                BusquedaResponse(
+                    documentos_relevantes=[
+                        self._documento_to_response(doc) for doc in documentos
+                    ],
+                    pregunta_original=pregunta
+                )
+                for pregunta, documentos in zip(preguntas, documentos_por_pregunta)
+            ]
+            
+            return BusquedaBatchResponse(
+                resultados=resultados,
+                total_preguntas=len(resultados),
+                tiempo_procesamiento=time.time() - inicio_tiempo
+            )
+            
+        except ValueError as e:
+            raise e
+        except (PlazoAgotadoError, asyncio.CancelledError) as e:
+            self._registrar_cancelacion(plazo, "busqueda_batch", e)
+            raise e
+        except Exception as e:
+            self.metricas.incrementar("errores", operacion="busqueda_batch")
+            raise Exception(f"Error durante la búsqueda batch: {str(e)}")
+    
+    def _registrar_cancelacion(self, plazo: Plazo, operacion: str, error: BaseException):
+        """Cuenta la cancelación y detiene el trabajo que siga en otros hilos."""
+        motivo = "plazo" if isinstance(error, PlazoAgotadoError) else "desconexion"
+        plazo.cancelar()
+        self.metricas.incrementar("cancelaciones", operacion=operacion, motivo=motivo)
+    
+    def _crear_consulta(self, request: ConsultaRequest) -> Consulta:
+        """Valida la petición y crea la entidad de consulta."""
+        request.validar()
+        
+        consulta = Consulta(
+            pregunta=request.pregunta,
+            limite_resultados=request.limite_resultados,
+            modo=request.modo
+        )
+        
+        # Validar consulta según reglas de dominio
+        if not consulta.es_valida():
+            raise ValueError("La consulta no cumple con las reglas de validación")
+        
+        return consulta
+    
+    async def _recuperar_documentos(self, consulta: Consulta) -> Tuple[Vector, List[Documento]]:
+        """Genera el embedding de la pregunta y busca los documentos similares."""
+        with self.metricas.medir("embedding"):
+            embedding_pregunta = await self.embedding_service.generar_embedding(
+                consulta.pregunta
+            )
+        
+        with self.metricas.medir("recuperacion"):
+            documentos = await self.documento_repository.buscar_por_similitud(
+                embedding_pregunta, 
+                consulta.limite_resultados
+            )
+        return embedding_pregunta, documentos
+    
+    def _calcular_senales(self, consulta: Consulta, documentos: List[Documento]) -> SenalesConsulta:
+        """Rasgos de la consulta con los que un servicio LLM puede elegir modelo."""
+        similitudes = sorted(
+            (documento.similitud for documento in documentos if documento.similitud is not None),
+            reverse=True
+        )
+        return SenalesConsulta(
+            palabras_pregunta=len(consulta.pregunta.split()),
+            similitud_maxima=similitudes[0] if similitudes else None,
+            margen_similitud=(
+                similitudes[0] - similitudes[1] if len(similitudes) > 1
+                else similitudes[0] if similitudes else None
+            ),
+            documentos=len(documentos)
+        )
+    
+    async def _seleccionar(
+        self,
+        request: ConsultaRequest,
+        embedding_pregunta: Vector,
+        documentos: List[Documento]
+    ) -> Tuple[List[Documento], Optional[SeleccionResponse]]:
+        """Aplica la selección adaptativa si la consulta (o el servidor) la pide."""
+        adaptativo = request.adaptativo if request.adaptativo is not None else self.adaptativo_por_defecto
+        if not adaptativo:
+            return documentos, None
+        
+        with self.metricas.medir("seleccion"):
+            documentos, decision = self.selector_adaptativo.cortar(documentos)
+            if self.selector_adaptativo.usa_mmr and len(documentos) > 1:
+                embeddings = await self._embeddings_documentos(documentos)
+                documentos, decision.redundantes = self.selector_adaptativo.diversificar(
+                    embedding_pregunta, documentos, embeddings
+                )
+                decision.seleccionados = len(documentos)
+        
+        return documentos, SeleccionResponse(
+            candidatos=decision.candidatos,
+            seleccionados=decision.seleccionados,
+            motivo_corte=decision.motivo_corte,
+            posicion_corte=decision.posicion_corte,
+            caida=decision.caida,
+            redundantes=decision.redundantes
+        )
+    
+    async def _embeddings_documentos(self, documentos: List[Documento]) -> MatrizVectores:
+        """Embeddings guardados de los documentos; los que falten se vectorizan."""
+        try:
+            embeddings = await self.documento_repository.obtener_embeddings(
+                [documento.id for documento in documentos]
+            )
+        except NotImplementedError:
+            embeddings = {}
+        
+        faltan = [documento for documento in documentos if documento.id not in embeddings]
+        vectorizables = [documento for documento in faltan if documento.contenido.strip()]
+        if vectorizables:
+            calculados = await self.embedding_service.generar_embeddings_batch(
+                [documento.contenido for documento in vectorizables]
+            )
+            embeddings.update(zip((documento.id for documento in vectorizables), calculados))
+        # Un contenido en blanco no se puede vectorizar: vector nulo, sin parecido con nada
+        for documento in faltan:
+            if documento.id not in embeddings:
+                embeddings[documento.id] = np.zeros(
+                    self.embedding_service.obtener_dimension_embedding(), dtype=np.float32
+                )
+        return np.stack([embeddings[documento.id] for documento in documentos])
+    
+    async def _responder_extractivo(
+        self,
+        embedding_pregunta: Vector,
+        documentos: List[Documento]
+    ) -> Tuple[str, List[CitaResponse]]:
+        """Responde con las frases más parecidas a la pregunta, citando su documento."""
+        with self.metricas.medir("extractivo"):
+            frases = await self.respondedor_extractivo.responder(embedding_pregunta, documentos)
+        
+        if not frases:
+            return "No se encontraron documentos relevantes.", []
+        
+        respuesta = " ".join(f"{frase.texto} [{frase.documento}]" for frase in frases)
+        citas = [
+            CitaResponse(
+                documento=frase.documento,
+                documento_id=frase.documento_id,
+                titulo=frase.titulo,
+                texto=frase.texto,
+                inicio=frase.inicio,
+                fin=frase.fin,
+                similitud=frase.similitud
+            )
+            for frase in frases
+        ]
+        return respuesta, citas
+    
     def _preparar_contexto(self, documentos: List[Documento]) -> str:
         """Prepara el contexto a partir de los documentos relevantes."""
         if not documentos:
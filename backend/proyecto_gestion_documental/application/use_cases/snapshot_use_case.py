@@ -0,0 +1,215 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Optional
+from ..dto.snapshot_dto import (
+    SnapshotRequest,
+    ManifiestoSnapshotDTO,
+    SnapshotsListResponse,
+    EstadoSnapshotResponse
+)
+from ...domain.entities.snapshot import ManifiestoSnapshot
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.repositories.snapshot_repository import SnapshotRepository
+
+
+logger = logging.getLogger(__name__)
+
+OPERACION_EXPORTACION = "exportacion"
+OPERACION_IMPORTACION = "importacion"
+
+ESTADO_INACTIVA = "inactiva"
+ESTADO_EN_CURSO = "en_curso"
+ESTADO_COMPLETADA = "completada"
+ESTADO_ERROR = "error"
+
+TAMANO_LOTE_SNAPSHOT = 5000
+
+
+class SnapshotUseCase:
+    """
+    Caso de uso para exportar el corpus con sus embeddings a un snapshot e
+    importarlo en otro índice sin volver a vectorizar.
+
+    `exportar` e `importar` esperan a terminar (para la línea de comandos);
+    `iniciar_exportacion` e `iniciar_importacion` las lanzan en segundo plano
+    (para la API). Solo se ejecuta una operación a la vez.
+    """
+
+    def __init__(
+        self,
+        documento_repository: DocumentoRepository,
+        snapshot_repository: SnapshotRepository,
+        modelo_embeddings: str,
+        tamano_lote: int = TAMANO_LOTE_SNAPSHOT
+    ):
+        self.documento_repository = documento_repository
+        self.snapshot_repository = snapshot_repository
+        self.modelo_embeddings = modelo_embeddings
+        self.tamano_lote = tamano_lote
+        self._tarea: Optional[asyncio.Task] = None
+        self._estado = EstadoSnapshotResponse(estado=ESTADO_INACTIVA)
+
+    async def exportar(
+        self,
+        nombre: str,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> ManifiestoSnapshot:
+        """
+        Exporta todos los documentos con sus embeddings.
+
+        Returns:
+            ManifiestoSnapshot: Descripción del snapshot escrito
+        """
+        total = await self.documento_repository.contar_documentos()
+        exportados = 0
+        if progreso is not None:
+            progreso(exportados, total)
+
+        async def _lotes():
+            nonlocal exportados
+            async for documentos, embeddings in self.documento_repository.iterar_con_embeddings(self.tamano_lote):
+                yield documentos, embeddings
+                exportados += len(documentos)
+                if progreso is not None:
+                    progreso(exportados, total)
+
+        try:
+            return await self.snapshot_repository.escribir(
+                ManifiestoSnapshot(nombre=nombre, modelo_embeddings=self.modelo_embeddings),
+                _lotes()
+            )
+
+        except ValueError as e:
+            raise e
+        except NotImplementedError as e:
+            raise ValueError(str(e))
+        except Exception as e:
+            raise Exception(f"Error al exportar el snapshot: {str(e)}")
+
+    async def importar(
+        self,
+        nombre: str,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Carga en el índice los documentos y embeddings de un snapshot.
+        Los documentos cuyo ID ya exista se reemplazan.
+
+        Returns:
+            int: Número de documentos importados
+
+        Raises:
+            ValueError: Si el snapshot no existe o se creó con otro modelo de embeddings
+        """
+        manifiesto = await self._obtener_manifiesto_compatible(nombre)
+
+        try:
+            importados = 0
+            async for documentos, embeddings in self.snapshot_repository.leer(nombre):
+                await self.documento_repository.guardar_con_embeddings(documentos, embeddings)
+                importados += len(documentos)
+                if progreso is not None:
+                    progreso(importados, manifiesto.total_documentos)
+            return importados
+
+        except ValueError as e:
+            raise e
+        except NotImplementedError as e:
+            raise ValueError(str(e))
+        except Exception as e:
+            raise Exception(f"Error al importar el snapshot: {str(e)}")
+
+    async def iniciar_exportacion(self, request: SnapshotRequest) -> EstadoSnapshotResponse:
+        """Lanza la exportación en segundo plano y retorna sin esperarla."""
+        # El total lo cuenta la propia exportación: aquí no se espera nada
+        # entre comprobar que no hay otra operación y ocupar su lugar
+        self._reservar(OPERACION_EXPORTACION, request.nombre)
+        return self._lanzar(self.exportar, request.nombre)
+
+    async def iniciar_importacion(self, request: SnapshotRequest) -> EstadoSnapshotResponse:
+        """
+        Lanza la importación en segundo plano y retorna sin esperarla.
+
+        Raises:
+            ValueError: Si el snapshot no existe o se creó con otro modelo de embeddings
+        """
+        anterior = self._reservar(OPERACION_IMPORTACION, request.nombre)
+        try:
+            manifiesto = await self._obtener_manifiesto_compatible(request.nombre)
+        except Exception:
+            self._estado = anterior
+            raise
+        self._estado.documentos_totales = manifiesto.total_documentos
+        return self._lanzar(self.importar, request.nombre)
+
+    async def obtener_estado(self) -> EstadoSnapshotResponse:
+        """Retorna el estado de la última exportación o importación."""
+        return self._estado.model_copy()
+
+    async def listar(self) -> SnapshotsListResponse:
+        """Lista los snapshots disponibles."""
+        try:
+            manifiestos = await self.snapshot_repository.listar()
+            return SnapshotsListResponse(snapshots=[
+                ManifiestoSnapshotDTO(
+                    nombre=manifiesto.nombre,
+                    modelo_embeddings=manifiesto.modelo_embeddings,
+                    dimension=manifiesto.dimension,
+                    total_documentos=manifiesto.total_documentos,
+                    partes=manifiesto.partes,
+                    fecha_creacion=manifiesto.fecha_creacion
+                )
+                for manifiesto in manifiestos
+            ])
+
+        except Exception as e:
+            raise Exception(f"Error al listar snapshots: {str(e)}")
+
+    async def _obtener_manifiesto_compatible(self, nombre: str) -> ManifiestoSnapshot:
+        manifiesto = await self.snapshot_repository.obtener_manifiesto(nombre)
+        if manifiesto is None:
+            raise ValueError(f"No existe el snapshot {nombre}")
+        if manifiesto.modelo_embeddings != self.modelo_embeddings:
+            raise ValueError(
+                f"El snapshot se creó con el modelo {manifiesto.modelo_embeddings} "
+                f"y el índice usa {self.modelo_embeddings}"
+            )
+        return manifiesto
+
+    def _reservar(self, operacion: str, nombre: str) -> EstadoSnapshotResponse:
+        """
+        Marca la operación como en curso, o falla si ya hay otra. Es síncrono:
+        entre la comprobación y la marca no puede colarse otra petición.
+        Retorna el estado anterior, para restaurarlo si no llega a lanzarse.
+        """
+        if self._estado.estado == ESTADO_EN_CURSO:
+            raise ValueError(f"Ya hay una {self._estado.operacion} de snapshot en curso")
+
+        anterior = self._estado
+        self._estado = EstadoSnapshotResponse(
+            operacion=operacion,
+            estado=ESTADO_EN_CURSO,
+            nombre=nombre,
+            fecha_inicio=datetime.now()
+        )
+        return anterior
+
+    def _lanzar(self, ejecutar, nombre: str) -> EstadoSnapshotResponse:
+        self._tarea = asyncio.create_task(self._ejecutar(ejecutar, nombre))
+        return self._estado.model_copy()
+
+    async def _ejecutar(self, ejecutar, nombre: str):
+        try:
+            await ejecutar(nombre, self._actualizar_progreso)
+            self._estado.estado = ESTADO_COMPLETADA
+        except Exception as e:
+            logger.exception("Error en la %s del snapshot %s", self._estado.operacion, nombre)
+            self._estado.estado = ESTADO_ERROR
+            self._estado.error = str(e)
+        finally:
+            self._estado.fecha_fin = datetime.now()
+
+    def _actualizar_progreso(self, procesados: int, totales: int):
+        self._estado.documentos_procesados = procesados
+        self._estado.documentos_totales = totales
\ No newline at end of file
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Asignaciones de memoria al pasar embeddings como listas o como arrays NumPy.
+
+Compara los dos formatos en la frontera entre el servicio de embeddings y
+los repositorios:
+- conversión: devolver el lote como listas de float (`.tolist()`) frente
+  a devolver la matriz tal cual
+- ingesta: `guardar_batch` con un servicio que devuelve uno u otro formato
+- búsqueda: `buscar_por_similitud_batch` con las consultas en uno u otro
+
+Para cada caso reporta el tiempo por llamada, los bloques de memoria de
+Python que siguen vivos tras la llamada y el pico de memoria medido con
+`tracemalloc`. Los embeddings son aleatorios, así que no hace falta el
+modelo.
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/benchmark_asignaciones.py
+    python benchmarks/benchmark_asignaciones.py --lotes 16 256 --motores chroma numpy
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Awaitable, Callable, List
+
+import numpy as np
+
+from ejecutar_benchmark import DIRECTORIO_BACKEND, DIRECTORIO_BENCHMARKS, _commit_actual
+
+if DIRECTORIO_BACKEND not in sys.path:
+    sys.path.insert(0, DIRECTORIO_BACKEND)
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+import chromadb
+from proyecto_gestion_documental.domain.entities.documento import Documento
+from proyecto_gestion_documental.domain.services.embedding_service import EmbeddingService
+from proyecto_gestion_documental.infrastructure.database.chroma_repository import ChromaDocumentoRepository
+from proyecto_gestion_documental.infrastructure.database.numpy_repository import NumpyDocumentoRepository
+
+FORMATOS = ("listas", "arrays")
+
+
+class EmbeddingsAleatorios(EmbeddingService):
+    """Devuelve vectores aleatorios como listas de float o como una matriz NumPy."""
+
+    def __init__(self, dimension: int, formato: str):
+        self.dimension = dimension
+        self.formato = formato
+        self._generador = np.random.default_rng(7)
+
+    def _vectores(self, cantidad: int):
+        vectores = self._generador.standard_normal((cantidad, self.dimension), dtype=np.float32)
+        return [vector.tolist() for vector in vectores] if self.formato == "listas" else vectores
+
+    async def generar_embedding(self, texto: str):
+        return self._vectores(1)[0]
+
+    async def generar_embeddings_batch(self, textos: List[str]):
+        return self._vectores(len(textos))
+
+    def obtener_dimension_embedding(self) -> int:
+        return self.dimension
+
+    def obtener_modelo_usado(self) -> str:
+        return "aleatorio"
+
+
+async def medir(llamada: Callable[[], Awaitable], repeticiones: int) -> dict:
+    """Tiempo por llamada (sin tracemalloc) y memoria de una llamada (con tracemalloc)."""
+    await llamada()
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        await llamada()
+    por_llamada = (time.perf_counter() - inicio) / repeticiones
+
+    bloques_antes = sys.getallocatedblocks()
+    tracemalloc.start()
+    resultado = await llamada()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    bloques_vivos = sys.getallocatedblocks() - bloques_antes
+    del resultado
+
+    return {
+        "ms_por_llamada": round(por_llamada * 1000, 3),
+        "bloques_vivos": bloques_vivos,
+        "pico_kb": round(pico / 1024, 1)
+    }
+
+
+def _crear_repositorio(motor: str, embeddings: EmbeddingService, directorio: str):
+    if motor == "numpy":
+        return NumpyDocumentoRepository(embeddings, directorio)
+    return ChromaDocumentoRepository(
+        embeddings, "asignaciones", chroma_client=chromadb.PersistentClient(path=directorio)
+    )
+
+
+async def medir_lote(motor: str, tamano_lote: int, dimension: int, repeticiones: int) -> List[dict]:
+    resultados = []
+    for formato in FORMATOS:
+        embeddings = EmbeddingsAleatorios(dimension, formato)
+        textos = [f"texto {i}" for i in range(tamano_lote)]
+
+        conversion = await medir(lambda: embeddings.generar_embeddings_batch(textos), repeticiones)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            repositorio = _crear_repositorio(motor, embeddings, directorio)
+            contador = iter(range(10 ** 9))
+
+            def _lote_nuevo():
+                # IDs nuevos en cada llamada: se mide la inserción, no el reemplazo
+                return repositorio.guardar_batch([
+                    Documento(id=f"d{next(contador)}", titulo="t", contenido=texto, tipo="benchmark")
+                    for texto in textos
+                ])
+
+            ingesta = await medir(_lote_nuevo, repeticiones)
+
+            consultas = await embeddings.generar_embeddings_batch(textos)
+            busqueda = await medir(lambda: repositorio.buscar_por_similitud_batch(consultas, 5), repeticiones)
+
+        for etapa, valores in (("conversion", conversion), ("ingesta", ingesta), ("busqueda", busqueda)):
+            resultados.append({
+                "motor": motor,
+                "tamano_lote": tamano_lote,
+                "formato": formato,
+                "etapa": etapa,
+                **valores
+            })
+    return resultados
+
+
+async def ejecutar(args) -> dict:
+    resultados = []
+    for motor in args.motores:
+        for tamano_lote in args.lotes:
+            print(f"⏱️  motor={motor} lote={tamano_lote}")
+            filas = await medir_lote(motor, tamano_lote, args.dimension, args.repeticiones)
+            resultados.extend(filas)
+            for etapa in ("conversion", "ingesta", "busqueda"):
+                listas, arrays = (
+                    next(f for f in filas if f["etapa"] == etapa and f["formato"] == formato)
+                    for formato in FORMATOS
+                )
+                print(
+                    f"   {etapa:<10} listas {listas['ms_por_llamada']:>8.3f} ms "
+                    f"{listas['bloques_vivos']:>8} bloques {listas['pico_kb']:>9.1f} KB  |  "
+                    f"arrays {arrays['ms_por_llamada']:>8.3f} ms "
+                    f"{arrays['bloques_vivos']:>8} bloques {arrays['pico_kb']:>9.1f} KB"
+                )
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "dimension": args.dimension,
+        "repeticiones": args.repeticiones,
+        "resultados": resultados
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asignaciones con embeddings como listas o arrays")
+    parser.add_argument("--motores", nargs="+", default=["chroma", "numpy"], choices=["chroma", "numpy"])
+    parser.add_argument("--lotes", nargs="+", type=int, default=[1, 16, 256])
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    args = parser.parse_args()
+
+    informe = asyncio.run(ejecutar(args))
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"asignaciones_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
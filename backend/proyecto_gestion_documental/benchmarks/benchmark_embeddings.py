@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark de `SentenceTransformerEmbeddingService`.
+
+Recorre tamaños de lote, número de hilos de torch, backends y longitudes
+de texto, y para cada combinación mide frases por segundo, latencia por
+llamada, memoria máxima del proceso y el sobrecoste del servicio frente
+a llamar a `model.encode` directamente (executor), junto al coste de la
+conversión a listas que el servicio hacía antes de devolver arrays NumPy.
+
+Cada combinación se mide en un proceso nuevo para que el número de hilos
+y el pico de memoria no se contaminen entre ellas.
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/benchmark_embeddings.py
+    python benchmarks/benchmark_embeddings.py --lotes 1 16 64 --hilos 1 4 --backends torch onnx
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+import multiprocessing
+
+from corpus_sintetico import generar_documentos
+from ejecutar_benchmark import DIRECTORIO_BACKEND, DIRECTORIO_BENCHMARKS, _commit_actual
+
+LONGITUDES = {"corta": 12, "media": 64, "larga": 256}  # palabras por texto
+
+
+def generar_textos(cantidad: int, palabras: int) -> list:
+    """Textos del corpus sintético recortados (o repetidos) a `palabras` palabras."""
+    textos = []
+    for documento in generar_documentos(cantidad, semilla=123):
+        tokens = documento["contenido"].split()
+        while len(tokens) < palabras:
+            tokens += tokens
+        textos.append(" ".join(tokens[:palabras]))
+    return textos
+
+
+def _medir_configuracion(
+    modelo: str,
+    backend: str,
+    hilos: int,
+    tamano_lote: int,
+    longitud: str,
+    repeticiones: int
+) -> dict:
+    """Se ejecuta en un proceso hijo: carga el modelo y mide una combinación."""
+    # Fijar los hilos antes de importar torch/onnxruntime
+    os.environ["OMP_NUM_THREADS"] = str(hilos)
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    if DIRECTORIO_BACKEND not in sys.path:
+        sys.path.insert(0, DIRECTORIO_BACKEND)
+
+    import asyncio
+    import resource
+    import torch
+    from proyecto_gestion_documental.infrastructure.external_services.sentence_transformer_service import (
+        SentenceTransformerEmbeddingService
+    )
+
+    torch.set_num_threads(hilos)
+    servicio = SentenceTransformerEmbeddingService(modelo, backend=backend)
+    textos = generar_textos(tamano_lote, LONGITUDES[longitud])
+
+    async def _medir():
+        # Calentamiento
+        await servicio.generar_embeddings_batch(textos)
+        await servicio.generar_embedding(textos[0])
+
+        # Camino batch del servicio
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            await servicio.generar_embeddings_batch(textos)
+        por_llamada_batch = (time.perf_counter() - inicio) / repeticiones
+
+        # Mismo trabajo llamando al modelo directamente, sin executor
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            vectores = servicio.model.encode(textos)
+        por_llamada_encode = (time.perf_counter() - inicio) / repeticiones
+
+        # Referencia: lo que costaba convertir el lote a listas de float
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            [vector.tolist() for vector in vectores]
+        por_llamada_tolist = (time.perf_counter() - inicio) / repeticiones
+
+        # Camino individual: una llamada por texto
+        inicio = time.perf_counter()
+        for texto in textos:
+            await servicio.generar_embedding(texto)
+        por_texto_individual = (time.perf_counter() - inicio) / len(textos)
+
+        inicio = time.perf_counter()
+        for texto in textos:
+            servicio.model.encode([texto])
+        por_texto_encode = (time.perf_counter() - inicio) / len(textos)
+
+        return {
+            "batch_frases_por_segundo": round(tamano_lote / por_llamada_batch, 1),
+            "batch_ms_por_llamada": round(por_llamada_batch * 1000, 3),
+            "batch_sobrecoste_ms": round((por_llamada_batch - por_llamada_encode) * 1000, 3),
+            "tolist_ms_por_llamada": round(por_llamada_tolist * 1000, 3),
+            "individual_frases_por_segundo": round(1 / por_texto_individual, 1),
+            "individual_ms_por_llamada": round(por_texto_individual * 1000, 3),
+            "individual_sobrecoste_ms": round((por_texto_individual - por_texto_encode) * 1000, 3)
+        }
+
+    resultado = asyncio.run(_medir())
+    return {
+        "backend": backend,
+        "hilos": hilos,
+        "tamano_lote": tamano_lote,
+        "longitud": longitud,
+        **resultado,
+        # En Linux ru_maxrss viene en KB
+        "memoria_maxima_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def ejecutar(args) -> dict:
+    combinaciones = list(product(args.backends, args.hilos, args.lotes, args.longitudes))
+    resultados = []
+    contexto = multiprocessing.get_context("spawn")
+
+    for numero, (backend, hilos, tamano_lote, longitud) in enumerate(combinaciones, 1):
+        print(f"⏱️  [{numero}/{len(combinaciones)}] backend={backend} hilos={hilos} "
+              f"lote={tamano_lote} longitud={longitud}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+            try:
+                resultado = executor.submit(
+                    _medir_configuracion, args.modelo, backend, hilos,
+                    tamano_lote, longitud, args.repeticiones
+                ).result()
+            except Exception as e:
+                print(f"   ❌ {e}")
+                continue
+
+        resultados.append(resultado)
+        print(
+            f"   batch {resultado['batch_frases_por_segundo']:>8.1f} frases/s "
+            f"(+{resultado['batch_sobrecoste_ms']:.2f} ms/llamada)  "
+            f"individual {resultado['individual_frases_por_segundo']:>7.1f} frases/s "
+            f"(+{resultado['individual_sobrecoste_ms']:.2f} ms/llamada)  "
+            f"memoria {resultado['memoria_maxima_mb']:.0f} MB"
+        )
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "modelo": args.modelo,
+        "cpus": os.cpu_count(),
+        "repeticiones": args.repeticiones,
+        "resultados": resultados
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark de embeddings")
+    parser.add_argument("--modelo", default="all-MiniLM-L6-v2")
+    parser.add_argument("--backends", nargs="+", default=["torch"],
+                        choices=["torch", "onnx", "openvino"])
+    parser.add_argument("--hilos", nargs="+", type=int,
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--lotes", nargs="+", type=int, default=[1, 8, 32, 128])
+    parser.add_argument("--longitudes", nargs="+", choices=list(LONGITUDES),
+                        default=list(LONGITUDES))
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    args = parser.parse_args()
+
+    informe = ejecutar(args)
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"embeddings_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
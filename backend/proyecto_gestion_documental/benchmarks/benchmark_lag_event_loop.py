@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Retraso del event loop con carga mixta sobre el repositorio Chroma.
+
+Mientras varias tareas buscan sin parar, otra ingesta documentos en lotes
+grandes y otra lista la colección entera (`obtener_todos`). A la vez, un
+reloj se despierta cada `--intervalo` ms y anota cuánto tarde llega: ese
+retraso es lo que espera cualquier otra petición del worker para empezar.
+
+Se mide en dos modos:
+- en_loop: las llamadas a Chroma se ejecutan dentro de la corrutina, en el
+  hilo del event loop (como antes de moverlas a un ejecutor)
+- ejecutor: las llamadas van a los hilos del ejecutor, con las escrituras
+  por lotes de `--lote-escritura` y las lecturas esperando al lote en curso
+  (salvo con `--sin-bloqueo-lecturas`)
+
+Los embeddings son aleatorios, así que no hace falta el modelo.
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/benchmark_lag_event_loop.py
+    python benchmarks/benchmark_lag_event_loop.py --documentos 20000 --buscadores 16 --duracion 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+from ejecutar_benchmark import DIRECTORIO_BACKEND, DIRECTORIO_BENCHMARKS, _commit_actual
+
+if DIRECTORIO_BACKEND not in sys.path:
+    sys.path.insert(0, DIRECTORIO_BACKEND)
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+import chromadb
+from proyecto_gestion_documental.domain.entities.documento import Documento
+from proyecto_gestion_documental.infrastructure.database.chroma_repository import ChromaDocumentoRepository
+from proyecto_gestion_documental.infrastructure.workers.ejecutor import Ejecutor
+
+from benchmark_asignaciones import EmbeddingsAleatorios
+
+MODOS = ("en_loop", "ejecutor")
+
+
+class EjecutorEnLinea:
+    """Ejecuta las llamadas en el propio hilo del event loop (comportamiento anterior)."""
+
+    async def ejecutar(self, funcion, *args):
+        return funcion(*args)
+
+
+def _percentiles(valores: List[float]) -> dict:
+    if not valores:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    milisegundos = np.asarray(valores) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(milisegundos, 50)), 2),
+        "p99_ms": round(float(np.percentile(milisegundos, 99)), 2),
+        "max_ms": round(float(milisegundos.max()), 2)
+    }
+
+
+def _documentos(desde: int, cantidad: int) -> List[Documento]:
+    return [
+        Documento(id=f"d{i}", titulo=f"Documento {i}", contenido=f"contenido del documento {i}", tipo="benchmark")
+        for i in range(desde, desde + cantidad)
+    ]
+
+
+async def medir_modo(modo: str, args) -> dict:
+    embeddings = EmbeddingsAleatorios(args.dimension, "arrays")
+    with tempfile.TemporaryDirectory() as directorio:
+        ejecutor = Ejecutor("chroma", args.hilos) if modo == "ejecutor" else EjecutorEnLinea()
+        repositorio = ChromaDocumentoRepository(
+            embeddings,
+            "lag_event_loop",
+            chroma_client=chromadb.PersistentClient(path=directorio),
+            ejecutor=ejecutor,
+            # En el loop la ingesta iba en una sola llamada
+            tamano_lote_escritura=args.lote_escritura if modo == "ejecutor" else 10 ** 9,
+            bloqueo_lecturas=not args.sin_bloqueo_lecturas
+        )
+        await repositorio.guardar_con_embeddings(
+            _documentos(0, args.documentos),
+            await embeddings.generar_embeddings_batch(["x"] * args.documentos)
+        )
+
+        retrasos: List[float] = []
+        latencias_busqueda: List[float] = []
+        escrituras = 0
+        listados = 0
+        fin = time.perf_counter() + args.duracion
+
+        async def reloj():
+            intervalo = args.intervalo / 1000
+            while time.perf_counter() < fin:
+                esperado = time.perf_counter() + intervalo
+                await asyncio.sleep(intervalo)
+                retrasos.append(max(0.0, time.perf_counter() - esperado))
+
+        async def buscador():
+            while time.perf_counter() < fin:
+                consulta = await embeddings.generar_embeddings_batch(["pregunta"])
+                inicio = time.perf_counter()
+                await repositorio.buscar_por_similitud_batch(consulta, 5)
+                latencias_busqueda.append(time.perf_counter() - inicio)
+                await asyncio.sleep(0)
+
+        async def ingesta():
+            nonlocal escrituras
+            siguiente = args.documentos
+            while time.perf_counter() < fin:
+                await repositorio.guardar_con_embeddings(
+                    _documentos(siguiente, args.lote_ingesta),
+                    await embeddings.generar_embeddings_batch(["x"] * args.lote_ingesta)
+                )
+                siguiente += args.lote_ingesta
+                escrituras += 1
+                await asyncio.sleep(0)
+
+        async def listado():
+            nonlocal listados
+            while time.perf_counter() < fin:
+                await repositorio.obtener_todos()
+                listados += 1
+                await asyncio.sleep(0)
+
+        await asyncio.gather(
+            reloj(), ingesta(), listado(), *(buscador() for _ in range(args.buscadores))
+        )
+        if isinstance(ejecutor, Ejecutor):
+            ejecutor.cerrar()
+
+    return {
+        "modo": modo,
+        "retraso_loop": _percentiles(retrasos),
+        "busqueda": _percentiles(latencias_busqueda),
+        "busquedas_por_segundo": round(len(latencias_busqueda) / args.duracion, 1),
+        "lotes_ingestados": escrituras,
+        "listados": listados
+    }
+
+
+async def ejecutar(args) -> dict:
+    resultados = []
+    for modo in args.modos:
+        print(f"⏱️  modo={modo}")
+        fila = await medir_modo(modo, args)
+        resultados.append(fila)
+        retraso, busqueda = fila["retraso_loop"], fila["busqueda"]
+        print(
+            f"   retraso del loop p50 {retraso['p50_ms']:>8.2f} ms  p99 {retraso['p99_ms']:>8.2f} ms  "
+            f"max {retraso['max_ms']:>8.2f} ms  |  búsqueda p99 {busqueda['p99_ms']:>8.2f} ms  "
+            f"{fila['busquedas_por_segundo']:>7.1f}/s  |  {fila['lotes_ingestados']} lotes, "
+            f"{fila['listados']} listados"
+        )
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "parametros": vars(args),
+        "resultados": resultados
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retraso del event loop con carga mixta sobre Chroma")
+    parser.add_argument("--modos", nargs="+", default=list(MODOS), choices=MODOS)
+    parser.add_argument("--documentos", type=int, default=5000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--buscadores", type=int, default=8)
+    parser.add_argument("--lote-ingesta", type=int, default=2000)
+    parser.add_argument("--lote-escritura", type=int, default=256)
+    parser.add_argument("--hilos", type=int, default=4)
+    parser.add_argument("--sin-bloqueo-lecturas", action="store_true")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="ms entre despertares del reloj")
+    parser.add_argument("--duracion", type=float, default=10.0, help="segundos por modo")
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    args = parser.parse_args()
+
+    informe = asyncio.run(ejecutar(args))
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"lag_event_loop_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
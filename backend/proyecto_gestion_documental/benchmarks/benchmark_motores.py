@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Comparación de motores de búsqueda: ChromaDB (HNSW) frente a NumPy (exacta).
+
+Indexa vectores aleatorios normalizados con cada motor y mide tiempo de
+indexación, latencia de consultas individuales y por lotes, recall@10 de
+cada motor frente al top 10 exacto (y su pérdida), bytes por vector en
+memoria y en disco, memoria máxima del proceso y tamaño en disco. Los
+embeddings se generan sin modelo, así que se mide solo el motor.
+
+Cada combinación de motor y tamaño se mide en un proceso nuevo para que el
+pico de memoria no se contamine entre ellas.
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/benchmark_motores.py
+    python benchmarks/benchmark_motores.py --tamanos 10000 200000 --motores numpy --tipos-vector float32 float16 int8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+
+from ejecutar_benchmark import DIRECTORIO_BACKEND, DIRECTORIO_BENCHMARKS, _commit_actual
+from generador_carga import resumir_latencias
+
+K = 10
+TAMANO_LOTE_INDEXACION = 2000
+
+
+def _generar_vectores(cantidad: int, dimension: int, semilla: int):
+    import numpy as np
+    vectores = np.random.default_rng(semilla).standard_normal((cantidad, dimension), dtype=np.float32)
+    return vectores / np.linalg.norm(vectores, axis=1, keepdims=True)
+
+
+def _medir_motor(
+    motor: str,
+    tipo_vector: str,
+    tamano: int,
+    dimension: int,
+    consultas: int,
+    tamano_lote_consultas: int,
+    factor_reevaluacion: int
+) -> dict:
+    """Se ejecuta en un proceso hijo: indexa `tamano` vectores y mide las búsquedas."""
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+    if DIRECTORIO_BACKEND not in sys.path:
+        sys.path.insert(0, DIRECTORIO_BACKEND)
+
+    import asyncio
+    import resource
+    import tempfile
+    from typing import List
+    import numpy as np
+    from evaluar_recuperacion import _tamano_directorio_mb
+    from proyecto_gestion_documental.domain.entities.documento import Documento
+    from proyecto_gestion_documental.domain.services.embedding_service import (
+        EmbeddingService, Vector, MatrizVectores
+    )
+
+    vectores = _generar_vectores(tamano, dimension, semilla=1)
+    preguntas = _generar_vectores(consultas, dimension, semilla=2)
+
+    class VectoresPrecalculados(EmbeddingService):
+        """El contenido de cada documento es el número de su fila en `vectores`."""
+
+        async def generar_embedding(self, texto: str) -> Vector:
+            return vectores[int(texto)]
+
+        async def generar_embeddings_batch(self, textos: List[str]) -> MatrizVectores:
+            return vectores[[int(texto) for texto in textos]]
+
+        def obtener_dimension_embedding(self) -> int:
+            return dimension
+
+        def obtener_modelo_usado(self) -> str:
+            return "aleatorio"
+
+    # Top K exacto de referencia
+    similitudes = preguntas @ vectores.T
+    exactos = np.argsort(-similitudes, axis=1)[:, :K]
+
+    async def _medir(directorio: str) -> dict:
+        embeddings = VectoresPrecalculados()
+        if motor == "numpy":
+            from proyecto_gestion_documental.infrastructure.database.numpy_repository import (
+                NumpyDocumentoRepository
+            )
+            repositorio = NumpyDocumentoRepository(
+                embeddings, directorio,
+                tipo_vector=tipo_vector,
+                factor_reevaluacion=factor_reevaluacion
+            )
+        else:
+            import chromadb
+            from proyecto_gestion_documental.infrastructure.database.chroma_repository import (
+                ChromaDocumentoRepository
+            )
+            repositorio = ChromaDocumentoRepository(
+                embeddings, "benchmark", chroma_client=chromadb.PersistentClient(path=directorio)
+            )
+
+        inicio = time.perf_counter()
+        for i in range(0, tamano, TAMANO_LOTE_INDEXACION):
+            await repositorio.guardar_batch([
+                Documento(id=f"v{fila}", titulo="", contenido=str(fila), tipo="benchmark")
+                for fila in range(i, min(i + TAMANO_LOTE_INDEXACION, tamano))
+            ])
+        tiempo_indexacion = time.perf_counter() - inicio
+
+        # Calentamiento
+        await repositorio.buscar_por_similitud(preguntas[0], K)
+
+        latencias, aciertos = [], 0
+        for pregunta, esperados in zip(preguntas, exactos):
+            inicio = time.perf_counter()
+            resultados = await repositorio.buscar_por_similitud(pregunta, K)
+            latencias.append(time.perf_counter() - inicio)
+            encontrados = {int(documento.id[1:]) for documento in resultados}
+            aciertos += len(encontrados & set(esperados.tolist()))
+
+        latencias_lote = []
+        for i in range(0, consultas, tamano_lote_consultas):
+            lote = preguntas[i:i + tamano_lote_consultas]
+            inicio = time.perf_counter()
+            await repositorio.buscar_por_similitud_batch(lote, K)
+            latencias_lote.append((time.perf_counter() - inicio) / len(lote))
+
+        disco_mb = _tamano_directorio_mb(directorio)
+        recall = aciertos / (consultas * K)
+        return {
+            "indexacion_s": round(tiempo_indexacion, 2),
+            f"recall@{K}": round(recall, 4),
+            "perdida_recall": round(1 - recall, 4),
+            # Lo que recorre cada búsqueda; para Chroma, vectores float32 sin el grafo
+            "memoria_bytes_por_vector": (
+                repositorio.obtener_bytes_por_vector() if motor == "numpy" else dimension * 4
+            ),
+            "disco_bytes_por_vector": round(disco_mb * 1024 * 1024 / tamano, 1),
+            **{f"consulta_{clave}": valor for clave, valor in resumir_latencias(latencias).items()},
+            **{f"lote_por_consulta_{clave}": valor
+               for clave, valor in resumir_latencias(latencias_lote).items()},
+            "disco_mb": disco_mb
+        }
+
+    with tempfile.TemporaryDirectory() as directorio:
+        resultado = asyncio.run(_medir(directorio))
+
+    return {
+        "motor": motor,
+        "tipo_vector": tipo_vector if motor == "numpy" else "float32",
+        "tamano": tamano,
+        "dimension": dimension,
+        **resultado,
+        # En Linux ru_maxrss viene en KB
+        "memoria_maxima_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def ejecutar(args) -> dict:
+    combinaciones = [
+        (motor, tipo_vector, tamano)
+        for tamano in args.tamanos
+        for motor in args.motores
+        for tipo_vector in (args.tipos_vector if motor == "numpy" else ["float32"])
+    ]
+    resultados = []
+    contexto = multiprocessing.get_context("spawn")
+
+    for numero, (motor, tipo_vector, tamano) in enumerate(combinaciones, 1):
+        print(f"⏱️  [{numero}/{len(combinaciones)}] motor={motor} tipo={tipo_vector} tamaño={tamano}")
+        with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+            try:
+                resultado = executor.submit(
+                    _medir_motor, motor, tipo_vector, tamano, args.dimension,
+                    args.consultas, args.lote_consultas, args.factor_reevaluacion
+                ).result()
+            except Exception as e:
+                print(f"   ❌ {e}")
+                continue
+
+        resultados.append(resultado)
+        print(
+            f"   indexación {resultado['indexacion_s']:.1f} s  "
+            f"consulta p50 {resultado['consulta_p50_ms']:.2f} ms p95 {resultado['consulta_p95_ms']:.2f} ms  "
+            f"lote p50 {resultado['lote_por_consulta_p50_ms']:.2f} ms/consulta  "
+            f"R@{K} {resultado[f'recall@{K}']:.3f}  "
+            f"{resultado['memoria_bytes_por_vector']} B/vector  "
+            f"memoria {resultado['memoria_maxima_mb']:.0f} MB  disco {resultado['disco_mb']:.1f} MB"
+        )
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "cpus": os.cpu_count(),
+        "consultas": args.consultas,
+        "factor_reevaluacion": args.factor_reevaluacion,
+        "resultados": resultados
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparación de motores de búsqueda vectorial")
+    parser.add_argument("--motores", nargs="+", default=["chroma", "numpy"], choices=["chroma", "numpy"])
+    parser.add_argument("--tipos-vector", nargs="+", default=["float32"], choices=["float32", "float16", "int8"],
+                        help="tipos de la matriz del motor numpy")
+    parser.add_argument("--factor-reevaluacion", type=int, default=4,
+                        help="candidatos por resultado reevaluados en float32 (float16 e int8)")
+    parser.add_argument("--tamanos", nargs="+", type=int, default=[10000, 50000, 200000])
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--lote-consultas", type=int, default=32)
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    args = parser.parse_args()
+
+    informe = ejecutar(args)
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"motores_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Throughput de la API con varios workers de uvicorn contra un servidor Chroma.
+
+Arranca un servidor Chroma local (`chroma run`) y un Ollama falso, carga el
+corpus sintético una vez y, para cada número de workers, lanza la API con
+`RAG_CHROMA_URL` apuntando al servidor. Comprueba que todos los workers ven
+el mismo corpus (el total del listado no cambia entre peticiones, que
+reparte uvicorn) y mide throughput y latencias de `/busqueda/` con carga
+concurrente, junto a la aceleración frente a un solo worker.
+
+El modelo de embeddings debe estar ya en la caché de Hugging Face. La
+aceleración está limitada por los núcleos disponibles: cada worker embebe
+las preguntas en CPU.
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/benchmark_workers.py
+    python benchmarks/benchmark_workers.py --workers 1 2 4 8 --documentos 2000 --concurrencia 32
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from itertools import cycle, islice
+
+import requests
+
+from corpus_sintetico import generar_documentos, generar_preguntas
+from ejecutar_benchmark import DIRECTORIO_BENCHMARKS, _commit_actual, _puerto_libre, arrancar_api
+from generador_carga import ejecutar_escenario
+from ollama_falso import iniciar_ollama_falso
+
+
+def arrancar_chroma(directorio: str, timeout: float = 60.0):
+    """Lanza `chroma run` en un puerto libre y espera a que responda."""
+    ejecutable = shutil.which("chroma")
+    if ejecutable is None:
+        raise RuntimeError("No se encontró el comando `chroma` (pip install chromadb)")
+
+    puerto = _puerto_libre()
+    proceso = subprocess.Popen(
+        [ejecutable, "run", "--path", directorio, "--port", str(puerto)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    url = f"http://127.0.0.1:{puerto}"
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError("El servidor Chroma terminó durante el arranque")
+        try:
+            if requests.get(f"{url}/api/v2/heartbeat", timeout=1).status_code == 200:
+                return proceso, url
+        except requests.RequestException:
+            pass
+        time.sleep(0.3)
+
+    proceso.terminate()
+    raise RuntimeError(f"El servidor Chroma no respondió en {timeout:.0f} s")
+
+
+def _detener(proceso: subprocess.Popen):
+    proceso.terminate()
+    proceso.wait(timeout=30)
+
+
+def cargar_corpus(url: str, documentos: int, args) -> dict:
+    print(f"📤 Subiendo {documentos} documentos...")
+    return ejecutar_escenario(
+        "subida",
+        (
+            lambda sesion, doc=doc: sesion.post(
+                f"{url}/documentos/", params={"sincrono": "true"}, json=doc, timeout=60
+            )
+            for doc in generar_documentos(documentos, args.semilla)
+        ),
+        args.concurrencia
+    )
+
+
+def totales_vistos(url: str, peticiones: int) -> set:
+    """Totales del listado en varias peticiones; con un índice compartido, uno solo."""
+    totales = set()
+    with requests.Session() as sesion:
+        for _ in range(peticiones):
+            # Conexión nueva en cada petición para que la atiendan workers distintos
+            respuesta = sesion.get(
+                f"{url}/documentos/", params={"pagina": 1, "limite": 1},
+                headers={"Connection": "close"}, timeout=60
+            )
+            respuesta.raise_for_status()
+            totales.add(respuesta.json()["total"])
+    return totales
+
+
+def medir_busqueda(url: str, args) -> dict:
+    preguntas = generar_preguntas(100, args.semilla)
+
+    # Calentamiento: cada worker carga el modelo en su primera petición
+    ejecutar_escenario(
+        "calentamiento",
+        (
+            lambda sesion, pregunta=pregunta: sesion.post(
+                f"{url}/busqueda/", json={"pregunta": pregunta, "limite_resultados": 5}, timeout=120
+            )
+            for pregunta in islice(cycle(preguntas), args.concurrencia * 4)
+        ),
+        args.concurrencia
+    )
+
+    return ejecutar_escenario(
+        "busqueda",
+        (
+            lambda sesion, pregunta=pregunta: sesion.post(
+                f"{url}/busqueda/", json={"pregunta": pregunta, "limite_resultados": 5}, timeout=120
+            )
+            for pregunta in islice(cycle(preguntas), args.consultas)
+        ),
+        args.concurrencia
+    )
+
+
+def ejecutar(args) -> dict:
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "cpus": os.cpu_count(),
+        "parametros": {
+            "documentos": args.documentos,
+            "consultas": args.consultas,
+            "concurrencia": args.concurrencia,
+            "semilla": args.semilla
+        },
+        "resultados": []
+    }
+
+    ollama = iniciar_ollama_falso()
+    url_ollama = f"http://127.0.0.1:{ollama.server_port}"
+
+    with tempfile.TemporaryDirectory() as directorio:
+        chroma, url_chroma = arrancar_chroma(os.path.join(directorio, "chroma"))
+        print(f"🗄️  Servidor Chroma en {url_chroma}")
+        entorno = {
+            "RAG_CHROMA_URL": url_chroma,
+            "RAG_COLECCION": f"benchmark_workers_{int(time.time())}"
+        }
+
+        try:
+            proceso, url = arrancar_api(url_ollama, directorio, entorno_extra=entorno)
+            try:
+                informe["subida"] = cargar_corpus(url, args.documentos, args)
+            finally:
+                _detener(proceso)
+
+            base = None
+            for workers in args.workers:
+                print(f"\n⚙️  {workers} worker(s)")
+                proceso, url = arrancar_api(url_ollama, directorio, workers=workers, entorno_extra=entorno)
+                try:
+                    totales = totales_vistos(url, workers * 4)
+                    busqueda = medir_busqueda(url, args)
+                finally:
+                    _detener(proceso)
+
+                base = base or busqueda["throughput_rps"]
+                resultado = {
+                    "workers": workers,
+                    "totales_vistos": sorted(totales),
+                    "consistente": totales == {args.documentos},
+                    "aceleracion": round(busqueda["throughput_rps"] / base, 2) if base else 0.0,
+                    **busqueda
+                }
+                informe["resultados"].append(resultado)
+                print(
+                    f"   {resultado['throughput_rps']:>8.1f} req/s (x{resultado['aceleracion']:.2f})  "
+                    f"p50 {resultado['p50_ms']:>8.1f} ms  p95 {resultado['p95_ms']:>8.1f} ms  "
+                    f"errores {resultado['errores']}  totales vistos {resultado['totales_vistos']}"
+                )
+        finally:
+            _detener(chroma)
+            ollama.shutdown()
+
+    return informe
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput con varios workers contra un servidor Chroma")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--documentos", type=int, default=1000)
+    parser.add_argument("--consultas", type=int, default=400)
+    parser.add_argument("--concurrencia", type=int, default=16)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    args = parser.parse_args()
+
+    informe = ejecutar(args)
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"workers_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
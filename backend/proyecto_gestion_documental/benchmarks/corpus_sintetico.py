@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Genera corpus sintéticos de documentos normativos, reproducibles por semilla.
+
+Uso:
+    python benchmarks/corpus_sintetico.py --documentos 10000 --salida corpus_10k.json
+"""
+
+import argparse
+import json
+import random
+from typing import Dict, Iterator, List
+
+TAMANOS_CORPUS = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+TIPOS = ["normativo", "procedimiento", "manual", "politica"]
+TEMAS = [
+    "vacaciones", "teletrabajo", "contratación pública", "protección de datos",
+    "horarios", "viáticos", "licencias médicas", "seguridad informática",
+    "capacitación", "evaluación del desempeño", "archivo documental", "compras menores",
+    "firma electrónica", "atención al ciudadano", "gestión de riesgos", "presupuesto"
+]
+ORGANOS = ["Consejo Directivo", "Rectorado", "Dirección de Talento Humano",
+           "Secretaría General", "Dirección Financiera", "Dirección de TIC"]
+FRASES = [
+    "Los servidores deberán presentar la solicitud con al menos {n} días de anticipación.",
+    "El plazo máximo para resolver será de {n} días hábiles contados desde la recepción.",
+    "La {organo} supervisará el cumplimiento de lo dispuesto en este artículo.",
+    "Se exceptúan de esta disposición los casos de fuerza mayor debidamente justificados.",
+    "El incumplimiento será sancionado conforme al régimen disciplinario vigente.",
+    "Los registros se conservarán durante {n} años en el archivo institucional.",
+    "Toda modificación deberá ser aprobada por la {organo} mediante resolución.",
+    "El procedimiento se realizará a través del sistema de gestión documental."
+]
+
+
+def generar_documentos(cantidad: int, semilla: int = 42) -> Iterator[Dict[str, str]]:
+    """Genera `cantidad` documentos deterministas (mismo corpus para la misma semilla)."""
+    aleatorio = random.Random(semilla)
+    for numero in range(1, cantidad + 1):
+        tema = aleatorio.choice(TEMAS)
+        organo = aleatorio.choice(ORGANOS)
+        articulos = []
+        for articulo in range(1, aleatorio.randint(2, 5) + 1):
+            frases = " ".join(
+                aleatorio.choice(FRASES).format(n=aleatorio.randint(2, 30), organo=organo)
+                for _ in range(aleatorio.randint(2, 4))
+            )
+            articulos.append(f"Artículo {articulo}.- Sobre {tema}: {frases}")
+
+        yield {
+            "titulo": f"Reglamento {numero:06d} de {tema}",
+            "contenido": "\n".join(articulos),
+            "tipo": aleatorio.choice(TIPOS)
+        }
+
+
+def generar_preguntas(cantidad: int, semilla: int = 7) -> List[str]:
+    """Preguntas sobre los temas del corpus para las consultas de carga."""
+    aleatorio = random.Random(semilla)
+    plantillas = [
+        "¿Cuál es el plazo para {tema}?",
+        "¿Qué órgano aprueba los cambios sobre {tema}?",
+        "¿Qué sanciones hay por incumplir la norma de {tema}?",
+        "¿Cómo se solicita {tema}?"
+    ]
+    return [
+        aleatorio.choice(plantillas).format(tema=aleatorio.choice(TEMAS))
+        for _ in range(cantidad)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generador de corpus sintético")
+    parser.add_argument("--documentos", type=int, default=1000)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default="corpus_sintetico.json")
+    args = parser.parse_args()
+
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(list(generar_documentos(args.documentos, args.semilla)), archivo, ensure_ascii=False)
+    print(f"✅ {args.documentos} documentos guardados en {args.salida}")
\ No newline at end of file
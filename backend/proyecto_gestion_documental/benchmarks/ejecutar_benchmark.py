@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Benchmark reproducible de la API: subida, listado y consulta.
+
+Arranca un Ollama falso y, por cada tamaño de corpus, una instancia nueva
+de la API (`crear_app`) apuntando a él; carga el corpus sintético, lanza
+los escenarios con carga concurrente y guarda un informe JSON con
+throughput y latencias p50/p95/p99 para comparar entre commits.
+
+Todo se ejecuta en local. El modelo de embeddings debe estar ya en la
+caché de Hugging Face (basta con haber arrancado la API una vez).
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/ejecutar_benchmark.py --corpus 1k 10k
+    python benchmarks/ejecutar_benchmark.py --url http://localhost:8000 --corpus 1k
+    python benchmarks/ejecutar_benchmark.py --comparar resultados/a.json resultados/b.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import cycle, islice
+from typing import Dict, Optional
+
+import requests
+
+from corpus_sintetico import TAMANOS_CORPUS, generar_documentos, generar_preguntas
+from generador_carga import ejecutar_escenario
+from ollama_falso import ConfiguracionOllamaFalso, iniciar_ollama_falso
+
+DIRECTORIO_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_BACKEND = os.path.dirname(os.path.dirname(DIRECTORIO_BENCHMARKS))
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=DIRECTORIO_BENCHMARKS, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def arrancar_api(
+    url_ollama: str,
+    directorio_datos: str,
+    timeout: float = 180.0,
+    workers: int = 1,
+    entorno_extra: Optional[Dict[str, str]] = None
+):
+    """Lanza la API con uvicorn (`workers` procesos) en un puerto libre y espera a que responda."""
+    puerto = _puerto_libre()
+    entorno = dict(os.environ)
+    entorno.update({
+        "RAG_OLLAMA_URLS": url_ollama,
+        "RAG_INGESTAS_DB_URL": f"sqlite:///{os.path.join(directorio_datos, 'ingestas.db')}",
+        "PYTHONPATH": DIRECTORIO_BACKEND,
+        **(entorno_extra or {})
+    })
+    # Sin red: modelo desde la caché local y sin telemetría de ChromaDB
+    entorno.setdefault("HF_HUB_OFFLINE", "1")
+    entorno.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+    proceso = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn",
+            "proyecto_gestion_documental.infrastructure.web.app:crear_app",
+            "--factory", "--port", str(puerto), "--log-level", "warning",
+            "--workers", str(workers)
+        ],
+        cwd=DIRECTORIO_BACKEND,
+        env=entorno
+    )
+
+    url = f"http://127.0.0.1:{puerto}"
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError("La API terminó durante el arranque")
+        try:
+            if requests.get(f"{url}/metrics", timeout=1).status_code == 200:
+                return proceso, url
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+
+    proceso.terminate()
+    raise RuntimeError(f"La API no respondió en {timeout:.0f} s")
+
+
+def ejecutar_escenarios(url: str, documentos: int, args) -> list:
+    """Carga el corpus (escenario de subida) y mide listado y consulta."""
+    resultados = []
+
+    print(f"📤 Subiendo {documentos} documentos...")
+    resultados.append(ejecutar_escenario(
+        "subida",
+        (
+            lambda sesion, doc=doc: sesion.post(
+                f"{url}/documentos/", params={"sincrono": "true"}, json=doc, timeout=60
+            )
+            for doc in generar_documentos(documentos, args.semilla)
+        ),
+        args.concurrencia
+    ))
+
+    print(f"📋 Listando ({args.listados} peticiones)...")
+    paginas = max(1, documentos // 20)
+    resultados.append(ejecutar_escenario(
+        "listado",
+        (
+            lambda sesion, pagina=(i % paginas) + 1: sesion.get(
+                f"{url}/documentos/", params={"pagina": pagina, "limite": 20}, timeout=60
+            )
+            for i in range(args.listados)
+        ),
+        args.concurrencia
+    ))
+
+    print(f"💬 Consultando ({args.consultas} peticiones)...")
+    preguntas = islice(cycle(generar_preguntas(100, args.semilla)), args.consultas)
+    resultados.append(ejecutar_escenario(
+        "consulta",
+        (
+            lambda sesion, pregunta=pregunta: sesion.post(
+                f"{url}/consultas/",
+                json={"pregunta": pregunta, "limite_resultados": 5},
+                timeout=120
+            )
+            for pregunta in preguntas
+        ),
+        args.concurrencia
+    ))
+
+    for resultado in resultados:
+        print(
+            f"   {resultado['escenario']:<9} {resultado['throughput_rps']:>8.1f} req/s  "
+            f"p50 {resultado['p50_ms']:>8.1f} ms  p95 {resultado['p95_ms']:>8.1f} ms  "
+            f"p99 {resultado['p99_ms']:>8.1f} ms  errores {resultado['errores']}"
+        )
+    return resultados
+
+
+def ejecutar_benchmark(args) -> dict:
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "parametros": {
+            "concurrencia": args.concurrencia,
+            "consultas": args.consultas,
+            "listados": args.listados,
+            "tokens_por_segundo": args.tokens_por_segundo,
+            "latencia_llm": args.latencia_llm,
+            "semilla": args.semilla
+        },
+        "resultados": []
+    }
+
+    ollama = None
+    if args.url is None:
+        ollama = iniciar_ollama_falso(config=ConfiguracionOllamaFalso(
+            tokens_por_segundo=args.tokens_por_segundo,
+            latencia=args.latencia_llm,
+            tokens_respuesta=args.tokens
+        ))
+        url_ollama = f"http://127.0.0.1:{ollama.server_port}"
+        print(f"🤖 Ollama falso en {url_ollama}")
+
+    try:
+        for corpus in args.corpus:
+            documentos = TAMANOS_CORPUS[corpus]
+            print(f"\n📚 Corpus {corpus} ({documentos} documentos)")
+
+            if args.url is not None:
+                escenarios = ejecutar_escenarios(args.url, documentos, args)
+            else:
+                # Instancia nueva por corpus para que no se acumulen documentos
+                with tempfile.TemporaryDirectory() as directorio_datos:
+                    proceso, url = arrancar_api(url_ollama, directorio_datos)
+                    try:
+                        escenarios = ejecutar_escenarios(url, documentos, args)
+                    finally:
+                        proceso.terminate()
+                        proceso.wait(timeout=30)
+
+            informe["resultados"].append({
+                "corpus": corpus,
+                "documentos": documentos,
+                "escenarios": escenarios
+            })
+    finally:
+        if ollama is not None:
+            ollama.shutdown()
+
+    return informe
+
+
+def comparar_informes(ruta_base: str, ruta_nuevo: str):
+    """Muestra la variación de throughput, p95 y p99 entre dos informes."""
+    with open(ruta_base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(ruta_nuevo, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+
+    print(f"Comparando {base['commit']} → {nuevo['commit']}")
+    indice_base = {
+        (r["corpus"], e["escenario"]): e
+        for r in base["resultados"] for e in r["escenarios"]
+    }
+    for resultado in nuevo["resultados"]:
+        for escenario in resultado["escenarios"]:
+            anterior = indice_base.get((resultado["corpus"], escenario["escenario"]))
+            if anterior is None:
+                continue
+
+            def _variacion(clave):
+                if not anterior[clave]:
+                    return "   n/a"
+                return f"{(escenario[clave] - anterior[clave]) / anterior[clave] * 100:+6.1f}%"
+
+            print(
+                f"   {resultado['corpus']:<5} {escenario['escenario']:<9} "
+                f"throughput {_variacion('throughput_rps')}  p95 {_variacion('p95_ms')}  "
+                f"p99 {_variacion('p99_ms')}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de la API de gestión documental")
+    parser.add_argument("--corpus", nargs="+", choices=list(TAMANOS_CORPUS), default=["1k"])
+    parser.add_argument("--url", help="API ya en marcha (por defecto se arranca una local)")
+    parser.add_argument("--concurrencia", type=int, default=8)
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--listados", type=int, default=200)
+    parser.add_argument("--tokens-por-segundo", type=float, default=40.0)
+    parser.add_argument("--latencia-llm", type=float, default=0.2)
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NUEVO"))
+    args = parser.parse_args()
+
+    if args.comparar:
+        comparar_informes(*args.comparar)
+        sys.exit(0)
+
+    informe = ejecutar_benchmark(args)
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Evaluación de calidad y latencia de la recuperación.
+
+Indexa un conjunto etiquetado de preguntas → documentos relevantes (por
+defecto los documentos normativos de `normativo_test.py`) bajo varias
+configuraciones y, para cada una, reporta recall@k y MRR junto a la
+latencia de `buscar_por_similitud` y el tamaño del índice en disco.
+
+Las configuraciones son el producto de los parámetros indicados: modelo
+de embeddings, tamaño de fragmento y, por motor, espacio de distancia y
+parámetros HNSW de ChromaDB (M, ef de construcción y ef de búsqueda) o
+tipo de vector del motor NumPy (float32, float16, int8). Para los tipos
+cuantizados se reporta también la memoria por vector y la pérdida de
+recall frente a float32. Se pueden añadir documentos sintéticos como
+distractores para acercar el tamaño del índice al de producción.
+
+Uso (desde proyecto_gestion_documental/):
+    python benchmarks/evaluar_recuperacion.py
+    python benchmarks/evaluar_recuperacion.py --espacios l2 cosine --ef-busqueda 10 50 200 --distractores 10000
+    python benchmarks/evaluar_recuperacion.py --motores numpy --tipos-vector float32 float16 int8 --distractores 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import product
+from typing import Dict, List, Optional
+import numpy as np
+
+from corpus_sintetico import generar_documentos
+from ejecutar_benchmark import DIRECTORIO_BACKEND, DIRECTORIO_BENCHMARKS, _commit_actual
+from generador_carga import resumir_latencias
+
+if DIRECTORIO_BACKEND not in sys.path:
+    sys.path.insert(0, DIRECTORIO_BACKEND)
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+import chromadb
+from proyecto_gestion_documental.domain.entities.documento import Documento
+from proyecto_gestion_documental.domain.entities.parametros_indice import ParametrosIndice
+from proyecto_gestion_documental.domain.services.embedding_service import (
+    EmbeddingService, Vector, MatrizVectores
+)
+from proyecto_gestion_documental.domain.services.fragmentador_texto import FragmentadorTexto
+from proyecto_gestion_documental.infrastructure.database.chroma_repository import ChromaDocumentoRepository
+from proyecto_gestion_documental.infrastructure.database.numpy_repository import NumpyDocumentoRepository
+
+CONJUNTO_POR_DEFECTO = os.path.join(DIRECTORIO_BENCHMARKS, "datos", "evaluacion_normativa.json")
+VALORES_K = (1, 3, 5, 10)
+TAMANO_LOTE_INDEXACION = 512
+
+
+class EmbeddingsEnCache(EmbeddingService):
+    """Reutiliza los embeddings ya calculados entre configuraciones del mismo modelo."""
+
+    def __init__(self, servicio: EmbeddingService):
+        self.servicio = servicio
+        self._cache: Dict[str, Vector] = {}
+
+    async def generar_embedding(self, texto: str) -> Vector:
+        return (await self.generar_embeddings_batch([texto]))[0]
+
+    async def generar_embeddings_batch(self, textos: List[str]) -> MatrizVectores:
+        pendientes = [texto for texto in dict.fromkeys(textos) if texto not in self._cache]
+        if pendientes:
+            for texto, embedding in zip(
+                pendientes, await self.servicio.generar_embeddings_batch(pendientes)
+            ):
+                self._cache[texto] = embedding
+        return np.stack([self._cache[texto] for texto in textos])
+
+    def obtener_dimension_embedding(self) -> int:
+        return self.servicio.obtener_dimension_embedding()
+
+    def obtener_modelo_usado(self) -> str:
+        return self.servicio.obtener_modelo_usado()
+
+
+def cargar_conjunto(ruta: str, distractores: int) -> tuple:
+    with open(ruta, encoding="utf-8") as archivo:
+        conjunto = json.load(archivo)
+
+    documentos = list(conjunto["documentos"])
+    for numero, documento in enumerate(generar_documentos(distractores, semilla=99), 1):
+        documentos.append({"id": f"sintetico_{numero:06d}", **documento})
+
+    return documentos, conjunto["preguntas"]
+
+
+def fragmentar_documentos(documentos: List[dict], tamano_fragmento: Optional[int]) -> tuple:
+    """Retorna los Documento a indexar y el mapa id de fragmento → id de documento."""
+    if tamano_fragmento is None:
+        return [
+            Documento(id=d["id"], titulo=d["titulo"], contenido=d["contenido"], tipo=d["tipo"])
+            for d in documentos
+        ], {d["id"]: d["id"] for d in documentos}
+
+    fragmentador = FragmentadorTexto(tamano_fragmento, solapamiento=min(150, tamano_fragmento // 4))
+    fragmentos, origen = [], {}
+    for documento in documentos:
+        for numero, texto in enumerate(fragmentador.fragmentar([documento["contenido"]]), 1):
+            fragmento_id = f"{documento['id']}_{numero:05d}"
+            fragmentos.append(Documento(
+                id=fragmento_id,
+                titulo=documento["titulo"],
+                contenido=texto,
+                tipo=documento["tipo"]
+            ))
+            origen[fragmento_id] = documento["id"]
+    return fragmentos, origen
+
+
+def calcular_metricas(rankings: List[List[str]], relevantes: List[List[str]]) -> dict:
+    """recall@k (fracción de relevantes recuperados en el top k) y MRR."""
+    metricas = {}
+    for k in VALORES_K:
+        recall = [
+            len(set(ranking[:k]) & set(esperados)) / len(esperados)
+            for ranking, esperados in zip(rankings, relevantes)
+        ]
+        metricas[f"recall@{k}"] = round(sum(recall) / len(recall), 4)
+
+    reciprocos = []
+    for ranking, esperados in zip(rankings, relevantes):
+        posicion = next((i for i, doc_id in enumerate(ranking, 1) if doc_id in esperados), None)
+        reciprocos.append(1 / posicion if posicion else 0.0)
+    metricas["mrr"] = round(sum(reciprocos) / len(reciprocos), 4)
+    return metricas
+
+
+def _tamano_directorio_mb(ruta: str) -> float:
+    total = 0
+    for raiz, _, archivos in os.walk(ruta):
+        total += sum(os.path.getsize(os.path.join(raiz, archivo)) for archivo in archivos)
+    return round(total / (1024 * 1024), 2)
+
+
+async def evaluar_configuracion(
+    embeddings: EmbeddingService,
+    documentos: List[dict],
+    preguntas: List[dict],
+    configuracion: dict
+) -> dict:
+    fragmentos, origen = fragmentar_documentos(documentos, configuracion["tamano_fragmento"])
+
+    with tempfile.TemporaryDirectory() as directorio:
+        if configuracion["motor"] == "numpy":
+            repositorio = NumpyDocumentoRepository(
+                embeddings,
+                directorio,
+                tipo_vector=configuracion["tipo_vector"]
+            )
+        else:
+            repositorio = ChromaDocumentoRepository(
+                embeddings,
+                "evaluacion",
+                chroma_client=chromadb.PersistentClient(path=directorio),
+                parametros_indice=ParametrosIndice(
+                    espacio=configuracion["espacio"],
+                    m=configuracion["m"],
+                    ef_construccion=configuracion["ef_construccion"],
+                    ef_busqueda=configuracion["ef_busqueda"]
+                )
+            )
+
+        inicio = time.perf_counter()
+        for i in range(0, len(fragmentos), TAMANO_LOTE_INDEXACION):
+            await repositorio.guardar_batch(fragmentos[i:i + TAMANO_LOTE_INDEXACION])
+        tiempo_indexacion = time.perf_counter() - inicio
+
+        # Con fragmentos se piden más resultados para quedarse con k documentos distintos
+        limite = max(VALORES_K) * (3 if configuracion["tamano_fragmento"] else 1)
+        rankings, latencias = [], []
+        for pregunta in preguntas:
+            embedding = await embeddings.generar_embedding(pregunta["pregunta"])
+            inicio = time.perf_counter()
+            resultados = await repositorio.buscar_por_similitud(embedding, limite)
+            latencias.append(time.perf_counter() - inicio)
+            rankings.append(list(dict.fromkeys(origen[doc.id] for doc in resultados)))
+
+        tamano_indice = _tamano_directorio_mb(directorio)
+        # Memoria que recorre cada búsqueda; para Chroma, los vectores float32 sin el grafo
+        bytes_por_vector = (
+            repositorio.obtener_bytes_por_vector() if configuracion["motor"] == "numpy"
+            else embeddings.obtener_dimension_embedding() * 4
+        )
+
+    return {
+        **configuracion,
+        "documentos": len(documentos),
+        "fragmentos": len(fragmentos),
+        **calcular_metricas(rankings, [p["relevantes"] for p in preguntas]),
+        **{f"busqueda_{clave}": valor for clave, valor in resumir_latencias(latencias).items()},
+        "indexacion_s": round(tiempo_indexacion, 2),
+        "indice_mb": tamano_indice,
+        "bytes_por_vector": bytes_por_vector
+    }
+
+
+def _configuraciones(args, modelo: str) -> List[dict]:
+    configuraciones = []
+    for tamano_fragmento in args.fragmentos:
+        base = {"modelo": modelo, "tamano_fragmento": tamano_fragmento or None}
+        if "chroma" in args.motores:
+            for espacio, m, ef_construccion, ef_busqueda in product(
+                args.espacios, args.m, args.ef_construccion, args.ef_busqueda
+            ):
+                configuraciones.append({
+                    **base,
+                    "motor": "chroma",
+                    "espacio": espacio,
+                    "m": m,
+                    "ef_construccion": ef_construccion,
+                    "ef_busqueda": ef_busqueda
+                })
+        if "numpy" in args.motores:
+            for tipo_vector in args.tipos_vector:
+                configuraciones.append({**base, "motor": "numpy", "tipo_vector": tipo_vector})
+    return configuraciones
+
+
+def _describir(configuracion: dict) -> str:
+    fragmento = configuracion["tamano_fragmento"] or "-"
+    if configuracion["motor"] == "numpy":
+        return f"{configuracion['modelo']} frag={fragmento} numpy {configuracion['tipo_vector']}"
+    return (
+        f"{configuracion['modelo']} frag={fragmento} {configuracion['espacio']} "
+        f"M={configuracion['m']} efC={configuracion['ef_construccion']} "
+        f"efS={configuracion['ef_busqueda']}"
+    )
+
+
+async def ejecutar(args) -> dict:
+    from proyecto_gestion_documental.infrastructure.external_services.sentence_transformer_service import (
+        SentenceTransformerEmbeddingService
+    )
+
+    documentos, preguntas = cargar_conjunto(args.conjunto, args.distractores)
+    print(f"📚 {len(documentos)} documentos, {len(preguntas)} preguntas etiquetadas")
+
+    resultados = []
+    for modelo in args.modelos:
+        embeddings = EmbeddingsEnCache(SentenceTransformerEmbeddingService(modelo))
+        referencias = {}
+        for configuracion in _configuraciones(args, modelo):
+            resultado = await evaluar_configuracion(embeddings, documentos, preguntas, configuracion)
+
+            # Pérdida por cuantizar: diferencia con numpy float32 en el mismo fragmento
+            if configuracion["motor"] == "numpy":
+                if configuracion["tipo_vector"] == "float32":
+                    referencias[configuracion["tamano_fragmento"]] = resultado
+                referencia = referencias.get(configuracion["tamano_fragmento"])
+                if referencia is not None:
+                    for clave in [f"recall@{k}" for k in VALORES_K] + ["mrr"]:
+                        resultado[f"perdida_{clave}"] = round(referencia[clave] - resultado[clave], 4)
+
+            resultados.append(resultado)
+            print(
+                f"   {_describir(configuracion)}  "
+                f"R@5 {resultado['recall@5']:.3f}  MRR {resultado['mrr']:.3f}  "
+                f"p95 {resultado['busqueda_p95_ms']:.2f} ms  índice {resultado['indice_mb']:.1f} MB  "
+                f"{resultado['bytes_por_vector']} B/vector"
+            )
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_actual(),
+        "conjunto": os.path.basename(args.conjunto),
+        "distractores": args.distractores,
+        "resultados": resultados
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluación de recuperación (recall@k, MRR, latencia)")
+    parser.add_argument("--conjunto", default=CONJUNTO_POR_DEFECTO,
+                        help="JSON con 'documentos' (id, titulo, contenido, tipo) y 'preguntas' (pregunta, relevantes)")
+    parser.add_argument("--distractores", type=int, default=0,
+                        help="documentos sintéticos añadidos como ruido")
+    parser.add_argument("--modelos", nargs="+", default=["all-MiniLM-L6-v2"])
+    parser.add_argument("--fragmentos", nargs="+", type=int, default=[0],
+                        help="tamaños de fragmento en caracteres (0 = documento completo)")
+    parser.add_argument("--motores", nargs="+", default=["chroma"], choices=["chroma", "numpy"])
+    parser.add_argument("--tipos-vector", nargs="+", default=["float32", "float16", "int8"],
+                        choices=["float32", "float16", "int8"],
+                        help="tipos de vector del motor numpy (float32 primero: es la referencia)")
+    parser.add_argument("--espacios", nargs="+", default=["cosine"], choices=["cosine", "l2", "ip"])
+    parser.add_argument("--m", nargs="+", type=int, default=[16])
+    parser.add_argument("--ef-construccion", nargs="+", type=int, default=[100])
+    parser.add_argument("--ef-busqueda", nargs="+", type=int, default=[100])
+    parser.add_argument("--salida", default=os.path.join(DIRECTORIO_BENCHMARKS, "resultados"))
+    args = parser.parse_args()
+
+    informe = asyncio.run(ejecutar(args))
+
+    os.makedirs(args.salida, exist_ok=True)
+    ruta = os.path.join(
+        args.salida,
+        f"recuperacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{informe['commit']}.json"
+    )
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\n✅ Informe guardado en {ruta}")
\ No newline at end of file
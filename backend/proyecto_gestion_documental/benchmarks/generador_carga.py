@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Generador de carga concurrente y cálculo de percentiles de latencia."""
+
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+
+import requests
+
+# Cada petición recibe la sesión HTTP del hilo y retorna la respuesta
+Peticion = Callable[[requests.Session], requests.Response]
+
+
+def resumir_latencias(latencias: List[float]) -> Dict[str, float]:
+    """p50/p95/p99, media y máximo en milisegundos."""
+    if not latencias:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "media_ms": 0.0, "max_ms": 0.0}
+
+    ordenadas = sorted(latencias)
+    if len(ordenadas) > 1:
+        cuantiles = statistics.quantiles(ordenadas, n=100, method="inclusive")
+        p50, p95, p99 = cuantiles[49], cuantiles[94], cuantiles[98]
+    else:
+        p50 = p95 = p99 = ordenadas[0]
+
+    return {
+        "p50_ms": round(p50 * 1000, 2),
+        "p95_ms": round(p95 * 1000, 2),
+        "p99_ms": round(p99 * 1000, 2),
+        "media_ms": round(statistics.fmean(ordenadas) * 1000, 2),
+        "max_ms": round(ordenadas[-1] * 1000, 2)
+    }
+
+
+def ejecutar_escenario(
+    nombre: str,
+    peticiones: Iterable[Peticion],
+    concurrencia: int = 8
+) -> Dict:
+    """
+    Lanza las peticiones con `concurrencia` hilos y mide cada una.
+
+    Returns:
+        Dict con throughput (peticiones/s), percentiles y número de errores
+    """
+    sesiones = threading.local()
+    latencias: List[float] = []
+    errores: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def _ejecutar(peticion: Peticion):
+        if not hasattr(sesiones, "sesion"):
+            sesiones.sesion = requests.Session()
+
+        inicio = time.perf_counter()
+        try:
+            respuesta = peticion(sesiones.sesion)
+            duracion = time.perf_counter() - inicio
+            error = None if respuesta.status_code < 400 else f"HTTP {respuesta.status_code}"
+        except requests.RequestException as e:
+            duracion = time.perf_counter() - inicio
+            error = type(e).__name__
+
+        with lock:
+            if error is None:
+                latencias.append(duracion)
+            else:
+                errores[error] = errores.get(error, 0) + 1
+
+    inicio_escenario = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as executor:
+        for _ in executor.map(_ejecutar, peticiones):
+            pass
+    duracion_total = time.perf_counter() - inicio_escenario
+
+    total_errores = sum(errores.values())
+    return {
+        "escenario": nombre,
+        "concurrencia": concurrencia,
+        "peticiones": len(latencias) + total_errores,
+        "errores": total_errores,
+        "detalle_errores": errores,
+        "duracion_s": round(duracion_total, 3),
+        "throughput_rps": round(len(latencias) / duracion_total, 2) if duracion_total > 0 else 0.0,
+        **resumir_latencias(latencias)
+    }
\ No newline at end of file
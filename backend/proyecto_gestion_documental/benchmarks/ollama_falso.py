@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Servidor que imita la API REST de Ollama para pruebas de carga sin GPU.
+
+Responde `/api/tags` y `/api/generate` (con y sin streaming) generando
+tokens sintéticos a un ritmo configurable, tras una latencia inicial que
+simula el procesamiento del prompt.
+
+Uso:
+    python benchmarks/ollama_falso.py --puerto 11500 --tokens-por-segundo 40 --latencia 0.2
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PALABRAS = (
+    "según el artículo citado la normativa establece que los procedimientos "
+    "deben cumplirse dentro del plazo previsto por la resolución vigente"
+).split()
+
+
+class ConfiguracionOllamaFalso:
+    """Parámetros de comportamiento del servidor falso."""
+
+    def __init__(
+        self,
+        tokens_por_segundo: float = 40.0,
+        latencia: float = 0.2,
+        tokens_respuesta: int = 60,
+        modelo: str = "llama3.2:1b"
+    ):
+        self.tokens_por_segundo = tokens_por_segundo
+        self.latencia = latencia
+        self.tokens_respuesta = tokens_respuesta
+        self.modelo = modelo
+
+
+def _crear_manejador(config: ConfiguracionOllamaFalso):
+
+    class ManejadorOllama(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _responder_json(self, datos: dict, estado: int = 200):
+            cuerpo = json.dumps(datos).encode()
+            self.send_response(estado)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self._responder_json({"models": [{"name": config.modelo}]})
+            else:
+                self._responder_json({"error": "no encontrado"}, 404)
+
+        def do_POST(self):
+            longitud = int(self.headers.get("Content-Length", 0))
+            peticion = json.loads(self.rfile.read(longitud) or b"{}")
+
+            if self.path != "/api/generate":
+                self._responder_json({"error": "no encontrado"}, 404)
+                return
+
+            time.sleep(config.latencia)
+            intervalo = 1.0 / config.tokens_por_segundo if config.tokens_por_segundo > 0 else 0.0
+            tokens = [
+                PALABRAS[i % len(PALABRAS)] + " "
+                for i in range(config.tokens_respuesta)
+            ]
+
+            if not peticion.get("stream", True):
+                time.sleep(intervalo * len(tokens))
+                self._responder_json({
+                    "model": config.modelo,
+                    "response": "".join(tokens),
+                    "done": True
+                })
+                return
+
+            # Streaming: una línea JSON por token, con transferencia por trozos
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                self._enviar_trozo({"model": config.modelo, "response": token, "done": False})
+                time.sleep(intervalo)
+            self._enviar_trozo({"model": config.modelo, "response": "", "done": True})
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _enviar_trozo(self, datos: dict):
+            linea = (json.dumps(datos) + "\n").encode()
+            self.wfile.write(f"{len(linea):x}\r\n".encode() + linea + b"\r\n")
+            self.wfile.flush()
+
+    return ManejadorOllama
+
+
+class _ServidorOllamaFalso(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Los clientes cierran conexiones keep-alive sin avisar; no es un error
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def iniciar_ollama_falso(
+    puerto: int = 0,
+    config: ConfiguracionOllamaFalso = None
+) -> ThreadingHTTPServer:
+    """Arranca el servidor en un hilo y lo retorna (usar `.shutdown()` para pararlo)."""
+    servidor = _ServidorOllamaFalso(
+        ("127.0.0.1", puerto),
+        _crear_manejador(config or ConfiguracionOllamaFalso())
+    )
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor Ollama falso para benchmarks")
+    parser.add_argument("--puerto", type=int, default=11500)
+    parser.add_argument("--tokens-por-segundo", type=float, default=40.0)
+    parser.add_argument("--latencia", type=float, default=0.2, help="segundos hasta el primer token")
+    parser.add_argument("--tokens", type=int, default=60, help="tokens por respuesta")
+    args = parser.parse_args()
+
+    servidor = iniciar_ollama_falso(args.puerto, ConfiguracionOllamaFalso(
+        tokens_por_segundo=args.tokens_por_segundo,
+        latencia=args.latencia,
+        tokens_respuesta=args.tokens
+    ))
+    print(f"🤖 Ollama falso en http://127.0.0.1:{servidor.server_port} (Ctrl+C para salir)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
\ No newline at end of file
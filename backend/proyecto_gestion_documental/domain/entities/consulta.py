@@ -4,6 +4,12 @@ from datetime import datetime
 from .documento import Documento
 
 
+# Cómo se responde: generando con el LLM o extrayendo frases de los documentos
+MODO_GENERATIVO = "generativo"
+MODO_EXTRACTIVO = "extractivo"
+MODOS_CONSULTA = (MODO_GENERATIVO, MODO_EXTRACTIVO)
+
+
 @dataclass
 class Consulta:
     """Entidad de dominio que representa una consulta de búsqueda."""
@@ -11,6 +17,7 @@ class Consulta:
     pregunta: str
     limite_resultados: int = 5
     fecha_consulta: Optional[datetime] = None
+    modo: str = MODO_GENERATIVO
     
     def __post_init__(self):
         if self.fecha_consulta is None:
@@ -21,7 +28,8 @@ class Consulta:
         return (
             bool(self.pregunta.strip()) and 
             self.limite_resultados > 0 and 
-            self.limite_resultados <= 20
+            self.limite_resultados <= 20 and
+            self.modo in MODOS_CONSULTA
         )
 
 
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Optional
+from .documento import Documento
+from ..services.embedding_service import Vector
+
+
+OPERACION_GUARDAR = "guardar"
+OPERACION_ELIMINAR = "eliminar"
+
+
+@dataclass
+class EntradaRegistro:
+    """
+    Entidad de dominio que representa una escritura en el registro de ingesta.
+
+    Un `guardar` lleva el documento tal como se indexó (alta o
+    actualización: el último gana) y, si se registran, su embedding y el
+    modelo con el que se calculó. Un `eliminar` solo lleva el ID.
+    """
+
+    operacion: str
+    documento_id: str
+    documento: Optional[Documento] = None
+    embedding: Optional[Vector] = None
+    modelo_embeddings: Optional[str] = None
+    secuencia: int = 0  # la asigna el registro al anexar la entrada
\ No newline at end of file
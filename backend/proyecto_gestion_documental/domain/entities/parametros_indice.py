@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+ESPACIO_COSENO = "cosine"
+ESPACIO_L2 = "l2"
+ESPACIO_PRODUCTO_INTERNO = "ip"
+ESPACIOS_VALIDOS = (ESPACIO_COSENO, ESPACIO_L2, ESPACIO_PRODUCTO_INTERNO)
+
+
+@dataclass
+class ParametrosIndice:
+    """
+    Parámetros del índice vectorial (HNSW).
+
+    `m` y `ef_construccion` fijan la calidad del grafo al indexar y
+    `ef_busqueda` el número de candidatos explorados en cada búsqueda:
+    valores mayores dan más recall a cambio de latencia y memoria.
+    """
+
+    espacio: str = ESPACIO_COSENO
+    m: int = 16
+    ef_construccion: int = 100
+    ef_busqueda: int = 100
+
+    def validar(self):
+        """Valida los parámetros. Raises: ValueError si alguno no es válido."""
+        if self.espacio not in ESPACIOS_VALIDOS:
+            raise ValueError(f'El espacio debe ser uno de: {", ".join(ESPACIOS_VALIDOS)}')
+        if not 2 <= self.m <= 128:
+            raise ValueError("M debe estar entre 2 y 128")
+        if not 1 <= self.ef_construccion <= 2000:
+            raise ValueError("ef de construcción debe estar entre 1 y 2000")
+        if not 1 <= self.ef_busqueda <= 2000:
+            raise ValueError("ef de búsqueda debe estar entre 1 y 2000")
+
+    def distancia_a_similitud(self, distancia: Optional[float]) -> Optional[float]:
+        """
+        Convierte una distancia del índice en similitud (mayor es más parecido).
+
+        - cosine: distancia = 1 - coseno, así que similitud = coseno
+        - ip: distancia = 1 - producto interno, similitud = producto interno
+        - l2: distancia = L2 al cuadrado, sin cota superior; se usa 1 / (1 + d)
+        """
+        if distancia is None:
+            return None
+        if self.espacio == ESPACIO_L2:
+            return 1.0 / (1.0 + distancia)
+        return 1.0 - distancia
\ No newline at end of file
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+
+@dataclass
+class ManifiestoSnapshot:
+    """
+    Entidad de dominio que describe un snapshot del corpus.
+
+    Guarda con qué modelo se calcularon los embeddings: importar un
+    snapshot en un índice que usa otro modelo mezclaría vectores
+    incompatibles.
+    """
+
+    nombre: str
+    modelo_embeddings: str
+    dimension: int = 0
+    total_documentos: int = 0
+    partes: int = 0
+    fecha_creacion: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.fecha_creacion is None:
+            self.fecha_creacion = datetime.now()
\ No newline at end of file
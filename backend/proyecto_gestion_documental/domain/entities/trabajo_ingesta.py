@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+
+ESTADO_PENDIENTE = "pendiente"
+ESTADO_PROCESANDO = "procesando"
+ESTADO_COMPLETADO = "completado"
+ESTADO_ERROR = "error"
+
+
+@dataclass
+class TrabajoIngesta:
+    """Entidad de dominio que representa un documento en cola para ser indexado."""
+
+    id: str
+    documento_id: str
+    titulo: str
+    contenido: str
+    tipo: str
+    estado: str = ESTADO_PENDIENTE
+    progreso: int = 0
+    error: Optional[str] = None
+    intentos: int = 0
+    fecha_creacion: Optional[datetime] = None
+    fecha_actualizacion: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.fecha_creacion is None:
+            self.fecha_creacion = datetime.now()
+        if self.fecha_actualizacion is None:
+            self.fecha_actualizacion = self.fecha_creacion
+
+    @property
+    def esta_terminado(self) -> bool:
+        """Indica si el trabajo ya no va a cambiar de estado."""
+        return self.estado in (ESTADO_COMPLETADO, ESTADO_ERROR)
\ No newline at end of file
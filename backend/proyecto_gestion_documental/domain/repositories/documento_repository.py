@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from ..entities.documento import Documento
+from ..entities.parametros_indice import ParametrosIndice
+from ..services.embedding_service import Vector, MatrizVectores
 
 
 class DocumentoRepository(ABC):
@@ -21,6 +23,39 @@ class DocumentoRepository(ABC):
         """Guarda un documento y retorna su ID."""
         pass
     
+    async def guardar_batch(self, documentos: List[Documento]) -> List[str]:
+        """
+        Guarda varios documentos y retorna sus IDs en el mismo orden.
+        
+        Las implementaciones que puedan vectorizar en batch deben sobrescribir
+        este método, reemplazando los documentos cuyo ID ya exista para que
+        reintentar un lote sea seguro.
+        """
+        return [await self.guardar(documento) for documento in documentos]
+    
+    async def guardar_con_embeddings(
+        self, 
+        documentos: List[Documento], 
+        embeddings: MatrizVectores
+    ) -> List[str]:
+        """
+        Guarda documentos con sus embeddings ya calculados (una fila por
+        documento), reemplazando los que ya existan. Permite mover documentos
+        entre repositorios sin volver a vectorizar.
+        """
+        raise NotImplementedError("Este repositorio no soporta guardar embeddings ya calculados")
+    
+    def iterar_con_embeddings(
+        self, 
+        tamano_lote: int = 1000
+    ) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """Recorre todos los documentos por lotes junto a sus embeddings guardados."""
+        raise NotImplementedError("Este repositorio no soporta leer los embeddings guardados")
+    
+    async def obtener_embeddings(self, documento_ids: List[str]) -> Dict[str, Vector]:
+        """Embeddings guardados de los documentos indicados (los que no existan se omiten)."""
+        raise NotImplementedError("Este repositorio no soporta leer los embeddings guardados")
+    
     @abstractmethod
     async def eliminar(self, documento_id: str) -> bool:
         """Elimina un documento por su ID."""
@@ -29,13 +64,50 @@ class DocumentoRepository(ABC):
     @abstractmethod
     async def buscar_por_similitud(
         self, 
-        embedding: List[float], 
+        embedding: Vector, 
         limite: int = 5
     ) -> List[Documento]:
         """Busca documentos similares basándose en un embedding."""
         pass
     
+    async def buscar_por_similitud_batch(
+        self, 
+        embeddings: MatrizVectores, 
+        limite: int = 5
+    ) -> List[List[Documento]]:
+        """
+        Busca documentos similares para varios embeddings a la vez (una fila por consulta).
+        
+        Las implementaciones que soporten consultas múltiples deben
+        sobrescribir este método; por defecto se consulta uno a uno.
+        """
+        return [
+            await self.buscar_por_similitud(embedding, limite)
+            for embedding in embeddings
+        ]
+    
     @abstractmethod
     async def contar_documentos(self) -> int:
         """Cuenta el número total de documentos."""
-        pass
\ No newline at end of file
+        pass
+    
+    def obtener_parametros_indice(self) -> Optional[ParametrosIndice]:
+        """Parámetros del índice vectorial, si la implementación los expone."""
+        return None
+    
+    async def reconstruir_indice(
+        self, 
+        parametros: ParametrosIndice,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Reconstruye el índice con nuevos parámetros sin volver a vectorizar.
+        
+        Args:
+            parametros: Parámetros del nuevo índice
+            progreso: Callback opcional (documentos copiados, total)
+            
+        Returns:
+            int: Número de documentos en el índice reconstruido
+        """
+        raise NotImplementedError("Este repositorio no soporta reconstruir el índice")
\ No newline at end of file
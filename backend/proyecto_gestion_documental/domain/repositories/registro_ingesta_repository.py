@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List
+from ..entities.entrada_registro import EntradaRegistro
+
+
+class RegistroIngestaRepository(ABC):
+    """
+    Interface para el registro de ingesta (write-ahead log): todas las
+    escrituras del índice, en orden, para poder reconstruirlo desde cero.
+    """
+    
+    @abstractmethod
+    async def anexar(self, entradas: List[EntradaRegistro]) -> int:
+        """
+        Anexa las entradas en orden y retorna la secuencia de la última.
+        
+        Solo retorna cuando las entradas son duraderas (fsync), así que el
+        índice puede aplicarlas después sin riesgo de perderlas.
+        """
+        pass
+    
+    @abstractmethod
+    def leer(self, desde: int = 0, tamano_lote: int = 1000) -> AsyncIterator[List[EntradaRegistro]]:
+        """Recorre por lotes, en orden, las entradas con secuencia mayor que `desde`."""
+        pass
+    
+    @abstractmethod
+    async def ultima_secuencia(self) -> int:
+        """Secuencia de la última entrada duradera (0 si el registro está vacío)."""
+        pass
+    
+    @abstractmethod
+    async def guardar_checkpoint(self, nombre: str, secuencia: int):
+        """Guarda hasta qué secuencia se ha aplicado el registro a un destino."""
+        pass
+    
+    @abstractmethod
+    async def obtener_checkpoint(self, nombre: str) -> int:
+        """Secuencia aplicada a un destino (0 si no hay checkpoint)."""
+        pass
+    
+    async def abrir(self):
+        """Prepara el registro para escribir; por defecto, en la primera escritura."""
+        pass
+    
+    async def cerrar(self):
+        """Termina las escrituras pendientes y libera el registro."""
+        pass
\ No newline at end of file
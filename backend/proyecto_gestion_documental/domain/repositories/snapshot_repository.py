@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional, Tuple
+from ..entities.documento import Documento
+from ..entities.snapshot import ManifiestoSnapshot
+from ..services.embedding_service import MatrizVectores
+
+
+class SnapshotRepository(ABC):
+    """Interface para guardar y leer snapshots del corpus con sus embeddings."""
+    
+    @abstractmethod
+    async def escribir(
+        self, 
+        manifiesto: ManifiestoSnapshot, 
+        lotes: AsyncIterator[Tuple[List[Documento], MatrizVectores]]
+    ) -> ManifiestoSnapshot:
+        """
+        Escribe los lotes en partes y retorna el manifiesto con los totales.
+        
+        El snapshot solo es visible al terminar; reemplaza al que tuviera el
+        mismo nombre.
+        """
+        pass
+    
+    @abstractmethod
+    def leer(self, nombre: str) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """Recorre las partes del snapshot en orden (documentos y sus embeddings)."""
+        pass
+    
+    @abstractmethod
+    async def obtener_manifiesto(self, nombre: str) -> Optional[ManifiestoSnapshot]:
+        """Obtiene el manifiesto de un snapshot por su nombre."""
+        pass
+    
+    @abstractmethod
+    async def listar(self) -> List[ManifiestoSnapshot]:
+        """Lista los snapshots disponibles."""
+        pass
\ No newline at end of file
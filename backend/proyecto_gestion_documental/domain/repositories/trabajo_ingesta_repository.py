@@ -0,0 +1,57 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from ..entities.trabajo_ingesta import TrabajoIngesta
+
+
+class TrabajoIngestaRepository(ABC):
+    """Interface para la cola persistente de trabajos de ingesta."""
+
+    @abstractmethod
+    async def encolar(self, trabajo: TrabajoIngesta) -> str:
+        """Guarda un trabajo pendiente y retorna su ID."""
+        pass
+
+    @abstractmethod
+    async def obtener_por_id(self, trabajo_id: str) -> Optional[TrabajoIngesta]:
+        """Obtiene un trabajo por su ID."""
+        pass
+
+    @abstractmethod
+    async def reclamar_pendientes(self, limite: int) -> List[TrabajoIngesta]:
+        """
+        Marca como 'procesando' hasta `limite` trabajos pendientes (los más
+        antiguos primero) y los retorna. Un trabajo solo puede ser reclamado
+        por un worker.
+        """
+        pass
+
+    @abstractmethod
+    async def actualizar_estado(
+        self,
+        trabajo_id: str,
+        estado: str,
+        progreso: int,
+        error: Optional[str] = None
+    ) -> bool:
+        """Actualiza el estado y el progreso de un trabajo."""
+        pass
+
+    @abstractmethod
+    async def actualizar_estados(self, trabajo_ids: List[str], estado: str, progreso: int) -> int:
+        """Actualiza a la vez el estado y el progreso de varios trabajos y retorna cuántos cambiaron."""
+        pass
+
+    @abstractmethod
+    async def contar_pendientes(self) -> int:
+        """Cuenta los trabajos que esperan en la cola."""
+        pass
+
+    @abstractmethod
+    async def reencolar_en_proceso(self, antiguedad_minima: float) -> int:
+        """
+        Devuelve a 'pendiente' los trabajos que llevan en 'procesando' más de
+        `antiguedad_minima` segundos sin actualizarse (su worker murió o se
+        reinició) y retorna cuántos se reencolaron. Los que sigue
+        procesando un worker vivo no se tocan.
+        """
+        pass
\ No newline at end of file
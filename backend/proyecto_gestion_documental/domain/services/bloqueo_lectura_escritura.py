@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Tuple
+
+
+class BloqueoLecturaEscritura:
+    """
+    Bloqueo asíncrono de lectores y escritores con turno de llegada.
+
+    Varias lecturas pueden ir a la vez; una escritura va sola. Los turnos se
+    conceden en orden de llegada, así que una escritura que espera no deja
+    pasar a las lecturas que llegan después (no se queda sin turno) y una
+    escritura larga partida en lotes, que pide turno por cada lote, deja
+    pasar entre lote y lote a las lecturas que llegaron mientras tanto.
+
+    Como cualquier primitiva de asyncio, se usa desde un único event loop.
+    """
+
+    def __init__(self):
+        self._lectores = 0
+        self._escribiendo = False
+        self._esperando: Deque[Tuple[bool, asyncio.Future]] = deque()
+
+    @property
+    def lectores(self) -> int:
+        return self._lectores
+
+    @property
+    def escribiendo(self) -> bool:
+        return self._escribiendo
+
+    @asynccontextmanager
+    async def lectura(self) -> AsyncIterator[None]:
+        """Turno compartido con otras lecturas."""
+        await self._adquirir(escritura=False)
+        try:
+            yield
+        finally:
+            self._lectores -= 1
+            self._despertar()
+
+    @asynccontextmanager
+    async def escritura(self) -> AsyncIterator[None]:
+        """Turno exclusivo."""
+        await self._adquirir(escritura=True)
+        try:
+            yield
+        finally:
+            self._escribiendo = False
+            self._despertar()
+
+    async def _adquirir(self, escritura: bool):
+        if not self._esperando and self._libre(escritura):
+            self._ocupar(escritura)
+            return
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando.append((escritura, futuro))
+        try:
+            await futuro
+        except asyncio.CancelledError:
+            if futuro.done() and not futuro.cancelled():
+                # Se le concedió el turno justo al cancelarse: se devuelve
+                if escritura:
+                    self._escribiendo = False
+                else:
+                    self._lectores -= 1
+            elif (escritura, futuro) in self._esperando:
+                self._esperando.remove((escritura, futuro))
+            self._despertar()
+            raise
+
+    def _libre(self, escritura: bool) -> bool:
+        if escritura:
+            return not self._escribiendo and self._lectores == 0
+        return not self._escribiendo
+
+    def _ocupar(self, escritura: bool):
+        if escritura:
+            self._escribiendo = True
+        else:
+            self._lectores += 1
+
+    def _despertar(self):
+        """Concede el turno a los primeros de la cola que puedan entrar."""
+        while self._esperando:
+            escritura, futuro = self._esperando[0]
+            if futuro.done():
+                # Cancelado mientras esperaba
+                self._esperando.popleft()
+                continue
+            if not self._libre(escritura):
+                return
+            self._esperando.popleft()
+            self._ocupar(escritura)
+            futuro.set_result(None)
+            if escritura:
+                return
\ No newline at end of file
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Callable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class EjecutorService(ABC):
+    """Interface para ejecutar trabajo bloqueante sin detener el event loop."""
+
+    @abstractmethod
+    async def ejecutar(self, funcion: Callable[..., T], *args) -> T:
+        """Ejecuta `funcion(*args)` fuera del event loop y espera su resultado."""
+        pass
+
+    def cerrar(self):
+        """Libera los recursos del ejecutor."""
+        pass
\ No newline at end of file
@@ -1,12 +1,20 @@
 from abc import ABC, abstractmethod
 from typing import List, Union
+import numpy as np
+
+
+# Un embedding es un np.ndarray float32 de una dimensión y un lote de
+# embeddings una matriz 2D contigua, con una fila por texto. Se pasan sin
+# convertir a listas: solo los backends que lo exijan deben hacerlo
+Vector = np.ndarray
+MatrizVectores = np.ndarray
 
 
 class EmbeddingService(ABC):
     """Interface para servicios de generación de embeddings."""
     
     @abstractmethod
-    async def generar_embedding(self, texto: str) -> List[float]:
+    async def generar_embedding(self, texto: str) -> Vector:
         """
         Genera un embedding vectorial para un texto.
         
@@ -14,7 +22,7 @@ class EmbeddingService(ABC):
             texto: El texto para el cual generar el embedding
             
         Returns:
-            List[float]: Vector de embedding del texto
+            Vector: Vector de embedding del texto (float32, una dimensión)
         """
         pass
     
@@ -22,7 +30,7 @@ class EmbeddingService(ABC):
     async def generar_embeddings_batch(
         self, 
         textos: List[str]
-    ) -> List[List[float]]:
+    ) -> MatrizVectores:
         """
         Genera embeddings para múltiples textos de forma eficiente.
         
@@ -30,7 +38,12 @@ class EmbeddingService(ABC):
             textos: Lista de textos para generar embeddings
             
         Returns:
-            List[List[float]]: Lista de vectores de embedding
+            MatrizVectores: Matriz float32 con un embedding por fila, en el
+            orden de `textos`
+            
+        Raises:
+            ValueError: Si algún texto está vacío (no se omite: la fila
+            i tiene que seguir siendo la del texto i)
         """
         pass
     
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator, List
+
+
+class ExtractorTexto(ABC):
+    """Interface para extraer texto de archivos (PDF, DOCX, TXT...)."""
+
+    @abstractmethod
+    def extraer_bloques(self, archivo: BinaryIO) -> Iterator[str]:
+        """
+        Extrae el texto del archivo de forma incremental.
+
+        Args:
+            archivo: Archivo binario abierto y posicionable (seek)
+
+        Returns:
+            Iterator[str]: Bloques de texto (páginas, párrafos o trozos) en
+            orden; nunca se carga el texto completo en memoria
+        """
+        pass
+
+    @abstractmethod
+    def extensiones_soportadas(self) -> List[str]:
+        """Retorna las extensiones de archivo que maneja (p. ej. ['.pdf'])."""
+        pass
\ No newline at end of file
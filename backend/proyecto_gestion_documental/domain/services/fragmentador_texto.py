@@ -0,0 +1,76 @@
+import re
+from typing import Iterable, Iterator
+
+
+class FragmentadorTexto:
+    """
+    Divide texto en fragmentos de tamaño acotado para vectorizarlos.
+
+    Trabaja sobre un flujo de bloques (p. ej. páginas) y solo mantiene en
+    memoria el fragmento en construcción, por lo que el tamaño del documento
+    no afecta al consumo de memoria.
+    """
+
+    def __init__(self, tamano_fragmento: int = 1000, solapamiento: int = 150):
+        if tamano_fragmento < 100:
+            raise ValueError("El tamaño de fragmento debe ser al menos 100 caracteres")
+        if solapamiento < 0 or solapamiento >= tamano_fragmento // 2:
+            raise ValueError("El solapamiento debe estar entre 0 y la mitad del tamaño de fragmento")
+
+        self.tamano_fragmento = tamano_fragmento
+        self.solapamiento = solapamiento
+
+    def fragmentar(self, bloques: Iterable[str]) -> Iterator[str]:
+        """
+        Genera fragmentos de como mucho `tamano_fragmento` caracteres.
+
+        Los cortes se hacen preferentemente en fin de párrafo, de frase o de
+        palabra, y cada fragmento repite los últimos `solapamiento`
+        caracteres del anterior para no perder contexto en los bordes.
+        """
+        buffer = ""
+
+        for bloque in bloques:
+            bloque = self._normalizar(bloque)
+            if not bloque:
+                continue
+
+            buffer = f"{buffer}\n{bloque}" if buffer else bloque
+
+            while len(buffer) > self.tamano_fragmento:
+                corte = self._buscar_corte(buffer)
+                fragmento = buffer[:corte].strip()
+                if fragmento:
+                    yield fragmento
+                buffer = buffer[self._inicio_solapamiento(buffer, corte):]
+
+        if buffer.strip():
+            yield buffer.strip()
+
+    def _normalizar(self, texto: str) -> str:
+        """Colapsa espacios y saltos de línea repetidos."""
+        texto = re.sub(r"[ \t\r\f\v]+", " ", texto)
+        texto = re.sub(r" ?\n ?", "\n", texto)
+        texto = re.sub(r"\n{3,}", "\n\n", texto)
+        return texto.strip()
+
+    def _buscar_corte(self, texto: str) -> int:
+        """Busca la mejor posición de corte en la segunda mitad del fragmento."""
+        minimo = self.tamano_fragmento // 2
+        ventana = texto[:self.tamano_fragmento]
+
+        for separador in ("\n\n", "\n", ". ", "; ", " "):
+            posicion = ventana.rfind(separador, minimo)
+            if posicion != -1:
+                return posicion + len(separador)
+
+        return self.tamano_fragmento
+
+    def _inicio_solapamiento(self, texto: str, corte: int) -> int:
+        """Inicio del siguiente fragmento, alineado a palabra si es posible."""
+        if self.solapamiento == 0:
+            return corte
+
+        inicio = corte - self.solapamiento
+        espacio = texto.find(" ", inicio, corte)
+        return espacio + 1 if espacio != -1 else inicio
\ No newline at end of file
@@ -1,7 +1,29 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Optional
 
 
+class LLMNoDisponibleError(Exception):
+    """El servicio LLM no puede generar una respuesta (caído, timeout o circuito abierto)."""
+    pass
+
+
+@dataclass
+class SenalesConsulta:
+    """Rasgos baratos de una consulta, conocidos antes de generar (para enrutarla)."""
+    palabras_pregunta: int
+    similitud_maxima: Optional[float] = None  # la del mejor documento recuperado
+    margen_similitud: Optional[float] = None  # distancia entre el primer y el segundo documento
+    documentos: int = 0
+
+
+@dataclass
+class RespuestaLLM:
+    """Texto generado y modelo que lo generó."""
+    texto: str
+    modelo: str
+
+
 class LLMService(ABC):
     """Interface para servicios de Large Language Models."""
     
@@ -9,7 +31,8 @@ class LLMService(ABC):
     async def generar_respuesta(
         self, 
         prompt: str, 
-        contexto: Optional[str] = None
+        contexto: Optional[str] = None,
+        senales: Optional[SenalesConsulta] = None
     ) -> str:
         """
         Genera una respuesta usando un modelo de lenguaje.
@@ -17,9 +40,13 @@ class LLMService(ABC):
         Args:
             prompt: La pregunta o prompt para el modelo
             contexto: Contexto adicional para mejorar la respuesta
+            senales: Rasgos de la consulta (los usan los servicios que enrutan)
             
         Returns:
             str: La respuesta generada por el modelo
+            
+        Raises:
+            LLMNoDisponibleError: Si el modelo no está disponible
         """
         pass
     
@@ -31,4 +58,18 @@ class LLMService(ABC):
     @abstractmethod
     def obtener_modelo_usado(self) -> str:
         """Retorna el nombre del modelo que se está usando."""
+        pass
+    
+    async def generar_respuesta_con_modelo(
+        self,
+        prompt: str,
+        contexto: Optional[str] = None,
+        senales: Optional[SenalesConsulta] = None
+    ) -> RespuestaLLM:
+        """Como `generar_respuesta`, indicando el modelo que respondió realmente."""
+        texto = await self.generar_respuesta(prompt, contexto, senales)
+        return RespuestaLLM(texto, self.obtener_modelo_usado())
+    
+    async def cerrar(self):
+        """Libera las conexiones del servicio (por defecto no tiene ninguna abierta)."""
         pass
\ No newline at end of file
@@ -0,0 +1,69 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+from .traza import traza_actual
+
+
+class MetricasService(ABC):
+    """Interface para registrar métricas de la aplicación."""
+
+    @abstractmethod
+    def observar_etapa(self, etapa: str, segundos: float):
+        """Registra la duración de una etapa del pipeline (embedding, recuperacion...)."""
+        pass
+
+    @abstractmethod
+    def observar_retraso_event_loop(self, segundos: float):
+        """Registra una muestra del retraso del event loop (fuera de las etapas de las peticiones)."""
+        pass
+
+    @abstractmethod
+    def incrementar(self, contador: str, valor: float = 1.0, **etiquetas: str):
+        """Incrementa un contador (peticiones, errores, cache_aciertos...)."""
+        pass
+
+    @abstractmethod
+    def fijar(self, indicador: str, valor: float, **etiquetas: str):
+        """Fija el valor actual de un indicador (p. ej. profundidad de cola)."""
+        pass
+
+    @abstractmethod
+    def exportar(self) -> Tuple[bytes, str]:
+        """Retorna las métricas serializadas y su content-type."""
+        pass
+
+    def registrar_etapa(self, etapa: str, segundos: float):
+        """Registra la etapa en las métricas y en la traza de la petición en curso."""
+        self.observar_etapa(etapa, segundos)
+        traza = traza_actual()
+        if traza is not None:
+            traza.registrar(etapa, segundos)
+
+    @contextmanager
+    def medir(self, etapa: str) -> Iterator[None]:
+        """Mide la duración del bloque y la registra como etapa."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_etapa(etapa, time.perf_counter() - inicio)
+
+
+class MetricasNulas(MetricasService):
+    """Implementación que descarta las métricas (por defecto en los casos de uso)."""
+
+    def observar_etapa(self, etapa: str, segundos: float):
+        pass
+
+    def observar_retraso_event_loop(self, segundos: float):
+        pass
+
+    def incrementar(self, contador: str, valor: float = 1.0, **etiquetas: str):
+        pass
+
+    def fijar(self, indicador: str, valor: float, **etiquetas: str):
+        pass
+
+    def exportar(self) -> Tuple[bytes, str]:
+        return b"", "text/plain"
\ No newline at end of file
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class PlazoAgotadoError(Exception):
+    """La petición agotó su plazo o se canceló antes de terminar."""
+    pass
+
+
+class Plazo:
+    """
+    Fecha límite de una petición y su cancelación.
+
+    Como la traza, se guarda en una variable de contexto: el caso de uso la
+    fija y los servicios la consultan sin recibirla por parámetros. La
+    cancelación es visible desde otros hilos, así que el trabajo que se
+    ejecuta fuera del event loop (p. ej. el encode de los embeddings) puede
+    comprobarla antes de empezar.
+    """
+
+    def __init__(self, segundos: Optional[float] = None):
+        self.limite = time.monotonic() + segundos if segundos is not None else None
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado.is_set()
+
+    def restante(self) -> Optional[float]:
+        """Segundos que quedan (None si no hay límite)."""
+        if self.limite is None:
+            return None
+        return self.limite - time.monotonic()
+
+    def agotado(self) -> bool:
+        restante = self.restante()
+        return self.cancelado or (restante is not None and restante <= 0)
+
+    def comprobar(self):
+        """Lanza PlazoAgotadoError si ya no merece la pena seguir trabajando."""
+        if self.agotado():
+            raise PlazoAgotadoError("La petición agotó su plazo o fue cancelada")
+
+    def cancelar(self):
+        """Marca el plazo como cancelado; el trabajo pendiente en otros hilos ya no empieza."""
+        self._cancelado.set()
+
+    async def esperar(self, operacion: Awaitable[T]) -> T:
+        """
+        Espera la operación como mucho hasta el límite. Si se agota, la
+        cancela (también el trabajo pendiente en otros hilos) y lanza PlazoAgotadoError.
+        """
+        restante = self.restante()
+        if self.cancelado or (restante is not None and restante <= 0):
+            if asyncio.iscoroutine(operacion):
+                operacion.close()
+            self.cancelar()
+            raise PlazoAgotadoError("La petición agotó su plazo")
+        try:
+            return await asyncio.wait_for(operacion, restante)
+        except asyncio.TimeoutError:
+            self.cancelar()
+            raise PlazoAgotadoError("La petición agotó su plazo")
+
+
+_plazo_actual: ContextVar[Optional[Plazo]] = ContextVar("plazo_actual", default=None)
+
+
+def iniciar_plazo(segundos: Optional[float] = None) -> Plazo:
+    """Crea un plazo (sin límite si `segundos` es None) y lo fija como el actual del contexto."""
+    plazo = Plazo(segundos)
+    _plazo_actual.set(plazo)
+    return plazo
+
+
+def plazo_actual() -> Optional[Plazo]:
+    """Retorna el plazo de la petición en curso, si lo hay."""
+    return _plazo_actual.get()
\ No newline at end of file
@@ -0,0 +1,164 @@
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+from ..entities.documento import Documento
+from .embedding_service import EmbeddingService, Vector, MatrizVectores
+from .metricas_service import MetricasService, MetricasNulas
+
+
+# Fin de frase: puntuación seguida de espacio, o salto de línea
+_FIN_FRASE = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+@dataclass
+class FraseCitada:
+    """Frase de un documento recuperado elegida como respuesta."""
+    documento: int      # posición (desde 1) del documento entre los recuperados
+    documento_id: str
+    titulo: str
+    texto: str
+    inicio: int         # posición de la frase dentro del contenido del documento
+    fin: int
+    similitud: float
+
+
+class RespondedorExtractivo:
+    """
+    Responde sin LLM eligiendo las frases de los documentos recuperados más
+    parecidas a la pregunta.
+
+    Cada frase se vectoriza una sola vez: los embeddings se guardan en una
+    caché LRU por texto, así que los documentos que se recuperan a menudo
+    (y las frases repetidas por el solapamiento entre fragmentos) no vuelven
+    a pasar por el modelo y la respuesta sale en decenas de milisegundos.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        metricas: Optional[MetricasService] = None,
+        max_frases: int = 3,
+        longitud_minima: int = 25,
+        tamano_cache: int = 20000
+    ):
+        if max_frases < 1:
+            raise ValueError("Debe elegirse al menos una frase")
+        self.embedding_service = embedding_service
+        self.metricas = metricas or MetricasNulas()
+        self.max_frases = max_frases
+        # Las frases más cortas (p. ej. "Artículo 5.") se unen a la siguiente
+        self.longitud_minima = longitud_minima
+        self.tamano_cache = tamano_cache
+        self._cache: "OrderedDict[str, Vector]" = OrderedDict()
+
+    async def responder(
+        self,
+        embedding_pregunta: Vector,
+        documentos: List[Documento]
+    ) -> List[FraseCitada]:
+        """
+        Elige las frases que mejor responden a la pregunta.
+
+        Args:
+            embedding_pregunta: Embedding de la pregunta (el mismo de la búsqueda)
+            documentos: Documentos recuperados, en orden de relevancia
+
+        Returns:
+            List[FraseCitada]: Como mucho `max_frases`, de mayor a menor similitud
+        """
+        candidatas: List[Tuple[int, Documento, int, int]] = []
+        for posicion, documento in enumerate(documentos, 1):
+            for inicio, fin in self.dividir_frases(documento.contenido):
+                candidatas.append((posicion, documento, inicio, fin))
+        if not candidatas:
+            return []
+
+        textos = [documento.contenido[inicio:fin] for _, documento, inicio, fin in candidatas]
+        similitudes = self._similitudes(embedding_pregunta, await self._embeddings(textos))
+
+        elegidas: List[FraseCitada] = []
+        vistas = set()
+        for indice in np.argsort(-similitudes):
+            # El solapamiento entre fragmentos repite frases: se citan una vez
+            if textos[indice] in vistas:
+                continue
+            vistas.add(textos[indice])
+            posicion, documento, inicio, fin = candidatas[indice]
+            elegidas.append(FraseCitada(
+                documento=posicion,
+                documento_id=documento.id,
+                titulo=documento.titulo,
+                texto=textos[indice],
+                inicio=inicio,
+                fin=fin,
+                similitud=float(similitudes[indice])
+            ))
+            if len(elegidas) == self.max_frases:
+                break
+        return elegidas
+
+    def dividir_frases(self, texto: str) -> List[Tuple[int, int]]:
+        """Retorna las posiciones (inicio, fin) de las frases del texto."""
+        cortes = []
+        inicio = 0
+        for separador in _FIN_FRASE.finditer(texto):
+            cortes.append((inicio, separador.start()))
+            inicio = separador.end()
+        cortes.append((inicio, len(texto.rstrip())))
+
+        frases: List[Tuple[int, int]] = []
+        pendiente = None
+        for inicio, fin in cortes:
+            # Sin los espacios de los extremos: una frase en blanco no se vectoriza
+            frase = texto[inicio:fin]
+            inicio += len(frase) - len(frase.lstrip())
+            fin = inicio + len(frase.strip())
+            if fin <= inicio:
+                continue
+            if pendiente is not None:
+                inicio, pendiente = pendiente, None
+            if fin - inicio < self.longitud_minima:
+                pendiente = inicio
+                continue
+            frases.append((inicio, fin))
+
+        # Un resto corto al final se une a la última frase
+        if pendiente is not None:
+            fin = cortes[-1][1]
+            if frases:
+                frases[-1] = (frases[-1][0], fin)
+            elif fin > pendiente:
+                frases.append((pendiente, fin))
+        return frases
+
+    async def _embeddings(self, textos: List[str]) -> MatrizVectores:
+        """Embeddings de las frases, calculando en un solo batch los que no están en caché."""
+        # Se copian antes de vectorizar: otra consulta podría expulsarlos mientras
+        vectores = {}
+        aciertos = 0
+        for texto in textos:
+            if texto in self._cache:
+                vectores[texto] = self._cache[texto]
+                self._cache.move_to_end(texto)
+                aciertos += 1
+        if aciertos:
+            self.metricas.incrementar("cache_aciertos", aciertos, cache="frases")
+
+        nuevos = [texto for texto in dict.fromkeys(textos) if texto not in vectores]
+        if nuevos:
+            matriz = await self.embedding_service.generar_embeddings_batch(nuevos)
+            for texto, vector in zip(nuevos, matriz):
+                vectores[texto] = vector
+                self._cache[texto] = vector
+            while len(self._cache) > self.tamano_cache:
+                self._cache.popitem(last=False)
+
+        return np.stack([vectores[texto] for texto in textos])
+
+    @staticmethod
+    def _similitudes(embedding_pregunta: Vector, embeddings: MatrizVectores) -> np.ndarray:
+        """Similitud coseno entre la pregunta y cada frase."""
+        normas = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(embedding_pregunta)
+        return (embeddings @ embedding_pregunta) / np.maximum(normas, 1e-12)
\ No newline at end of file
@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+import numpy as np
+from ..entities.documento import Documento
+from .embedding_service import Vector, MatrizVectores
+
+
+# Por qué se cortó la lista de resultados
+CORTE_LIMITE = "limite"                      # no se cortó: llegaron los pedidos
+CORTE_CAIDA = "caida"                        # salto grande de similitud entre dos resultados
+CORTE_SIMILITUD_MINIMA = "similitud_minima"  # por debajo del mínimo
+
+
+@dataclass
+class DecisionSeleccion:
+    """Diagnóstico de la selección adaptativa de una consulta."""
+    candidatos: int
+    seleccionados: int
+    motivo_corte: str = CORTE_LIMITE
+    posicion_corte: Optional[int] = None  # primer resultado descartado (desde 0)
+    caida: Optional[float] = None         # salto de similitud en el corte
+    redundantes: List[str] = field(default_factory=list)  # IDs descartados por MMR
+
+
+class SelectorAdaptativo:
+    """
+    Decide cuántos de los resultados recuperados merecen ir al prompt.
+
+    `limite_resultados` pasa a ser un máximo: la lista se corta en el
+    primer salto de similitud mayor que `caida_maxima` o en el primer
+    resultado por debajo de `similitud_minima`, conservando siempre
+    `minimo_resultados`. Con `mmr_lambda`, los que quedan se reordenan por
+    Maximal Marginal Relevance y se descartan los casi duplicados de uno ya
+    elegido (similitud coseno ≥ `umbral_redundancia`), típicos del
+    solapamiento entre fragmentos de un mismo documento.
+    """
+
+    def __init__(
+        self,
+        similitud_minima: float = 0.3,
+        caida_maxima: float = 0.1,
+        minimo_resultados: int = 1,
+        mmr_lambda: Optional[float] = None,
+        umbral_redundancia: float = 0.95
+    ):
+        if minimo_resultados < 1:
+            raise ValueError("Debe conservarse al menos un resultado")
+        if mmr_lambda is not None and not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda debe estar entre 0 y 1")
+
+        self.similitud_minima = similitud_minima
+        self.caida_maxima = caida_maxima
+        self.minimo_resultados = minimo_resultados
+        self.mmr_lambda = mmr_lambda
+        self.umbral_redundancia = umbral_redundancia
+
+    @property
+    def usa_mmr(self) -> bool:
+        return self.mmr_lambda is not None
+
+    def cortar(self, documentos: List[Documento]) -> Tuple[List[Documento], DecisionSeleccion]:
+        """Corta los resultados (ordenados de mayor a menor similitud) donde dejan de ser relevantes."""
+        decision = DecisionSeleccion(candidatos=len(documentos), seleccionados=len(documentos))
+        anterior = None
+        for posicion, documento in enumerate(documentos):
+            similitud = documento.similitud
+            if similitud is None:
+                continue
+            if posicion >= self.minimo_resultados:
+                if similitud < self.similitud_minima:
+                    decision.motivo_corte = CORTE_SIMILITUD_MINIMA
+                elif anterior is not None and anterior - similitud > self.caida_maxima:
+                    decision.motivo_corte = CORTE_CAIDA
+                    decision.caida = anterior - similitud
+                if decision.motivo_corte != CORTE_LIMITE:
+                    decision.posicion_corte = posicion
+                    decision.seleccionados = posicion
+                    return documentos[:posicion], decision
+            anterior = similitud
+        return documentos, decision
+
+    def diversificar(
+        self,
+        embedding_pregunta: Vector,
+        documentos: List[Documento],
+        embeddings: MatrizVectores
+    ) -> Tuple[List[Documento], List[str]]:
+        """
+        Reordena por MMR y descarta los casi duplicados.
+
+        Args:
+            embedding_pregunta: Embedding de la pregunta
+            documentos: Resultados a diversificar
+            embeddings: Embedding de cada documento (una fila por documento)
+
+        Returns:
+            Documentos en orden MMR e IDs de los descartados por redundantes
+        """
+        if len(documentos) < 2:
+            return documentos, []
+
+        vectores = _normalizar(embeddings)
+        relevancia = vectores @ _normalizar(embedding_pregunta.reshape(1, -1))[0]
+        parecidos = vectores @ vectores.T
+
+        pendientes = list(range(len(documentos)))
+        elegidos: List[int] = []
+        redundantes: List[str] = []
+        while pendientes:
+            if elegidos:
+                redundancia = parecidos[np.ix_(pendientes, elegidos)].max(axis=1)
+            else:
+                redundancia = np.zeros(len(pendientes), dtype=np.float32)
+
+            # Los casi duplicados de uno ya elegido no aportan nada al prompt
+            duplicados = redundancia >= self.umbral_redundancia
+            redundantes.extend(documentos[pendientes[i]].id for i in np.flatnonzero(duplicados))
+            pendientes = [indice for indice, duplicado in zip(pendientes, duplicados) if not duplicado]
+            redundancia = redundancia[~duplicados]
+            if not pendientes:
+                break
+
+            puntuacion = self.mmr_lambda * relevancia[pendientes] - (1 - self.mmr_lambda) * redundancia
+            elegidos.append(pendientes.pop(int(np.argmax(puntuacion))))
+
+        return [documentos[indice] for indice in elegidos], redundantes
+
+
+def _normalizar(matriz: np.ndarray) -> np.ndarray:
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    return matriz / np.maximum(normas, 1e-12)
\ No newline at end of file
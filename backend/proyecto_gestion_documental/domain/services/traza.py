@@ -0,0 +1,71 @@
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Span:
+    """Una etapa medida dentro de una traza."""
+    nombre: str
+    inicio: float    # segundos desde el inicio de la traza
+    duracion: float  # segundos
+
+
+@dataclass
+class Traza:
+    """
+    Etapas medidas durante una petición.
+
+    Se guarda en una variable de contexto, de modo que cualquier capa puede
+    registrar etapas sin que la traza se pase explícitamente por parámetros.
+    """
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    inicio: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+
+    def registrar(self, nombre: str, duracion: float, fin: Optional[float] = None):
+        """Añade una etapa que terminó en `fin` (por defecto, ahora)."""
+        fin = time.perf_counter() if fin is None else fin
+        self.spans.append(Span(nombre=nombre, inicio=fin - duracion - self.inicio, duracion=duracion))
+
+    def duraciones(self, desde: int = 0) -> Dict[str, float]:
+        """
+        Duración total por etapa, en segundos (las repetidas se suman).
+
+        `desde` permite quedarse solo con las etapas registradas a partir de
+        una posición, p. ej. las de una operación dentro de la petición.
+        """
+        resultado: Dict[str, float] = {}
+        for span in self.spans[desde:]:
+            resultado[span.nombre] = resultado.get(span.nombre, 0.0) + span.duracion
+        return resultado
+
+    def duracion_total(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def server_timing(self, incluir_total: bool = True) -> str:
+        """Formatea las etapas como cabecera `Server-Timing` (en milisegundos)."""
+        partes = [
+            f"{nombre};dur={duracion * 1000:.1f}"
+            for nombre, duracion in self.duraciones().items()
+        ]
+        if incluir_total:
+            partes.append(f"total;dur={self.duracion_total() * 1000:.1f}")
+        return ", ".join(partes)
+
+
+_traza_actual: ContextVar[Optional[Traza]] = ContextVar("traza_actual", default=None)
+
+
+def iniciar_traza() -> Traza:
+    """Crea una traza nueva y la fija como la actual del contexto."""
+    traza = Traza()
+    _traza_actual.set(traza)
+    return traza
+
+
+def traza_actual() -> Optional[Traza]:
+    """Retorna la traza de la petición en curso, si la hay."""
+    return _traza_actual.get()
\ No newline at end of file
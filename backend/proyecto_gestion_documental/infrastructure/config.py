@@ -0,0 +1,177 @@
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+def _lista(valor: str) -> List[str]:
+    return [parte.strip() for parte in valor.split(",") if parte.strip()]
+
+
+def _booleano(valor: str) -> bool:
+    return valor.strip().lower() in ("1", "true", "si", "sí", "yes")
+
+
+def _opcional(valor: Optional[str], tipo, por_defecto):
+    """Sin variable, el valor por defecto; vacía o "none", sin valor (None)."""
+    if valor is None:
+        return por_defecto
+    if not valor.strip() or valor.strip().lower() == "none":
+        return None
+    return tipo(valor)
+
+
+@dataclass
+class Configuracion:
+    """
+    Configuración de la aplicación.
+
+    Los valores por defecto son los del entorno de desarrollo; en despliegue
+    se leen de variables de entorno con `desde_entorno()`.
+    """
+    modelo_embeddings: str = "all-MiniLM-L6-v2"
+    backend_embeddings: str = "torch"
+    coleccion: str = "documentos_normativos"
+    chroma_url: Optional[str] = None  # servidor Chroma compartido; sin él, índice en memoria del proceso
+    chroma_conexiones: int = 32
+    chroma_reintentos: int = 3
+    chroma_timeout: float = 30.0
+    chroma_lote_escritura: int = 256  # documentos por escritura
+    chroma_bloqueo_lecturas: bool = True  # las lecturas esperan al lote que se está escribiendo
+    motor_busqueda: str = "chroma"  # chroma (HNSW) o numpy (exacta, fuerza bruta)
+    numpy_directorio: str = "indice_numpy"
+    numpy_tipo_vector: str = "float32"  # float32, float16 o int8
+    numpy_factor_reevaluacion: int = 4
+    snapshots_directorio: str = "snapshots"
+    registro_directorio: Optional[str] = None  # registro de ingesta (write-ahead log); sin él, no se registra
+    registro_embeddings: bool = True  # guardar también los embeddings para reconstruir sin vectorizar
+    registro_tamano_segmento_mb: int = 64
+    registro_espera_fsync_ms: float = 0.0
+    numero_shards: int = 1  # colecciones locales entre las que se reparten los documentos
+    shards_urls: List[str] = field(default_factory=list)  # servidores Chroma, uno por shard
+    indice_espacio: str = "cosine"
+    indice_m: int = 16
+    indice_ef_construccion: int = 100
+    indice_ef_busqueda: int = 100
+    ollama_urls: List[str] = field(default_factory=lambda: ["http://localhost:11434"])
+    ollama_modelo: str = "llama3.2:1b"
+    ollama_timeout: int = 30
+    router_modelo_rapido: Optional[str] = None  # modelo para las preguntas fáciles; sin él, no se enruta
+    router_urls_rapido: List[str] = field(default_factory=list)  # sin URLs, las de ollama_urls
+    router_max_palabras: Optional[int] = 12
+    router_similitud_minima: Optional[float] = 0.6
+    router_margen_minimo: Optional[float] = None
+    consulta_timeout: Optional[float] = None  # plazo de las consultas sin `timeout` propio; None: sin límite
+    extractivo_respaldo: bool = True  # sin LLM disponible, responder con frases de los documentos
+    extractivo_frases: int = 3
+    extractivo_cache: int = 20000  # embeddings de frases en caché
+    adaptativo: bool = False  # selección adaptativa de resultados en las consultas que no la indican
+    adaptativo_similitud_minima: float = 0.3
+    adaptativo_caida: float = 0.1  # salto de similitud entre resultados consecutivos que corta la lista
+    adaptativo_mmr: Optional[float] = None  # lambda de MMR; None: sin reordenar ni quitar duplicados
+    adaptativo_redundancia: float = 0.95
+    ejecutor_embeddings_hilos: int = 2  # hilos para el encode de los embeddings
+    ejecutor_io_hilos: int = 16  # hilos para la E/S bloqueante (índice, registro, snapshots, chequeos)
+    ejecutor_contrasenas_hilos: int = 2  # hilos para el hash bcrypt de registro y login
+    ejecutor_extraccion_hilos: int = 2  # hilos para extraer el texto de los archivos subidos
+    ingestas_db_url: str = "sqlite:///ingestas.db"
+    worker_paralelismo: int = 2
+    worker_tamano_lote: int = 16
+    worker_concesion: float = 600.0  # segundos sin actualizarse tras los que un trabajo en curso se reencola
+    metricas_prefijo: str = "rag"
+    trazas_archivo: Optional[str] = None  # sin archivo no se guardan trazas
+    trazas_muestreo: float = 0.01
+    cors_origenes: List[str] = field(default_factory=lambda: ["*"])
+    token_admin: Optional[str] = None
+    carga_retraso_baja: Optional[float] = 0.1  # retraso del event loop (s) desde el que se rechazan listados y lotes
+    carga_retraso_normal: Optional[float] = 1.0  # y desde el que se rechaza todo salvo métricas y administración
+    carga_en_curso_baja: Optional[int] = 64  # peticiones en curso desde las que se rechazan listados y lotes
+    carga_en_curso_normal: Optional[int] = None
+    carga_reintentar_tras: int = 2  # Retry-After mínimo de los rechazos (s)
+    carga_rutas_baja: List[str] = field(default_factory=lambda: ["GET /documentos/", "POST /busqueda/batch"])
+    carga_intervalo_monitor: float = 0.05
+
+    @classmethod
+    def desde_entorno(cls) -> "Configuracion":
+        """Crea la configuración a partir de las variables de entorno `RAG_*`."""
+        base = cls()
+        return cls(
+            modelo_embeddings=os.environ.get("RAG_MODELO_EMBEDDINGS", base.modelo_embeddings),
+            backend_embeddings=os.environ.get("RAG_BACKEND_EMBEDDINGS", base.backend_embeddings),
+            coleccion=os.environ.get("RAG_COLECCION", base.coleccion),
+            chroma_url=os.environ.get("RAG_CHROMA_URL", base.chroma_url),
+            chroma_conexiones=int(os.environ.get("RAG_CHROMA_CONEXIONES", base.chroma_conexiones)),
+            chroma_reintentos=int(os.environ.get("RAG_CHROMA_REINTENTOS", base.chroma_reintentos)),
+            chroma_timeout=float(os.environ.get("RAG_CHROMA_TIMEOUT", base.chroma_timeout)),
+            chroma_lote_escritura=int(os.environ.get("RAG_CHROMA_LOTE_ESCRITURA", base.chroma_lote_escritura)),
+            chroma_bloqueo_lecturas=_booleano(
+                os.environ.get("RAG_CHROMA_BLOQUEO_LECTURAS", str(base.chroma_bloqueo_lecturas))
+            ),
+            motor_busqueda=os.environ.get("RAG_MOTOR_BUSQUEDA", base.motor_busqueda),
+            numpy_directorio=os.environ.get("RAG_NUMPY_DIRECTORIO", base.numpy_directorio),
+            numpy_tipo_vector=os.environ.get("RAG_NUMPY_TIPO_VECTOR", base.numpy_tipo_vector),
+            numpy_factor_reevaluacion=int(os.environ.get("RAG_NUMPY_FACTOR_REEVALUACION", base.numpy_factor_reevaluacion)),
+            snapshots_directorio=os.environ.get("RAG_SNAPSHOTS_DIRECTORIO", base.snapshots_directorio),
+            registro_directorio=os.environ.get("RAG_REGISTRO_DIRECTORIO", base.registro_directorio),
+            registro_embeddings=_booleano(os.environ.get("RAG_REGISTRO_EMBEDDINGS", str(base.registro_embeddings))),
+            registro_tamano_segmento_mb=int(os.environ.get("RAG_REGISTRO_TAMANO_SEGMENTO_MB", base.registro_tamano_segmento_mb)),
+            registro_espera_fsync_ms=float(os.environ.get("RAG_REGISTRO_ESPERA_FSYNC_MS", base.registro_espera_fsync_ms)),
+            numero_shards=int(os.environ.get("RAG_NUMERO_SHARDS", base.numero_shards)),
+            shards_urls=_lista(os.environ.get("RAG_SHARDS_URLS", ",".join(base.shards_urls))),
+            indice_espacio=os.environ.get("RAG_INDICE_ESPACIO", base.indice_espacio),
+            indice_m=int(os.environ.get("RAG_INDICE_M", base.indice_m)),
+            indice_ef_construccion=int(os.environ.get("RAG_INDICE_EF_CONSTRUCCION", base.indice_ef_construccion)),
+            indice_ef_busqueda=int(os.environ.get("RAG_INDICE_EF_BUSQUEDA", base.indice_ef_busqueda)),
+            ollama_urls=_lista(os.environ.get("RAG_OLLAMA_URLS", ",".join(base.ollama_urls))),
+            ollama_modelo=os.environ.get("RAG_OLLAMA_MODELO", base.ollama_modelo),
+            ollama_timeout=int(os.environ.get("RAG_OLLAMA_TIMEOUT", base.ollama_timeout)),
+            router_modelo_rapido=os.environ.get("RAG_ROUTER_MODELO_RAPIDO", base.router_modelo_rapido),
+            router_urls_rapido=_lista(os.environ.get("RAG_ROUTER_URLS_RAPIDO", ",".join(base.router_urls_rapido))),
+            router_max_palabras=_opcional(os.environ.get("RAG_ROUTER_MAX_PALABRAS"), int, base.router_max_palabras),
+            router_similitud_minima=_opcional(
+                os.environ.get("RAG_ROUTER_SIMILITUD_MINIMA"), float, base.router_similitud_minima
+            ),
+            router_margen_minimo=_opcional(os.environ.get("RAG_ROUTER_MARGEN_MINIMO"), float, base.router_margen_minimo),
+            consulta_timeout=(
+                float(os.environ["RAG_CONSULTA_TIMEOUT"]) if os.environ.get("RAG_CONSULTA_TIMEOUT")
+                else base.consulta_timeout
+            ),
+            extractivo_respaldo=_booleano(os.environ.get("RAG_EXTRACTIVO_RESPALDO", str(base.extractivo_respaldo))),
+            extractivo_frases=int(os.environ.get("RAG_EXTRACTIVO_FRASES", base.extractivo_frases)),
+            extractivo_cache=int(os.environ.get("RAG_EXTRACTIVO_CACHE", base.extractivo_cache)),
+            adaptativo=_booleano(os.environ.get("RAG_ADAPTATIVO", str(base.adaptativo))),
+            adaptativo_similitud_minima=float(os.environ.get("RAG_ADAPTATIVO_SIMILITUD_MINIMA", base.adaptativo_similitud_minima)),
+            adaptativo_caida=float(os.environ.get("RAG_ADAPTATIVO_CAIDA", base.adaptativo_caida)),
+            adaptativo_mmr=(
+                float(os.environ["RAG_ADAPTATIVO_MMR"]) if os.environ.get("RAG_ADAPTATIVO_MMR")
+                else base.adaptativo_mmr
+            ),
+            adaptativo_redundancia=float(os.environ.get("RAG_ADAPTATIVO_REDUNDANCIA", base.adaptativo_redundancia)),
+            ejecutor_embeddings_hilos=int(os.environ.get("RAG_EJECUTOR_EMBEDDINGS_HILOS", base.ejecutor_embeddings_hilos)),
+            ejecutor_io_hilos=int(os.environ.get("RAG_EJECUTOR_IO_HILOS", base.ejecutor_io_hilos)),
+            ejecutor_contrasenas_hilos=int(
+                os.environ.get("RAG_EJECUTOR_CONTRASENAS_HILOS", base.ejecutor_contrasenas_hilos)
+            ),
+            ejecutor_extraccion_hilos=int(
+                os.environ.get("RAG_EJECUTOR_EXTRACCION_HILOS", base.ejecutor_extraccion_hilos)
+            ),
+            ingestas_db_url=os.environ.get("RAG_INGESTAS_DB_URL", base.ingestas_db_url),
+            worker_paralelismo=int(os.environ.get("RAG_WORKER_PARALELISMO", base.worker_paralelismo)),
+            worker_tamano_lote=int(os.environ.get("RAG_WORKER_TAMANO_LOTE", base.worker_tamano_lote)),
+            worker_concesion=float(os.environ.get("RAG_WORKER_CONCESION", base.worker_concesion)),
+            metricas_prefijo=os.environ.get("RAG_METRICAS_PREFIJO", base.metricas_prefijo),
+            trazas_archivo=os.environ.get("RAG_TRAZAS_ARCHIVO", base.trazas_archivo),
+            trazas_muestreo=float(os.environ.get("RAG_TRAZAS_MUESTREO", base.trazas_muestreo)),
+            cors_origenes=_lista(os.environ.get("RAG_CORS_ORIGENES", ",".join(base.cors_origenes))),
+            token_admin=os.environ.get("RAG_TOKEN_ADMIN", base.token_admin),
+            carga_retraso_baja=_opcional(os.environ.get("RAG_CARGA_RETRASO_BAJA"), float, base.carga_retraso_baja),
+            carga_retraso_normal=_opcional(
+                os.environ.get("RAG_CARGA_RETRASO_NORMAL"), float, base.carga_retraso_normal
+            ),
+            carga_en_curso_baja=_opcional(os.environ.get("RAG_CARGA_EN_CURSO_BAJA"), int, base.carga_en_curso_baja),
+            carga_en_curso_normal=_opcional(
+                os.environ.get("RAG_CARGA_EN_CURSO_NORMAL"), int, base.carga_en_curso_normal
+            ),
+            carga_reintentar_tras=int(os.environ.get("RAG_CARGA_REINTENTAR_TRAS", base.carga_reintentar_tras)),
+            carga_rutas_baja=_lista(os.environ.get("RAG_CARGA_RUTAS_BAJA", ",".join(base.carga_rutas_baja))),
+            carga_intervalo_monitor=float(os.environ.get("RAG_CARGA_INTERVALO_MONITOR", base.carga_intervalo_monitor))
+        )
\ No newline at end of file
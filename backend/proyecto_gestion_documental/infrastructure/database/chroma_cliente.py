@@ -0,0 +1,111 @@
+import time
+from urllib.parse import urlparse
+import chromadb
+import httpx
+from chromadb.config import Settings
+
+
+CODIGOS_REINTENTABLES = (502, 503, 504)
+ERRORES_REINTENTABLES = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.RemoteProtocolError,
+    httpx.PoolTimeout
+)
+
+
+class _TransporteConReintentos(httpx.BaseTransport):
+    """
+    Reintenta con espera exponencial los fallos de conexión y las respuestas
+    502/503/504 (servidor reiniciándose o saturado).
+
+    Las operaciones que usa el repositorio son idempotentes (get, query,
+    upsert, delete; add ignora los IDs que ya existen), así que repetir una
+    petición cuya respuesta se perdió es seguro.
+    """
+
+    def __init__(self, transporte: httpx.BaseTransport, reintentos: int, espera_inicial: float):
+        self._transporte = transporte
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for intento in range(self.reintentos + 1):
+            ultimo = intento == self.reintentos
+            try:
+                respuesta = self._transporte.handle_request(request)
+                if ultimo or respuesta.status_code not in CODIGOS_REINTENTABLES:
+                    return respuesta
+                respuesta.close()
+            except ERRORES_REINTENTABLES:
+                if ultimo:
+                    raise
+            time.sleep(self.espera_inicial * 2 ** intento)
+
+    def close(self):
+        self._transporte.close()
+
+
+def crear_cliente_http(
+    url: str,
+    conexiones: int = 32,
+    reintentos: int = 3,
+    timeout: float = 30.0,
+    espera_inicial: float = 0.1
+):
+    """
+    Cliente de un servidor Chroma (`chroma run`) con un pool de conexiones
+    persistentes y reintentos.
+
+    El cliente HTTP de chromadb usa una sesión httpx sin límite de tiempo ni
+    reintentos; se sustituye por una con `conexiones` conexiones keep-alive
+    como máximo, compartidas por todos los hilos del proceso.
+
+    Args:
+        url: URL del servidor, p. ej. http://localhost:8001
+        conexiones: Tamaño máximo del pool de conexiones
+        reintentos: Reintentos ante fallos de conexión o 502/503/504
+        timeout: Límite en segundos de cada petición
+        espera_inicial: Espera antes del primer reintento (se duplica en cada uno)
+    """
+    if conexiones < 1:
+        raise ValueError("El pool de conexiones a Chroma necesita al menos una conexión")
+    if reintentos < 0:
+        raise ValueError("El número de reintentos no puede ser negativo")
+
+    partes = urlparse(url)
+    if partes.scheme not in ("http", "https") or not partes.hostname:
+        raise ValueError(f"URL de servidor Chroma no válida: {url}")
+
+    cliente = chromadb.HttpClient(
+        host=partes.hostname,
+        port=partes.port or (443 if partes.scheme == "https" else 8000),
+        ssl=partes.scheme == "https",
+        settings=Settings(anonymized_telemetry=False)
+    )
+
+    # chromadb no deja configurar su sesión httpx: se sustituye el atributo
+    # privado `cliente._server._session`, que existe en la versión fijada en
+    # requirements.txt (chromadb==1.0.15). Si otra versión lo cambia, se
+    # falla aquí en vez de seguir sin límite de tiempo ni reintentos
+    servidor = getattr(cliente, "_server", None)
+    sesion_anterior = getattr(servidor, "_session", None)
+    if not isinstance(sesion_anterior, httpx.Client):
+        raise Exception(
+            f"El cliente HTTP de chromadb {chromadb.__version__} no tiene la sesión httpx esperada "
+            "(_server._session): el pool de conexiones a Chroma requiere chromadb==1.0.15"
+        )
+
+    limites = httpx.Limits(max_connections=conexiones, max_keepalive_connections=conexiones)
+    servidor._session = httpx.Client(
+        timeout=httpx.Timeout(timeout),
+        headers=sesion_anterior.headers,
+        transport=_TransporteConReintentos(
+            httpx.HTTPTransport(limits=limites),
+            reintentos,
+            espera_inicial
+        )
+    )
+    sesion_anterior.close()
+    return cliente
\ No newline at end of file
@@ -1,22 +1,91 @@
-from typing import List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, TypeVar
 import chromadb
+import numpy as np
 from chromadb.config import Settings
+from chromadb.errors import NotFoundError
 from ...domain.entities.documento import Documento
+from ...domain.entities.parametros_indice import ParametrosIndice, ESPACIO_L2
 from ...domain.repositories.documento_repository import DocumentoRepository
-from ...domain.services.embedding_service import EmbeddingService
+from ...domain.services.bloqueo_lectura_escritura import BloqueoLecturaEscritura
+from ..workers.ejecutor import Ejecutor
+from ...domain.services.embedding_service import EmbeddingService, Vector, MatrizVectores
+
+
+TAMANO_LOTE_RECONSTRUCCION = 1000
+# Documentos por escritura: entre lote y lote pasan las lecturas que esperan
+TAMANO_LOTE_ESCRITURA = 256
+
+T = TypeVar("T")
+
+
+class _ColeccionCompartida:
+    """
+    Colección que se vuelve a abrir por nombre si otro proceso la reemplaza.
+
+    Con varios workers contra el mismo servidor Chroma, una reconstrucción
+    del índice en uno de ellos sustituye la colección por otra con el mismo
+    nombre; los demás lo detectan en su siguiente operación y avisan con
+    `al_reabrir` para actualizar los parámetros del índice.
+    """
+    
+    def __init__(self, client, nombre: str, coleccion, al_reabrir: Callable[[object], None]):
+        self._client = client
+        self._nombre = nombre
+        self._coleccion = coleccion
+        self._al_reabrir = al_reabrir
+    
+    def __getattr__(self, atributo: str):
+        valor = getattr(self._coleccion, atributo)
+        if not callable(valor):
+            return valor
+        
+        def _llamar(*args, **kwargs):
+            try:
+                return getattr(self._coleccion, atributo)(*args, **kwargs)
+            except NotFoundError:
+                self._coleccion = self._client.get_collection(name=self._nombre)
+                self._al_reabrir(self._coleccion)
+                return getattr(self._coleccion, atributo)(*args, **kwargs)
+        return _llamar
 
 
 class ChromaDocumentoRepository(DocumentoRepository):
-    """Implementación del repositorio de documentos usando ChromaDB."""
+    """
+    Implementación del repositorio de documentos usando ChromaDB.
+    
+    El cliente de Chroma es síncrono: cada llamada se ejecuta en los hilos de
+    `ejecutor` para no bloquear el event loop. Las escrituras van de una en
+    una y por lotes de `tamano_lote_escritura`, así que una ingesta masiva
+    ocupa un solo hilo y deja el resto a las búsquedas.
+    
+    El cliente embebido retiene el GIL mientras escribe, y si una lectura
+    coincide con una escritura ambas se alargan y el event loop se queda
+    parado segundos. Con `bloqueo_lecturas` (por defecto) las lecturas
+    esperan a que termine el lote en curso; contra un servidor Chroma
+    (`HttpClient`), donde las llamadas son E/S de red, puede desactivarse.
+    """
     
     def __init__(
         self, 
         embedding_service: EmbeddingService,
         collection_name: str = "documentos_normativos",
-        chroma_client: Optional[chromadb.Client] = None
+        chroma_client: Optional[chromadb.Client] = None,
+        parametros_indice: Optional[ParametrosIndice] = None,
+        ejecutor: Optional[Ejecutor] = None,
+        tamano_lote_escritura: int = TAMANO_LOTE_ESCRITURA,
+        bloqueo_lecturas: bool = True
     ):
         self.embedding_service = embedding_service
         self.collection_name = collection_name
+        self.ejecutor = ejecutor or Ejecutor("chroma", hilos=4)
+        self.tamano_lote_escritura = tamano_lote_escritura
+        self.bloqueo_lecturas = bloqueo_lecturas
+        # Turno exclusivo para las escrituras y el intercambio de colecciones
+        # al reconstruir el índice; compartido para las lecturas que lo piden
+        self._bloqueo = BloqueoLecturaEscritura()
+        self._reconstruyendo = False
+        # IDs escritos durante una reconstrucción: se vuelven a copiar antes del intercambio
+        self._escritos_reconstruccion: Set[str] = set()
         
         # Usar cliente proporcionado o crear uno nuevo
         if chroma_client is not None:
@@ -24,19 +93,36 @@ class ChromaDocumentoRepository(DocumentoRepository):
         else:
             self.client = chromadb.Client()
             
-        # Crear o obtener colección
+        parametros_indice = parametros_indice or ParametrosIndice()
+        parametros_indice.validar()
+            
+        # Crear o obtener colección. Los parámetros del índice solo se aplican
+        # al crearla; para cambiarlos en una existente, reconstruir_indice()
         try:
-            self.collection = self.client.get_collection(name=collection_name)
+            coleccion = self.client.get_collection(name=collection_name)
         except:
-            self.collection = self.client.create_collection(name=collection_name)
+            try:
+                coleccion = self.client.create_collection(
+                    name=collection_name,
+                    metadata=self._metadata_indice(parametros_indice)
+                )
+            except Exception:
+                # Otro worker contra el mismo servidor la creó a la vez
+                coleccion = self.client.get_collection(name=collection_name)
+        self.collection = _ColeccionCompartida(
+            self.client, collection_name, coleccion, self._al_reabrir_coleccion
+        )
+        
+        # Los parámetros efectivos son los de la colección, no los pedidos
+        self.parametros_indice = self._leer_parametros_indice(self.collection)
     
     async def obtener_por_id(self, documento_id: str) -> Optional[Documento]:
         """Obtiene un documento por su ID."""
         try:
-            resultado = self.collection.get(
+            resultado = await self._leer(lambda: self.collection.get(
                 ids=[documento_id],
                 include=['documents', 'metadatas']
-            )
+            ))
             
             if not resultado['ids']:
                 return None
@@ -53,9 +139,9 @@ class ChromaDocumentoRepository(DocumentoRepository):
     async def obtener_todos(self) -> List[Documento]:
         """Obtiene todos los documentos almacenados."""
         try:
-            resultado = self.collection.get(
+            resultado = await self._leer(lambda: self.collection.get(
                 include=['documents', 'metadatas']
-            )
+            ))
             
             documentos = []
             for i, doc_id in enumerate(resultado['ids']):
@@ -80,29 +166,118 @@ class ChromaDocumentoRepository(DocumentoRepository):
             )
             
             # Preparar metadata
-            metadata = {
-                "titulo": documento.titulo,
-                "tipo": documento.tipo,
-                "fecha_creacion": documento.fecha_creacion.isoformat() if documento.fecha_creacion else None
-            }
+            metadata = self._crear_metadata(documento)
             
             # Guardar en ChromaDB
-            self.collection.add(
-                embeddings=[embedding],
+            await self._escribir(lambda: self.collection.add(
+                embeddings=embedding.reshape(1, -1),
                 documents=[documento.contenido],
                 metadatas=[metadata],
                 ids=[documento.id]
-            )
+            ), [documento.id])
             
             return documento.id
             
         except Exception as e:
             raise Exception(f"Error al guardar documento: {str(e)}")
     
+    async def guardar_batch(self, documentos: List[Documento]) -> List[str]:
+        """Guarda varios documentos con un único cálculo de embeddings."""
+        if not documentos:
+            return []
+        
+        try:
+            embeddings = await self.embedding_service.generar_embeddings_batch(
+                [documento.contenido for documento in documentos]
+            )
+            
+            return await self.guardar_con_embeddings(documentos, embeddings)
+            
+        except Exception as e:
+            raise Exception(f"Error al guardar documentos: {str(e)}")
+    
+    async def guardar_con_embeddings(
+        self, 
+        documentos: List[Documento], 
+        embeddings: MatrizVectores
+    ) -> List[str]:
+        """Guarda documentos con embeddings ya calculados."""
+        if not documentos:
+            return []
+        
+        try:
+            # upsert: reintentar un lote ya indexado no duplica documentos
+            for inicio in range(0, len(documentos), self.tamano_lote_escritura):
+                lote = documentos[inicio:inicio + self.tamano_lote_escritura]
+                vectores = embeddings[inicio:inicio + self.tamano_lote_escritura]
+                ids = [documento.id for documento in lote]
+                await self._escribir(lambda lote=lote, vectores=vectores, ids=ids: self.collection.upsert(
+                    embeddings=vectores,
+                    documents=[documento.contenido for documento in lote],
+                    metadatas=[self._crear_metadata(documento) for documento in lote],
+                    ids=ids
+                ), ids)
+            
+            return [documento.id for documento in documentos]
+            
+        except Exception as e:
+            raise Exception(f"Error al guardar documentos: {str(e)}")
+    
+    async def obtener_embeddings(self, documento_ids: List[str]) -> Dict[str, Vector]:
+        """Embeddings guardados de los documentos indicados."""
+        if not documento_ids:
+            return {}
+        try:
+            resultado = await self._leer(
+                lambda: self.collection.get(ids=documento_ids, include=['embeddings'])
+            )
+            return {
+                doc_id: np.asarray(embedding, dtype=np.float32)
+                for doc_id, embedding in zip(resultado['ids'], resultado['embeddings'])
+            }
+            
+        except Exception as e:
+            raise Exception(f"Error al obtener embeddings: {str(e)}")
+    
+    async def iterar_con_embeddings(
+        self, 
+        tamano_lote: int = TAMANO_LOTE_RECONSTRUCCION
+    ) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """
+        Recorre la colección por lotes con los embeddings guardados.
+        
+        Se leen primero todos los IDs y después los documentos por ID: con
+        `offset`, un borrado durante el recorrido desplazaría las filas
+        siguientes y el documento del borde de página no se leería nunca.
+        Los borrados posteriores a la lista de IDs simplemente no aparecen.
+        """
+        try:
+            ids = (await self._leer(lambda: self.collection.get(include=[])))['ids']
+        except Exception as e:
+            raise Exception(f"Error al leer documentos con embeddings: {str(e)}")
+        
+        for inicio in range(0, len(ids), tamano_lote):
+            pendientes = ids[inicio:inicio + tamano_lote]
+            try:
+                lote = await self._leer(lambda pendientes=pendientes: self.collection.get(
+                    ids=pendientes,
+                    include=['embeddings', 'documents', 'metadatas']
+                ))
+            except Exception as e:
+                raise Exception(f"Error al leer documentos con embeddings: {str(e)}")
+            
+            if not lote['ids']:
+                continue
+            
+            yield [
+                self._convertir_a_documento(doc_id, contenido, metadata)
+                for doc_id, contenido, metadata in zip(lote['ids'], lote['documents'], lote['metadatas'])
+            ], np.asarray(lote['embeddings'], dtype=np.float32)
+    
     async def eliminar(self, documento_id: str) -> bool:
         """Elimina un documento por su ID."""
         try:
-            self.collection.delete(ids=[documento_id])
+            await self._escribir(lambda: self.collection.delete(ids=[documento_id]), [documento_id])
             return True
             
         except Exception as e:
@@ -110,33 +285,52 @@ class ChromaDocumentoRepository(DocumentoRepository):
     
     async def buscar_por_similitud(
         self, 
-        embedding: List[float], 
+        embedding: Vector, 
         limite: int = 5
     ) -> List[Documento]:
         """Busca documentos similares basándose en un embedding."""
+        resultados = await self.buscar_por_similitud_batch(embedding.reshape(1, -1), limite)
+        return resultados[0]
+    
+    async def buscar_por_similitud_batch(
+        self, 
+        embeddings: MatrizVectores, 
+        limite: int = 5
+    ) -> List[List[Documento]]:
+        """Busca documentos similares para varios embeddings en una sola consulta."""
+        if len(embeddings) == 0:
+            return []
+        
         try:
-            resultados = self.collection.query(
-                query_embeddings=[embedding],
+            resultados = await self._leer(lambda: self.collection.query(
+                query_embeddings=embeddings,
                 n_results=limite,
                 include=['documents', 'metadatas', 'distances']
-            )
+            ))
             
-            documentos = []
+            documentos_por_consulta = []
             
-            if resultados['ids'] and resultados['ids'][0]:
-                for i, doc_id in enumerate(resultados['ids'][0]):
-                    # Convertir distancia a similitud (1 - distancia)
-                    similitud = 1 - resultados['distances'][0][i] if resultados['distances'] else None
+            for q in range(len(embeddings)):
+                documentos = []
+                ids = resultados['ids'][q] if resultados['ids'] else []
+                
+                for i, doc_id in enumerate(ids):
+                    # La conversión depende del espacio de distancia del índice
+                    similitud = self.parametros_indice.distancia_a_similitud(
+                        resultados['distances'][q][i]
+                    ) if resultados['distances'] else None
                     
                     documento = self._convertir_a_documento(
                         doc_id,
-                        resultados['documents'][0][i],
-                        resultados['metadatas'][0][i],
+                        resultados['documents'][q][i],
+                        resultados['metadatas'][q][i],
                         similitud
                     )
                     documentos.append(documento)
+                
+                documentos_por_consulta.append(documentos)
             
-            return documentos
+            return documentos_por_consulta
             
         except Exception as e:
             raise Exception(f"Error en búsqueda por similitud: {str(e)}")
@@ -144,12 +338,184 @@ class ChromaDocumentoRepository(DocumentoRepository):
     async def contar_documentos(self) -> int:
         """Cuenta el número total de documentos."""
         try:
-            resultado = self.collection.count()
+            resultado = await self._leer(self.collection.count)
             return resultado
             
         except Exception as e:
             raise Exception(f"Error al contar documentos: {str(e)}")
     
+    def obtener_parametros_indice(self) -> Optional[ParametrosIndice]:
+        """Parámetros HNSW de la colección actual."""
+        return self.parametros_indice
+    
+    async def reconstruir_indice(
+        self, 
+        parametros: ParametrosIndice,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Copia la colección a una nueva con otros parámetros HNSW y las intercambia.
+        
+        Se copian los embeddings ya calculados, sin volver a vectorizar. Las
+        búsquedas y escrituras siguen usando la colección actual durante la
+        copia; al terminar se copian los documentos añadidos (y se quitan
+        los eliminados) mientras tanto, y se intercambian las colecciones.
+        """
+        parametros.validar()
+        nombre_temporal = f"{self.collection_name}__reconstruccion"
+        # Desde ya, todas las lecturas piden turno: ninguna puede estar en
+        # curso cuando se intercambien las colecciones
+        self._reconstruyendo = True
+        self._escritos_reconstruccion = set()
+        
+        try:
+            nueva = await self.ejecutor.ejecutar(self._crear_coleccion_temporal, nombre_temporal, parametros)
+            
+            total = await self._leer(self.collection.count)
+            copiados = 0
+            while True:
+                lote = await self._leer(lambda: self.collection.get(
+                    include=['embeddings', 'documents', 'metadatas'],
+                    limit=TAMANO_LOTE_RECONSTRUCCION,
+                    offset=copiados
+                ))
+                if not lote['ids']:
+                    break
+                
+                # La colección nueva aún no la ve nadie: no hace falta turno
+                await self.ejecutor.ejecutar(lambda: nueva.upsert(
+                    ids=lote['ids'],
+                    embeddings=lote['embeddings'],
+                    documents=lote['documents'],
+                    metadatas=lote['metadatas']
+                ))
+                copiados += len(lote['ids'])
+                if progreso is not None:
+                    progreso(copiados, total)
+            
+            # Con el turno exclusivo ninguna otra petición lee ni escribe
+            # entre la sincronización final y el intercambio
+            async with self._bloqueo.escritura():
+                await self.ejecutor.ejecutar(self._intercambiar_colecciones, nueva)
+                self.collection = _ColeccionCompartida(
+                    self.client, self.collection_name, nueva, self._al_reabrir_coleccion
+                )
+                self.parametros_indice = self._leer_parametros_indice(nueva)
+            return await self._leer(nueva.count)
+            
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al reconstruir el índice: {str(e)}")
+        finally:
+            self._reconstruyendo = False
+            self._escritos_reconstruccion = set()
+    
+    async def _leer(self, operacion: Callable[[], T]) -> T:
+        """Ejecuta una lectura de Chroma fuera del event loop, a la vez que otras lecturas."""
+        if not (self.bloqueo_lecturas or self._reconstruyendo):
+            return await self.ejecutor.ejecutar(operacion)
+        async with self._bloqueo.lectura():
+            return await self.ejecutor.ejecutar(operacion)
+    
+    async def _escribir(self, operacion: Callable[[], T], ids: List[str]) -> T:
+        """Ejecuta una escritura de Chroma fuera del event loop, sin otras escrituras a la vez."""
+        async with self._bloqueo.escritura():
+            if self._reconstruyendo:
+                self._escritos_reconstruccion.update(ids)
+            return await self.ejecutor.ejecutar(operacion)
+    
+    def _crear_coleccion_temporal(self, nombre: str, parametros: ParametrosIndice):
+        # Restos de un intento anterior interrumpido
+        for resto in (nombre, f"{self.collection_name}__respaldo"):
+            try:
+                self.client.delete_collection(name=resto)
+            except Exception:
+                pass
+        return self.client.create_collection(name=nombre, metadata=self._metadata_indice(parametros))
+    
+    def _intercambiar_colecciones(self, nueva):
+        """
+        Copia a `nueva` lo escrito durante la reconstrucción y la pone en lugar de la actual.
+        
+        La actual se renombra primero a un respaldo y solo se borra cuando la
+        nueva ya tiene su nombre: si el renombrado falla, se restaura.
+        """
+        self._sincronizar_colecciones(self.collection, nueva, self._escritos_reconstruccion)
+        
+        nombre_respaldo = f"{self.collection_name}__respaldo"
+        actual = self.client.get_collection(name=self.collection_name)
+        actual.modify(name=nombre_respaldo)
+        try:
+            nueva.modify(name=self.collection_name)
+        except Exception:
+            actual.modify(name=self.collection_name)
+            raise
+        self.client.delete_collection(name=nombre_respaldo)
+    
+    def _sincronizar_colecciones(self, origen, destino, modificados: Set[str] = frozenset()):
+        """
+        Copia a `destino` los IDs que faltan o se modificaron y elimina los
+        que ya no están en `origen`.
+        """
+        ids_origen = set(origen.get(include=[])['ids'])
+        ids_destino = set(destino.get(include=[])['ids'])
+        
+        # Los escritos durante la copia pueden haber llegado ya en su versión antigua
+        faltan = list((ids_origen - ids_destino) | (ids_origen & set(modificados)))
+        for i in range(0, len(faltan), TAMANO_LOTE_RECONSTRUCCION):
+            lote = origen.get(
+                ids=faltan[i:i + TAMANO_LOTE_RECONSTRUCCION],
+                include=['embeddings', 'documents', 'metadatas']
+            )
+            destino.upsert(
+                ids=lote['ids'],
+                embeddings=lote['embeddings'],
+                documents=lote['documents'],
+                metadatas=lote['metadatas']
+            )
+        
+        sobran = list(ids_destino - ids_origen)
+        if sobran:
+            destino.delete(ids=sobran)
+    
+    def _al_reabrir_coleccion(self, coleccion):
+        """Otro proceso reconstruyó el índice: sus parámetros pueden haber cambiado."""
+        self.parametros_indice = self._leer_parametros_indice(coleccion)
+    
+    def _metadata_indice(self, parametros: ParametrosIndice) -> dict:
+        """Metadata con la que ChromaDB configura el índice HNSW de una colección."""
+        return {
+            "hnsw:space": parametros.espacio,
+            "hnsw:M": parametros.m,
+            "hnsw:construction_ef": parametros.ef_construccion,
+            "hnsw:search_ef": parametros.ef_busqueda
+        }
+    
+    def _leer_parametros_indice(self, collection) -> ParametrosIndice:
+        """Lee los parámetros HNSW de una colección existente."""
+        # ChromaDB >= 1.0 los expone en la configuración; antes, solo en la metadata
+        hnsw = (getattr(collection, "configuration", None) or {}).get("hnsw") or {}
+        metadata = collection.metadata or {}
+        por_defecto = ParametrosIndice()
+        return ParametrosIndice(
+            # Sin espacio explícito ChromaDB usa L2
+            espacio=hnsw.get("space", metadata.get("hnsw:space", ESPACIO_L2)),
+            m=hnsw.get("max_neighbors", metadata.get("hnsw:M", por_defecto.m)),
+            ef_construccion=hnsw.get(
+                "ef_construction", metadata.get("hnsw:construction_ef", por_defecto.ef_construccion)
+            ),
+            ef_busqueda=hnsw.get("ef_search", metadata.get("hnsw:search_ef", por_defecto.ef_busqueda))
+        )
+    
+    def _crear_metadata(self, documento: Documento) -> dict:
+        """Prepara la metadata que se guarda junto al documento en ChromaDB."""
+        return {
+            "titulo": documento.titulo,
+            "tipo": documento.tipo,
+            "fecha_creacion": documento.fecha_creacion.isoformat() if documento.fecha_creacion else None
+        }
+    
     def _convertir_a_documento(
         self, 
         doc_id: str, 
@@ -0,0 +1,189 @@
+import json
+import os
+import re
+import shutil
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+import numpy as np
+from ...domain.entities.documento import Documento
+from ...domain.entities.snapshot import ManifiestoSnapshot
+from ...domain.repositories.snapshot_repository import SnapshotRepository
+from ...domain.services.embedding_service import MatrizVectores
+from ..workers.ejecutor import Ejecutor
+
+
+ARCHIVO_MANIFIESTO = "manifiesto.json"
+SUFIJO_PARCIAL = ".parcial"
+SUFIJO_ANTERIOR = ".anterior"
+VERSION_FORMATO = 1
+PATRON_NOMBRE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,99}")
+
+
+class NpySnapshotRepository(SnapshotRepository):
+    """
+    Snapshots en un directorio por snapshot, con una pareja de archivos por parte:
+
+        <directorio>/<nombre>/manifiesto.json
+        <directorio>/<nombre>/parte_00000.npy     embeddings float32 (n × dimensión)
+        <directorio>/<nombre>/parte_00000.jsonl   un documento por línea, en el mismo orden
+
+    Cada parte corresponde a un lote del recorrido, así que ni la exportación
+    ni la importación cargan el corpus entero en memoria. Las partes se
+    leen y escriben en los hilos de `ejecutor`.
+    """
+
+    def __init__(self, directorio: str = "snapshots", ejecutor: Optional[Ejecutor] = None):
+        self.directorio = directorio
+        self.ejecutor = ejecutor or Ejecutor("snapshots", hilos=1)
+        os.makedirs(directorio, exist_ok=True)
+
+    async def escribir(
+        self,
+        manifiesto: ManifiestoSnapshot,
+        lotes: AsyncIterator[Tuple[List[Documento], MatrizVectores]]
+    ) -> ManifiestoSnapshot:
+        """Escribe las partes en un directorio temporal y lo publica al terminar."""
+        destino = self._ruta(manifiesto.nombre)
+        parcial = destino + SUFIJO_PARCIAL
+        shutil.rmtree(parcial, ignore_errors=True)
+        os.makedirs(parcial)
+
+        try:
+            async for documentos, embeddings in lotes:
+                if not documentos:
+                    continue
+                vectores = np.ascontiguousarray(embeddings, dtype=np.float32)
+                if manifiesto.dimension == 0:
+                    manifiesto.dimension = vectores.shape[1]
+                elif vectores.shape[1] != manifiesto.dimension:
+                    raise ValueError("Todos los embeddings del snapshot deben tener la misma dimensión")
+
+                # Escritura fuera del event loop: la API sigue atendiendo peticiones
+                await self.ejecutor.ejecutar(
+                    self._escribir_parte, parcial, manifiesto.partes, documentos, vectores
+                )
+                manifiesto.partes += 1
+                manifiesto.total_documentos += len(documentos)
+
+            self._escribir_manifiesto(parcial, manifiesto)
+            self._publicar(parcial, destino)
+            return manifiesto
+
+        except ValueError as e:
+            shutil.rmtree(parcial, ignore_errors=True)
+            raise e
+        except Exception as e:
+            shutil.rmtree(parcial, ignore_errors=True)
+            raise Exception(f"Error al escribir el snapshot {manifiesto.nombre}: {str(e)}")
+
+    async def leer(self, nombre: str) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """Recorre las partes en orden; cada una se lee fuera del event loop."""
+        manifiesto = await self.obtener_manifiesto(nombre)
+        if manifiesto is None:
+            raise ValueError(f"No existe el snapshot {nombre}")
+
+        ruta = self._ruta(nombre)
+        for parte in range(manifiesto.partes):
+            try:
+                documentos, vectores = await self.ejecutor.ejecutar(self._leer_parte, ruta, parte)
+            except Exception as e:
+                raise Exception(f"Error al leer la parte {parte} del snapshot {nombre}: {str(e)}")
+            yield documentos, vectores
+
+    async def obtener_manifiesto(self, nombre: str) -> Optional[ManifiestoSnapshot]:
+        """Obtiene el manifiesto de un snapshot por su nombre."""
+        ruta = os.path.join(self._ruta(nombre), ARCHIVO_MANIFIESTO)
+        if not os.path.exists(ruta):
+            return None
+
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            return ManifiestoSnapshot(
+                nombre=datos["nombre"],
+                modelo_embeddings=datos["modelo_embeddings"],
+                dimension=datos["dimension"],
+                total_documentos=datos["total_documentos"],
+                partes=datos["partes"],
+                fecha_creacion=datetime.fromisoformat(datos["fecha_creacion"])
+            )
+
+        except Exception as e:
+            raise Exception(f"Error al leer el manifiesto del snapshot {nombre}: {str(e)}")
+
+    async def listar(self) -> List[ManifiestoSnapshot]:
+        """Lista los snapshots completos, del más reciente al más antiguo."""
+        manifiestos = []
+        for nombre in sorted(os.listdir(self.directorio)):
+            if PATRON_NOMBRE.fullmatch(nombre) and not nombre.endswith((SUFIJO_PARCIAL, SUFIJO_ANTERIOR)):
+                manifiesto = await self.obtener_manifiesto(nombre)
+                if manifiesto is not None:
+                    manifiestos.append(manifiesto)
+        return sorted(manifiestos, key=lambda m: m.fecha_creacion, reverse=True)
+
+    def _ruta(self, nombre: str) -> str:
+        # El nombre llega desde la API: nada de rutas relativas ni separadores
+        if not PATRON_NOMBRE.fullmatch(nombre) or nombre.endswith((SUFIJO_PARCIAL, SUFIJO_ANTERIOR)):
+            raise ValueError(
+                "El nombre del snapshot solo admite letras, números, '.', '_' y '-' (hasta 100 caracteres)"
+            )
+        return os.path.join(self.directorio, nombre)
+
+    @staticmethod
+    def _escribir_parte(directorio: str, parte: int, documentos: List[Documento], vectores: np.ndarray):
+        base = os.path.join(directorio, f"parte_{parte:05d}")
+        np.save(base + ".npy", vectores)
+        with open(base + ".jsonl", "w", encoding="utf-8") as archivo:
+            for documento in documentos:
+                archivo.write(json.dumps({
+                    "id": documento.id,
+                    "titulo": documento.titulo,
+                    "contenido": documento.contenido,
+                    "tipo": documento.tipo,
+                    "fecha_creacion": documento.fecha_creacion.isoformat() if documento.fecha_creacion else None
+                }, ensure_ascii=False))
+                archivo.write("\n")
+
+    @staticmethod
+    def _leer_parte(directorio: str, parte: int) -> Tuple[List[Documento], np.ndarray]:
+        base = os.path.join(directorio, f"parte_{parte:05d}")
+        vectores = np.load(base + ".npy")
+        documentos = []
+        with open(base + ".jsonl", encoding="utf-8") as archivo:
+            for linea in archivo:
+                datos = json.loads(linea)
+                documentos.append(Documento(
+                    id=datos["id"],
+                    titulo=datos["titulo"],
+                    contenido=datos["contenido"],
+                    tipo=datos["tipo"],
+                    fecha_creacion=(
+                        datetime.fromisoformat(datos["fecha_creacion"]) if datos["fecha_creacion"] else None
+                    )
+                ))
+        if len(documentos) != len(vectores):
+            raise ValueError(f"La parte {parte} tiene {len(documentos)} documentos y {len(vectores)} embeddings")
+        return documentos, vectores
+
+    @staticmethod
+    def _escribir_manifiesto(directorio: str, manifiesto: ManifiestoSnapshot):
+        with open(os.path.join(directorio, ARCHIVO_MANIFIESTO), "w", encoding="utf-8") as archivo:
+            json.dump({
+                "version_formato": VERSION_FORMATO,
+                "nombre": manifiesto.nombre,
+                "modelo_embeddings": manifiesto.modelo_embeddings,
+                "dimension": manifiesto.dimension,
+                "total_documentos": manifiesto.total_documentos,
+                "partes": manifiesto.partes,
+                "fecha_creacion": manifiesto.fecha_creacion.isoformat()
+            }, archivo, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def _publicar(parcial: str, destino: str):
+        """Sustituye el snapshot anterior (si lo hay) por el recién escrito."""
+        anterior = destino + SUFIJO_ANTERIOR
+        shutil.rmtree(anterior, ignore_errors=True)
+        if os.path.exists(destino):
+            os.rename(destino, anterior)
+        os.rename(parcial, destino)
+        shutil.rmtree(anterior, ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,792 @@
+import asyncio
+import glob
+import os
+import re
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import create_engine, text, Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from ...domain.entities.documento import Documento
+from ...domain.entities.parametros_indice import ParametrosIndice, ESPACIO_COSENO
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.services.embedding_service import EmbeddingService, Vector, MatrizVectores
+from ..workers.ejecutor import Ejecutor
+
+
+# Definir modelo SQLAlchemy
+Base = declarative_base()
+
+class VectorDocumentoModel(Base):
+    __tablename__ = "vectores_documentos"
+
+    fila = Column(Integer, primary_key=True)  # fila del documento en la matriz de embeddings
+    id = Column(String, nullable=False, index=True)
+    titulo = Column(String, nullable=False)
+    contenido = Column(Text, nullable=False)
+    tipo = Column(String, nullable=False)
+    fecha_creacion = Column(DateTime, default=datetime.now)
+    eliminado = Column(Boolean, nullable=False, default=False)
+
+
+# La matriz "vectores" guarda siempre los embeddings en float32; con float16
+# o int8 se busca sobre una copia compacta y solo se releen en float32 los
+# mejores candidatos
+TIPO_COMPLETO = "float32"
+TIPOS_VECTOR = (TIPO_COMPLETO, "float16", "int8")
+CAPACIDAD_INICIAL = 1024
+# Filas por bloque en la búsqueda: acota la memoria temporal de cada producto
+TAMANO_BLOQUE_BUSQUEDA = 65536
+TAMANO_BLOQUE_CONVERSION = 1024
+# Candidatos por resultado que se reevalúan con los vectores completos
+FACTOR_REEVALUACION = 4
+SUFIJO_PARCIAL = ".parcial"
+
+
+class NumpyDocumentoRepository(DocumentoRepository):
+    """
+    Repositorio con búsqueda exacta por fuerza bruta sobre NumPy.
+
+    Los embeddings normalizados se guardan en una matriz contigua mapeada en
+    memoria (`vectores_<capacidad>.npy`) y los documentos en SQLite, con la
+    fila de la matriz como clave. Buscar es un producto matriz-vector más un
+    `argpartition`, lo que para colecciones de hasta unos cientos de miles
+    de fragmentos es más rápido que recorrer un grafo HNSW y da resultados
+    exactos.
+
+    Con `tipo_vector` float16 o int8 (cuantización escalar con una escala por
+    vector) el recorrido se hace sobre una copia compacta de la matriz, de
+    2 o 4 veces menos memoria, y los `limite * factor_reevaluacion` mejores
+    candidatos se puntúan de nuevo con los vectores float32, que se quedan
+    en disco salvo esas filas.
+
+    Las inserciones se añaden al final de la matriz y los borrados solo
+    marcan la fila como eliminada; `reconstruir_indice()` compacta ambas.
+    Los recorridos y escrituras de las matrices y todas las consultas a
+    SQLite se ejecutan en los hilos de `ejecutor`; en el event loop solo se
+    actualiza el mapa de filas en memoria.
+    """
+
+    def __init__(
+        self,
+        embedding_service: EmbeddingService,
+        directorio: str = "indice_numpy",
+        tipo_vector: str = TIPO_COMPLETO,
+        factor_reevaluacion: int = FACTOR_REEVALUACION,
+        ejecutor: Optional[Ejecutor] = None
+    ):
+        if tipo_vector not in TIPOS_VECTOR:
+            raise ValueError(f'El tipo de vector debe ser uno de: {", ".join(TIPOS_VECTOR)}')
+        if factor_reevaluacion < 1:
+            raise ValueError("El factor de reevaluación debe ser al menos 1")
+
+        self.embedding_service = embedding_service
+        self.directorio = directorio
+        self.tipo_vector = tipo_vector
+        self.factor_reevaluacion = factor_reevaluacion
+        self.ejecutor = ejecutor or Ejecutor("numpy", hilos=4)
+        self._escritura = asyncio.Lock()
+        os.makedirs(directorio, exist_ok=True)
+
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(directorio, 'documentos.db')}",
+            connect_args={"check_same_thread": False}
+        )
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        # Crear tablas si no existen
+        Base.metadata.create_all(bind=self.engine)
+
+        self._cargar()
+
+    def _get_session(self) -> Session:
+        """Obtiene una sesión de base de datos."""
+        return self.SessionLocal()
+
+    async def obtener_por_id(self, documento_id: str) -> Optional[Documento]:
+        """Obtiene un documento por su ID."""
+        def _consultar() -> Optional[Documento]:
+            with self._get_session() as db:
+                documento_model = db.query(VectorDocumentoModel).filter(
+                    VectorDocumentoModel.id == documento_id,
+                    VectorDocumentoModel.eliminado == False
+                ).first()
+
+                if documento_model is None:
+                    return None
+
+                return self._convertir_a_documento(documento_model)
+
+        try:
+            return await self.ejecutor.ejecutar(_consultar)
+
+        except Exception as e:
+            raise Exception(f"Error al obtener documento {documento_id}: {str(e)}")
+
+    async def obtener_todos(self) -> List[Documento]:
+        """Obtiene todos los documentos almacenados."""
+        def _consultar() -> List[Documento]:
+            with self._get_session() as db:
+                documentos = db.query(VectorDocumentoModel).filter(
+                    VectorDocumentoModel.eliminado == False
+                ).order_by(VectorDocumentoModel.fila).all()
+
+                return [self._convertir_a_documento(d) for d in documentos]
+
+        try:
+            return await self.ejecutor.ejecutar(_consultar)
+
+        except Exception as e:
+            raise Exception(f"Error al obtener todos los documentos: {str(e)}")
+
+    async def guardar(self, documento: Documento) -> str:
+        """Guarda un documento y retorna su ID."""
+        ids = await self.guardar_batch([documento])
+        return ids[0]
+
+    async def guardar_batch(self, documentos: List[Documento]) -> List[str]:
+        """Añade los documentos al final de la matriz; los IDs repetidos reemplazan al anterior."""
+        if not documentos:
+            return []
+
+        try:
+            embeddings = await self.embedding_service.generar_embeddings_batch(
+                [documento.contenido for documento in documentos]
+            )
+            return await self.guardar_con_embeddings(documentos, embeddings)
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al guardar documentos: {str(e)}")
+
+    async def guardar_con_embeddings(
+        self,
+        documentos: List[Documento],
+        embeddings: MatrizVectores
+    ) -> List[str]:
+        """Guarda documentos con embeddings ya calculados."""
+        if not documentos:
+            return []
+
+        try:
+            vectores = self._normalizar(embeddings)
+
+            # Una escritura a la vez: crecer o compactar copia las matrices en
+            # otro hilo, y no deben cambiar mientras tanto
+            async with self._escritura:
+                await self._asegurar_capacidad(len(documentos))
+                inicio = self._n
+                ids_nuevos = [documento.id for documento in documentos]
+                filas_reemplazadas = [
+                    self._fila_por_id[documento_id]
+                    for documento_id in set(ids_nuevos)
+                    if documento_id in self._fila_por_id
+                ]
+                # Las búsquedas no ven las filas nuevas (más allá de n) ni los
+                # reemplazos hasta actualizar el mapa al volver del ejecutor
+                await self.ejecutor.ejecutar(
+                    self._anexar, documentos, vectores, inicio, filas_reemplazadas
+                )
+                self._registrar_anexados(ids_nuevos, inicio, filas_reemplazadas)
+                return ids_nuevos
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al guardar documentos: {str(e)}")
+
+    def _anexar(
+        self,
+        documentos: List[Documento],
+        vectores: np.ndarray,
+        inicio: int,
+        filas_reemplazadas: List[int]
+    ):
+        """Escribe los vectores a partir de la fila `inicio` y confirma los documentos en SQLite."""
+        # Primero los vectores: si el proceso cae antes de confirmar en
+        # SQLite, las filas quedan sin usar y se sobrescriben después
+        self._escribir_vectores(self._matrices, inicio, vectores)
+
+        ids_nuevos = [documento.id for documento in documentos]
+        with self._get_session() as db:
+            if filas_reemplazadas:
+                db.query(VectorDocumentoModel).filter(
+                    VectorDocumentoModel.fila.in_(filas_reemplazadas)
+                ).update({VectorDocumentoModel.eliminado: True}, synchronize_session=False)
+
+            db.add_all([
+                VectorDocumentoModel(
+                    fila=inicio + i,
+                    id=documento.id,
+                    titulo=documento.titulo,
+                    contenido=documento.contenido,
+                    tipo=documento.tipo,
+                    fecha_creacion=documento.fecha_creacion,
+                    # Si el ID se repite dentro del lote, vale el último
+                    eliminado=documento.id in ids_nuevos[i + 1:]
+                )
+                for i, documento in enumerate(documentos)
+            ])
+            db.commit()
+
+    def _registrar_anexados(self, ids_nuevos: List[str], inicio: int, filas_reemplazadas: List[int]):
+        """Publica en el mapa de filas en memoria un lote ya escrito por `_anexar`."""
+        for fila in filas_reemplazadas:
+            self._vivos[fila] = False
+        for i, documento_id in enumerate(ids_nuevos):
+            fila = inicio + i
+            anterior = self._fila_por_id.get(documento_id)
+            if anterior is not None and anterior >= inicio:
+                self._vivos[anterior] = False
+            self._ids.append(documento_id)
+            self._fila_por_id[documento_id] = fila
+            self._vivos[fila] = True
+        self._n = inicio + len(ids_nuevos)
+
+    async def iterar_con_embeddings(
+        self,
+        tamano_lote: int = 1000
+    ) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """Recorre los documentos vivos en orden de fila con sus vectores (normalizados)."""
+        def _leer_lote(ultima_fila: int) -> Tuple[List[Documento], List[int], np.ndarray]:
+            with self._get_session() as db:
+                modelos = db.query(VectorDocumentoModel).filter(
+                    VectorDocumentoModel.fila > ultima_fila,
+                    VectorDocumentoModel.eliminado == False
+                ).order_by(VectorDocumentoModel.fila).limit(tamano_lote).all()
+                documentos = [self._convertir_a_documento(modelo) for modelo in modelos]
+                filas = [modelo.fila for modelo in modelos]
+            return documentos, filas, np.array(self._matrices["vectores"][filas], dtype=np.float32)
+
+        ultima_fila = -1
+        while True:
+            try:
+                # Una compactación renumera las filas en SQLite antes de pasar a
+                # las matrices nuevas: la consulta y la lectura no pueden quedar
+                # a ambos lados
+                async with self._escritura:
+                    documentos, filas, vectores = await self.ejecutor.ejecutar(_leer_lote, ultima_fila)
+            except Exception as e:
+                raise Exception(f"Error al leer documentos con embeddings: {str(e)}")
+
+            if not documentos:
+                return
+
+            yield documentos, vectores
+            ultima_fila = filas[-1]
+
+    async def obtener_embeddings(self, documento_ids: List[str]) -> Dict[str, Vector]:
+        """Vectores (normalizados) de los documentos indicados."""
+        try:
+            encontrados = [
+                (documento_id, self._fila_por_id[documento_id])
+                for documento_id in documento_ids if documento_id in self._fila_por_id
+            ]
+            if not encontrados:
+                return {}
+            # La lectura de filas sueltas de la matriz puede ir al disco
+            matriz, filas = self._matrices["vectores"], [fila for _, fila in encontrados]
+            vectores = await self.ejecutor.ejecutar(lambda: np.array(matriz[filas], dtype=np.float32))
+            return {documento_id: vector for (documento_id, _), vector in zip(encontrados, vectores)}
+
+        except Exception as e:
+            raise Exception(f"Error al obtener embeddings: {str(e)}")
+
+    async def eliminar(self, documento_id: str) -> bool:
+        """Marca el documento como eliminado; su fila se libera al compactar."""
+        try:
+            async with self._escritura:
+                fila = self._fila_por_id.get(documento_id)
+                if fila is None:
+                    return False
+
+                def _marcar():
+                    with self._get_session() as db:
+                        db.query(VectorDocumentoModel).filter(
+                            VectorDocumentoModel.fila == fila
+                        ).update({VectorDocumentoModel.eliminado: True}, synchronize_session=False)
+                        db.commit()
+
+                await self.ejecutor.ejecutar(_marcar)
+                self._vivos[fila] = False
+                del self._fila_por_id[documento_id]
+                return True
+
+        except Exception as e:
+            raise Exception(f"Error al eliminar documento {documento_id}: {str(e)}")
+
+    async def buscar_por_similitud(
+        self,
+        embedding: Vector,
+        limite: int = 5
+    ) -> List[Documento]:
+        """Busca documentos similares basándose en un embedding."""
+        resultados = await self.buscar_por_similitud_batch(embedding.reshape(1, -1), limite)
+        return resultados[0]
+
+    async def buscar_por_similitud_batch(
+        self,
+        embeddings: MatrizVectores,
+        limite: int = 5
+    ) -> List[List[Documento]]:
+        """Busca los `limite` documentos más similares (coseno exacto) para cada embedding."""
+        if len(embeddings) == 0:
+            return []
+
+        try:
+            consultas = self._normalizar(embeddings)
+
+            # Instantánea del estado: las escrituras posteriores no la alteran
+            # (añaden filas más allá de n o sustituyen las matrices y la lista de IDs)
+            matrices, n, ids = self._matrices, self._n, self._ids
+            vivos = self._vivos[:n].copy()
+
+            # NumPy libera el GIL en el producto: se calcula fuera del event loop
+            mejores = await self.ejecutor.ejecutar(
+                _buscar,
+                matrices["vectores"],
+                matrices.get(f"vectores_{self.tipo_vector}"),
+                matrices.get(f"escalas_{self.tipo_vector}"),
+                n,
+                vivos,
+                consultas,
+                limite,
+                self.factor_reevaluacion
+            )
+
+            return await self.ejecutor.ejecutar(self._cargar_resultados, mejores, ids)
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error en búsqueda por similitud: {str(e)}")
+
+    async def contar_documentos(self) -> int:
+        """Cuenta el número total de documentos."""
+        return len(self._fila_por_id)
+
+    def obtener_bytes_por_vector(self) -> int:
+        """Bytes por vector de las matrices que recorre cada búsqueda (las que ocupan memoria)."""
+        dimension = self._matrices["vectores"].shape[1]
+        if self.tipo_vector == "int8":
+            return dimension + np.dtype(np.float32).itemsize  # int8 más la escala
+        return dimension * np.dtype(self.tipo_vector).itemsize
+
+    async def reconstruir_indice(
+        self,
+        parametros: ParametrosIndice,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Compacta la matriz descartando las filas eliminadas.
+
+        La búsqueda es exacta, así que los parámetros HNSW no aplican; solo se
+        admite el espacio coseno.
+        """
+        if parametros.espacio != ESPACIO_COSENO:
+            raise ValueError("El motor numpy solo admite similitud coseno")
+
+        try:
+            progreso_hilo = None
+            if progreso is not None:
+                # La copia avisa desde el hilo del ejecutor
+                loop = asyncio.get_running_loop()
+
+                def progreso_hilo(copiados: int, total: int):
+                    loop.call_soon_threadsafe(progreso, copiados, total)
+
+            # Las búsquedas siguen sobre las matrices actuales mientras se copia
+            async with self._escritura:
+                filas_vivas = np.flatnonzero(self._vivos[:self._n])
+                total = len(filas_vivas)
+
+                nuevas = await self.ejecutor.ejecutar(
+                    self._copiar_matrices, max(CAPACIDAD_INICIAL, total), filas_vivas, progreso_hilo
+                )
+                filas = await self.ejecutor.ejecutar(self._renumerar, filas_vivas)
+                # Sin await entre ambos: matrices y mapa de filas cambian a la vez
+                self._sustituir_matrices(nuevas)
+                self._aplicar_estado(filas)
+            return total
+
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al compactar el índice: {str(e)}")
+
+    def _cargar(self):
+        """Abre las matrices existentes (o las crea vacías) y carga el mapa de IDs."""
+        # Restos de un crecimiento o una compactación interrumpidos
+        for archivo in glob.glob(os.path.join(self.directorio, f"*{SUFIJO_PARCIAL}")):
+            self._eliminar_archivo(archivo)
+
+        completas = sorted(
+            (
+                ruta for ruta in glob.glob(os.path.join(self.directorio, "vectores_*.npy"))
+                if self._capacidad_de_archivo(ruta) is not None
+            ),
+            key=self._capacidad_de_archivo
+        )
+
+        if completas:
+            capacidad = self._capacidad_de_archivo(completas[-1])
+            self._matrices = {
+                "vectores": np.lib.format.open_memmap(completas[-1], mode="r+")
+            }
+        else:
+            capacidad = CAPACIDAD_INICIAL
+            self._matrices = self._publicar_matrices(self._crear_matrices(
+                capacidad,
+                self.embedding_service.obtener_dimension_embedding(),
+                ["vectores"]
+            ))
+
+        self._cargar_estado()
+
+        # La copia compacta se regenera desde la matriz completa si falta
+        # (primer arranque con este tipo de vector o crecimiento interrumpido)
+        nombres_compactos = [nombre for nombre in self._especificaciones(0) if nombre != "vectores"]
+        if all(os.path.exists(self._ruta(nombre, capacidad)) for nombre in nombres_compactos):
+            for nombre in nombres_compactos:
+                self._matrices[nombre] = np.lib.format.open_memmap(
+                    self._ruta(nombre, capacidad), mode="r+"
+                )
+        elif nombres_compactos:
+            compactas = self._crear_matrices(capacidad, self._dimension(), nombres_compactos)
+            for inicio in range(0, self._n, TAMANO_BLOQUE_BUSQUEDA):
+                fin = min(inicio + TAMANO_BLOQUE_BUSQUEDA, self._n)
+                vectores = np.asarray(self._matrices["vectores"][inicio:fin])
+                self._escribir_vectores(compactas, inicio, vectores, solo_compactas=True)
+            self._matrices.update(self._publicar_matrices(compactas))
+
+        # Archivos de otras capacidades o de otros tipos de vector
+        vigentes = {self._ruta(nombre, capacidad) for nombre in self._matrices}
+        for archivo in glob.glob(os.path.join(self.directorio, "*.npy")):
+            if archivo not in vigentes:
+                self._eliminar_archivo(archivo)
+
+    def _cargar_estado(self):
+        """Reconstruye en memoria el mapa fila → ID y la máscara de filas vivas."""
+        self._aplicar_estado(self._leer_filas())
+
+    def _leer_filas(self) -> list:
+        with self._get_session() as db:
+            return db.query(
+                VectorDocumentoModel.fila,
+                VectorDocumentoModel.id,
+                VectorDocumentoModel.eliminado
+            ).order_by(VectorDocumentoModel.fila).all()
+
+    def _aplicar_estado(self, filas: list):
+        self._n = filas[-1].fila + 1 if filas else 0
+        self._ids: List[Optional[str]] = [None] * self._n
+        self._fila_por_id: Dict[str, int] = {}
+        self._vivos = np.zeros(self._matrices["vectores"].shape[0], dtype=bool)
+
+        for fila, documento_id, eliminado in filas:
+            self._ids[fila] = documento_id
+            if not eliminado:
+                self._fila_por_id[documento_id] = fila
+                self._vivos[fila] = True
+
+    async def _asegurar_capacidad(self, adicionales: int):
+        """Duplica las matrices (en archivos nuevos, fuera del event loop) si no caben `adicionales` filas más."""
+        capacidad = self._matrices["vectores"].shape[0]
+        if self._n + adicionales <= capacidad:
+            return
+
+        vivos = np.zeros(max(capacidad * 2, self._n + adicionales), dtype=bool)
+        vivos[:self._n] = self._vivos[:self._n]
+        self._sustituir_matrices(
+            await self.ejecutor.ejecutar(self._copiar_matrices, len(vivos), np.arange(self._n))
+        )
+        self._vivos = vivos
+
+    def _copiar_matrices(
+        self,
+        capacidad: int,
+        filas: np.ndarray,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, np.memmap]:
+        """Copia las `filas` indicadas a matrices nuevas de `capacidad` filas, ya publicadas en disco."""
+        nuevas = self._crear_matrices(capacidad, self._dimension(), list(self._matrices))
+
+        for inicio in range(0, len(filas), TAMANO_BLOQUE_BUSQUEDA):
+            bloque = filas[inicio:inicio + TAMANO_BLOQUE_BUSQUEDA]
+            for nombre, matriz in nuevas.items():
+                matriz[inicio:inicio + len(bloque)] = self._matrices[nombre][bloque]
+            if progreso is not None:
+                progreso(inicio + len(bloque), len(filas))
+
+        return self._publicar_matrices(nuevas)
+
+    def _sustituir_matrices(self, nuevas: Dict[str, np.memmap]):
+        """Pasa a usar las matrices nuevas y borra los archivos de las anteriores."""
+        anteriores = {self._ruta(nombre, self._matrices["vectores"].shape[0]) for nombre in self._matrices}
+        capacidad = nuevas["vectores"].shape[0]
+        # Se sustituye el diccionario, no se modifica: las búsquedas en curso
+        # conservan su referencia a las matrices anteriores
+        self._matrices = nuevas
+        for ruta in anteriores - {self._ruta(nombre, capacidad) for nombre in nuevas}:
+            self._eliminar_archivo(ruta)
+
+    def _renumerar(self, filas_vivas: np.ndarray) -> list:
+        """
+        Borra los documentos eliminados y numera los vivos de forma consecutiva,
+        con una tabla temporal antigua → nueva y dos UPDATE en bloque.
+        Retorna el estado resultante (como `_leer_filas`).
+        """
+        tabla = VectorDocumentoModel.__tablename__
+        cambios = [
+            {"antigua": fila_antigua, "nueva": fila_nueva}
+            for fila_nueva, fila_antigua in enumerate(filas_vivas.tolist())
+            if fila_nueva != fila_antigua
+        ]
+        with self._get_session() as db:
+            db.query(VectorDocumentoModel).filter(
+                VectorDocumentoModel.eliminado == True
+            ).delete(synchronize_session=False)
+            if cambios:
+                db.execute(text("DROP TABLE IF EXISTS renumeracion"))
+                db.execute(text(
+                    "CREATE TEMP TABLE renumeracion (antigua INTEGER PRIMARY KEY, nueva INTEGER NOT NULL)"
+                ))
+                db.execute(text("INSERT INTO renumeracion (antigua, nueva) VALUES (:antigua, :nueva)"), cambios)
+                # Primero a negativos y luego de vuelta: la fila es la clave
+                # primaria y una fila nueva puede coincidir con una antigua aún
+                # sin renumerar
+                db.execute(text(
+                    f"UPDATE {tabla} SET fila = -1 - "
+                    f"(SELECT nueva FROM renumeracion WHERE antigua = {tabla}.fila) "
+                    "WHERE fila IN (SELECT antigua FROM renumeracion)"
+                ))
+                db.execute(text(f"UPDATE {tabla} SET fila = -1 - fila WHERE fila < 0"))
+                db.execute(text("DROP TABLE renumeracion"))
+            db.commit()
+        return self._leer_filas()
+
+    def _especificaciones(self, dimension: int) -> Dict[str, Tuple[np.dtype, tuple]]:
+        """Tipo y forma de cada fila de las matrices que usa el tipo de vector configurado."""
+        especificaciones = {"vectores": (np.float32, (dimension,))}
+        if self.tipo_vector == "float16":
+            especificaciones["vectores_float16"] = (np.float16, (dimension,))
+        elif self.tipo_vector == "int8":
+            especificaciones["vectores_int8"] = (np.int8, (dimension,))
+            especificaciones["escalas_int8"] = (np.float32, ())
+        return especificaciones
+
+    def _crear_matrices(self, capacidad: int, dimension: int, nombres: List[str]) -> Dict[str, np.memmap]:
+        """Crea las matrices en archivos `.parcial` que `_publicar_matrices` renombra."""
+        especificaciones = self._especificaciones(dimension)
+        return {
+            nombre: np.lib.format.open_memmap(
+                self._ruta(nombre, capacidad) + SUFIJO_PARCIAL,
+                mode="w+",
+                dtype=especificaciones[nombre][0],
+                shape=(capacidad, *especificaciones[nombre][1])
+            )
+            for nombre in nombres
+        }
+
+    def _publicar_matrices(self, matrices: Dict[str, np.memmap]) -> Dict[str, np.memmap]:
+        """Vuelca a disco y renombra; la matriz completa se renombra la última."""
+        capacidad = matrices[next(iter(matrices))].shape[0]
+        for nombre in sorted(matrices, key=lambda nombre: nombre == "vectores"):
+            matrices[nombre].flush()
+            ruta = self._ruta(nombre, capacidad)
+            os.replace(ruta + SUFIJO_PARCIAL, ruta)
+        return dict(matrices)
+
+    def _escribir_vectores(
+        self,
+        matrices: Dict[str, np.memmap],
+        inicio: int,
+        vectores: np.ndarray,
+        solo_compactas: bool = False
+    ):
+        """Escribe `vectores` (float32 normalizados) en todas las matrices a partir de `inicio`."""
+        fin = inicio + len(vectores)
+        valores = {} if solo_compactas else {"vectores": vectores}
+        if self.tipo_vector == "float16":
+            valores["vectores_float16"] = vectores.astype(np.float16)
+        elif self.tipo_vector == "int8":
+            # Cuantización simétrica por vector: v ≈ escala * q, con q en [-127, 127]
+            escalas = np.abs(vectores).max(axis=1) / 127
+            escalas[escalas == 0] = 1
+            valores["vectores_int8"] = np.rint(vectores / escalas[:, None]).astype(np.int8)
+            valores["escalas_int8"] = escalas.astype(np.float32)
+
+        for nombre, valor in valores.items():
+            matrices[nombre][inicio:fin] = valor
+            matrices[nombre].flush()
+
+    def _ruta(self, nombre: str, capacidad: int) -> str:
+        return os.path.join(self.directorio, f"{nombre}_{capacidad}.npy")
+
+    def _dimension(self) -> int:
+        return self._matrices["vectores"].shape[1]
+
+    def _normalizar(self, embeddings: MatrizVectores) -> np.ndarray:
+        """Convierte a float32 y normaliza a norma 1 (el producto pasa a ser el coseno)."""
+        vectores = np.asarray(embeddings, dtype=np.float32)
+        if vectores.ndim != 2 or vectores.shape[1] != self._dimension():
+            raise ValueError(f"Los embeddings deben tener dimensión {self._dimension()}")
+        normas = np.linalg.norm(vectores, axis=1, keepdims=True)
+        return vectores / np.where(normas == 0, 1, normas)
+
+    def _cargar_resultados(
+        self,
+        mejores: List[Tuple[np.ndarray, np.ndarray]],
+        ids: List[Optional[str]]
+    ) -> List[List[Documento]]:
+        """Carga de SQLite los documentos de las filas encontradas, por ID."""
+        ids_buscados = {ids[fila] for filas, _ in mejores for fila in filas.tolist()}
+        if not ids_buscados:
+            return [[] for _ in mejores]
+
+        with self._get_session() as db:
+            # Consulta por columnas: evita el coste de construir objetos del ORM
+            modelos = db.query(
+                VectorDocumentoModel.id,
+                VectorDocumentoModel.titulo,
+                VectorDocumentoModel.contenido,
+                VectorDocumentoModel.tipo,
+                VectorDocumentoModel.fecha_creacion
+            ).filter(
+                VectorDocumentoModel.id.in_(ids_buscados),
+                VectorDocumentoModel.eliminado == False
+            ).all()
+            por_id = {modelo.id: modelo for modelo in modelos}
+
+            documentos_por_consulta = []
+            for filas, puntuaciones in mejores:
+                documentos = []
+                for fila, puntuacion in zip(filas.tolist(), puntuaciones.tolist()):
+                    modelo = por_id.get(ids[fila])
+                    # Eliminado mientras se buscaba
+                    if modelo is not None:
+                        documentos.append(self._convertir_a_documento(modelo, puntuacion))
+                documentos_por_consulta.append(documentos)
+
+        return documentos_por_consulta
+
+    def _convertir_a_documento(
+        self,
+        documento_model: VectorDocumentoModel,
+        similitud: Optional[float] = None
+    ) -> Documento:
+        """Convierte un modelo SQLAlchemy a entidad de dominio."""
+        return Documento(
+            id=documento_model.id,
+            titulo=documento_model.titulo,
+            contenido=documento_model.contenido,
+            tipo=documento_model.tipo,
+            fecha_creacion=documento_model.fecha_creacion,
+            similitud=similitud
+        )
+
+    @staticmethod
+    def _capacidad_de_archivo(ruta: str) -> Optional[int]:
+        """Capacidad de un archivo de la matriz completa; None para los demás."""
+        coincidencia = re.fullmatch(r"vectores_(\d+)\.npy", os.path.basename(ruta))
+        return int(coincidencia.group(1)) if coincidencia else None
+
+    @staticmethod
+    def _eliminar_archivo(ruta: str):
+        try:
+            os.remove(ruta)
+        except OSError:
+            # En Windows no se puede borrar un archivo mapeado; se limpia al reabrir
+            pass
+
+
+def _buscar(
+    completa: np.ndarray,
+    compacta: Optional[np.ndarray],
+    escalas: Optional[np.ndarray],
+    n: int,
+    vivos: np.ndarray,
+    consultas: np.ndarray,
+    limite: int,
+    factor_reevaluacion: int
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Top-k sobre la matriz completa o, si hay copia compacta, preselección
+    sobre ella y reevaluación de los candidatos con los vectores completos.
+    """
+    if compacta is None:
+        return _buscar_top_k(completa, None, n, vivos, consultas, limite)
+
+    candidatos = _buscar_top_k(compacta, escalas, n, vivos, consultas, limite * factor_reevaluacion)
+
+    resultados = []
+    for consulta, (filas, _) in zip(consultas, candidatos):
+        # Filas en orden para que la lectura del disco sea lo más secuencial posible
+        filas = np.sort(filas)
+        puntuaciones = np.asarray(completa[filas], dtype=np.float32) @ consulta
+        orden = np.argsort(-puntuaciones)[:limite]
+        resultados.append((filas[orden], puntuaciones[orden]))
+    return resultados
+
+
+def _buscar_top_k(
+    matriz: np.ndarray,
+    escalas: Optional[np.ndarray],
+    n: int,
+    vivos: np.ndarray,
+    consultas: np.ndarray,
+    limite: int
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Top-k por producto interno, recorriendo la matriz por bloques.
+
+    Returns:
+        Por cada consulta, (filas, puntuaciones) ordenadas de mayor a menor
+    """
+    k = min(limite, int(vivos.sum()))
+    if k <= 0:
+        return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)) for _ in consultas]
+
+    mejores_puntuaciones = np.full((len(consultas), 0), -np.inf, dtype=np.float32)
+    mejores_filas = np.empty((len(consultas), 0), dtype=np.int64)
+
+    for inicio in range(0, n, TAMANO_BLOQUE_BUSQUEDA):
+        fin = min(inicio + TAMANO_BLOQUE_BUSQUEDA, n)
+        bloque = matriz[inicio:fin]
+        if bloque.dtype == np.float32:
+            puntuaciones = consultas @ bloque.T
+        else:
+            # float16 e int8 se convierten a float32 en trozos que caben en la
+            # caché: convertir el bloque entero cuesta más memoria y tiempo
+            puntuaciones = np.empty((len(consultas), fin - inicio), dtype=np.float32)
+            for desde in range(0, fin - inicio, TAMANO_BLOQUE_CONVERSION):
+                trozo = np.asarray(bloque[desde:desde + TAMANO_BLOQUE_CONVERSION], dtype=np.float32)
+                puntuaciones[:, desde:desde + len(trozo)] = consultas @ trozo.T
+        if escalas is not None:
+            puntuaciones *= escalas[inicio:fin]
+        vivos_bloque = vivos[inicio:fin]
+        if not vivos_bloque.all():
+            puntuaciones[:, ~vivos_bloque] = -np.inf
+
+        k_bloque = min(k, fin - inicio)
+        candidatos = np.argpartition(-puntuaciones, k_bloque - 1, axis=1)[:, :k_bloque]
+
+        mejores_puntuaciones = np.concatenate(
+            [mejores_puntuaciones, np.take_along_axis(puntuaciones, candidatos, axis=1)], axis=1
+        )
+        mejores_filas = np.concatenate([mejores_filas, candidatos + inicio], axis=1)
+
+        if mejores_puntuaciones.shape[1] > k:
+            seleccion = np.argpartition(-mejores_puntuaciones, k - 1, axis=1)[:, :k]
+            mejores_puntuaciones = np.take_along_axis(mejores_puntuaciones, seleccion, axis=1)
+            mejores_filas = np.take_along_axis(mejores_filas, seleccion, axis=1)
+
+    orden = np.argsort(-mejores_puntuaciones, axis=1)
+    resultados = []
+    for fila_consulta in range(len(consultas)):
+        puntuaciones = mejores_puntuaciones[fila_consulta, orden[fila_consulta]]
+        filas = mejores_filas[fila_consulta, orden[fila_consulta]]
+        validas = np.isfinite(puntuaciones)
+        resultados.append((filas[validas], puntuaciones[validas]))
+    return resultados
\ No newline at end of file
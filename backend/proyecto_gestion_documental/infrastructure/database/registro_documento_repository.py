@@ -0,0 +1,163 @@
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from ...domain.entities.documento import Documento
+from ...domain.entities.entrada_registro import EntradaRegistro, OPERACION_GUARDAR, OPERACION_ELIMINAR
+from ...domain.entities.parametros_indice import ParametrosIndice
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.repositories.registro_ingesta_repository import RegistroIngestaRepository
+from ...domain.services.embedding_service import EmbeddingService, Vector, MatrizVectores
+
+
+class RegistroDocumentoRepository(DocumentoRepository):
+    """
+    Repositorio que anota cada escritura en el registro de ingesta antes de
+    aplicarla al repositorio que envuelve (write-ahead log).
+
+    Una escritura solo llega al índice cuando su entrada es duradera, así
+    que el registro siempre contiene al menos lo que hay en el índice y
+    `ReplayIngestLogUseCase` puede reconstruirlo desde cero. Si el índice
+    falla después de registrar, la entrada queda en el registro: reproducirla
+    equivale al reintento que hará el cliente.
+
+    Con `embedding_service`, los embeddings se calculan aquí, se registran
+    con el documento y el repositorio envuelto los recibe ya calculados; así
+    la reconstrucción no vuelve a vectorizar. Sin él, el registro solo
+    guarda los textos (más compacto).
+    """
+
+    def __init__(
+        self,
+        repositorio: DocumentoRepository,
+        registro: RegistroIngestaRepository,
+        embedding_service: Optional[EmbeddingService] = None
+    ):
+        self.repositorio = repositorio
+        self.registro = registro
+        self.embedding_service = embedding_service
+
+    async def obtener_por_id(self, documento_id: str) -> Optional[Documento]:
+        """Obtiene un documento por su ID."""
+        return await self.repositorio.obtener_por_id(documento_id)
+
+    async def obtener_todos(self) -> List[Documento]:
+        """Obtiene todos los documentos almacenados."""
+        return await self.repositorio.obtener_todos()
+
+    async def guardar(self, documento: Documento) -> str:
+        """Registra el documento y lo guarda."""
+        if self.embedding_service is None:
+            await self._registrar_guardados([documento])
+            return await self.repositorio.guardar(documento)
+
+        ids = await self.guardar_batch([documento])
+        return ids[0]
+
+    async def guardar_batch(self, documentos: List[Documento]) -> List[str]:
+        """Registra los documentos (con sus embeddings, si se registran) y los guarda."""
+        if not documentos:
+            return []
+        if self.embedding_service is None:
+            await self._registrar_guardados(documentos)
+            return await self.repositorio.guardar_batch(documentos)
+
+        try:
+            embeddings = await self.embedding_service.generar_embeddings_batch(
+                [documento.contenido for documento in documentos]
+            )
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al guardar documentos: {str(e)}")
+        return await self.guardar_con_embeddings(documentos, embeddings)
+
+    async def guardar_con_embeddings(
+        self,
+        documentos: List[Documento],
+        embeddings: MatrizVectores
+    ) -> List[str]:
+        """Registra los documentos con sus embeddings ya calculados y los guarda."""
+        if not documentos:
+            return []
+        # El registro empareja cada documento con la fila de su misma posición
+        if len(embeddings) != len(documentos):
+            raise ValueError(f"Hay {len(documentos)} documentos y {len(embeddings)} embeddings")
+
+        await self._registrar_guardados(
+            documentos, embeddings if self.embedding_service is not None else None
+        )
+        try:
+            return await self.repositorio.guardar_con_embeddings(documentos, embeddings)
+        except NotImplementedError:
+            return await self.repositorio.guardar_batch(documentos)
+
+    def iterar_con_embeddings(
+        self,
+        tamano_lote: int = 1000
+    ) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """Recorre los documentos del repositorio envuelto con sus embeddings."""
+        return self.repositorio.iterar_con_embeddings(tamano_lote)
+
+    async def obtener_embeddings(self, documento_ids: List[str]) -> Dict[str, Vector]:
+        """Embeddings guardados en el repositorio envuelto."""
+        return await self.repositorio.obtener_embeddings(documento_ids)
+
+    async def eliminar(self, documento_id: str) -> bool:
+        """Registra el borrado y elimina el documento."""
+        await self._registrar([EntradaRegistro(operacion=OPERACION_ELIMINAR, documento_id=documento_id)])
+        return await self.repositorio.eliminar(documento_id)
+
+    async def buscar_por_similitud(
+        self,
+        embedding: Vector,
+        limite: int = 5
+    ) -> List[Documento]:
+        """Busca documentos similares basándose en un embedding."""
+        return await self.repositorio.buscar_por_similitud(embedding, limite)
+
+    async def buscar_por_similitud_batch(
+        self,
+        embeddings: MatrizVectores,
+        limite: int = 5
+    ) -> List[List[Documento]]:
+        """Busca documentos similares para varios embeddings a la vez."""
+        return await self.repositorio.buscar_por_similitud_batch(embeddings, limite)
+
+    async def contar_documentos(self) -> int:
+        """Cuenta el número total de documentos."""
+        return await self.repositorio.contar_documentos()
+
+    def obtener_parametros_indice(self) -> Optional[ParametrosIndice]:
+        """Parámetros del índice del repositorio envuelto."""
+        return self.repositorio.obtener_parametros_indice()
+
+    async def reconstruir_indice(
+        self,
+        parametros: ParametrosIndice,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """Reconstruye el índice; no cambia ningún documento, así que no se registra."""
+        return await self.repositorio.reconstruir_indice(parametros, progreso)
+
+    async def _registrar_guardados(
+        self,
+        documentos: List[Documento],
+        embeddings: Optional[MatrizVectores] = None
+    ):
+        modelo = self.embedding_service.obtener_modelo_usado() if embeddings is not None else None
+        await self._registrar([
+            EntradaRegistro(
+                operacion=OPERACION_GUARDAR,
+                documento_id=documento.id,
+                documento=documento,
+                embedding=embeddings[posicion] if embeddings is not None else None,
+                modelo_embeddings=modelo
+            )
+            for posicion, documento in enumerate(documentos)
+        ])
+
+    async def _registrar(self, entradas: List[EntradaRegistro]):
+        try:
+            await self.registro.anexar(entradas)
+        except ValueError as e:
+            raise e
+        except Exception as e:
+            raise Exception(f"Error al registrar la escritura: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,444 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+from itertools import islice
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple
+import numpy as np
+from ...domain.entities.documento import Documento
+from ...domain.entities.entrada_registro import EntradaRegistro, OPERACION_GUARDAR, OPERACION_ELIMINAR
+from ...domain.repositories.registro_ingesta_repository import RegistroIngestaRepository
+from ..workers.ejecutor import Ejecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+
+MAGIA_SEGMENTO = b"RAGWAL01"
+PREFIJO_SEGMENTO = "segmento_"
+SUFIJO_SEGMENTO = ".log"
+DIRECTORIO_CHECKPOINTS = "checkpoints"
+ARCHIVO_BLOQUEO = ".bloqueo"
+PATRON_CHECKPOINT = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,99}")
+
+# Cada entrada: prefijo (longitud y CRC32 del cuerpo) y cuerpo (secuencia,
+# operación, longitud del JSON comprimido, JSON y embedding)
+PREFIJO_ENTRADA = struct.Struct("<II")
+CABECERA_CUERPO = struct.Struct("<QBI")
+CODIGOS_OPERACION = {OPERACION_GUARDAR: 0, OPERACION_ELIMINAR: 1}
+OPERACIONES = {codigo: operacion for operacion, codigo in CODIGOS_OPERACION.items()}
+
+
+class SegmentosRegistroIngesta(RegistroIngestaRepository):
+    """
+    Registro de ingesta en archivos de segmento de tamaño acotado:
+
+        <directorio>/segmento_<primera secuencia>.log
+        <directorio>/checkpoints/<destino>.json
+
+    Cada segmento empieza con una cabecera (modelo de embeddings) y sigue
+    con entradas binarias: cabecera fija con CRC32, documento en JSON
+    comprimido con zlib y, si lo hay, el embedding en float32.
+
+    Un hilo escritor agrupa las entradas que llegan mientras se hace el
+    fsync anterior (group commit): cada `anexar` espera a su fsync, pero
+    con muchas escrituras concurrentes se hace un fsync por grupo y no por
+    entrada. Al abrirse para escribir, se descarta la cola incompleta que
+    pudiera dejar una caída y se empieza un segmento nuevo.
+
+    Leer no necesita el bloqueo de escritura: otro proceso (la herramienta
+    de reproducción) puede recorrer el registro mientras la API escribe.
+    Las lecturas, la recuperación al abrir y la espera al cerrar van a los
+    hilos de `ejecutor`.
+    """
+
+    def __init__(
+        self,
+        directorio: str = "registro_ingesta",
+        tamano_segmento: int = 64 * 1024 * 1024,
+        espera_fsync: float = 0.0,
+        nivel_compresion: int = 1,
+        ejecutor: Optional[Ejecutor] = None
+    ):
+        if tamano_segmento <= 0:
+            raise ValueError("El tamaño de segmento debe ser positivo")
+
+        self.directorio = directorio
+        self.tamano_segmento = tamano_segmento
+        # Espera opcional antes de cada fsync para agrupar más entradas
+        self.espera_fsync = espera_fsync
+        self.nivel_compresion = nivel_compresion
+        self.ejecutor = ejecutor or Ejecutor("registro", hilos=1)
+        os.makedirs(os.path.join(directorio, DIRECTORIO_CHECKPOINTS), exist_ok=True)
+
+        self._cola: "queue.Queue" = queue.Queue()
+        self._hilo: Optional[threading.Thread] = None
+        self._arranque = threading.Lock()
+        self._bloqueo: Optional[BinaryIO] = None
+        self._archivo: Optional[BinaryIO] = None
+        self._modelo_segmento: Optional[str] = None
+        self._secuencia = 0
+        self._secuencia_duradera = 0
+        self._fallo: Optional[Exception] = None
+
+    async def anexar(self, entradas: List[EntradaRegistro]) -> int:
+        """Anexa las entradas y espera a que el fsync de su grupo termine."""
+        if not entradas:
+            return await self.ultima_secuencia()
+        for entrada in entradas:
+            if entrada.operacion not in CODIGOS_OPERACION:
+                raise ValueError(f"Operación de registro desconocida: {entrada.operacion}")
+
+        await self.abrir()
+        futuro: concurrent.futures.Future = concurrent.futures.Future()
+        self._cola.put((entradas, futuro))
+        return await asyncio.wrap_future(futuro)
+
+    async def leer(self, desde: int = 0, tamano_lote: int = 1000) -> AsyncIterator[List[EntradaRegistro]]:
+        """Recorre las entradas posteriores a `desde`; la lectura de archivos va fuera del event loop."""
+        entradas = self._recorrer(desde)
+        while True:
+            try:
+                lote = await self.ejecutor.ejecutar(lambda: list(islice(entradas, tamano_lote)))
+            except ValueError as e:
+                raise e
+            except Exception as e:
+                raise Exception(f"Error al leer el registro de ingesta: {str(e)}")
+            if not lote:
+                return
+            yield lote
+
+    async def ultima_secuencia(self) -> int:
+        """Secuencia de la última entrada duradera."""
+        if self._hilo is not None:
+            return self._secuencia_duradera
+
+        segmentos = self._segmentos()
+        if not segmentos:
+            return 0
+        primera, ruta = segmentos[-1]
+        ultima = primera - 1
+        with open(ruta, "rb") as archivo:
+            if self._leer_cabecera_segmento(archivo, incompleta_permitida=True) is None:
+                return ultima
+            for _, secuencia, _, _, _ in self._entradas_validas(archivo):
+                ultima = secuencia
+        return ultima
+
+    async def guardar_checkpoint(self, nombre: str, secuencia: int):
+        """Escribe el checkpoint en un archivo temporal y lo sustituye de forma atómica."""
+        ruta = self._ruta_checkpoint(nombre)
+        temporal = ruta + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                json.dump({"secuencia": secuencia, "fecha": datetime.now().isoformat()}, archivo)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, ruta)
+
+        except Exception as e:
+            raise Exception(f"Error al guardar el checkpoint {nombre}: {str(e)}")
+
+    async def obtener_checkpoint(self, nombre: str) -> int:
+        """Secuencia aplicada al destino, o 0 si todavía no tiene checkpoint."""
+        ruta = self._ruta_checkpoint(nombre)
+        if not os.path.exists(ruta):
+            return 0
+
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                return int(json.load(archivo)["secuencia"])
+
+        except Exception as e:
+            raise Exception(f"Error al leer el checkpoint {nombre}: {str(e)}")
+
+    async def abrir(self):
+        """Toma el bloqueo de escritura, recupera el último segmento y arranca el hilo escritor."""
+        if self._hilo is None:
+            await self.ejecutor.ejecutar(self._iniciar_escritor)
+
+    async def cerrar(self):
+        """Espera a que se escriban las entradas pendientes y libera el registro."""
+        if self._hilo is None:
+            return
+        self._cola.put(None)
+        await self.ejecutor.ejecutar(self._hilo.join)
+        self._hilo = None
+
+    def _iniciar_escritor(self):
+        with self._arranque:
+            if self._hilo is not None:
+                return
+            self._abrir_para_escribir()
+            self._hilo = threading.Thread(
+                target=self._escribir_en_bucle, name="registro-ingesta", daemon=True
+            )
+            self._hilo.start()
+
+    def _abrir_para_escribir(self):
+        self._bloqueo = open(os.path.join(self.directorio, ARCHIVO_BLOQUEO), "wb")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._bloqueo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._bloqueo.close()
+                raise Exception(
+                    f"El registro {self.directorio} está en uso por otro proceso: "
+                    "cada proceso que escribe necesita su propio directorio"
+                )
+
+        segmentos = self._segmentos()
+        if segmentos:
+            primera, ruta = segmentos[-1]
+            self._secuencia = self._recuperar_segmento(primera, ruta)
+        self._secuencia_duradera = self._secuencia
+
+    def _recuperar_segmento(self, primera: int, ruta: str) -> int:
+        """Trunca la cola incompleta del último segmento y retorna su última secuencia."""
+        ultima = primera - 1
+        with open(ruta, "r+b") as archivo:
+            if self._leer_cabecera_segmento(archivo, incompleta_permitida=True) is None:
+                fin_valido = 0
+            else:
+                fin_valido = archivo.tell()
+            for _, secuencia, _, _, fin in self._entradas_validas(archivo):
+                ultima, fin_valido = secuencia, fin
+            archivo.truncate(fin_valido)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        if ultima < primera:
+            os.remove(ruta)
+        return ultima
+
+    def _escribir_en_bucle(self):
+        terminar = False
+        while not terminar:
+            grupo = [self._cola.get()]
+            if grupo[0] is None:
+                break
+            if self.espera_fsync > 0:
+                time.sleep(self.espera_fsync)
+            # Todo lo que llegó durante el fsync anterior va en el mismo grupo
+            while True:
+                try:
+                    pendiente = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if pendiente is None:
+                    terminar = True
+                    break
+                grupo.append(pendiente)
+            self._escribir_grupo(grupo)
+
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        if self._bloqueo is not None:
+            self._bloqueo.close()
+            self._bloqueo = None
+
+    def _escribir_grupo(self, grupo: List[Tuple[List[EntradaRegistro], concurrent.futures.Future]]):
+        if self._fallo is not None:
+            for _, futuro in grupo:
+                futuro.set_exception(self._fallo)
+            return
+
+        try:
+            ultimas = []
+            for entradas, _ in grupo:
+                for entrada in entradas:
+                    self._escribir_entrada(entrada)
+                ultimas.append(self._secuencia)
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+
+        except Exception as e:
+            # Tras un fsync fallido no se sabe qué llegó al disco: no se escribe
+            # nada más hasta reiniciar, que recorta la cola incompleta
+            self._fallo = Exception(f"Error al escribir en el registro de ingesta: {str(e)}")
+            for _, futuro in grupo:
+                futuro.set_exception(self._fallo)
+            return
+
+        self._secuencia_duradera = self._secuencia
+        for (_, futuro), ultima in zip(grupo, ultimas):
+            futuro.set_result(ultima)
+
+    def _escribir_entrada(self, entrada: EntradaRegistro):
+        modelo = entrada.modelo_embeddings if entrada.embedding is not None else None
+        necesita_segmento = (
+            self._archivo is None
+            or self._archivo.tell() >= self.tamano_segmento
+            or (modelo is not None and modelo != self._modelo_segmento)
+        )
+        if necesita_segmento:
+            self._abrir_segmento(modelo)
+
+        entrada.secuencia = self._secuencia + 1
+        self._archivo.write(self._serializar(entrada))
+        self._secuencia = entrada.secuencia
+
+    def _abrir_segmento(self, modelo: Optional[str]):
+        """Cierra el segmento actual (con fsync) y empieza uno nuevo."""
+        if self._archivo is not None:
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._archivo.close()
+            # Un segmento nuevo conserva el modelo mientras nadie anexe embeddings de otro
+            modelo = modelo or self._modelo_segmento
+
+        ruta = os.path.join(self.directorio, f"{PREFIJO_SEGMENTO}{self._secuencia + 1:016d}{SUFIJO_SEGMENTO}")
+        self._archivo = open(ruta, "wb")
+        cabecera = json.dumps({"modelo_embeddings": modelo, "fecha": datetime.now().isoformat()}).encode("utf-8")
+        self._archivo.write(MAGIA_SEGMENTO + struct.pack("<I", len(cabecera)) + cabecera)
+        self._modelo_segmento = modelo
+        self._sincronizar_directorio()
+
+    def _sincronizar_directorio(self):
+        # Sin fsync del directorio, el archivo recién creado podría no sobrevivir a una caída
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        descriptor = os.open(self.directorio, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def _serializar(self, entrada: EntradaRegistro) -> bytes:
+        datos = {"id": entrada.documento_id}
+        if entrada.documento is not None:
+            documento = entrada.documento
+            datos.update({
+                "titulo": documento.titulo,
+                "contenido": documento.contenido,
+                "tipo": documento.tipo,
+                "fecha_creacion": documento.fecha_creacion.isoformat() if documento.fecha_creacion else None
+            })
+        comprimido = zlib.compress(json.dumps(datos, ensure_ascii=False).encode("utf-8"), self.nivel_compresion)
+        vector = b""
+        if entrada.embedding is not None:
+            vector = np.ascontiguousarray(entrada.embedding, dtype=np.float32).tobytes()
+
+        cuerpo = CABECERA_CUERPO.pack(entrada.secuencia, CODIGOS_OPERACION[entrada.operacion], len(comprimido))
+        cuerpo += comprimido + vector
+        return PREFIJO_ENTRADA.pack(len(cuerpo), zlib.crc32(cuerpo)) + cuerpo
+
+    def _recorrer(self, desde: int) -> Iterator[EntradaRegistro]:
+        segmentos = self._segmentos()
+        for posicion, (primera, ruta) in enumerate(segmentos):
+            siguiente = segmentos[posicion + 1][0] if posicion + 1 < len(segmentos) else None
+            if siguiente is not None and siguiente - 1 <= desde:
+                continue
+            ultimo = siguiente is None
+
+            with open(ruta, "rb") as archivo:
+                cabecera = self._leer_cabecera_segmento(archivo, incompleta_permitida=ultimo)
+                if cabecera is None:
+                    return
+                esperada = primera
+                for operacion, secuencia, comprimido, vector, _ in self._entradas_validas(archivo):
+                    if secuencia != esperada:
+                        raise ValueError(f"Secuencia {secuencia} fuera de orden en {ruta} (se esperaba {esperada})")
+                    esperada += 1
+                    if secuencia > desde:
+                        yield self._deserializar(
+                            operacion, secuencia, comprimido, vector, cabecera["modelo_embeddings"]
+                        )
+
+                # Solo el último segmento puede acabar a medias (escritura en curso)
+                if not ultimo and (archivo.read(1) or esperada != siguiente):
+                    raise ValueError(f"El segmento {ruta} está dañado a partir de la secuencia {esperada}")
+
+    @staticmethod
+    def _entradas_validas(archivo: BinaryIO) -> Iterator[Tuple[int, int, bytes, bytes, int]]:
+        """Entradas hasta la primera incompleta o con CRC incorrecto: (operación, secuencia, JSON, vector, fin)."""
+        while True:
+            inicio = archivo.tell()
+            prefijo = archivo.read(PREFIJO_ENTRADA.size)
+            if len(prefijo) < PREFIJO_ENTRADA.size:
+                archivo.seek(inicio)
+                return
+            longitud, crc = PREFIJO_ENTRADA.unpack(prefijo)
+            cuerpo = archivo.read(longitud)
+            if len(cuerpo) < longitud or longitud < CABECERA_CUERPO.size or zlib.crc32(cuerpo) != crc:
+                archivo.seek(inicio)
+                return
+            secuencia, operacion, longitud_json = CABECERA_CUERPO.unpack_from(cuerpo)
+            resto = cuerpo[CABECERA_CUERPO.size:]
+            yield operacion, secuencia, resto[:longitud_json], resto[longitud_json:], archivo.tell()
+
+    @staticmethod
+    def _leer_cabecera_segmento(archivo: BinaryIO, incompleta_permitida: bool = False) -> Optional[dict]:
+        """
+        Lee la cabecera del segmento. Si una caída la dejó a medias (solo
+        puede pasar en el último segmento) retorna None.
+        """
+        magia = archivo.read(len(MAGIA_SEGMENTO))
+        longitud = archivo.read(4)
+        if magia == MAGIA_SEGMENTO and len(longitud) == 4:
+            datos = archivo.read(struct.unpack("<I", longitud)[0])
+            try:
+                return json.loads(datos.decode("utf-8"))
+            except ValueError:
+                pass
+        elif magia and not MAGIA_SEGMENTO.startswith(magia):
+            raise ValueError(f"{archivo.name} no es un segmento del registro de ingesta")
+
+        if incompleta_permitida:
+            return None
+        raise ValueError(f"La cabecera del segmento {archivo.name} está incompleta")
+
+    @staticmethod
+    def _deserializar(
+        operacion: int,
+        secuencia: int,
+        comprimido: bytes,
+        vector: bytes,
+        modelo: Optional[str]
+    ) -> EntradaRegistro:
+        datos = json.loads(zlib.decompress(comprimido).decode("utf-8"))
+        documento = None
+        if "contenido" in datos:
+            documento = Documento(
+                id=datos["id"],
+                titulo=datos["titulo"],
+                contenido=datos["contenido"],
+                tipo=datos["tipo"],
+                fecha_creacion=datetime.fromisoformat(datos["fecha_creacion"]) if datos["fecha_creacion"] else None
+            )
+        embedding = np.frombuffer(vector, dtype=np.float32) if vector else None
+        return EntradaRegistro(
+            operacion=OPERACIONES[operacion],
+            documento_id=datos["id"],
+            documento=documento,
+            embedding=embedding,
+            modelo_embeddings=modelo if embedding is not None else None,
+            secuencia=secuencia
+        )
+
+    def _segmentos(self) -> List[Tuple[int, str]]:
+        """Segmentos ordenados por su primera secuencia."""
+        segmentos = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.startswith(PREFIJO_SEGMENTO) and nombre.endswith(SUFIJO_SEGMENTO):
+                primera = nombre[len(PREFIJO_SEGMENTO):-len(SUFIJO_SEGMENTO)]
+                if primera.isdigit():
+                    segmentos.append((int(primera), os.path.join(self.directorio, nombre)))
+        return sorted(segmentos)
+
+    def _ruta_checkpoint(self, nombre: str) -> str:
+        if not PATRON_CHECKPOINT.fullmatch(nombre):
+            raise ValueError(
+                "El nombre del checkpoint solo admite letras, números, '.', '_' y '-' (hasta 100 caracteres)"
+            )
+        return os.path.join(self.directorio, DIRECTORIO_CHECKPOINTS, nombre + ".json")
\ No newline at end of file
@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import heapq
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Coroutine, Dict, List, Optional, Set, Tuple
+import numpy as np
+from ...domain.entities.documento import Documento
+from ...domain.entities.parametros_indice import ParametrosIndice
+from ...domain.repositories.documento_repository import DocumentoRepository
+from ...domain.services.embedding_service import Vector, MatrizVectores
+
+
+def shard_de_id(documento_id: str, numero_shards: int) -> int:
+    """
+    Shard al que pertenece un documento (jump consistent hash).
+
+    Al pasar de N a N+1 shards solo cambia de shard 1/(N+1) de los
+    documentos, y siempre hacia el shard nuevo.
+    """
+    clave = int.from_bytes(
+        hashlib.blake2b(documento_id.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+    cubeta, siguiente = -1, 0
+    while siguiente < numero_shards:
+        cubeta = siguiente
+        clave = (clave * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        siguiente = int((cubeta + 1) * (float(1 << 31) / float((clave >> 33) + 1)))
+    return cubeta
+
+
+class _HiloShard:
+    """Hilo con su propio event loop: las operaciones de un shard se ejecutan en él, en orden."""
+
+    def __init__(self, nombre: str):
+        self.loop = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self.loop.run_forever, name=nombre, daemon=True)
+        self._hilo.start()
+
+    def enviar(self, corrutina: Coroutine) -> asyncio.Future:
+        """Programa la corrutina en el hilo del shard y devuelve un future del loop actual."""
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(corrutina, self.loop))
+
+    def detener(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._hilo.join()
+        self.loop.close()
+
+
+class ShardedDocumentoRepository(DocumentoRepository):
+    """
+    Reparte los documentos entre varios repositorios (shards) por un hash del ID.
+
+    Cada shard atiende sus operaciones en un hilo propio, así que una
+    consulta se lanza a todos a la vez (scatter) y las listas top-k de cada
+    uno se mezclan por similitud (gather). Un shard puede ser una colección
+    local o un servidor Chroma en otro proceso (`chromadb.HttpClient`).
+
+    Al añadir shards, `rebalancear()` mueve con sus embeddings los documentos
+    que ahora pertenecen a otro shard, sin volver a vectorizar.
+    """
+
+    def __init__(self, shards: List[DocumentoRepository]):
+        if not shards:
+            raise ValueError("Se necesita al menos un shard")
+
+        self.shards = list(shards)
+        self._hilos = [_HiloShard(f"shard-{i}") for i in range(len(self.shards))]
+        # IDs escritos durante un rebalanceo: el rebalanceo no debe pisarlos
+        # con la copia antigua. None cuando no hay rebalanceo en curso
+        self._modificados: Optional[Set[str]] = None
+
+    def shard_de(self, documento_id: str) -> int:
+        """Índice del shard al que pertenece el documento."""
+        return shard_de_id(documento_id, len(self.shards))
+
+    def _enviar(self, indice: int, corrutina: Coroutine) -> asyncio.Future:
+        return self._hilos[indice].enviar(corrutina)
+
+    def _registrar_escritura(self, documento_ids: List[str]):
+        if self._modificados is not None:
+            self._modificados.update(documento_ids)
+
+    async def obtener_por_id(self, documento_id: str) -> Optional[Documento]:
+        """Obtiene un documento por su ID."""
+        indice = self.shard_de(documento_id)
+        documento = await self._enviar(indice, self.shards[indice].obtener_por_id(documento_id))
+        if documento is not None or self._modificados is None:
+            return documento
+
+        # Durante un rebalanceo puede seguir en su shard anterior
+        encontrados = await asyncio.gather(*(
+            self._enviar(i, shard.obtener_por_id(documento_id))
+            for i, shard in enumerate(self.shards) if i != indice
+        ))
+        return next((documento for documento in encontrados if documento is not None), None)
+
+    async def obtener_todos(self) -> List[Documento]:
+        """Obtiene todos los documentos almacenados."""
+        por_shard = await asyncio.gather(*(
+            self._enviar(i, shard.obtener_todos()) for i, shard in enumerate(self.shards)
+        ))
+        vistos = set()
+        documentos = []
+        for documento in (documento for lista in por_shard for documento in lista):
+            # Durante un rebalanceo un documento puede estar en dos shards
+            if documento.id not in vistos:
+                vistos.add(documento.id)
+                documentos.append(documento)
+        return documentos
+
+    async def guardar(self, documento: Documento) -> str:
+        """Guarda un documento en su shard y retorna su ID."""
+        self._registrar_escritura([documento.id])
+        indice = self.shard_de(documento.id)
+        return await self._enviar(indice, self.shards[indice].guardar(documento))
+
+    async def guardar_batch(self, documentos: List[Documento]) -> List[str]:
+        """Agrupa los documentos por shard y los guarda en todos a la vez."""
+        self._registrar_escritura([documento.id for documento in documentos])
+        await asyncio.gather(*(
+            self._enviar(indice, self.shards[indice].guardar_batch([documentos[p] for p in posiciones]))
+            for indice, posiciones in self._agrupar(documentos).items()
+        ))
+        return [documento.id for documento in documentos]
+
+    async def guardar_con_embeddings(
+        self,
+        documentos: List[Documento],
+        embeddings: MatrizVectores
+    ) -> List[str]:
+        """Guarda documentos con embeddings ya calculados, cada uno en su shard."""
+        self._registrar_escritura([documento.id for documento in documentos])
+        await asyncio.gather(*(
+            self._enviar(indice, self.shards[indice].guardar_con_embeddings(
+                [documentos[p] for p in posiciones], embeddings[posiciones]
+            ))
+            for indice, posiciones in self._agrupar(documentos).items()
+        ))
+        return [documento.id for documento in documentos]
+
+    async def iterar_con_embeddings(
+        self,
+        tamano_lote: int = 1000
+    ) -> AsyncIterator[Tuple[List[Documento], MatrizVectores]]:
+        """Recorre los shards uno tras otro."""
+        for indice, shard in enumerate(self.shards):
+            iterador = shard.iterar_con_embeddings(tamano_lote)
+            while True:
+                try:
+                    lote = await self._enviar(indice, iterador.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield lote
+
+    async def obtener_embeddings(self, documento_ids: List[str]) -> Dict[str, Vector]:
+        """Pide a cada shard los embeddings de sus documentos."""
+        por_shard: Dict[int, List[str]] = defaultdict(list)
+        for documento_id in documento_ids:
+            por_shard[self.shard_de(documento_id)].append(documento_id)
+        parciales = await asyncio.gather(*(
+            self._enviar(indice, self.shards[indice].obtener_embeddings(ids))
+            for indice, ids in por_shard.items()
+        ))
+        return {documento_id: vector for parcial in parciales for documento_id, vector in parcial.items()}
+
+    async def eliminar(self, documento_id: str) -> bool:
+        """Elimina un documento de su shard."""
+        self._registrar_escritura([documento_id])
+        if self._modificados is None:
+            indice = self.shard_de(documento_id)
+            return await self._enviar(indice, self.shards[indice].eliminar(documento_id))
+
+        # Durante un rebalanceo puede estar todavía en otro shard
+        eliminados = await asyncio.gather(*(
+            self._enviar(i, shard.eliminar(documento_id)) for i, shard in enumerate(self.shards)
+        ))
+        return any(eliminados)
+
+    async def buscar_por_similitud(
+        self,
+        embedding: Vector,
+        limite: int = 5
+    ) -> List[Documento]:
+        """Busca documentos similares basándose en un embedding."""
+        resultados = await self.buscar_por_similitud_batch(embedding.reshape(1, -1), limite)
+        return resultados[0]
+
+    async def buscar_por_similitud_batch(
+        self,
+        embeddings: MatrizVectores,
+        limite: int = 5
+    ) -> List[List[Documento]]:
+        """Consulta todos los shards a la vez y mezcla sus top-k por similitud."""
+        if len(embeddings) == 0:
+            return []
+
+        por_shard = await asyncio.gather(*(
+            self._enviar(i, shard.buscar_por_similitud_batch(embeddings, limite))
+            for i, shard in enumerate(self.shards)
+        ))
+
+        resultados = []
+        for consulta in range(len(embeddings)):
+            # Cada lista ya viene ordenada de más a menos similar
+            mezcla = heapq.merge(
+                *(resultados_shard[consulta] for resultados_shard in por_shard),
+                key=lambda documento: -(documento.similitud or 0.0)
+            )
+            vistos = set()
+            documentos = []
+            for documento in mezcla:
+                if documento.id in vistos:
+                    continue
+                vistos.add(documento.id)
+                documentos.append(documento)
+                if len(documentos) == limite:
+                    break
+            resultados.append(documentos)
+        return resultados
+
+    async def contar_documentos(self) -> int:
+        """Suma los documentos de todos los shards."""
+        return sum(await asyncio.gather(*(
+            self._enviar(i, shard.contar_documentos()) for i, shard in enumerate(self.shards)
+        )))
+
+    def obtener_parametros_indice(self) -> Optional[ParametrosIndice]:
+        """Parámetros del índice (todos los shards comparten los mismos)."""
+        return self.shards[0].obtener_parametros_indice()
+
+    async def reconstruir_indice(
+        self,
+        parametros: ParametrosIndice,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """Rebalancea y reconstruye el índice de cada shard; el progreso suma el de todos."""
+        await self.rebalancear()
+
+        totales = await asyncio.gather(*(
+            self._enviar(i, shard.contar_documentos()) for i, shard in enumerate(self.shards)
+        ))
+        copiados = [0] * len(self.shards)
+
+        def _progreso_shard(indice: int) -> Callable[[int, int], None]:
+            def _actualizar(hechos: int, _total: int):
+                copiados[indice] = hechos
+                if progreso:
+                    progreso(sum(copiados), sum(totales))
+            return _actualizar
+
+        reconstruidos = await asyncio.gather(*(
+            self._enviar(i, shard.reconstruir_indice(parametros, _progreso_shard(i)))
+            for i, shard in enumerate(self.shards)
+        ))
+        return sum(reconstruidos)
+
+    async def agregar_shard(self, shard: DocumentoRepository, rebalancear: bool = True) -> int:
+        """
+        Añade un shard y, si se pide, mueve a él los documentos que le corresponden.
+
+        Returns:
+            int: Número de documentos movidos
+        """
+        self.shards.append(shard)
+        self._hilos.append(_HiloShard(f"shard-{len(self.shards) - 1}"))
+        return await self.rebalancear() if rebalancear else 0
+
+    async def rebalancear(
+        self,
+        progreso: Optional[Callable[[int, int], None]] = None
+    ) -> int:
+        """
+        Mueve cada documento que no está en su shard al que le corresponde.
+
+        Las lecturas y escrituras siguen atendiéndose mientras tanto: los
+        documentos escritos durante el rebalanceo no se sobrescriben con su
+        copia antigua, y las búsquedas eliminan duplicados.
+
+        Args:
+            progreso: Callback opcional (documentos revisados, total)
+
+        Returns:
+            int: Número de documentos movidos
+        """
+        if self._modificados is not None:
+            raise ValueError("Ya hay un rebalanceo en curso")
+
+        self._modificados = set()
+        try:
+            total = await self.contar_documentos()
+            revisados = movidos = 0
+            # Los documentos copiados a un shard que aún no se ha recorrido ya
+            # están en su sitio: al llegar a él no se vuelven a contar
+            llegados: Set[str] = set()
+
+            for origen, shard in enumerate(self.shards):
+                a_eliminar: List[str] = []
+                iterador = shard.iterar_con_embeddings()
+                while True:
+                    try:
+                        documentos, embeddings = await self._enviar(origen, iterador.__anext__())
+                    except StopAsyncIteration:
+                        break
+
+                    # Filtrar y enviar sin await entremedias: una escritura
+                    # posterior queda detrás de la copia en la cola del shard
+                    por_destino: Dict[int, List[int]] = defaultdict(list)
+                    for posicion, documento in enumerate(documentos):
+                        destino = self.shard_de(documento.id)
+                        if destino != origen:
+                            a_eliminar.append(documento.id)
+                            if documento.id not in self._modificados:
+                                por_destino[destino].append(posicion)
+                    await asyncio.gather(*(
+                        self._enviar(destino, self.shards[destino].guardar_con_embeddings(
+                            [documentos[p] for p in posiciones], embeddings[np.asarray(posiciones)]
+                        ))
+                        for destino, posiciones in por_destino.items()
+                    ))
+
+                    revisados += sum(1 for documento in documentos if documento.id not in llegados)
+                    llegados.update(documentos[p].id for posiciones in por_destino.values() for p in posiciones)
+                    if progreso:
+                        # Los documentos añadidos durante el rebalanceo no estaban en el total
+                        progreso(revisados, max(total, revisados))
+
+                # Se borran al final para no alterar el recorrido del iterador
+                for documento_id in a_eliminar:
+                    await self._enviar(origen, shard.eliminar(documento_id))
+                movidos += len(a_eliminar)
+
+            return movidos
+        finally:
+            self._modificados = None
+
+    def cerrar(self):
+        """Detiene los hilos de los shards."""
+        for hilo in self._hilos:
+            hilo.detener()
+
+    def _agrupar(self, documentos: List[Documento]) -> Dict[int, List[int]]:
+        """Posiciones de los documentos agrupadas por shard."""
+        por_shard: Dict[int, List[int]] = defaultdict(list)
+        for posicion, documento in enumerate(documentos):
+            por_shard[self.shard_de(documento.id)].append(posicion)
+        return por_shard
\ No newline at end of file
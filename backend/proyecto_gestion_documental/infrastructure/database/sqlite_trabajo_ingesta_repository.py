@@ -0,0 +1,238 @@
+from typing import List, Optional
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from datetime import datetime, timedelta
+from ...domain.entities.trabajo_ingesta import (
+    TrabajoIngesta,
+    ESTADO_PENDIENTE,
+    ESTADO_PROCESANDO
+)
+from ...domain.repositories.trabajo_ingesta_repository import TrabajoIngestaRepository
+from ..workers.ejecutor import Ejecutor
+
+
+# Definir modelo SQLAlchemy
+Base = declarative_base()
+
+class TrabajoIngestaModel(Base):
+    __tablename__ = "trabajos_ingesta"
+
+    id = Column(String, primary_key=True, index=True)
+    documento_id = Column(String, nullable=False)
+    titulo = Column(String, nullable=False)
+    contenido = Column(Text, nullable=False)
+    tipo = Column(String, nullable=False)
+    estado = Column(String, nullable=False, index=True, default=ESTADO_PENDIENTE)
+    progreso = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    intentos = Column(Integer, nullable=False, default=0)
+    fecha_creacion = Column(DateTime, default=datetime.now, index=True)
+    fecha_actualizacion = Column(DateTime, default=datetime.now)
+
+
+class SQLiteTrabajoIngestaRepository(TrabajoIngestaRepository):
+    """
+    Cola de trabajos de ingesta persistida en SQLite (sobrevive a reinicios).
+
+    Las consultas se ejecutan en los hilos de `ejecutor`: los suscriptores
+    al progreso consultan la cola cada poco y el worker la actualiza por
+    cada lote, y nada de eso debe bloquear el event loop.
+    """
+
+    def __init__(self, database_url: str = "sqlite:///ingestas.db", ejecutor: Optional[Ejecutor] = None):
+        self.ejecutor = ejecutor or Ejecutor("ingestas", hilos=2)
+        self.engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False}
+        )
+        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        # Crear tablas si no existen
+        Base.metadata.create_all(bind=self.engine)
+
+    def _get_session(self) -> Session:
+        """Obtiene una sesión de base de datos."""
+        return self.SessionLocal()
+
+    async def encolar(self, trabajo: TrabajoIngesta) -> str:
+        """Guarda un trabajo pendiente y retorna su ID."""
+        def _encolar():
+            with self._get_session() as db:
+                db.add(TrabajoIngestaModel(
+                    id=trabajo.id,
+                    documento_id=trabajo.documento_id,
+                    titulo=trabajo.titulo,
+                    contenido=trabajo.contenido,
+                    tipo=trabajo.tipo,
+                    estado=trabajo.estado,
+                    progreso=trabajo.progreso,
+                    intentos=trabajo.intentos,
+                    fecha_creacion=trabajo.fecha_creacion,
+                    fecha_actualizacion=trabajo.fecha_actualizacion
+                ))
+                db.commit()
+                return trabajo.id
+
+        try:
+            return await self.ejecutor.ejecutar(_encolar)
+
+        except Exception as e:
+            raise Exception(f"Error al encolar trabajo de ingesta: {str(e)}")
+
+    async def obtener_por_id(self, trabajo_id: str) -> Optional[TrabajoIngesta]:
+        """Obtiene un trabajo por su ID."""
+        def _consultar():
+            with self._get_session() as db:
+                trabajo_model = db.query(TrabajoIngestaModel).filter(
+                    TrabajoIngestaModel.id == trabajo_id
+                ).first()
+
+                if trabajo_model is None:
+                    return None
+
+                return self._convertir_a_entidad(trabajo_model)
+
+        try:
+            return await self.ejecutor.ejecutar(_consultar)
+
+        except Exception as e:
+            raise Exception(f"Error al obtener trabajo {trabajo_id}: {str(e)}")
+
+    async def reclamar_pendientes(self, limite: int) -> List[TrabajoIngesta]:
+        """Marca como 'procesando' los trabajos pendientes más antiguos y los retorna."""
+        def _reclamar():
+            with self._get_session() as db:
+                candidatos = db.query(TrabajoIngestaModel.id).filter(
+                    TrabajoIngestaModel.estado == ESTADO_PENDIENTE
+                ).order_by(
+                    TrabajoIngestaModel.fecha_creacion
+                ).limit(limite).all()
+
+                reclamados = []
+                for (trabajo_id,) in candidatos:
+                    # La condición sobre el estado evita que dos workers
+                    # (o dos procesos) reclamen el mismo trabajo
+                    actualizados = db.query(TrabajoIngestaModel).filter(
+                        TrabajoIngestaModel.id == trabajo_id,
+                        TrabajoIngestaModel.estado == ESTADO_PENDIENTE
+                    ).update({
+                        TrabajoIngestaModel.estado: ESTADO_PROCESANDO,
+                        TrabajoIngestaModel.intentos: TrabajoIngestaModel.intentos + 1,
+                        TrabajoIngestaModel.fecha_actualizacion: datetime.now()
+                    }, synchronize_session=False)
+
+                    if actualizados == 1:
+                        reclamados.append(trabajo_id)
+
+                db.commit()
+
+                if not reclamados:
+                    return []
+
+                trabajos = db.query(TrabajoIngestaModel).filter(
+                    TrabajoIngestaModel.id.in_(reclamados)
+                ).order_by(TrabajoIngestaModel.fecha_creacion).all()
+
+                return [self._convertir_a_entidad(t) for t in trabajos]
+
+        try:
+            return await self.ejecutor.ejecutar(_reclamar)
+
+        except Exception as e:
+            raise Exception(f"Error al reclamar trabajos pendientes: {str(e)}")
+
+    async def actualizar_estado(
+        self,
+        trabajo_id: str,
+        estado: str,
+        progreso: int,
+        error: Optional[str] = None
+    ) -> bool:
+        """Actualiza el estado y el progreso de un trabajo."""
+        try:
+            return await self.ejecutor.ejecutar(
+                self._actualizar, [trabajo_id], estado, progreso, error
+            ) == 1
+
+        except Exception as e:
+            raise Exception(f"Error al actualizar trabajo {trabajo_id}: {str(e)}")
+
+    async def actualizar_estados(self, trabajo_ids: List[str], estado: str, progreso: int) -> int:
+        """Actualiza a la vez el estado y el progreso de varios trabajos."""
+        if not trabajo_ids:
+            return 0
+        try:
+            return await self.ejecutor.ejecutar(self._actualizar, trabajo_ids, estado, progreso, None)
+
+        except Exception as e:
+            raise Exception(f"Error al actualizar {len(trabajo_ids)} trabajos: {str(e)}")
+
+    async def contar_pendientes(self) -> int:
+        """Cuenta los trabajos que esperan en la cola."""
+        def _contar():
+            with self._get_session() as db:
+                return db.query(TrabajoIngestaModel).filter(
+                    TrabajoIngestaModel.estado == ESTADO_PENDIENTE
+                ).count()
+
+        try:
+            return await self.ejecutor.ejecutar(_contar)
+
+        except Exception as e:
+            raise Exception(f"Error al contar trabajos pendientes: {str(e)}")
+
+    async def reencolar_en_proceso(self, antiguedad_minima: float) -> int:
+        """Devuelve a 'pendiente' los trabajos a medias cuya concesión caducó."""
+        limite = datetime.now() - timedelta(seconds=antiguedad_minima)
+
+        def _reencolar():
+            with self._get_session() as db:
+                # La cola es compartida entre procesos: solo se reclaman los
+                # trabajos que nadie ha actualizado en `antiguedad_minima`
+                reencolados = db.query(TrabajoIngestaModel).filter(
+                    TrabajoIngestaModel.estado == ESTADO_PROCESANDO,
+                    TrabajoIngestaModel.fecha_actualizacion < limite
+                ).update({
+                    TrabajoIngestaModel.estado: ESTADO_PENDIENTE,
+                    TrabajoIngestaModel.progreso: 0,
+                    TrabajoIngestaModel.fecha_actualizacion: datetime.now()
+                }, synchronize_session=False)
+
+                db.commit()
+                return reencolados
+
+        try:
+            return await self.ejecutor.ejecutar(_reencolar)
+
+        except Exception as e:
+            raise Exception(f"Error al reencolar trabajos en proceso: {str(e)}")
+
+    def _actualizar(self, trabajo_ids: List[str], estado: str, progreso: int, error: Optional[str]) -> int:
+        with self._get_session() as db:
+            actualizados = db.query(TrabajoIngestaModel).filter(
+                TrabajoIngestaModel.id.in_(trabajo_ids)
+            ).update({
+                TrabajoIngestaModel.estado: estado,
+                TrabajoIngestaModel.progreso: progreso,
+                TrabajoIngestaModel.error: error,
+                TrabajoIngestaModel.fecha_actualizacion: datetime.now()
+            }, synchronize_session=False)
+
+            db.commit()
+            return actualizados
+
+    def _convertir_a_entidad(self, trabajo_model: TrabajoIngestaModel) -> TrabajoIngesta:
+        """Convierte un modelo SQLAlchemy a entidad de dominio."""
+        return TrabajoIngesta(
+            id=trabajo_model.id,
+            documento_id=trabajo_model.documento_id,
+            titulo=trabajo_model.titulo,
+            contenido=trabajo_model.contenido,
+            tipo=trabajo_model.tipo,
+            estado=trabajo_model.estado,
+            progreso=trabajo_model.progreso,
+            error=trabajo_model.error,
+            intentos=trabajo_model.intentos,
+            fecha_creacion=trabajo_model.fecha_creacion,
+            fecha_actualizacion=trabajo_model.fecha_actualizacion
+        )
\ No newline at end of file
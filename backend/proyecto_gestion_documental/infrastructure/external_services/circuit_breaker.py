@@ -0,0 +1,88 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker para servicios externos (Ollama).
+
+    - cerrado: las peticiones pasan normalmente.
+    - abierto: tras `umbral_fallos` fallos consecutivos las peticiones se
+      rechazan de inmediato durante `tiempo_apertura` segundos.
+    - semiabierto: pasado ese tiempo se deja pasar una única petición de
+      prueba; si tiene éxito el circuito se cierra y si falla se vuelve a abrir.
+    """
+
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+    SEMIABIERTO = "semiabierto"
+
+    def __init__(self, umbral_fallos: int = 3, tiempo_apertura: float = 30.0):
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_apertura = tiempo_apertura
+        self._estado = self.CERRADO
+        self._fallos_consecutivos = 0
+        self._abierto_desde = 0.0
+        self._prueba_en_curso = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self) -> str:
+        """Retorna el estado actual del circuito."""
+        with self._lock:
+            if self._estado == self.ABIERTO and self._tiempo_cumplido():
+                return self.SEMIABIERTO
+            return self._estado
+
+    def permitir_peticion(self) -> bool:
+        """Indica si se puede llamar al servicio o hay que fallar rápido."""
+        with self._lock:
+            if self._estado == self.CERRADO:
+                return True
+
+            if self._estado == self.ABIERTO:
+                if not self._tiempo_cumplido():
+                    return False
+                self._estado = self.SEMIABIERTO
+
+            # Semiabierto: solo una petición de prueba a la vez
+            if self._prueba_en_curso:
+                return False
+            self._prueba_en_curso = True
+            return True
+
+    def registrar_exito(self):
+        """Registra una llamada correcta y cierra el circuito."""
+        with self._lock:
+            self._estado = self.CERRADO
+            self._fallos_consecutivos = 0
+            self._prueba_en_curso = False
+
+    def registrar_fallo(self):
+        """Registra una llamada fallida y abre el circuito si corresponde."""
+        with self._lock:
+            self._fallos_consecutivos += 1
+            if (
+                self._estado == self.SEMIABIERTO or
+                self._fallos_consecutivos >= self.umbral_fallos
+            ):
+                self._estado = self.ABIERTO
+                self._abierto_desde = time.monotonic()
+            self._prueba_en_curso = False
+
+    def registrar_cancelacion(self):
+        """Libera la petición de prueba si se canceló: no dice nada de la salud del servicio."""
+        with self._lock:
+            self._prueba_en_curso = False
+
+    def obtener_estado(self) -> dict:
+        """Retorna el estado del circuito para diagnóstico."""
+        return {
+            "estado": self.estado,
+            "fallos_consecutivos": self._fallos_consecutivos,
+            "umbral_fallos": self.umbral_fallos,
+            "tiempo_apertura": self.tiempo_apertura
+        }
+
+    def _tiempo_cumplido(self) -> bool:
+        return time.monotonic() - self._abierto_desde >= self.tiempo_apertura
\ No newline at end of file
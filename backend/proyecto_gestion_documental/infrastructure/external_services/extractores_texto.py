@@ -0,0 +1,97 @@
+import io
+import zipfile
+from typing import BinaryIO, Iterator, List
+from xml.etree import ElementTree
+from ...domain.services.extractor_texto import ExtractorTexto
+
+
+class PdfExtractorTexto(ExtractorTexto):
+    """Extrae el texto de un PDF página a página usando pypdf."""
+
+    def __init__(self, paginas_por_limpieza: int = 20):
+        # pypdf cachea los objetos ya leídos; se vacía la caché cada N páginas
+        # para que la memoria no crezca con el número de páginas
+        self.paginas_por_limpieza = paginas_por_limpieza
+
+    def extraer_bloques(self, archivo: BinaryIO) -> Iterator[str]:
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            raise Exception("pypdf no está instalado. Ejecute 'pip install pypdf'")
+
+        try:
+            lector = PdfReader(archivo)
+            total_paginas = len(lector.pages)
+        except Exception as e:
+            raise ValueError(f"No se pudo leer el PDF: {str(e)}")
+
+        for numero in range(total_paginas):
+            texto = lector.pages[numero].extract_text() or ""
+            if texto.strip():
+                yield texto
+
+            if (numero + 1) % self.paginas_por_limpieza == 0 and hasattr(lector, "resolved_objects"):
+                lector.resolved_objects.clear()
+
+    def extensiones_soportadas(self) -> List[str]:
+        return [".pdf"]
+
+
+class DocxExtractorTexto(ExtractorTexto):
+    """
+    Extrae el texto de un DOCX párrafo a párrafo.
+
+    Lee `word/document.xml` directamente del zip con `iterparse`, liberando
+    cada párrafo tras procesarlo, en lugar de cargar todo el documento.
+    """
+
+    NS_WORD = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+    def extraer_bloques(self, archivo: BinaryIO) -> Iterator[str]:
+        try:
+            docx = zipfile.ZipFile(archivo)
+            xml = docx.open("word/document.xml")
+        except (zipfile.BadZipFile, KeyError) as e:
+            raise ValueError(f"No se pudo leer el DOCX: {str(e)}")
+
+        with docx, xml:
+            for _, elemento in ElementTree.iterparse(xml, events=("end",)):
+                if elemento.tag != f"{self.NS_WORD}p":
+                    continue
+
+                texto = "".join(
+                    nodo.text or ""
+                    for nodo in elemento.iter()
+                    if nodo.tag == f"{self.NS_WORD}t"
+                )
+                elemento.clear()
+
+                if texto.strip():
+                    yield texto
+
+    def extensiones_soportadas(self) -> List[str]:
+        return [".docx"]
+
+
+class TxtExtractorTexto(ExtractorTexto):
+    """Lee un archivo de texto plano en trozos de tamaño acotado."""
+
+    def __init__(self, tamano_bloque: int = 8192, encoding: str = "utf-8"):
+        self.tamano_bloque = tamano_bloque
+        self.encoding = encoding
+
+    def extraer_bloques(self, archivo: BinaryIO) -> Iterator[str]:
+        texto = io.TextIOWrapper(archivo, encoding=self.encoding, errors="replace")
+        try:
+            while True:
+                bloque = texto.read(self.tamano_bloque)
+                if not bloque:
+                    break
+                # Completar hasta el fin de línea para no partir palabras
+                yield bloque + texto.readline(self.tamano_bloque)
+        finally:
+            # No cerrar el archivo subyacente, pertenece al llamador
+            texto.detach()
+
+    def extensiones_soportadas(self) -> List[str]:
+        return [".txt"]
\ No newline at end of file
@@ -0,0 +1,235 @@
+from dataclasses import dataclass
+from typing import List, Optional
+import json
+import time
+import httpx
+from ...domain.services.llm_service import LLMService, LLMNoDisponibleError, SenalesConsulta
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+
+
+@dataclass
+class BackendOllama:
+    """Estado de un servidor Ollama dentro del pool."""
+
+    base_url: str
+    en_curso: int = 0
+    fallos_consecutivos: int = 0
+    expulsado_hasta: float = 0.0
+    ultimo_chequeo: Optional[float] = None
+    ultimo_estado: bool = True
+
+    def esta_expulsado(self, ahora: float) -> bool:
+        return ahora < self.expulsado_hasta
+
+
+class OllamaPoolLLMService(LLMService):
+    """
+    Servicio LLM que reparte la generación entre varios servidores Ollama.
+
+    Cada petición va al backend con menos peticiones en curso. La salud de
+    cada backend se comprueba con `/api/tags` (resultado cacheado durante
+    `ttl_salud` segundos) y un backend que falla queda expulsado del pool
+    durante `enfriamiento` segundos.
+
+    Los chequeos y la generación comparten un único `httpx.AsyncClient`
+    con conexiones keep-alive a cada backend, que se cierra con `cerrar()`.
+    """
+
+    def __init__(
+        self,
+        base_urls: List[str],
+        model_name: str = "llama3.2:1b",
+        timeout: int = 30,
+        ttl_salud: float = 10.0,
+        enfriamiento: float = 30.0,
+        timeout_salud: float = 2.0,
+        metricas: Optional[MetricasService] = None
+    ):
+        if not base_urls:
+            raise ValueError("El pool de Ollama necesita al menos un servidor")
+
+        self.backends = [BackendOllama(base_url=url.rstrip("/")) for url in base_urls]
+        self.model_name = model_name
+        self.timeout = timeout
+        self.ttl_salud = ttl_salud
+        self.enfriamiento = enfriamiento
+        self.timeout_salud = timeout_salud
+        self.metricas = metricas or MetricasNulas()
+        self._cliente = httpx.AsyncClient(timeout=timeout)
+
+    async def generar_respuesta(
+        self,
+        prompt: str,
+        contexto: Optional[str] = None,
+        senales: Optional[SenalesConsulta] = None
+    ) -> str:
+        """
+        Genera una respuesta en el backend menos cargado del pool.
+
+        Si el backend elegido falla se expulsa y se reintenta con el
+        siguiente, de modo que cada petición prueba cada servidor como mucho
+        una vez.
+
+        Args:
+            prompt: El prompt para el modelo
+            contexto: Contexto adicional (ya incluido en el prompt)
+            senales: Rasgos de la consulta (no se usan: un solo modelo)
+
+        Returns:
+            str: Respuesta generada por el modelo
+
+        Raises:
+            LLMNoDisponibleError: Si ningún backend del pool pudo responder
+        """
+        errores = []
+        intentados = set()
+
+        while True:
+            backend = await self._seleccionar_backend(excluir=intentados)
+            if backend is None:
+                break
+            intentados.add(backend.base_url)
+
+            try:
+                return await self._generar_en(backend, prompt)
+            except Exception as e:
+                errores.append(f"{backend.base_url}: {str(e)}")
+            finally:
+                backend.en_curso -= 1
+
+        if not errores:
+            raise LLMNoDisponibleError("Ningún servidor Ollama del pool está disponible")
+        raise LLMNoDisponibleError(f"Error al consultar LLM: {' | '.join(errores)}")
+
+    async def esta_disponible(self) -> bool:
+        """Verifica si al menos un backend del pool está disponible."""
+        for backend in self.backends:
+            if await self._esta_sano(backend):
+                return True
+        return False
+
+    def obtener_modelo_usado(self) -> str:
+        """Retorna el nombre del modelo que se está usando."""
+        return self.model_name
+
+    async def cerrar(self):
+        """Cierra las conexiones con los backends."""
+        await self._cliente.aclose()
+
+    def obtener_estado_pool(self) -> List[dict]:
+        """Retorna el estado de cada backend para diagnóstico."""
+        ahora = time.monotonic()
+        return [
+            {
+                "base_url": backend.base_url,
+                "en_curso": backend.en_curso,
+                "fallos_consecutivos": backend.fallos_consecutivos,
+                "expulsado": backend.esta_expulsado(ahora),
+                "segundos_expulsion_restantes": max(0.0, round(backend.expulsado_hasta - ahora, 1)),
+                "sano": backend.ultimo_estado
+            }
+            for backend in self.backends
+        ]
+
+    async def _seleccionar_backend(self, excluir: set) -> Optional[BackendOllama]:
+        """
+        Elige y reserva el backend sano con menos peticiones en curso.
+
+        El contador `en_curso` se incrementa antes de cualquier `await` para
+        que las peticiones concurrentes vean la reserva y se repartan.
+        """
+        descartados = set(excluir)
+
+        while True:
+            ahora = time.monotonic()
+            candidatos = [
+                backend for backend in self.backends
+                if backend.base_url not in descartados and not backend.esta_expulsado(ahora)
+            ]
+            if not candidatos:
+                return None
+
+            # min() devuelve el primero ante empate, así el orden es estable
+            backend = min(candidatos, key=lambda b: b.en_curso)
+            backend.en_curso += 1
+
+            if await self._esta_sano(backend):
+                return backend
+
+            backend.en_curso -= 1
+            descartados.add(backend.base_url)
+
+    async def _esta_sano(self, backend: BackendOllama) -> bool:
+        """Consulta `/api/tags` del backend, cacheando el resultado."""
+        ahora = time.monotonic()
+        if backend.esta_expulsado(ahora):
+            return False
+        if backend.ultimo_chequeo is not None and ahora - backend.ultimo_chequeo < self.ttl_salud:
+            return backend.ultimo_estado
+
+        try:
+            response = await self._cliente.get(f"{backend.base_url}/api/tags", timeout=self.timeout_salud)
+            sano = response.status_code == 200
+        except httpx.HTTPError:
+            sano = False
+
+        backend.ultimo_chequeo = time.monotonic()
+        backend.ultimo_estado = sano
+        if not sano:
+            self._expulsar(backend)
+        return sano
+
+    async def _generar_en(self, backend: BackendOllama, prompt: str) -> str:
+        """
+        Genera la respuesta en streaming en un backend ya reservado.
+
+        Si la petición se cancela (el cliente se desconecta o se agota su
+        plazo), se cierra el stream y Ollama deja de generar.
+        """
+        try:
+            inicio = time.perf_counter()
+            async with self._cliente.stream(
+                "POST",
+                f"{backend.base_url}/api/generate",
+                json={
+                    "model": self.model_name,
+                    "prompt": prompt,
+                    "stream": True
+                }
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    raise Exception(f"Error HTTP {response.status_code}: {response.text}")
+
+                # Ollama envía una línea JSON por cada trozo generado. Se lee
+                # hasta el final (la línea `done` es la última) para que la
+                # conexión vuelva al pool en vez de cerrarse
+                partes = []
+                async for linea in response.aiter_lines():
+                    if not linea:
+                        continue
+                    if not partes:
+                        self.metricas.registrar_etapa("llm_primer_token", time.perf_counter() - inicio)
+                    partes.append(json.loads(linea).get("response", ""))
+                respuesta = "".join(partes)
+        except httpx.ConnectError:
+            self._expulsar(backend)
+            raise Exception("Ollama no está corriendo")
+        except httpx.TimeoutException:
+            self._expulsar(backend)
+            raise Exception("Timeout al conectar con Ollama")
+        except Exception:
+            self._expulsar(backend)
+            raise
+
+        backend.fallos_consecutivos = 0
+        return respuesta
+
+    def _expulsar(self, backend: BackendOllama):
+        """Saca un backend del pool durante el periodo de enfriamiento."""
+        ahora = time.monotonic()
+        backend.fallos_consecutivos += 1
+        backend.expulsado_hasta = ahora + self.enfriamiento
+        # Forzar un nuevo chequeo de salud en cuanto termine el enfriamiento
+        backend.ultimo_chequeo = None
+        backend.ultimo_estado = False
\ No newline at end of file
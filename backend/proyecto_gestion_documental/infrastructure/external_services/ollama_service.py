@@ -1,7 +1,12 @@
 from typing import Optional
-import requests
 import asyncio
-from ...domain.services.llm_service import LLMService
+import httpx
+import requests
+import json
+import time
+from ...domain.services.llm_service import LLMService, LLMNoDisponibleError, SenalesConsulta
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+from .circuit_breaker import CircuitBreaker
 
 
 class OllamaLLMService(LLMService):
@@ -11,16 +16,21 @@ class OllamaLLMService(LLMService):
         self, 
         base_url: str = "http://localhost:11434",
         model_name: str = "llama3.2:1b",
-        timeout: int = 30
+        timeout: int = 30,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        metricas: Optional[MetricasService] = None
     ):
         self.base_url = base_url
         self.model_name = model_name
         self.timeout = timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.metricas = metricas or MetricasNulas()
     
     async def generar_respuesta(
         self, 
         prompt: str, 
-        contexto: Optional[str] = None
+        contexto: Optional[str] = None,
+        senales: Optional[SenalesConsulta] = None
     ) -> str:
         """
         Genera una respuesta usando Ollama.
@@ -28,21 +38,34 @@ class OllamaLLMService(LLMService):
         Args:
             prompt: El prompt para el modelo
             contexto: Contexto adicional (ya incluido en el prompt)
+            senales: Rasgos de la consulta (no se usan: un solo modelo)
             
         Returns:
             str: Respuesta generada por el modelo
+            
+        Raises:
+            LLMNoDisponibleError: Si Ollama falla o el circuito está abierto
         """
+        # Fallar rápido mientras el circuito esté abierto
+        if not self.circuit_breaker.permitir_peticion():
+            raise LLMNoDisponibleError(
+                "Ollama no disponible (circuito abierto), se omite la generación"
+            )
+        
         try:
-            # Intentar usar librería ollama primero
-            response = await self._try_ollama_library(prompt)
-            if response:
-                return response
-                
-            # Fallback a API REST
-            return await self._try_rest_api(prompt)
+            response = await self._try_rest_api(prompt)
             
+        except asyncio.CancelledError:
+            # Petición abandonada (desconexión o plazo agotado): el stream ya
+            # se cerró y no cuenta como fallo de Ollama
+            self.circuit_breaker.registrar_cancelacion()
+            raise
         except Exception as e:
-            return f"Error al consultar LLM: {str(e)}"
+            self.circuit_breaker.registrar_fallo()
+            raise LLMNoDisponibleError(f"Error al consultar LLM: {str(e)}")
+        
+        self.circuit_breaker.registrar_exito()
+        return response
     
     async def esta_disponible(self) -> bool:
         """Verifica si el servicio Ollama está disponible."""
@@ -59,58 +82,51 @@ class OllamaLLMService(LLMService):
         """Retorna el nombre del modelo que se está usando."""
         return self.model_name
     
-    async def _try_ollama_library(self, prompt: str) -> Optional[str]:
-        """Intenta usar la librería ollama directamente."""
-        try:
-            import ollama
-            
-            # Ejecutar en un hilo separado para no bloquear
-            def _generate():
-                response = ollama.generate(
-                    model=self.model_name,
-                    prompt=prompt
-                )
-                return response['response']
-            
-            # Ejecutar de forma asíncrona
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, _generate)
-            return response
-            
-        except ImportError:
-            # La librería ollama no está disponible
-            return None
-        except Exception as e:
-            # Error con la librería, intentar API REST
-            return None
-    
     async def _try_rest_api(self, prompt: str) -> str:
-        """Usa la API REST de Ollama como fallback."""
+        """
+        Genera en streaming con la API REST de Ollama.
+        
+        Se usa httpx directamente y no `ollama.AsyncClient`: en la versión
+        fijada en requirements.txt (ollama==0.5.1) ese cliente no tiene
+        forma pública de cerrarse, y su httpx.AsyncClient interno solo se
+        cerraría con el atributo privado `_client`. Con `async with`, si la
+        petición se cancela (el cliente se desconecta o se agota su plazo),
+        se cierra el stream y Ollama deja de generar.
+        """
         try:
-            def _make_request():
-                response = requests.post(
+            inicio = time.perf_counter()
+            async with httpx.AsyncClient(timeout=self.timeout) as cliente:
+                async with cliente.stream(
+                    "POST",
                     f"{self.base_url}/api/generate",
                     json={
                         "model": self.model_name,
                         "prompt": prompt,
-                        "stream": False
-                    },
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    return response.json()["response"]
-                else:
-                    raise Exception(f"Error HTTP {response.status_code}: {response.text}")
-            
-            # Ejecutar de forma asíncrona
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, _make_request)
-            return response
+                        "stream": True
+                    }
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        raise Exception(f"Error HTTP {response.status_code}: {response.text}")
+                    
+                    # Ollama envía una línea JSON por cada trozo generado
+                    partes = []
+                    async for linea in response.aiter_lines():
+                        if not linea:
+                            continue
+                        if not partes:
+                            self.metricas.registrar_etapa(
+                                "llm_primer_token", time.perf_counter() - inicio
+                            )
+                        datos = json.loads(linea)
+                        partes.append(datos.get("response", ""))
+                        if datos.get("done"):
+                            break
+                    return "".join(partes)
             
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             raise Exception("Ollama no está corriendo. Ejecute 'ollama serve' en otra terminal.")
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise Exception("Timeout al conectar con Ollama. El modelo puede estar cargándose.")
         except Exception as e:
             raise Exception(f"Error en API REST de Ollama: {str(e)}")
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from ...domain.services.llm_service import LLMService, LLMNoDisponibleError, RespuestaLLM, SenalesConsulta
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+
+
+@dataclass
+class RutaLLM:
+    """
+    Modelo al que se envían las consultas que cumplen todas sus condiciones.
+
+    Una condición sin valor (None) no se comprueba; una ruta sin
+    condiciones acepta cualquier consulta.
+    """
+    nombre: str
+    servicio: LLMService
+    max_palabras: Optional[int] = None       # preguntas cortas
+    similitud_minima: Optional[float] = None  # el mejor documento se parece mucho a la pregunta
+    margen_minimo: Optional[float] = None     # y destaca sobre el segundo
+
+    def acepta(self, senales: Optional[SenalesConsulta]) -> bool:
+        if senales is None:
+            return self.max_palabras is None and self.similitud_minima is None and self.margen_minimo is None
+        if self.max_palabras is not None and senales.palabras_pregunta > self.max_palabras:
+            return False
+        if self.similitud_minima is not None and (
+            senales.similitud_maxima is None or senales.similitud_maxima < self.similitud_minima
+        ):
+            return False
+        if self.margen_minimo is not None and (
+            senales.margen_similitud is None or senales.margen_similitud < self.margen_minimo
+        ):
+            return False
+        return True
+
+
+class RouterLLMService(LLMService):
+    """
+    Servicio LLM que envía cada consulta a un modelo según sus señales.
+
+    Las rutas se evalúan en orden y la consulta va a la primera que la
+    acepta; si ninguna lo hace, a `por_defecto` (el modelo grande). Así las
+    preguntas fáciles (cortas y con un documento claramente relevante) las
+    responde un modelo pequeño y rápido sin bajar el modelo del resto. Si
+    el modelo de una ruta no está disponible, responde el de por defecto.
+
+    Por ruta se cuentan las consultas (`consultas_ruta`) y se mide la
+    latencia de generación (etapa `llm_ruta_<nombre>`).
+    """
+
+    def __init__(
+        self,
+        rutas: List[RutaLLM],
+        por_defecto: RutaLLM,
+        metricas: Optional[MetricasService] = None
+    ):
+        self.rutas = rutas
+        self.por_defecto = por_defecto
+        self.metricas = metricas or MetricasNulas()
+
+    def elegir_ruta(self, senales: Optional[SenalesConsulta]) -> RutaLLM:
+        """Retorna la primera ruta que acepta la consulta (o la de por defecto)."""
+        return next((ruta for ruta in self.rutas if ruta.acepta(senales)), self.por_defecto)
+
+    async def generar_respuesta(
+        self,
+        prompt: str,
+        contexto: Optional[str] = None,
+        senales: Optional[SenalesConsulta] = None
+    ) -> str:
+        """
+        Genera la respuesta con el modelo de la ruta elegida.
+
+        Args:
+            prompt: El prompt para el modelo
+            contexto: Contexto adicional (ya incluido en el prompt)
+            senales: Rasgos de la consulta con los que se elige la ruta
+
+        Returns:
+            str: Respuesta generada por el modelo
+
+        Raises:
+            LLMNoDisponibleError: Si ni la ruta elegida ni la de por defecto pudieron responder
+        """
+        respuesta = await self.generar_respuesta_con_modelo(prompt, contexto, senales)
+        return respuesta.texto
+
+    async def generar_respuesta_con_modelo(
+        self,
+        prompt: str,
+        contexto: Optional[str] = None,
+        senales: Optional[SenalesConsulta] = None
+    ) -> RespuestaLLM:
+        """Genera como `generar_respuesta` e indica el modelo de la ruta que respondió."""
+        ruta = self.elegir_ruta(senales)
+        try:
+            return await self._generar_en(ruta, prompt, contexto, senales)
+        except LLMNoDisponibleError:
+            if ruta is self.por_defecto:
+                raise
+            return await self._generar_en(self.por_defecto, prompt, contexto, senales)
+
+    async def esta_disponible(self) -> bool:
+        """Disponible si responde el modelo por defecto o el de alguna ruta."""
+        for ruta in [self.por_defecto, *self.rutas]:
+            if await ruta.servicio.esta_disponible():
+                return True
+        return False
+
+    def obtener_modelo_usado(self) -> str:
+        """Retorna el modelo por defecto."""
+        return self.por_defecto.servicio.obtener_modelo_usado()
+
+    async def cerrar(self):
+        """Cierra los servicios de todas las rutas."""
+        for ruta in [self.por_defecto, *self.rutas]:
+            await ruta.servicio.cerrar()
+
+    async def _generar_en(
+        self,
+        ruta: RutaLLM,
+        prompt: str,
+        contexto: Optional[str],
+        senales: Optional[SenalesConsulta]
+    ) -> RespuestaLLM:
+        self.metricas.incrementar("consultas_ruta", ruta=ruta.nombre)
+        with self.metricas.medir(f"llm_ruta_{ruta.nombre}"):
+            return await ruta.servicio.generar_respuesta_con_modelo(prompt, contexto, senales)
\ No newline at end of file
@@ -1,14 +1,25 @@
-from typing import List
-import asyncio
+from typing import List, Optional
+import numpy as np
 from sentence_transformers import SentenceTransformer
-from ...domain.services.embedding_service import EmbeddingService
+from ..workers.ejecutor import Ejecutor
+from ...domain.services.embedding_service import EmbeddingService, Vector, MatrizVectores
+from ...domain.services.plazo import PlazoAgotadoError, plazo_actual
 
 
 class SentenceTransformerEmbeddingService(EmbeddingService):
     """Implementación del servicio de embeddings usando SentenceTransformers."""
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        backend: str = 'torch',
+        ejecutor: Optional[Ejecutor] = None
+    ):
         self.model_name = model_name
+        # 'torch', 'onnx' u 'openvino' (ver benchmarks/benchmark_embeddings.py)
+        self.backend = backend
+        # Hilos propios: el encode no compite con otro trabajo bloqueante
+        self.ejecutor = ejecutor or Ejecutor("embeddings", hilos=2)
         self.model = None
         self._dimension = None
         self._initialize_model()
@@ -16,14 +27,14 @@ class SentenceTransformerEmbeddingService(EmbeddingService):
     def _initialize_model(self):
         """Inicializa el modelo de embeddings."""
         try:
-            self.model = SentenceTransformer(self.model_name)
+            self.model = SentenceTransformer(self.model_name, backend=self.backend)
             # Calcular dimensión usando un texto de prueba
             test_embedding = self.model.encode(["test"])
             self._dimension = len(test_embedding[0])
         except Exception as e:
             raise Exception(f"Error inicializando modelo de embeddings {self.model_name}: {str(e)}")
     
-    async def generar_embedding(self, texto: str) -> List[float]:
+    async def generar_embedding(self, texto: str) -> Vector:
         """
         Genera un embedding vectorial para un texto.
         
@@ -31,28 +42,34 @@ class SentenceTransformerEmbeddingService(EmbeddingService):
             texto: El texto para el cual generar el embedding
             
         Returns:
-            List[float]: Vector de embedding del texto
+            Vector: Vector de embedding del texto
         """
         if not texto or not texto.strip():
             raise ValueError("El texto no puede estar vacío")
         
+        plazo = plazo_actual()
         try:
             # Ejecutar encoding en un hilo separado para no bloquear
             def _encode():
+                # Con el executor saturado, la petición puede haberse cancelado
+                # mientras esperaba turno: no se gasta CPU en ella
+                if plazo is not None:
+                    plazo.comprobar()
                 embedding = self.model.encode([texto.strip()])
-                return embedding[0].tolist()
+                return np.ascontiguousarray(embedding[0], dtype=np.float32)
             
-            loop = asyncio.get_event_loop()
-            embedding = await loop.run_in_executor(None, _encode)
+            embedding = await self.ejecutor.ejecutar(_encode)
             return embedding
             
+        except PlazoAgotadoError as e:
+            raise e
         except Exception as e:
             raise Exception(f"Error generando embedding: {str(e)}")
     
     async def generar_embeddings_batch(
         self, 
         textos: List[str]
-    ) -> List[List[float]]:
+    ) -> MatrizVectores:
         """
         Genera embeddings para múltiples textos de forma eficiente.
         
@@ -60,27 +77,36 @@ class SentenceTransformerEmbeddingService(EmbeddingService):
             textos: Lista de textos para generar embeddings
             
         Returns:
-            List[List[float]]: Lista de vectores de embedding
+            MatrizVectores: Matriz de embeddings, una fila por texto
+            
+        Raises:
+            ValueError: Si algún texto está vacío
         """
         if not textos:
-            return []
-        
-        # Filtrar textos vacíos
-        textos_validos = [texto.strip() for texto in textos if texto and texto.strip()]
+            return np.empty((0, self.obtener_dimension_embedding()), dtype=np.float32)
         
-        if not textos_validos:
-            raise ValueError("No hay textos válidos para procesar")
+        # Los llamantes emparejan la fila i con el texto i: un texto vacío
+        # no se puede omitir sin desalinear el resto
+        textos_validos = [texto.strip() if texto else "" for texto in textos]
+        for posicion, texto in enumerate(textos_validos):
+            if not texto:
+                raise ValueError(f"El texto en la posición {posicion} está vacío")
         
+        plazo = plazo_actual()
         try:
             # Ejecutar encoding batch en un hilo separado
             def _encode_batch():
+                if plazo is not None:
+                    plazo.comprobar()
                 embeddings = self.model.encode(textos_validos)
-                return [embedding.tolist() for embedding in embeddings]
+                # encode ya devuelve float32 contiguo: no se copia
+                return np.ascontiguousarray(embeddings, dtype=np.float32)
             
-            loop = asyncio.get_event_loop()
-            embeddings = await loop.run_in_executor(None, _encode_batch)
+            embeddings = await self.ejecutor.ejecutar(_encode_batch)
             return embeddings
             
+        except PlazoAgotadoError as e:
+            raise e
         except Exception as e:
             raise Exception(f"Error generando embeddings batch: {str(e)}")
     
@@ -142,5 +168,6 @@ class SentenceTransformerEmbeddingService(EmbeddingService):
             "nombre": self.model_name,
             "dimension": self._dimension,
             "inicializado": self.model is not None,
+            "backend": self.backend,
             "tipo": "SentenceTransformer"
         }
\ No newline at end of file
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Optional
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+
+
+class MonitorEventLoop:
+    """
+    Mide cuánto tarda el event loop en atender una tarea lista.
+
+    Una tarea en segundo plano duerme `intervalo` segundos y anota cuánto
+    tarde se despierta: ese retraso es lo que espera cualquier petición
+    para empezar a ejecutarse. `retraso` sube en cuanto llega una muestra
+    mayor y baja poco a poco (`decaimiento` por muestra), así que un pico
+    se tiene en cuenta durante un rato en vez de olvidarse en la siguiente
+    muestra.
+
+    Publica el retraso actual (`event_loop_retraso_segundos`) y cada muestra
+    en su propio histograma, separado de las etapas de las peticiones.
+    """
+
+    def __init__(
+        self,
+        metricas: Optional[MetricasService] = None,
+        intervalo: float = 0.05,
+        decaimiento: float = 0.9
+    ):
+        if intervalo <= 0:
+            raise ValueError("El intervalo del monitor debe ser positivo")
+        if not 0.0 <= decaimiento < 1.0:
+            raise ValueError("El decaimiento debe estar entre 0 y 1")
+        self.metricas = metricas or MetricasNulas()
+        self.intervalo = intervalo
+        self.decaimiento = decaimiento
+        self._retraso = 0.0
+        self._tarea: Optional[asyncio.Task] = None
+
+    @property
+    def retraso(self) -> float:
+        """Retraso reciente del event loop, en segundos."""
+        return self._retraso
+
+    def registrar_muestra(self, muestra: float):
+        self._retraso = max(muestra, self._retraso * self.decaimiento)
+        self.metricas.observar_retraso_event_loop(muestra)
+        self.metricas.fijar("event_loop_retraso_segundos", self._retraso)
+
+    async def iniciar(self):
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._bucle(), name="monitor-event-loop")
+
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+
+    async def _bucle(self):
+        while True:
+            esperado = time.perf_counter() + self.intervalo
+            await asyncio.sleep(self.intervalo)
+            self.registrar_muestra(max(0.0, time.perf_counter() - esperado))
\ No newline at end of file
@@ -0,0 +1,132 @@
+import os
+import threading
+from typing import Dict, Tuple
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    CONTENT_TYPE_LATEST
+)
+from prometheus_client import multiprocess
+from ...domain.services.metricas_service import MetricasService
+
+
+# Desde 1 ms (embedding de una pregunta) hasta 60 s (generación completa)
+BUCKETS_ETAPAS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# El retraso del event loop sano está por debajo del milisegundo
+BUCKETS_RETRASO_EVENT_LOOP = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+class PrometheusMetricasService(MetricasService):
+    """
+    Métricas en formato Prometheus.
+
+    Con varios workers de uvicorn se debe exportar la variable de entorno
+    `PROMETHEUS_MULTIPROC_DIR` (un directorio vacío y escribible) antes de
+    arrancar: cada proceso escribe sus valores en ese directorio y
+    `exportar()` los agrega.
+    """
+
+    def __init__(self, prefijo: str = "rag"):
+        self.prefijo = prefijo
+        self.registry = CollectorRegistry()
+        self._contadores: Dict[str, Counter] = {}
+        self._indicadores: Dict[str, Gauge] = {}
+        self._lock = threading.Lock()
+
+        self._etapas = Histogram(
+            f"{prefijo}_etapa_duracion_segundos",
+            "Duración de cada etapa del pipeline RAG",
+            labelnames=["etapa"],
+            buckets=BUCKETS_ETAPAS,
+            registry=self.registry
+        )
+        # Las muestras del monitor del event loop llegan cada pocos ms y no
+        # pertenecen a ninguna petición: van aparte de las etapas
+        self._retraso_event_loop = Histogram(
+            f"{prefijo}_event_loop_retraso_muestras_segundos",
+            "Muestras del retraso del event loop",
+            buckets=BUCKETS_RETRASO_EVENT_LOOP,
+            registry=self.registry
+        )
+
+        # Declarar de antemano las series principales para que se exporten
+        # desde el arranque aunque todavía valgan 0
+        self._crear_contador("peticiones", ("operacion",))
+        self._crear_contador("errores", ("operacion",))
+        self._crear_contador("cache_aciertos", ("cache",))
+        self._crear_contador("cancelaciones", ("motivo", "operacion"))
+        self._crear_contador("ejecutor_saturaciones", ("ejecutor",))
+        # Cada proceso tiene sus propios ejecutores: se suma lo de todos
+        self._crear_indicador("ejecutor_pendientes", ("ejecutor",), modo_multiproceso="livesum")
+        self._crear_indicador("ejecutor_en_curso", ("ejecutor",), modo_multiproceso="livesum")
+        self._crear_contador("peticiones_rechazadas", ("motivo", "prioridad", "ruta"))
+        self._crear_indicador("peticiones_en_curso", ("ruta",), modo_multiproceso="livesum")
+        # El retraso y los umbrales son de cada worker: se exporta el mayor
+        self._crear_indicador("event_loop_retraso_segundos", (), modo_multiproceso="livemax")
+        self._crear_indicador("umbral_carga", ("umbral",), modo_multiproceso="livemax")
+        # La cola vive en una base compartida: todos los procesos ven el mismo valor
+        self._crear_indicador("cola_ingesta_pendientes", (), modo_multiproceso="livemax")
+
+    def observar_etapa(self, etapa: str, segundos: float):
+        self._etapas.labels(etapa=etapa).observe(segundos)
+
+    def observar_retraso_event_loop(self, segundos: float):
+        self._retraso_event_loop.observe(segundos)
+
+    def incrementar(self, contador: str, valor: float = 1.0, **etiquetas: str):
+        metrica = self._contadores.get(contador)
+        if metrica is None:
+            metrica = self._crear_contador(contador, tuple(sorted(etiquetas)))
+        (metrica.labels(**etiquetas) if etiquetas else metrica).inc(valor)
+
+    def fijar(self, indicador: str, valor: float, **etiquetas: str):
+        metrica = self._indicadores.get(indicador)
+        if metrica is None:
+            metrica = self._crear_indicador(indicador, tuple(sorted(etiquetas)))
+        (metrica.labels(**etiquetas) if etiquetas else metrica).set(valor)
+
+    def exportar(self) -> Tuple[bytes, str]:
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry), CONTENT_TYPE_LATEST
+        return generate_latest(self.registry), CONTENT_TYPE_LATEST
+
+    def _crear_contador(self, nombre: str, etiquetas: Tuple[str, ...]) -> Counter:
+        with self._lock:
+            if nombre not in self._contadores:
+                self._contadores[nombre] = Counter(
+                    f"{self.prefijo}_{nombre}",
+                    f"Contador de {nombre.replace('_', ' ')}",
+                    labelnames=etiquetas,
+                    registry=self.registry
+                )
+            return self._contadores[nombre]
+
+    def _crear_indicador(
+        self,
+        nombre: str,
+        etiquetas: Tuple[str, ...],
+        modo_multiproceso: str = "livesum"
+    ) -> Gauge:
+        with self._lock:
+            if nombre not in self._indicadores:
+                self._indicadores[nombre] = Gauge(
+                    f"{self.prefijo}_{nombre}",
+                    f"Valor actual de {nombre.replace('_', ' ')}",
+                    labelnames=etiquetas,
+                    registry=self.registry,
+                    # Con varios procesos, por defecto se suman los de los vivos
+                    multiprocess_mode=modo_multiproceso
+                )
+            return self._indicadores[nombre]
\ No newline at end of file
@@ -0,0 +1,55 @@
+import json
+import logging
+import random
+from typing import Optional
+from ...domain.services.traza import Traza
+
+
+class RegistroTrazas:
+    """
+    Guarda una muestra de las trazas de petición para análisis offline.
+
+    Cada traza muestreada se escribe como una línea JSON con sus spans
+    (nombre, inicio y duración en milisegundos) en `ruta_archivo`.
+    """
+
+    def __init__(self, ruta_archivo: str, tasa_muestreo: float = 0.01):
+        if not 0.0 <= tasa_muestreo <= 1.0:
+            raise ValueError("La tasa de muestreo debe estar entre 0 y 1")
+
+        self.tasa_muestreo = tasa_muestreo
+        # El logging es thread-safe y no comparte el formato del log de la app
+        self._logger = logging.getLogger(f"{__name__}.{ruta_archivo}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        if not self._logger.handlers:
+            handler = logging.FileHandler(ruta_archivo, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+
+    def debe_muestrear(self) -> bool:
+        return self.tasa_muestreo > 0 and random.random() < self.tasa_muestreo
+
+    def registrar(
+        self,
+        traza: Traza,
+        metodo: str,
+        ruta: str,
+        estado: Optional[int] = None
+    ):
+        """Escribe la traza como una línea JSON."""
+        self._logger.info(json.dumps({
+            "traza_id": traza.id,
+            "metodo": metodo,
+            "ruta": ruta,
+            "estado": estado,
+            "duracion_ms": round(traza.duracion_total() * 1000, 2),
+            "spans": [
+                {
+                    "nombre": span.nombre,
+                    "inicio_ms": round(span.inicio * 1000, 2),
+                    "duracion_ms": round(span.duracion * 1000, 2)
+                }
+                for span in traza.spans
+            ]
+        }, ensure_ascii=False))
\ No newline at end of file
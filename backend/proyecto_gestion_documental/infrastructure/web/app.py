@@ -0,0 +1,301 @@
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from ..config import Configuracion
+from ..database.chroma_cliente import crear_cliente_http
+from ..database.chroma_repository import ChromaDocumentoRepository
+from ..database.numpy_repository import NumpyDocumentoRepository
+from ..database.sharded_repository import ShardedDocumentoRepository
+from ..database.npy_snapshot_repository import NpySnapshotRepository
+from ..database.registro_documento_repository import RegistroDocumentoRepository
+from ..database.segmentos_registro_ingesta import SegmentosRegistroIngesta
+from ..database.sqlite_trabajo_ingesta_repository import SQLiteTrabajoIngestaRepository
+from ..external_services.sentence_transformer_service import SentenceTransformerEmbeddingService
+from ..external_services.ollama_service import OllamaLLMService
+from ..external_services.ollama_pool_service import OllamaPoolLLMService
+from ..external_services.router_llm_service import RouterLLMService, RutaLLM
+from ..external_services.extractores_texto import (
+    PdfExtractorTexto,
+    DocxExtractorTexto,
+    TxtExtractorTexto
+)
+from ..observability.prometheus_metricas_service import PrometheusMetricasService
+from ..observability.registro_trazas import RegistroTrazas
+from ..observability.monitor_event_loop import MonitorEventLoop
+from ..workers.ingesta_worker import IngestaWorker
+from ..workers.ejecutor import Ejecutor
+from .controllers.documento_controller import DocumentoController
+from .controllers.admin_controller import AdminController
+from .controllers.metricas_controller import MetricasController
+from .traza_middleware import TrazaMiddleware
+from .control_carga_middleware import ControlCargaMiddleware, UmbralesCarga
+from ...application.use_cases.upload_document_use_case import UploadDocumentUseCase
+from ...application.use_cases.search_documents_use_case import SearchDocumentsUseCase
+from ...application.use_cases.list_documents_use_case import ListDocumentsUseCase
+from ...application.use_cases.enqueue_document_use_case import EnqueueDocumentUseCase
+from ...application.use_cases.process_ingestion_use_case import ProcessIngestionUseCase
+from ...application.use_cases.ingest_file_use_case import IngestFileUseCase
+from ...application.use_cases.rebuild_index_use_case import RebuildIndexUseCase
+from ...application.use_cases.snapshot_use_case import SnapshotUseCase
+from ...domain.entities.parametros_indice import ParametrosIndice
+from ...domain.services.llm_service import LLMService
+from ...domain.services.metricas_service import MetricasService
+from ...domain.services.respondedor_extractivo import RespondedorExtractivo
+from ...domain.services.seleccion_adaptativa import SelectorAdaptativo
+
+
+def crear_documento_repository(
+    configuracion: Configuracion,
+    embedding_service,
+    ejecutor_io: Optional[Ejecutor] = None
+):
+    """Repositorio del motor configurado; con varios shards, uno por shard detrás de un reparto."""
+    if configuracion.motor_busqueda not in ("chroma", "numpy"):
+        raise ValueError(f"Motor de búsqueda desconocido: {configuracion.motor_busqueda}")
+    if (configuracion.shards_urls or configuracion.chroma_url) and configuracion.motor_busqueda != "chroma":
+        raise ValueError("Los servidores Chroma remotos requieren el motor chroma")
+
+    parametros_indice = ParametrosIndice(
+        espacio=configuracion.indice_espacio,
+        m=configuracion.indice_m,
+        ef_construccion=configuracion.indice_ef_construccion,
+        ef_busqueda=configuracion.indice_ef_busqueda
+    )
+
+    def _shard(sufijo: str = "", url: Optional[str] = None):
+        if configuracion.motor_busqueda == "numpy":
+            return NumpyDocumentoRepository(
+                embedding_service,
+                directorio=configuracion.numpy_directorio + sufijo,
+                tipo_vector=configuracion.numpy_tipo_vector,
+                factor_reevaluacion=configuracion.numpy_factor_reevaluacion,
+                ejecutor=ejecutor_io
+            )
+        cliente = None
+        if url is not None:
+            cliente = crear_cliente_http(
+                url,
+                conexiones=configuracion.chroma_conexiones,
+                reintentos=configuracion.chroma_reintentos,
+                timeout=configuracion.chroma_timeout
+            )
+        return ChromaDocumentoRepository(
+            embedding_service,
+            collection_name=configuracion.coleccion + sufijo,
+            chroma_client=cliente,
+            parametros_indice=parametros_indice,
+            ejecutor=ejecutor_io,
+            tamano_lote_escritura=configuracion.chroma_lote_escritura,
+            bloqueo_lecturas=configuracion.chroma_bloqueo_lecturas
+        )
+
+    # Cada servidor Chroma es un proceso aparte con su propio shard
+    if configuracion.shards_urls:
+        return ShardedDocumentoRepository([_shard(url=url) for url in configuracion.shards_urls])
+    if configuracion.numero_shards > 1:
+        return ShardedDocumentoRepository([
+            _shard(f"_shard{i}", configuracion.chroma_url) for i in range(configuracion.numero_shards)
+        ])
+    # Con un servidor compartido, varios workers de uvicorn ven el mismo índice
+    return _shard(url=configuracion.chroma_url)
+
+
+def crear_registro_ingesta(
+    configuracion: Configuracion,
+    ejecutor_io: Optional[Ejecutor] = None
+) -> SegmentosRegistroIngesta:
+    """Registro de ingesta del directorio configurado (`RAG_REGISTRO_DIRECTORIO`)."""
+    if not configuracion.registro_directorio:
+        raise ValueError("No hay registro de ingesta configurado (RAG_REGISTRO_DIRECTORIO)")
+    return SegmentosRegistroIngesta(
+        configuracion.registro_directorio,
+        tamano_segmento=configuracion.registro_tamano_segmento_mb * 1024 * 1024,
+        espera_fsync=configuracion.registro_espera_fsync_ms / 1000,
+        ejecutor=ejecutor_io
+    )
+
+
+def crear_llm_service(configuracion: Configuracion, metricas: MetricasService) -> LLMService:
+    """Servicio LLM configurado: un Ollama, un pool o un router entre dos modelos."""
+    def _ollama(urls: List[str], modelo: str) -> LLMService:
+        # Con varios servidores de Ollama se reparte la carga entre ellos
+        if len(urls) > 1:
+            return OllamaPoolLLMService(
+                urls,
+                model_name=modelo,
+                timeout=configuracion.ollama_timeout,
+                metricas=metricas
+            )
+        return OllamaLLMService(
+            base_url=urls[0],
+            model_name=modelo,
+            timeout=configuracion.ollama_timeout,
+            metricas=metricas
+        )
+
+    principal = _ollama(configuracion.ollama_urls, configuracion.ollama_modelo)
+    if not configuracion.router_modelo_rapido:
+        return principal
+
+    # Las preguntas fáciles van al modelo rápido; el resto, al principal
+    rapida = RutaLLM(
+        "rapida",
+        _ollama(
+            configuracion.router_urls_rapido or configuracion.ollama_urls,
+            configuracion.router_modelo_rapido
+        ),
+        max_palabras=configuracion.router_max_palabras,
+        similitud_minima=configuracion.router_similitud_minima,
+        margen_minimo=configuracion.router_margen_minimo
+    )
+    return RouterLLMService([rapida], RutaLLM("completa", principal), metricas=metricas)
+
+
+def crear_app(configuracion: Optional[Configuracion] = None) -> FastAPI:
+    """
+    Construye la aplicación FastAPI con todas sus dependencias.
+
+    Uso (desde `backend/`):
+        uvicorn proyecto_gestion_documental.infrastructure.web.app:crear_app --factory
+    """
+    configuracion = configuracion or Configuracion.desde_entorno()
+
+    metricas = PrometheusMetricasService(prefijo=configuracion.metricas_prefijo)
+    # Cada tipo de trabajo bloqueante tiene sus hilos: una ráfaga de E/S lenta
+    # no deja sin hilos al embedding de las consultas
+    ejecutor_embeddings = Ejecutor("embeddings", configuracion.ejecutor_embeddings_hilos, metricas)
+    ejecutor_io = Ejecutor("io", configuracion.ejecutor_io_hilos, metricas)
+    # pypdf es CPU: un PDF grande no debe ocupar los hilos de E/S del índice
+    ejecutor_extraccion = Ejecutor("extraccion", configuracion.ejecutor_extraccion_hilos, metricas)
+    embedding_service = SentenceTransformerEmbeddingService(
+        configuracion.modelo_embeddings,
+        backend=configuracion.backend_embeddings,
+        ejecutor=ejecutor_embeddings
+    )
+    documento_repository = crear_documento_repository(configuracion, embedding_service, ejecutor_io)
+
+    # Cada escritura se anota en el registro antes de llegar al índice
+    registro_ingesta = None
+    if configuracion.registro_directorio:
+        registro_ingesta = crear_registro_ingesta(configuracion, ejecutor_io)
+        documento_repository = RegistroDocumentoRepository(
+            documento_repository,
+            registro_ingesta,
+            embedding_service if configuracion.registro_embeddings else None
+        )
+
+    llm_service = crear_llm_service(configuracion, metricas)
+
+    trabajo_repository = SQLiteTrabajoIngestaRepository(configuracion.ingestas_db_url, ejecutor_io)
+    worker = IngestaWorker(
+        ProcessIngestionUseCase(trabajo_repository, documento_repository),
+        trabajo_repository,
+        paralelismo=configuracion.worker_paralelismo,
+        tamano_lote=configuracion.worker_tamano_lote,
+        tiempo_concesion=configuracion.worker_concesion,
+        metricas=metricas
+    )
+
+    documento_controller = DocumentoController(
+        upload_use_case=UploadDocumentUseCase(documento_repository, embedding_service),
+        search_use_case=SearchDocumentsUseCase(
+            documento_repository,
+            embedding_service,
+            llm_service,
+            metricas=metricas,
+            timeout_por_defecto=configuracion.consulta_timeout,
+            respondedor_extractivo=RespondedorExtractivo(
+                embedding_service,
+                metricas=metricas,
+                max_frases=configuracion.extractivo_frases,
+                tamano_cache=configuracion.extractivo_cache
+            ),
+            extractivo_como_respaldo=configuracion.extractivo_respaldo,
+            selector_adaptativo=SelectorAdaptativo(
+                similitud_minima=configuracion.adaptativo_similitud_minima,
+                caida_maxima=configuracion.adaptativo_caida,
+                mmr_lambda=configuracion.adaptativo_mmr,
+                umbral_redundancia=configuracion.adaptativo_redundancia
+            ),
+            adaptativo_por_defecto=configuracion.adaptativo
+        ),
+        list_use_case=ListDocumentsUseCase(documento_repository),
+        enqueue_use_case=EnqueueDocumentUseCase(trabajo_repository, al_encolar=worker.notificar),
+        ingest_file_use_case=IngestFileUseCase(
+            documento_repository,
+            [PdfExtractorTexto(), DocxExtractorTexto(), TxtExtractorTexto()],
+            ejecutor_extraccion
+        )
+    )
+
+    monitor = MonitorEventLoop(metricas, intervalo=configuracion.carga_intervalo_monitor)
+
+    @asynccontextmanager
+    async def ciclo_de_vida(app: FastAPI):
+        if registro_ingesta is not None:
+            await registro_ingesta.abrir()
+        await worker.iniciar()
+        await monitor.iniciar()
+        try:
+            yield
+        finally:
+            await monitor.detener()
+            await worker.detener()
+            await llm_service.cerrar()
+            if registro_ingesta is not None:
+                await registro_ingesta.cerrar()
+            ejecutor_embeddings.cerrar()
+            ejecutor_io.cerrar()
+            ejecutor_extraccion.cerrar()
+
+    app = FastAPI(title="Gestión Documental Inteligente API", lifespan=ciclo_de_vida)
+    # El más interno: los rechazos llevan también las cabeceras CORS y Server-Timing
+    app.add_middleware(
+        ControlCargaMiddleware,
+        monitor=monitor,
+        router=app.router,
+        umbrales=UmbralesCarga(
+            retraso_baja=configuracion.carga_retraso_baja,
+            retraso_normal=configuracion.carga_retraso_normal,
+            en_curso_baja=configuracion.carga_en_curso_baja,
+            en_curso_normal=configuracion.carga_en_curso_normal,
+            reintentar_tras=configuracion.carga_reintentar_tras,
+            rutas_baja=configuracion.carga_rutas_baja
+        ),
+        metricas=metricas
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=configuracion.cors_origenes,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Para que los clientes web puedan leer el desglose de tiempos y cuándo reintentar
+        expose_headers=["Server-Timing", "Retry-After"],
+    )
+    registro_trazas = None
+    if configuracion.trazas_archivo:
+        registro_trazas = RegistroTrazas(
+            configuracion.trazas_archivo,
+            tasa_muestreo=configuracion.trazas_muestreo
+        )
+    app.add_middleware(TrazaMiddleware, registro=registro_trazas)
+    app.include_router(documento_controller.get_router())
+    app.include_router(MetricasController(metricas).get_router())
+    app.include_router(AdminController(
+        RebuildIndexUseCase(documento_repository),
+        token_admin=configuracion.token_admin,
+        snapshot_use_case=SnapshotUseCase(
+            documento_repository,
+            NpySnapshotRepository(configuracion.snapshots_directorio, ejecutor_io),
+            embedding_service.obtener_modelo_usado()
+        )
+    ).get_router())
+
+    # Accesibles para pruebas y para los controladores que se añadan
+    app.state.configuracion = configuracion
+    app.state.metricas = metricas
+    app.state.worker = worker
+    app.state.monitor = monitor
+    return app
\ No newline at end of file
@@ -0,0 +1,141 @@
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from starlette.responses import JSONResponse
+from starlette.routing import Match, Router
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+from ..observability.monitor_event_loop import MonitorEventLoop
+
+
+PRIORIDAD_BAJA = "baja"
+PRIORIDAD_NORMAL = "normal"
+PRIORIDAD_EXENTA = "exenta"
+
+MOTIVO_RETRASO = "retraso"
+MOTIVO_EN_CURSO = "en_curso"
+
+RUTA_DESCONOCIDA = "otra"
+
+
+@dataclass
+class UmbralesCarga:
+    """
+    Umbrales a partir de los cuales se rechazan peticiones.
+
+    Un umbral sin valor (None) no se comprueba. Las de prioridad baja se
+    rechazan con los umbrales `*_baja`; el resto (salvo las exentas), con
+    los `*_normal`, que deberían ser más altos.
+    """
+    retraso_baja: Optional[float] = 0.1       # segundos de retraso del event loop
+    retraso_normal: Optional[float] = 1.0
+    en_curso_baja: Optional[int] = 64         # peticiones en curso en el worker
+    en_curso_normal: Optional[int] = None
+    reintentar_tras: int = 2                  # segundos mínimos de Retry-After
+    # "MÉTODO /ruta" tal como se declara en el router
+    rutas_baja: List[str] = field(default_factory=lambda: ["GET /documentos/", "POST /busqueda/batch"])
+    rutas_exentas: List[str] = field(default_factory=lambda: ["/metrics", "/admin"])  # prefijos
+
+
+class ControlCargaMiddleware:
+    """
+    Middleware ASGI que rechaza peticiones cuando el worker está saturado.
+
+    Cuenta las peticiones en curso por ruta (`peticiones_en_curso`) y, con
+    el retraso del event loop que mide `monitor`, decide antes de atender
+    cada petición: primero se rechazan las de prioridad baja (listados y
+    lotes) para que las consultas interactivas mantengan su latencia, y
+    solo con más carga las demás. El rechazo es un 503 con `Retry-After` y
+    se cuenta en `peticiones_rechazadas`. Los umbrales se publican como
+    `umbral_carga` para verlos junto a los valores medidos.
+    """
+
+    def __init__(
+        self,
+        app,
+        monitor: MonitorEventLoop,
+        router: Router,
+        umbrales: Optional[UmbralesCarga] = None,
+        metricas: Optional[MetricasService] = None
+    ):
+        self.app = app
+        self.monitor = monitor
+        self.router = router
+        self.umbrales = umbrales or UmbralesCarga()
+        self.metricas = metricas or MetricasNulas()
+        self._rutas_baja = set(self.umbrales.rutas_baja)
+        self._en_curso: Dict[str, int] = defaultdict(int)
+        self._total_en_curso = 0
+
+        for nombre in ("retraso_baja", "retraso_normal", "en_curso_baja", "en_curso_normal"):
+            valor = getattr(self.umbrales, nombre)
+            if valor is not None:
+                self.metricas.fijar("umbral_carga", valor, umbral=nombre)
+
+    @property
+    def total_en_curso(self) -> int:
+        return self._total_en_curso
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ruta = self._ruta(scope)
+        prioridad = self._prioridad(scope["method"], ruta)
+        if prioridad != PRIORIDAD_EXENTA:
+            motivo = self._motivo_rechazo(prioridad)
+            if motivo is not None:
+                self.metricas.incrementar("peticiones_rechazadas", ruta=ruta, prioridad=prioridad, motivo=motivo)
+                await self._rechazar(scope, receive, send)
+                return
+
+        self._cambiar_en_curso(ruta, 1)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._cambiar_en_curso(ruta, -1)
+
+    def _motivo_rechazo(self, prioridad: str) -> Optional[str]:
+        """Motivo por el que se rechaza una petición de esta prioridad, o None si se atiende."""
+        if prioridad == PRIORIDAD_BAJA:
+            max_retraso, max_en_curso = self.umbrales.retraso_baja, self.umbrales.en_curso_baja
+        else:
+            max_retraso, max_en_curso = self.umbrales.retraso_normal, self.umbrales.en_curso_normal
+
+        if max_retraso is not None and self.monitor.retraso > max_retraso:
+            return MOTIVO_RETRASO
+        if max_en_curso is not None and self._total_en_curso >= max_en_curso:
+            return MOTIVO_EN_CURSO
+        return None
+
+    async def _rechazar(self, scope, receive, send):
+        # El retraso baja poco a poco: no tiene sentido volver antes de que se disipe
+        reintentar = max(self.umbrales.reintentar_tras, math.ceil(self.monitor.retraso))
+        respuesta = JSONResponse(
+            status_code=503,
+            content={"detail": "Servidor saturado, reintente más tarde"},
+            headers={"Retry-After": str(reintentar)}
+        )
+        await respuesta(scope, receive, send)
+
+    def _ruta(self, scope) -> str:
+        """Ruta declarada que atenderá la petición (p. ej. `/documentos/{documento_id}`)."""
+        for ruta in self.router.routes:
+            coincidencia, _ = ruta.matches(scope)
+            if coincidencia == Match.FULL:
+                return ruta.path
+        # Sin ruta (404, 405): una sola serie para no multiplicar etiquetas
+        return RUTA_DESCONOCIDA
+
+    def _prioridad(self, metodo: str, ruta: str) -> str:
+        if any(ruta.startswith(prefijo) for prefijo in self.umbrales.rutas_exentas):
+            return PRIORIDAD_EXENTA
+        if f"{metodo} {ruta}" in self._rutas_baja:
+            return PRIORIDAD_BAJA
+        return PRIORIDAD_NORMAL
+
+    def _cambiar_en_curso(self, ruta: str, cambio: int):
+        self._en_curso[ruta] += cambio
+        self._total_en_curso += cambio
+        self.metricas.fijar("peticiones_en_curso", self._en_curso[ruta], ruta=ruta)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import secrets
+from fastapi import APIRouter, HTTPException, Depends, Header, Response
+from typing import Optional
+from ....application.use_cases.rebuild_index_use_case import RebuildIndexUseCase
+from ....application.use_cases.snapshot_use_case import SnapshotUseCase
+from ....application.dto.indice_dto import ParametrosIndiceDTO, EstadoIndiceResponse
+from ....application.dto.snapshot_dto import SnapshotRequest, SnapshotsListResponse, EstadoSnapshotResponse
+
+
+class AdminController:
+    """Controlador para operaciones de administración del índice."""
+
+    def __init__(
+        self,
+        rebuild_index_use_case: RebuildIndexUseCase,
+        token_admin: Optional[str] = None,
+        snapshot_use_case: Optional[SnapshotUseCase] = None
+    ):
+        self.rebuild_index_use_case = rebuild_index_use_case
+        self.snapshot_use_case = snapshot_use_case
+        # Sin token configurado los endpoints quedan abiertos (solo para desarrollo)
+        self.token_admin = token_admin
+        self.router = APIRouter(prefix="/admin", tags=["Administración"])
+        self._setup_routes()
+
+    def _verificar_token(self, x_admin_token: Optional[str] = Header(default=None)):
+        if self.token_admin is None:
+            return
+        if x_admin_token is None or not secrets.compare_digest(x_admin_token, self.token_admin):
+            raise HTTPException(status_code=401, detail="Token de administración inválido")
+
+    def _setup_routes(self):
+        """Configura las rutas del controlador."""
+
+        @self.router.get(
+            "/indice",
+            response_model=EstadoIndiceResponse,
+            summary="Parámetros del índice y estado de la reconstrucción",
+            dependencies=[Depends(self._verificar_token)]
+        )
+        async def obtener_indice():
+            try:
+                return await self.rebuild_index_use_case.obtener_estado()
+
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @self.router.post(
+            "/indice/reconstruir",
+            response_model=EstadoIndiceResponse,
+            status_code=202,
+            summary="Reconstruir el índice con nuevos parámetros",
+            dependencies=[Depends(self._verificar_token)]
+        )
+        async def reconstruir_indice(parametros: ParametrosIndiceDTO, response: Response):
+            """
+            Lanza la reconstrucción en segundo plano y responde 202. Las búsquedas
+            siguen usando el índice actual hasta que termina.
+            """
+            try:
+                resultado = await self.rebuild_index_use_case.execute(parametros)
+                response.headers["Location"] = "/admin/indice"
+                return resultado
+
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        if self.snapshot_use_case is not None:
+            self._setup_snapshot_routes()
+
+    def _setup_snapshot_routes(self):
+        """Configura las rutas de exportación e importación de snapshots."""
+
+        @self.router.get(
+            "/snapshots",
+            response_model=SnapshotsListResponse,
+            summary="Listar snapshots del corpus",
+            dependencies=[Depends(self._verificar_token)]
+        )
+        async def listar_snapshots():
+            try:
+                return await self.snapshot_use_case.listar()
+
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @self.router.get(
+            "/snapshots/estado",
+            response_model=EstadoSnapshotResponse,
+            summary="Estado de la última exportación o importación",
+            dependencies=[Depends(self._verificar_token)]
+        )
+        async def obtener_estado_snapshot():
+            return await self.snapshot_use_case.obtener_estado()
+
+        @self.router.post(
+            "/snapshots/exportar",
+            response_model=EstadoSnapshotResponse,
+            status_code=202,
+            summary="Exportar el corpus con sus embeddings",
+            dependencies=[Depends(self._verificar_token)]
+        )
+        async def exportar_snapshot(request: SnapshotRequest, response: Response):
+            """Escribe el snapshot en segundo plano y responde 202."""
+            try:
+                resultado = await self.snapshot_use_case.iniciar_exportacion(request)
+                response.headers["Location"] = "/admin/snapshots/estado"
+                return resultado
+
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+        @self.router.post(
+            "/snapshots/importar",
+            response_model=EstadoSnapshotResponse,
+            status_code=202,
+            summary="Importar un snapshot sin volver a vectorizar",
+            dependencies=[Depends(self._verificar_token)]
+        )
+        async def importar_snapshot(request: SnapshotRequest, response: Response):
+            """Carga el snapshot en el índice en segundo plano y responde 202."""
+            try:
+                resultado = await self.snapshot_use_case.iniciar_importacion(request)
+                response.headers["Location"] = "/admin/snapshots/estado"
+                return resultado
+
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+
+    def get_router(self) -> APIRouter:
+        """Retorna el router configurado."""
+        return self.router
\ No newline at end of file
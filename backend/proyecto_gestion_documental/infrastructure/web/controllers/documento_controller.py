@@ -1,17 +1,66 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from typing import Optional, Union
 from ....application.use_cases.upload_document_use_case import UploadDocumentUseCase
+from ....application.use_cases.enqueue_document_use_case import EnqueueDocumentUseCase
+from ....application.use_cases.ingest_file_use_case import IngestFileUseCase
 from ....application.use_cases.search_documents_use_case import SearchDocumentsUseCase
 from ....application.use_cases.list_documents_use_case import ListDocumentsUseCase
 from ....application.dto.documento_request import DocumentoCreateRequest
+from ....domain.entities.trabajo_ingesta import ESTADO_COMPLETADO, ESTADO_ERROR
+from ....domain.services.plazo import PlazoAgotadoError
 from ....application.dto.consulta_response import (
     ConsultaRequest, 
     ConsultaResponse, 
     DocumentoCreateResponse,
-    DocumentosListResponse
+    DocumentosListResponse,
+    BusquedaResponse,
+    BusquedaBatchRequest,
+    BusquedaBatchResponse,
+    TrabajoIngestaResponse,
+    IngestaArchivoResponse
 )
 
 
+# Código (no estándar, el de nginx) de las peticiones que el cliente abandonó
+ESTADO_CLIENTE_DESCONECTADO = 499
+
+
+async def _esperar_desconexion(request: Request):
+    """Termina cuando el cliente cierra la conexión."""
+    while True:
+        mensaje = await request.receive()
+        if mensaje["type"] == "http.disconnect":
+            return
+
+
+async def ejecutar_cancelable(request: Request, operacion):
+    """
+    Ejecuta la operación mientras el cliente siga conectado. Si se
+    desconecta antes, la operación se cancela (y con ella el embedding, la
+    búsqueda o el stream de Ollama en curso) en lugar de terminarla para
+    nadie.
+    """
+    tarea = asyncio.ensure_future(operacion)
+    vigilante = asyncio.ensure_future(_esperar_desconexion(request))
+    try:
+        await asyncio.wait({tarea, vigilante}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        vigilante.cancel()
+        if not tarea.done():
+            tarea.cancel()
+            try:
+                await tarea
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+    if tarea.cancelled():
+        raise HTTPException(status_code=ESTADO_CLIENTE_DESCONECTADO, detail="El cliente cerró la conexión")
+    return tarea.result()
+
+
 class DocumentoController:
     """Controlador para operaciones relacionadas con documentos."""
     
@@ -19,11 +68,18 @@ class DocumentoController:
         self,
         upload_use_case: UploadDocumentUseCase,
         search_use_case: SearchDocumentsUseCase,
-        list_use_case: ListDocumentsUseCase
+        list_use_case: ListDocumentsUseCase,
+        enqueue_use_case: Optional[EnqueueDocumentUseCase] = None,
+        ingest_file_use_case: Optional[IngestFileUseCase] = None,
+        intervalo_eventos: float = 0.5
     ):
         self.upload_use_case = upload_use_case
         self.search_use_case = search_use_case
         self.list_use_case = list_use_case
+        # Si hay cola de ingesta, las subidas se encolan y responden 202
+        self.enqueue_use_case = enqueue_use_case
+        self.ingest_file_use_case = ingest_file_use_case
+        self.intervalo_eventos = intervalo_eventos
         self.router = APIRouter()
         self._setup_routes()
     
@@ -32,12 +88,25 @@ class DocumentoController:
         
         @self.router.post(
             "/documentos/", 
-            response_model=DocumentoCreateResponse,
+            response_model=Union[TrabajoIngestaResponse, DocumentoCreateResponse],
             summary="Subir nuevo documento"
         )
-        async def subir_documento(documento: DocumentoCreateRequest):
-            """Sube un documento y lo vectoriza para búsquedas."""
+        async def subir_documento(
+            documento: DocumentoCreateRequest,
+            response: Response,
+            sincrono: bool = False
+        ):
+            """
+            Sube un documento para vectorizarlo. Con cola de ingesta responde
+            202 con el ID del trabajo; con `sincrono=true` espera a indexarlo.
+            """
             try:
+                if self.enqueue_use_case is not None and not sincrono:
+                    resultado = await self.enqueue_use_case.execute(documento)
+                    response.status_code = 202
+                    response.headers["Location"] = f"/ingestas/{resultado.trabajo_id}"
+                    return resultado
+                
                 resultado = await self.upload_use_case.execute(documento)
                 return resultado
                 
@@ -46,17 +115,71 @@ class DocumentoController:
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
         
+        if self.enqueue_use_case is not None:
+            self._setup_ingesta_routes()
+        
+        if self.ingest_file_use_case is not None:
+            self._setup_archivo_routes()
+        
         @self.router.post(
             "/consultas/", 
             response_model=ConsultaResponse,
             summary="Realizar consulta con RAG"
         )
-        async def realizar_consulta(consulta: ConsultaRequest):
-            """Realiza búsqueda semántica y genera respuesta con LLM."""
+        async def realizar_consulta(consulta: ConsultaRequest, request: Request):
+            """
+            Realiza búsqueda semántica y genera respuesta con LLM. Si el
+            plazo se agota durante la generación, responde solo con las
+            fuentes (`degradado`); si se agota antes, responde 504.
+            """
+            try:
+                resultado = await ejecutar_cancelable(request, self.search_use_case.execute(consulta))
+                return resultado
+                
+            except HTTPException:
+                raise
+            except PlazoAgotadoError as e:
+                raise HTTPException(status_code=504, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @self.router.post(
+            "/busqueda/", 
+            response_model=BusquedaResponse,
+            summary="Búsqueda semántica sin generación con LLM"
+        )
+        async def realizar_busqueda(consulta: ConsultaRequest, request: Request):
+            """Devuelve solo los documentos más similares a la pregunta."""
             try:
-                resultado = await self.search_use_case.execute(consulta)
+                resultado = await ejecutar_cancelable(request, self.search_use_case.buscar(consulta))
                 return resultado
                 
+            except HTTPException:
+                raise
+            except PlazoAgotadoError as e:
+                raise HTTPException(status_code=504, detail=str(e))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @self.router.post(
+            "/busqueda/batch", 
+            response_model=BusquedaBatchResponse,
+            summary="Búsqueda semántica de varias preguntas a la vez"
+        )
+        async def realizar_busqueda_batch(busqueda: BusquedaBatchRequest, request: Request):
+            """Embebe todas las preguntas en batch y consulta el índice una sola vez."""
+            try:
+                resultado = await ejecutar_cancelable(request, self.search_use_case.buscar_batch(busqueda))
+                return resultado
+                
+            except HTTPException:
+                raise
+            except PlazoAgotadoError as e:
+                raise HTTPException(status_code=504, detail=str(e))
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
@@ -101,6 +224,93 @@ class DocumentoController:
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
     
+    def _setup_ingesta_routes(self):
+        """Configura las rutas de seguimiento de la cola de ingesta."""
+        
+        @self.router.get(
+            "/ingestas/{trabajo_id}",
+            response_model=TrabajoIngestaResponse,
+            summary="Estado de un trabajo de ingesta"
+        )
+        async def obtener_ingesta(trabajo_id: str):
+            """Consulta el estado y el progreso de un documento encolado."""
+            try:
+                trabajo = await self.enqueue_use_case.obtener_estado(trabajo_id)
+                
+                if trabajo is None:
+                    raise HTTPException(
+                        status_code=404, 
+                        detail=f"Trabajo {trabajo_id} no encontrado"
+                    )
+                
+                return trabajo
+                
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+        
+        @self.router.get(
+            "/ingestas/{trabajo_id}/eventos",
+            summary="Suscribirse al progreso de un trabajo de ingesta (SSE)"
+        )
+        async def eventos_ingesta(trabajo_id: str, request: Request):
+            """Emite un evento Server-Sent Events cada vez que cambia el trabajo."""
+            trabajo = await self.enqueue_use_case.obtener_estado(trabajo_id)
+            if trabajo is None:
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Trabajo {trabajo_id} no encontrado"
+                )
+            
+            async def _eventos():
+                ultimo = None
+                while True:
+                    actual = await self.enqueue_use_case.obtener_estado(trabajo_id)
+                    clave = (actual.estado, actual.progreso)
+                    if clave != ultimo:
+                        ultimo = clave
+                        yield f"data: {actual.model_dump_json()}\n\n"
+                    if actual.estado in (ESTADO_COMPLETADO, ESTADO_ERROR):
+                        break
+                    if await request.is_disconnected():
+                        break
+                    await asyncio.sleep(self.intervalo_eventos)
+            
+            return StreamingResponse(_eventos(), media_type="text/event-stream")
+    
+    def _setup_archivo_routes(self):
+        """Configura la ruta de subida de archivos."""
+        
+        @self.router.post(
+            "/documentos/archivo",
+            response_model=IngestaArchivoResponse,
+            summary="Subir archivo PDF, DOCX o TXT"
+        )
+        async def subir_archivo(
+            archivo: UploadFile = File(...),
+            titulo: Optional[str] = Form(None),
+            tipo: str = Form("normativo")
+        ):
+            """Extrae el texto del archivo por páginas, lo fragmenta y lo indexa."""
+            try:
+                # UploadFile vuelca a disco los archivos grandes, así que el
+                # archivo nunca está entero en memoria
+                resultado = await self.ingest_file_use_case.execute(
+                    archivo.file,
+                    archivo.filename,
+                    titulo,
+                    tipo
+                )
+                return resultado
+                
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e))
+            finally:
+                await archivo.close()
+    
     def get_router(self) -> APIRouter:
         """Retorna el router configurado."""
         return self.router
\ No newline at end of file
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Response
+from ....domain.services.metricas_service import MetricasService
+
+
+class MetricasController:
+    """Controlador que expone las métricas para Prometheus."""
+
+    def __init__(self, metricas: MetricasService):
+        self.metricas = metricas
+        self.router = APIRouter()
+        self._setup_routes()
+
+    def _setup_routes(self):
+        """Configura las rutas del controlador."""
+
+        @self.router.get(
+            "/metrics",
+            summary="Métricas en formato Prometheus",
+            include_in_schema=False
+        )
+        async def obtener_metricas():
+            contenido, tipo_contenido = self.metricas.exportar()
+            return Response(content=contenido, media_type=tipo_contenido)
+
+    def get_router(self) -> APIRouter:
+        """Retorna el router configurado."""
+        return self.router
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import Optional
+from ...domain.services.traza import iniciar_traza
+from ..observability.registro_trazas import RegistroTrazas
+
+
+class TrazaMiddleware:
+    """
+    Middleware ASGI que abre una traza por petición HTTP.
+
+    Al enviar la respuesta añade la cabecera `Server-Timing` con las etapas
+    medidas y, si la petición sale en la muestra, la guarda en el registro.
+    """
+
+    def __init__(self, app, registro: Optional[RegistroTrazas] = None):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traza = iniciar_traza()
+        estado = None
+
+        async def _send(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+                cabeceras = list(mensaje.get("headers", []))
+                cabeceras.append((b"server-timing", traza.server_timing().encode("latin-1")))
+                mensaje = {**mensaje, "headers": cabeceras}
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            if self.registro is not None and self.registro.debe_muestrear():
+                self.registro.registrar(traza, scope["method"], scope["path"], estado)
\ No newline at end of file
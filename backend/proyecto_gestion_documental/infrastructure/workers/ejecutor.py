@@ -0,0 +1,94 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from ...domain.services.ejecutor_service import EjecutorService
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+
+
+T = TypeVar("T")
+
+
+class Ejecutor(EjecutorService):
+    """
+    Grupo de hilos dedicado a un tipo de trabajo bloqueante (embeddings,
+    E/S bloqueante, hash de contraseñas).
+
+    Cada tipo de trabajo tiene sus propios hilos, así que una cola larga en
+    uno (p. ej. llamadas HTTP lentas) no retrasa a los demás (el embedding de
+    las consultas). Publica la profundidad de su cola (`ejecutor_pendientes`),
+    los trabajos en curso (`ejecutor_en_curso`), cuántas veces llegó trabajo
+    con todos los hilos ocupados (`ejecutor_saturaciones`) y la espera en cola
+    como etapa `espera_<nombre>`.
+
+    El trabajo se ejecuta con el contexto de quien lo envía (traza, plazo) y,
+    si se cancela antes de empezar, no llega a ejecutarse.
+    """
+
+    def __init__(self, nombre: str, hilos: int, metricas: Optional[MetricasService] = None):
+        if hilos < 1:
+            raise ValueError(f"El ejecutor {nombre} necesita al menos un hilo")
+        self.nombre = nombre
+        self.hilos = hilos
+        self.metricas = metricas or MetricasNulas()
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix=f"ejecutor_{nombre}")
+        self._pendientes = 0
+        self._en_curso = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pendientes(self) -> int:
+        """Trabajos enviados que esperan un hilo libre."""
+        return self._pendientes
+
+    @property
+    def en_curso(self) -> int:
+        return self._en_curso
+
+    async def ejecutar(self, funcion: Callable[..., T], *args) -> T:
+        """Ejecuta `funcion(*args)` en un hilo del ejecutor y espera su resultado."""
+        contexto = contextvars.copy_context()
+        enviado = time.perf_counter()
+        with self._lock:
+            saturado = self._pendientes + self._en_curso >= self.hilos
+            self._pendientes += 1
+        if saturado:
+            self.metricas.incrementar("ejecutor_saturaciones", ejecutor=self.nombre)
+        self._publicar()
+
+        def _tarea():
+            with self._lock:
+                self._pendientes -= 1
+                self._en_curso += 1
+            self._publicar()
+            try:
+                return contexto.run(self._ejecutar_medido, time.perf_counter() - enviado, funcion, args)
+            finally:
+                with self._lock:
+                    self._en_curso -= 1
+                self._publicar()
+
+        futuro = self._pool.submit(_tarea)
+        try:
+            return await asyncio.wrap_future(futuro)
+        except asyncio.CancelledError:
+            # Si aún no había empezado, se retira de la cola
+            if futuro.cancel():
+                with self._lock:
+                    self._pendientes -= 1
+                self._publicar()
+            raise
+
+    def cerrar(self):
+        """Descarta el trabajo pendiente y libera los hilos cuando terminen el que tienen en curso."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _ejecutar_medido(self, espera: float, funcion: Callable[..., T], args: tuple) -> T:
+        self.metricas.registrar_etapa(f"espera_{self.nombre}", espera)
+        return funcion(*args)
+
+    def _publicar(self):
+        self.metricas.fijar("ejecutor_pendientes", self._pendientes, ejecutor=self.nombre)
+        self.metricas.fijar("ejecutor_en_curso", self._en_curso, ejecutor=self.nombre)
\ No newline at end of file
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+from ...application.use_cases.process_ingestion_use_case import ProcessIngestionUseCase
+from ...domain.repositories.trabajo_ingesta_repository import TrabajoIngestaRepository
+from ...domain.services.metricas_service import MetricasService, MetricasNulas
+
+
+logger = logging.getLogger(__name__)
+
+
+class IngestaWorker:
+    """
+    Drena la cola de ingesta en segundo plano.
+
+    Lanza `paralelismo` tareas asyncio que reclaman lotes de hasta
+    `tamano_lote` trabajos. Cuando la cola está vacía cada tarea espera
+    `intervalo_espera` segundos antes de volver a consultarla, o hasta que
+    `notificar()` avisa de un trabajo nuevo.
+
+    La cola puede compartirse entre procesos (varios workers de uvicorn),
+    así que un trabajo en 'procesando' solo se reencola cuando lleva
+    `tiempo_concesion` segundos sin actualizarse: su worker murió. Se
+    comprueba al iniciar y, mientras no hay trabajo, cada
+    `tiempo_concesion / 2` segundos. Un lote debe terminar dentro de la
+    concesión; si no, otro worker lo repite (guardar es idempotente).
+    """
+
+    def __init__(
+        self,
+        process_use_case: ProcessIngestionUseCase,
+        trabajo_repository: TrabajoIngestaRepository,
+        paralelismo: int = 2,
+        tamano_lote: int = 16,
+        intervalo_espera: float = 0.5,
+        tiempo_concesion: float = 600.0,
+        metricas: Optional[MetricasService] = None
+    ):
+        if paralelismo < 1:
+            raise ValueError("El paralelismo debe ser al menos 1")
+        if tamano_lote < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        if tiempo_concesion <= 0:
+            raise ValueError("El tiempo de concesión debe ser positivo")
+
+        self.process_use_case = process_use_case
+        self.trabajo_repository = trabajo_repository
+        self.paralelismo = paralelismo
+        self.tamano_lote = tamano_lote
+        self.intervalo_espera = intervalo_espera
+        self.tiempo_concesion = tiempo_concesion
+        self.metricas = metricas or MetricasNulas()
+        self._tareas: List[asyncio.Task] = []
+        self._hay_trabajo = asyncio.Event()
+        self._ultimo_reencolado = 0.0
+
+    async def iniciar(self):
+        """Reencola los trabajos abandonados y arranca las tareas del worker."""
+        if self._tareas:
+            return
+
+        await self._reencolar_abandonados()
+
+        self._tareas = [
+            asyncio.create_task(self._bucle(), name=f"ingesta-worker-{i}")
+            for i in range(self.paralelismo)
+        ]
+
+    async def detener(self):
+        """Detiene las tareas del worker; los lotes a medias se reencolan al caducar su concesión."""
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._tareas = []
+
+    def notificar(self):
+        """Despierta a las tareas en espera (p. ej. justo después de encolar)."""
+        self._hay_trabajo.set()
+
+    @property
+    def en_ejecucion(self) -> bool:
+        return any(not tarea.done() for tarea in self._tareas)
+
+    async def _bucle(self):
+        while True:
+            # Antes de reclamar: un aviso que llegue mientras se procesa no se pierde
+            self._hay_trabajo.clear()
+            try:
+                procesados = await self.process_use_case.execute(self.tamano_lote)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error procesando lote de ingesta")
+                procesados = 0
+
+            await self._publicar_profundidad_cola()
+
+            if procesados == 0:
+                if time.monotonic() - self._ultimo_reencolado >= self.tiempo_concesion / 2:
+                    if await self._reencolar_abandonados():
+                        continue
+                try:
+                    await asyncio.wait_for(self._hay_trabajo.wait(), self.intervalo_espera)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _reencolar_abandonados(self) -> int:
+        self._ultimo_reencolado = time.monotonic()
+        try:
+            reencolados = await self.trabajo_repository.reencolar_en_proceso(self.tiempo_concesion)
+        except Exception:
+            logger.exception("Error reencolando trabajos de ingesta abandonados")
+            return 0
+        if reencolados:
+            logger.info("Reencolados %d trabajos de ingesta abandonados", reencolados)
+        return reencolados
+
+    async def _publicar_profundidad_cola(self):
+        try:
+            pendientes = await self.trabajo_repository.contar_pendientes()
+            self.metricas.fijar("cola_ingesta_pendientes", pendientes)
+        except Exception:
+            logger.exception("Error consultando la profundidad de la cola de ingesta")
\ No newline at end of file
@@ -1,7 +1,11 @@
-from fastapi import FastAPI, HTTPException, Depends
+import os
+import sys
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+import time
 import chromadb
 from sentence_transformers import SentenceTransformer
 import requests
@@ -9,8 +13,38 @@ import json
 from sqlalchemy import create_engine, Column, Integer, String
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from passlib.context import CryptContext
+from domain.services.llm_service import LLMNoDisponibleError
+from infrastructure.external_services.circuit_breaker import CircuitBreaker
+from domain.services.traza import Traza
 
-app = FastAPI(title="Gestión Documental Inteligente API")
+# Los módulos de infraestructura usan imports relativos al paquete: se
+# importan como proyecto_gestion_documental.* (igual que snapshot_corpus.py)
+DIRECTORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DIRECTORIO_BACKEND not in sys.path:
+    sys.path.insert(0, DIRECTORIO_BACKEND)
+
+from proyecto_gestion_documental.infrastructure.config import Configuracion
+from proyecto_gestion_documental.infrastructure.observability.prometheus_metricas_service import PrometheusMetricasService
+from proyecto_gestion_documental.infrastructure.web.controllers.metricas_controller import MetricasController
+from proyecto_gestion_documental.infrastructure.workers.ejecutor import Ejecutor
+
+configuracion = Configuracion.desde_entorno()
+metricas = PrometheusMetricasService(configuracion.metricas_prefijo)
+# bcrypt es CPU pura y lenta a propósito: con hilos propios, fuera del event
+# loop y sin competir con el resto del trabajo bloqueante
+ejecutor_contrasenas = Ejecutor("contrasenas", configuracion.ejecutor_contrasenas_hilos, metricas)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        yield
+    finally:
+        ejecutor_contrasenas.cerrar()
+
+
+app = FastAPI(title="Gestión Documental Inteligente API", lifespan=lifespan)
+app.include_router(MetricasController(metricas).get_router())
 
 # CORS para Flutter
 app.add_middleware(
@@ -40,7 +74,18 @@ Base.metadata.create_all(bind=engine)
 # Inicializar modelos
 embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
 chroma_client = chromadb.Client()
-collection = chroma_client.create_collection(name="documentos_normativos")
+# Espacio coseno: la similitud se calcula como 1 - distancia
+collection = chroma_client.create_collection(
+    name="documentos_normativos",
+    metadata={"hnsw:space": "cosine"}
+)
+
+# Circuit breaker para no esperar al LLM en cada consulta cuando Ollama está caído
+ollama_breaker = CircuitBreaker(umbral_fallos=3, tiempo_apertura=30.0)
+RESPUESTA_DEGRADADA = (
+    "El servicio de IA no está disponible en este momento. "
+    "Se muestran únicamente los documentos relevantes encontrados."
+)
 
 # Modelos Pydantic
 class DocumentoRequest(BaseModel):
@@ -61,6 +106,8 @@ class RespuestaDocumento(BaseModel):
 class RespuestaConsulta(BaseModel):
     respuesta_ia: str
     documentos_relevantes: List[RespuestaDocumento]
+    degradado: bool = False
+    tiempos_etapas: Optional[Dict[str, float]] = None  # segundos por etapa
 
 # Modelos de Autenticación
 class UsuarioCreate(BaseModel):
@@ -84,7 +131,21 @@ def get_db():
         db.close()
 
 def consultar_ollama(prompt: str) -> str:
-    """Consulta al modelo Llama via Ollama"""
+    """Consulta al modelo Llama via Ollama, protegido por el circuit breaker"""
+    if not ollama_breaker.permitir_peticion():
+        raise LLMNoDisponibleError("Ollama no disponible (circuito abierto)")
+    
+    try:
+        respuesta = _generar_con_ollama(prompt)
+    except Exception as e:
+        ollama_breaker.registrar_fallo()
+        raise LLMNoDisponibleError(f"Error al consultar LLM: {str(e)}")
+    
+    ollama_breaker.registrar_exito()
+    return respuesta
+
+def _generar_con_ollama(prompt: str) -> str:
+    """Genera con la librería ollama y usa la API REST como fallback"""
     try:
         import ollama
         response = ollama.generate(
@@ -92,6 +153,9 @@ def consultar_ollama(prompt: str) -> str:
             prompt=prompt
         )
         return response['response']
+    except ConnectionError:
+        # Ollama no está corriendo: la API REST fallaría igual
+        raise Exception("Ollama no está corriendo. Ejecute 'ollama serve' en otra terminal.")
     except Exception as e:
         # Fallback to REST API
         try:
@@ -104,14 +168,11 @@ def consultar_ollama(prompt: str) -> str:
                 },
                 timeout=30
             )
-            if response.status_code == 200:
-                return response.json()["response"]
-            else:
-                return f"Error HTTP {response.status_code}: {response.text}"
         except requests.exceptions.ConnectionError:
-            return "Error: Ollama no está corriendo. Ejecute 'ollama serve' en otra terminal."
-        except Exception as e2:
-            return f"Error al consultar LLM: {str(e)} | Fallback error: {str(e2)}"
+            raise Exception("Ollama no está corriendo. Ejecute 'ollama serve' en otra terminal.")
+        if response.status_code != 200:
+            raise Exception(f"Error HTTP {response.status_code}: {response.text}")
+        return response.json()["response"]
 
 @app.post("/documentos/", summary="Subir nuevo documento")
 async def subir_documento(documento: DocumentoRequest):
@@ -123,7 +184,7 @@ async def subir_documento(documento: DocumentoRequest):
         # Guardar en ChromaDB
         doc_id = f"doc_{len(collection.get()['ids']) + 1}"
         collection.add(
-            embeddings=embedding.tolist(),
+            embeddings=embedding,
             documents=[documento.contenido],
             metadatas=[{
                 "titulo": documento.titulo,
@@ -137,17 +198,22 @@ async def subir_documento(documento: DocumentoRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/consultas/", response_model=RespuestaConsulta)
-async def realizar_consulta(consulta: ConsultaRequest):
+async def realizar_consulta(consulta: ConsultaRequest, response: Response):
     """Realiza búsqueda semántica y genera respuesta con LLM"""
+    traza = Traza()
     try:
         # 1. Vectorizar consulta
+        inicio = time.perf_counter()
         query_embedding = embedding_model.encode([consulta.pregunta])
+        traza.registrar("embedding", time.perf_counter() - inicio)
         
         # 2. Búsqueda en ChromaDB
+        inicio = time.perf_counter()
         resultados = collection.query(
-            query_embeddings=query_embedding.tolist(),
+            query_embeddings=query_embedding,
             n_results=consulta.limite_resultados
         )
+        traza.registrar("recuperacion", time.perf_counter() - inicio)
         
         # 3. Preparar contexto para LLM
         contexto = ""
@@ -182,11 +248,22 @@ async def realizar_consulta(consulta: ConsultaRequest):
         Respuesta:
         """
         
-        respuesta_ia = consultar_ollama(prompt)
+        degradado = False
+        inicio = time.perf_counter()
+        try:
+            respuesta_ia = consultar_ollama(prompt)
+        except LLMNoDisponibleError:
+            # Sin LLM se devuelven solo los documentos recuperados
+            respuesta_ia = RESPUESTA_DEGRADADA
+            degradado = True
+        traza.registrar("llm_total", time.perf_counter() - inicio)
         
+        response.headers["Server-Timing"] = traza.server_timing()
         return RespuestaConsulta(
             respuesta_ia=respuesta_ia,
-            documentos_relevantes=documentos_relevantes
+            documentos_relevantes=documentos_relevantes,
+            degradado=degradado,
+            tiempos_etapas=traza.duraciones()
         )
         
     except Exception as e:
@@ -222,7 +299,7 @@ async def register(usuario: UsuarioCreate, db: Session = Depends(get_db)):
             raise HTTPException(status_code=400, detail="Usuario ya existe")
         
         # Crear nuevo usuario
-        hashed_password = pwd_context.hash(usuario.password)
+        hashed_password = await ejecutor_contrasenas.ejecutar(pwd_context.hash, usuario.password)
         db_usuario = Usuario(username=usuario.username, hashed_password=hashed_password)
         db.add(db_usuario)
         db.commit()
@@ -244,7 +321,9 @@ async def login(usuario: UsuarioLogin, db: Session = Depends(get_db)):
     try:
         # Buscar usuario
         db_usuario = db.query(Usuario).filter(Usuario.username == usuario.username).first()
-        if not db_usuario or not pwd_context.verify(usuario.password, db_usuario.hashed_password):
+        if not db_usuario or not await ejecutor_contrasenas.ejecutar(
+            pwd_context.verify, usuario.password, db_usuario.hashed_password
+        ):
             raise HTTPException(status_code=401, detail="Credenciales inválidas")
         
         return {
@@ -262,6 +341,7 @@ async def root():
         "mensaje": "API de Gestión Documental Inteligente", 
         "estado": "activo",
         "version": "1.0.0",
+        "llm": ollama_breaker.obtener_estado(),
         "endpoints": {
             "documentos": "/documentos/",
             "consultas": "/consultas/",
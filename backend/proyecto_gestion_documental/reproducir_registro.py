@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Reconstruye el índice configurado aplicando el registro de ingesta.
+
+Usa la misma configuración `RAG_*` que la API: lee el registro de
+`RAG_REGISTRO_DIRECTORIO` y escribe en el índice del motor configurado
+(colección de Chroma o directorio de NumPy), que puede ser uno nuevo. El
+progreso se guarda en un checkpoint por destino: si se interrumpe, volver a
+ejecutarlo continúa donde se quedó, y ejecutarlo más tarde aplica solo las
+entradas nuevas.
+
+Los embeddings registrados con el mismo modelo se reutilizan; el resto de
+documentos se vectorizan, así que se carga el modelo de embeddings.
+
+Conviene reproducir sobre un índice en el que no escriba la API (p. ej.
+otra colección) y apuntarla a él al terminar: la API y la reproducción
+podrían aplicar versiones distintas del mismo documento en otro orden.
+
+Uso (desde proyecto_gestion_documental/):
+    RAG_COLECCION=documentos_reconstruidos python reproducir_registro.py
+    python reproducir_registro.py --desde-cero --paralelismo 8
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+
+DIRECTORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DIRECTORIO_BACKEND not in sys.path:
+    sys.path.insert(0, DIRECTORIO_BACKEND)
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+from proyecto_gestion_documental.application.use_cases.replay_ingest_log_use_case import (
+    ReplayIngestLogUseCase, TAMANO_LOTE_REPRODUCCION, PARALELISMO_REPRODUCCION
+)
+from proyecto_gestion_documental.infrastructure.config import Configuracion
+from proyecto_gestion_documental.infrastructure.external_services.sentence_transformer_service import (
+    SentenceTransformerEmbeddingService
+)
+from proyecto_gestion_documental.infrastructure.web.app import crear_documento_repository, crear_registro_ingesta
+
+
+def nombre_destino(configuracion: Configuracion) -> str:
+    """Nombre del checkpoint del índice configurado: motor, ubicación y colección."""
+    if configuracion.motor_busqueda == "numpy":
+        partes = ["numpy", os.path.abspath(configuracion.numpy_directorio)]
+    else:
+        partes = ["chroma", *(configuracion.shards_urls or [configuracion.chroma_url]), configuracion.coleccion]
+    if configuracion.numero_shards > 1:
+        partes.append(f"{configuracion.numero_shards}shards")
+    nombre = re.sub(r"[^A-Za-z0-9.-]+", "_", "_".join(partes)).strip("._-")
+    return nombre[-100:].lstrip("._-")
+
+
+def _mostrar_progreso(inicio: float):
+    def _mostrar(aplicadas: int, pendientes: int):
+        transcurrido = time.perf_counter() - inicio
+        ritmo = aplicadas / transcurrido if transcurrido > 0 else 0.0
+        print(f"\r   {aplicadas}/{pendientes} entradas ({ritmo:,.0f} entradas/s)", end="", flush=True)
+    return _mostrar
+
+
+async def ejecutar(args) -> int:
+    configuracion = Configuracion.desde_entorno()
+    if configuracion.motor_busqueda == "chroma" and not configuracion.chroma_url and not configuracion.shards_urls:
+        print("❌ Sin RAG_CHROMA_URL el índice vive en la memoria de este proceso y se perdería al terminar")
+        return 1
+
+    try:
+        registro = crear_registro_ingesta(configuracion)
+        destino = args.destino or nombre_destino(configuracion)
+        desde = 0 if args.desde_cero else await registro.obtener_checkpoint(destino)
+        ultima = await registro.ultima_secuencia()
+        if desde >= ultima:
+            print(f"✅ {destino} ya tiene aplicadas las {ultima} entradas del registro")
+            return 0
+        print(f"📜 Registro {configuracion.registro_directorio}: entradas {desde + 1}..{ultima}")
+        print(f"🎯 Destino {destino}")
+
+        embedding_service = SentenceTransformerEmbeddingService(
+            configuracion.modelo_embeddings,
+            backend=configuracion.backend_embeddings
+        )
+        caso_de_uso = ReplayIngestLogUseCase(
+            registro,
+            crear_documento_repository(configuracion, embedding_service),
+            embedding_service.obtener_modelo_usado(),
+            tamano_lote=args.tamano_lote,
+            paralelismo=args.paralelismo
+        )
+
+        inicio = time.perf_counter()
+        aplicadas = await caso_de_uso.reproducir(destino, args.desde_cero, _mostrar_progreso(inicio))
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        return 1
+
+    print(f"\n✅ {aplicadas} entradas aplicadas en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconstruye el índice desde el registro de ingesta")
+    parser.add_argument("--destino", help="nombre del checkpoint (por defecto, derivado del índice configurado)")
+    parser.add_argument("--desde-cero", action="store_true", help="ignorar el checkpoint y aplicar todo el registro")
+    parser.add_argument("--paralelismo", type=int, default=PARALELISMO_REPRODUCCION)
+    parser.add_argument("--tamano-lote", type=int, default=TAMANO_LOTE_REPRODUCCION)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(ejecutar(args)))
\ No newline at end of file
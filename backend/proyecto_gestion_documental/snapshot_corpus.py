@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Exporta e importa snapshots del corpus con sus embeddings ya calculados.
+
+Usa la misma configuración `RAG_*` que la API (motor, colección, servidor
+Chroma, directorio de snapshots) y no carga el modelo de embeddings: el
+snapshot guarda los vectores y el nombre del modelo con el que se
+calcularon, y la importación se rechaza si no coincide con `RAG_MODELO_EMBEDDINGS`.
+
+Con el motor chroma hace falta `RAG_CHROMA_URL` (o `RAG_SHARDS_URLS`): sin
+servidor, el índice vive en la memoria del proceso de la API y solo se
+puede exportar desde ella (`POST /admin/snapshots/exportar`).
+
+Uso (desde proyecto_gestion_documental/):
+    python snapshot_corpus.py exportar respaldo_2026_10
+    python snapshot_corpus.py importar respaldo_2026_10
+    python snapshot_corpus.py listar
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List, Optional
+
+DIRECTORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if DIRECTORIO_BACKEND not in sys.path:
+    sys.path.insert(0, DIRECTORIO_BACKEND)
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+from proyecto_gestion_documental.application.use_cases.snapshot_use_case import SnapshotUseCase
+from proyecto_gestion_documental.domain.services.embedding_service import (
+    EmbeddingService, Vector, MatrizVectores
+)
+from proyecto_gestion_documental.infrastructure.config import Configuracion
+from proyecto_gestion_documental.infrastructure.database.npy_snapshot_repository import NpySnapshotRepository
+from proyecto_gestion_documental.infrastructure.web.app import crear_documento_repository
+
+
+class EmbeddingsDelSnapshot(EmbeddingService):
+    """Modelo configurado, sin cargarlo: los embeddings vienen del índice o del snapshot."""
+
+    def __init__(self, modelo: str, dimension: Optional[int] = None):
+        self.modelo = modelo
+        self.dimension = dimension
+
+    async def generar_embedding(self, texto: str) -> Vector:
+        raise ValueError("Los snapshots no vectorizan: los embeddings ya están calculados")
+
+    async def generar_embeddings_batch(self, textos: List[str]) -> MatrizVectores:
+        raise ValueError("Los snapshots no vectorizan: los embeddings ya están calculados")
+
+    def obtener_dimension_embedding(self) -> int:
+        if self.dimension is None:
+            raise ValueError("El índice está vacío: no hay nada que exportar")
+        return self.dimension
+
+    def obtener_modelo_usado(self) -> str:
+        return self.modelo
+
+
+def _mostrar_progreso(inicio: float):
+    def _mostrar(procesados: int, totales: int):
+        transcurrido = time.perf_counter() - inicio
+        ritmo = procesados / transcurrido if transcurrido > 0 else 0.0
+        print(f"\r   {procesados}/{totales} documentos ({ritmo:,.0f} doc/s)", end="", flush=True)
+    return _mostrar
+
+
+async def ejecutar(args) -> int:
+    configuracion = Configuracion.desde_entorno()
+    snapshots = NpySnapshotRepository(configuracion.snapshots_directorio)
+
+    if args.comando == "listar":
+        for manifiesto in await snapshots.listar():
+            print(
+                f"{manifiesto.nombre:<30} {manifiesto.total_documentos:>10} documentos  "
+                f"{manifiesto.modelo_embeddings} ({manifiesto.dimension})  "
+                f"{manifiesto.fecha_creacion:%Y-%m-%d %H:%M}"
+            )
+        return 0
+
+    en_memoria = (
+        configuracion.motor_busqueda == "chroma"
+        and not configuracion.chroma_url
+        and not configuracion.shards_urls
+    )
+    if en_memoria:
+        print("❌ Sin RAG_CHROMA_URL el índice vive en la memoria de la API: usa /admin/snapshots")
+        return 1
+
+    inicio = time.perf_counter()
+    try:
+        # También valida el nombre antes de abrir el índice
+        manifiesto = await snapshots.obtener_manifiesto(args.nombre)
+        if args.comando == "importar" and manifiesto is None:
+            raise ValueError(f"No existe el snapshot {args.nombre}")
+        if args.comando == "exportar" and manifiesto is not None:
+            print(f"⚠️  El snapshot {args.nombre} existe y se reemplazará al terminar")
+
+        embeddings = EmbeddingsDelSnapshot(
+            configuracion.modelo_embeddings,
+            manifiesto.dimension if args.comando == "importar" else None
+        )
+        caso_de_uso = SnapshotUseCase(
+            crear_documento_repository(configuracion, embeddings),
+            snapshots,
+            configuracion.modelo_embeddings
+        )
+
+        if args.comando == "exportar":
+            print(f"📤 Exportando a {os.path.join(configuracion.snapshots_directorio, args.nombre)}")
+            manifiesto = await caso_de_uso.exportar(args.nombre, _mostrar_progreso(inicio))
+            total = manifiesto.total_documentos
+        else:
+            print(f"📥 Importando {args.nombre}")
+            total = await caso_de_uso.importar(args.nombre, _mostrar_progreso(inicio))
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        return 1
+
+    print(f"\n✅ {total} documentos en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshots del corpus con embeddings precalculados")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    subcomandos.add_parser("exportar", help="exportar el índice a un snapshot").add_argument("nombre")
+    subcomandos.add_parser("importar", help="cargar un snapshot en el índice").add_argument("nombre")
+    subcomandos.add_parser("listar", help="listar los snapshots disponibles")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(ejecutar(args)))
\ No newline at end of file
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Pruebas del bloqueo de lectores y escritores: orden de llegada y cancelaciones"""
+
+import asyncio
+import os
+import sys
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.services.bloqueo_lectura_escritura import BloqueoLecturaEscritura
+
+
+async def ceder(veces=5):
+    """Deja correr a las tareas listas"""
+    for _ in range(veces):
+        await asyncio.sleep(0)
+
+
+async def ocupar(bloqueo, escritura, nombre, registro, salida):
+    """Entra con el turno pedido, lo anota y sale cuando se activa `salida`"""
+    turno = bloqueo.escritura() if escritura else bloqueo.lectura()
+    async with turno:
+        registro.append(f"entra {nombre}")
+        await salida.wait()
+        registro.append(f"sale {nombre}")
+
+
+def test_orden_de_llegada():
+    """Una escritura en cola no deja pasar a las lecturas que llegan después"""
+    print("🔍 Probando el orden de llegada...")
+
+    async def probar():
+        bloqueo = BloqueoLecturaEscritura()
+        registro = []
+        salidas = {nombre: asyncio.Event() for nombre in ("L1", "L2", "E", "L3", "L4")}
+
+        def lanzar(nombre, escritura=False):
+            return asyncio.create_task(ocupar(bloqueo, escritura, nombre, registro, salidas[nombre]))
+
+        tareas = [lanzar("L1"), lanzar("L2")]
+        await ceder()
+        assert bloqueo.lectores == 2
+
+        tareas.append(lanzar("E", escritura=True))
+        await ceder()
+        tareas += [lanzar("L3"), lanzar("L4")]
+        await ceder()
+        # Las lecturas nuevas esperan detrás de la escritura
+        assert registro == ["entra L1", "entra L2"], registro
+
+        salidas["L1"].set()
+        await ceder()
+        assert not bloqueo.escribiendo
+        salidas["L2"].set()
+        await ceder()
+        assert bloqueo.escribiendo and bloqueo.lectores == 0
+
+        salidas["E"].set()
+        await ceder()
+        # Al salir la escritura entran juntas las dos lecturas que esperaban
+        assert bloqueo.lectores == 2
+        salidas["L3"].set()
+        salidas["L4"].set()
+        await asyncio.gather(*tareas)
+        return registro
+
+    registro = asyncio.run(probar())
+    assert registro.index("sale E") < registro.index("entra L3")
+    assert registro.index("sale L2") < registro.index("entra E")
+    print(f"✅ Turnos: {', '.join(registro)}")
+
+
+def test_cancelacion_en_cola():
+    """Cancelar una escritura en cola deja pasar a quien esperaba detrás"""
+    print("\n🔍 Probando cancelación en la cola...")
+
+    async def probar():
+        bloqueo = BloqueoLecturaEscritura()
+        registro = []
+        salida = asyncio.Event()
+        lector = asyncio.create_task(ocupar(bloqueo, False, "L1", registro, salida))
+        await ceder()
+        escritor = asyncio.create_task(ocupar(bloqueo, True, "E", registro, salida))
+        await ceder()
+        detras = asyncio.create_task(ocupar(bloqueo, False, "L2", registro, salida))
+        await ceder()
+        assert bloqueo.lectores == 1
+
+        escritor.cancel()
+        await ceder()
+        assert escritor.cancelled()
+        assert bloqueo.lectores == 2 and "entra L2" in registro
+        assert not bloqueo._esperando
+
+        salida.set()
+        await asyncio.gather(lector, detras)
+        assert bloqueo.lectores == 0 and not bloqueo.escribiendo
+
+    asyncio.run(probar())
+    print("✅ La escritura cancelada sale de la cola y la lectura de detrás entra")
+
+
+def test_cancelacion_con_turno_concedido():
+    """Un turno concedido a una tarea que se cancela antes de usarlo se devuelve"""
+    print("\n🔍 Probando cancelación con el turno recién concedido...")
+
+    async def probar(escritura):
+        bloqueo = BloqueoLecturaEscritura()
+        registro = []
+        async with bloqueo.escritura():
+            segundo = asyncio.create_task(ocupar(bloqueo, escritura, "segundo", registro, asyncio.Event()))
+            await ceder()
+            assert len(bloqueo._esperando) == 1
+        # Al salir se le concede el turno; se cancela antes de que despierte
+        assert not bloqueo._esperando
+        segundo.cancel()
+        await asyncio.gather(segundo, return_exceptions=True)
+
+        assert segundo.cancelled()
+        assert "entra segundo" not in registro
+        assert bloqueo.lectores == 0 and not bloqueo.escribiendo
+        # El bloqueo sigue utilizable
+        async with bloqueo.escritura():
+            assert bloqueo.escribiendo
+
+    for escritura in (True, False):
+        asyncio.run(probar(escritura))
+        print(f"✅ {'Escritura' if escritura else 'Lectura'} cancelada con el turno concedido: el bloqueo queda libre")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del bloqueo de lectura y escritura...")
+    print("=" * 50)
+
+    test_orden_de_llegada()
+    test_cancelacion_en_cola()
+    test_cancelacion_con_turno_concedido()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
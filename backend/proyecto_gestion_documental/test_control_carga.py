@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Pruebas del control de carga: rechazo por prioridad con 503 y Retry-After (no requiere el servidor)"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+from fastapi import FastAPI
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.services.metricas_service import MetricasNulas
+from proyecto_gestion_documental.infrastructure.observability.monitor_event_loop import MonitorEventLoop
+from proyecto_gestion_documental.infrastructure.web.control_carga_middleware import (
+    ControlCargaMiddleware,
+    UmbralesCarga
+)
+
+
+class MetricasRegistradas(MetricasNulas):
+    """Guarda los rechazos contados por el middleware"""
+
+    def __init__(self):
+        self.rechazos = []
+
+    def incrementar(self, contador, valor=1.0, **etiquetas):
+        if contador == "peticiones_rechazadas":
+            self.rechazos.append(etiquetas)
+
+
+def crear_app(monitor, metricas, umbrales=None, liberar=None):
+    """App con una ruta de cada prioridad; `/busqueda/` espera a `liberar` si se indica"""
+    app = FastAPI()
+
+    @app.get("/documentos/")
+    async def listar():
+        return []
+
+    @app.post("/busqueda/")
+    async def buscar():
+        if liberar is not None:
+            await liberar.wait()
+        return {"resultados": []}
+
+    @app.get("/metrics")
+    async def metricas_prometheus():
+        return {}
+
+    @app.get("/admin/estado")
+    async def estado():
+        return {}
+
+    app.add_middleware(
+        ControlCargaMiddleware, monitor=monitor, router=app.router, umbrales=umbrales, metricas=metricas
+    )
+    return app
+
+
+def cliente(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://prueba")
+
+
+def buscar_middleware(app):
+    """Instancia del middleware en la pila ya construida de la app"""
+    capa = app.middleware_stack
+    while capa is not None and not isinstance(capa, ControlCargaMiddleware):
+        capa = getattr(capa, "app", None)
+    return capa
+
+
+async def codigos(http):
+    """Código de respuesta de cada ruta"""
+    return {
+        "baja": (await http.get("/documentos/")).status_code,
+        "normal": (await http.post("/busqueda/")).status_code,
+        "metrics": (await http.get("/metrics")).status_code,
+        "admin": (await http.get("/admin/estado")).status_code
+    }
+
+
+def test_rechazo_por_retraso():
+    """Con el event loop retrasado caen primero las rutas de prioridad baja; las exentas nunca"""
+    print("🔍 Probando rechazos por retraso del event loop...")
+
+    async def probar():
+        monitor, metricas = MonitorEventLoop(), MetricasRegistradas()
+        async with cliente(crear_app(monitor, metricas)) as http:
+            assert await codigos(http) == {"baja": 200, "normal": 200, "metrics": 200, "admin": 200}
+
+            # Por encima del umbral bajo (0.1 s) y por debajo del normal (1 s)
+            monitor.registrar_muestra(0.5)
+            assert await codigos(http) == {"baja": 503, "normal": 200, "metrics": 200, "admin": 200}
+            respuesta = await http.get("/documentos/")
+            assert respuesta.headers["Retry-After"] == "2"
+            assert metricas.rechazos[0] == {"ruta": "/documentos/", "prioridad": "baja", "motivo": "retraso"}
+
+            # Por encima del normal: también se rechazan las consultas y Retry-After cubre el retraso
+            monitor.registrar_muestra(3.2)
+            assert await codigos(http) == {"baja": 503, "normal": 503, "metrics": 200, "admin": 200}
+            respuesta = await http.post("/busqueda/")
+            assert respuesta.headers["Retry-After"] == "4"
+            assert respuesta.json()["detail"]
+            return len(metricas.rechazos)
+
+    rechazos = asyncio.run(probar())
+    print(f"✅ 503 con Retry-After por prioridad; /metrics y /admin exentas ({rechazos} rechazos contados)")
+
+
+def test_rechazo_por_peticiones_en_curso():
+    """Con demasiadas peticiones en curso se rechazan las de prioridad baja"""
+    print("\n🔍 Probando rechazos por peticiones en curso...")
+
+    async def probar():
+        monitor, metricas = MonitorEventLoop(), MetricasRegistradas()
+        liberar = asyncio.Event()
+        middleware = None
+        app = crear_app(monitor, metricas, UmbralesCarga(en_curso_baja=2), liberar)
+        async with cliente(app) as http:
+            lentas = [asyncio.create_task(http.post("/busqueda/")) for _ in range(2)]
+            while middleware is None or middleware.total_en_curso < 2:
+                await asyncio.sleep(0.01)
+                middleware = middleware or buscar_middleware(app)
+
+            assert (await http.get("/documentos/")).status_code == 503
+            assert (await http.get("/metrics")).status_code == 200
+            assert metricas.rechazos[-1]["motivo"] == "en_curso"
+
+            liberar.set()
+            assert [respuesta.status_code for respuesta in await asyncio.gather(*lentas)] == [200, 200]
+            assert middleware.total_en_curso == 0
+            assert (await http.get("/documentos/")).status_code == 200
+
+    asyncio.run(probar())
+    print("✅ Las rutas de prioridad baja se rechazan mientras hay 2 peticiones en curso")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del control de carga...")
+    print("=" * 50)
+
+    test_rechazo_por_retraso()
+    test_rechazo_por_peticiones_en_curso()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
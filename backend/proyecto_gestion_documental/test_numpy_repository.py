@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Pruebas del motor de búsqueda NumPy con embeddings aleatorios (no requiere el modelo)"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.entities.parametros_indice import ParametrosIndice
+from proyecto_gestion_documental.infrastructure.database.numpy_repository import (
+    CAPACIDAD_INICIAL,
+    NumpyDocumentoRepository
+)
+from proyecto_gestion_documental.utilidades_pruebas import EmbeddingsFalsos, crear_documentos, vectores_aleatorios
+
+DIMENSION = 32
+
+
+async def ids_encontrados(repositorio, consultas, limite=5):
+    resultados = await repositorio.buscar_por_similitud_batch(consultas, limite)
+    return [[documento.id for documento in documentos] for documentos in resultados]
+
+
+def test_anadir_y_crecer():
+    """Cada documento es su propio vecino más cercano, también tras crecer la matriz"""
+    print("🔍 Probando inserción y crecimiento...")
+    total = CAPACIDAD_INICIAL + 500
+    vectores = vectores_aleatorios(total, DIMENSION)
+
+    async def probar(directorio):
+        repositorio = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), directorio)
+        for inicio in range(0, total, 300):
+            fin = min(inicio + 300, total)
+            await repositorio.guardar_con_embeddings(
+                crear_documentos([f"d{i}" for i in range(inicio, fin)]), vectores[inicio:fin]
+            )
+
+        assert await repositorio.contar_documentos() == total
+        assert repositorio._matrices["vectores"].shape[0] >= total
+        muestra = [0, CAPACIDAD_INICIAL - 1, CAPACIDAD_INICIAL, total - 1]
+        resultados = await repositorio.buscar_por_similitud_batch(vectores[muestra], 1)
+        for fila, documentos in zip(muestra, resultados):
+            assert documentos[0].id == f"d{fila}"
+            assert abs(documentos[0].similitud - 1.0) < 1e-5
+        # Solo quedan los archivos de la capacidad actual
+        return sorted(archivo for archivo in os.listdir(directorio) if archivo.endswith(".npy"))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        archivos = asyncio.run(probar(directorio))
+
+    assert len(archivos) == 1, archivos
+    print(f"✅ {total} documentos en {archivos[0]}")
+
+
+def test_borrado_y_reemplazo():
+    """Los borrados y los IDs repetidos dejan la fila anterior fuera de la búsqueda"""
+    print("\n🔍 Probando borrado y reemplazo...")
+    vectores = vectores_aleatorios(20, DIMENSION, semilla=1)
+
+    async def probar(directorio):
+        repositorio = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), directorio)
+        await repositorio.guardar_con_embeddings(crear_documentos([f"d{i}" for i in range(10)]), vectores[:10])
+
+        assert await repositorio.eliminar("d3")
+        assert not await repositorio.eliminar("d3")
+        assert await repositorio.obtener_por_id("d3") is None
+        assert "d3" not in (await ids_encontrados(repositorio, vectores[3:4], 10))[0]
+
+        # Reemplazo: d5 pasa a tener el vector 10
+        await repositorio.guardar_con_embeddings(crear_documentos(["d5"]), vectores[10:11])
+        assert (await ids_encontrados(repositorio, vectores[10:11], 1))[0] == ["d5"]
+        assert (await ids_encontrados(repositorio, vectores[5:6], 1))[0] != ["d5"]
+        assert np.allclose((await repositorio.obtener_embeddings(["d5"]))["d5"], vectores[10], atol=1e-6)
+
+        # ID repetido dentro del mismo lote: vale el último
+        await repositorio.guardar_con_embeddings(crear_documentos(["d7", "d7"]), vectores[11:13])
+        assert (await ids_encontrados(repositorio, vectores[12:13], 1))[0] == ["d7"]
+        assert (await ids_encontrados(repositorio, vectores[11:12], 1))[0] != ["d7"]
+        assert np.allclose((await repositorio.obtener_embeddings(["d7"]))["d7"], vectores[12], atol=1e-6)
+
+        assert await repositorio.contar_documentos() == 9
+        assert len(await repositorio.obtener_todos()) == 9
+        return repositorio._n
+
+    with tempfile.TemporaryDirectory() as directorio:
+        filas = asyncio.run(probar(directorio))
+
+    print(f"✅ 9 documentos vivos en {filas} filas")
+
+
+def test_compactacion_y_reapertura():
+    """Compactar descarta las filas eliminadas sin cambiar los resultados, y se conservan al reabrir"""
+    print("\n🔍 Probando compactación y reapertura...")
+    total = 2000
+    vectores = vectores_aleatorios(total, DIMENSION, semilla=2)
+    consultas = vectores_aleatorios(8, DIMENSION, semilla=3)
+
+    async def probar(directorio):
+        repositorio = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), directorio)
+        await repositorio.guardar_con_embeddings(crear_documentos([f"d{i}" for i in range(total)]), vectores)
+        for i in range(0, total, 3):
+            await repositorio.eliminar(f"d{i}")
+        vivos = await repositorio.contar_documentos()
+        antes = await ids_encontrados(repositorio, consultas)
+
+        progreso = []
+        compactados = await repositorio.reconstruir_indice(
+            ParametrosIndice(), lambda hechos, total: progreso.append((hechos, total))
+        )
+        await asyncio.sleep(0)  # el progreso llega desde el hilo del ejecutor
+
+        assert compactados == vivos
+        assert repositorio._n == vivos
+        assert progreso and progreso[-1] == (vivos, vivos)
+        assert await ids_encontrados(repositorio, consultas) == antes
+
+        # Tras compactar se sigue pudiendo escribir y borrar
+        await repositorio.guardar_con_embeddings(crear_documentos(["nuevo"]), -vectores[1:2])
+        assert (await ids_encontrados(repositorio, -vectores[1:2], 1))[0] == ["nuevo"]
+        await repositorio.eliminar("d1")
+
+        reabierto = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), directorio)
+        assert await reabierto.contar_documentos() == vivos
+        assert await ids_encontrados(reabierto, consultas) == await ids_encontrados(repositorio, consultas)
+        embedding = (await reabierto.obtener_embeddings(["nuevo"]))["nuevo"]
+        assert np.allclose(embedding, -vectores[1], atol=1e-6)
+        return vivos
+
+    with tempfile.TemporaryDirectory() as directorio:
+        vivos = asyncio.run(probar(directorio))
+
+    print(f"✅ {total} filas compactadas a {vivos}; resultados iguales antes, después y al reabrir")
+
+
+def test_reevaluacion_tipos_compactos():
+    """Con float16 e int8 los resultados coinciden con la búsqueda exacta en float32"""
+    print("\n🔍 Probando búsqueda compacta con reevaluación...")
+    total, limite = 3000, 10
+    vectores = vectores_aleatorios(total, DIMENSION, semilla=4)
+    # Consultas cercanas a documentos, como en una búsqueda real
+    consultas = vectores[:20] + 0.3 * vectores_aleatorios(20, DIMENSION, semilla=5)
+    consultas /= np.linalg.norm(consultas, axis=1, keepdims=True)
+    exactos = [
+        [f"d{fila}" for fila in np.argsort(-(vectores @ consulta))[:limite]]
+        for consulta in consultas
+    ]
+
+    async def probar(directorio, tipo_vector):
+        repositorio = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), directorio, tipo_vector=tipo_vector)
+        await repositorio.guardar_con_embeddings(crear_documentos([f"d{i}" for i in range(total)]), vectores)
+        resultados = await repositorio.buscar_por_similitud_batch(consultas, limite)
+
+        # Las similitudes devueltas son las de los vectores completos
+        for consulta, documentos in zip(consultas, resultados):
+            for documento in documentos:
+                exacta = float(vectores[int(documento.id[1:])] @ consulta)
+                assert abs(documento.similitud - exacta) < 1e-5
+
+        # Tras reabrir (la copia compacta se carga de disco) y compactar
+        await repositorio.eliminar("d0")
+        await repositorio.reconstruir_indice(ParametrosIndice())
+        reabierto = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), directorio, tipo_vector=tipo_vector)
+        assert "d0" not in (await ids_encontrados(reabierto, consultas[:1], limite))[0]
+
+        aciertos = sum(
+            len(set(encontrados) & set(esperados))
+            for encontrados, esperados in zip(await ids_encontrados(repositorio, consultas, limite), exactos)
+        )
+        return repositorio.obtener_bytes_por_vector(), aciertos
+
+    for tipo_vector in ("float16", "int8"):
+        with tempfile.TemporaryDirectory() as directorio:
+            bytes_por_vector, aciertos = asyncio.run(probar(directorio, tipo_vector))
+        # d0 se eliminó: su consulta pierde como mucho un acierto
+        recall = aciertos / (len(consultas) * limite - 1)
+        assert recall >= 0.99, (tipo_vector, recall)
+        assert bytes_por_vector < DIMENSION * 4
+        print(f"✅ {tipo_vector}: recall@{limite} {recall:.3f}, {bytes_por_vector} bytes por vector")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del motor NumPy...")
+    print("=" * 50)
+
+    test_anadir_y_crecer()
+    test_borrado_y_reemplazo()
+    test_compactacion_y_reapertura()
+    test_reevaluacion_tipos_compactos()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
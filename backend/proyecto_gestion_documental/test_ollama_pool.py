@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Pruebas del pool de Ollama contra servidores stub locales (no requiere Ollama)"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.services.llm_service import LLMNoDisponibleError
+from proyecto_gestion_documental.domain.services.metricas_service import MetricasNulas
+from proyecto_gestion_documental.infrastructure.external_services.ollama_pool_service import (
+    OllamaPoolLLMService
+)
+
+
+def iniciar_stub(nombre, latencia=0.05, sano=True):
+    """Levanta un servidor que imita /api/tags y /api/generate (en streaming) de Ollama"""
+    contador = {"generate": 0, "conexiones": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        # Conexiones keep-alive, como Ollama
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _responder(self, status, cuerpo, tipo="application/json"):
+            contador["conexiones"].add(self.client_address)
+            self.send_response(status)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_GET(self):
+            if self.path == "/api/tags" and sano:
+                self._responder(200, json.dumps({"models": [{"name": "llama3.2:1b"}]}).encode())
+            else:
+                self._responder(503, json.dumps({"error": "no disponible"}).encode())
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not sano:
+                self._responder(500, json.dumps({"error": "fallo"}).encode())
+                return
+            contador["generate"] += 1
+            time.sleep(latencia)
+            # Una línea JSON por trozo y la última con done
+            trozos = ["respuesta ", "de ", nombre]
+            lineas = [json.dumps({"response": trozo, "done": False}) for trozo in trozos]
+            lineas.append(json.dumps({"response": "", "done": True}))
+            self._responder(200, ("\n".join(lineas) + "\n").encode(), "application/x-ndjson")
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_port}", contador
+
+
+class MetricasRegistradas(MetricasNulas):
+    """Guarda las etapas registradas"""
+
+    def __init__(self):
+        self.etapas = []
+
+    def observar_etapa(self, etapa, segundos):
+        self.etapas.append(etapa)
+
+
+def test_reparto_por_carga():
+    """Las peticiones concurrentes se reparten entre todos los backends sanos"""
+    print("🔍 Probando reparto por menor carga...")
+    stubs = [iniciar_stub(f"stub{i}", latencia=0.1) for i in range(3)]
+    try:
+        pool = OllamaPoolLLMService([url for _, url, _ in stubs])
+
+        async def lanzar():
+            try:
+                return await asyncio.gather(*[pool.generar_respuesta("hola") for _ in range(9)])
+            finally:
+                await pool.cerrar()
+
+        respuestas = asyncio.run(lanzar())
+        repartos = [contador["generate"] for _, _, contador in stubs]
+
+        assert all(r.startswith("respuesta de") for r in respuestas)
+        assert all(n > 0 for n in repartos), repartos
+        print(f"✅ Peticiones por backend: {repartos}")
+    finally:
+        for servidor, _, _ in stubs:
+            servidor.shutdown()
+
+
+def test_expulsion_backend_caido():
+    """Un backend que falla queda expulsado y el tráfico va a los sanos"""
+    print("\n🔍 Probando expulsión de backend caído...")
+    caido = iniciar_stub("caido", sano=False)
+    sano = iniciar_stub("sano")
+    try:
+        pool = OllamaPoolLLMService([caido[1], sano[1]], enfriamiento=60)
+
+        async def lanzar():
+            try:
+                return [await pool.generar_respuesta("hola") for _ in range(5)]
+            finally:
+                await pool.cerrar()
+
+        respuestas = asyncio.run(lanzar())
+        estado = {b["base_url"]: b for b in pool.obtener_estado_pool()}
+
+        assert all(r == "respuesta de sano" for r in respuestas), respuestas
+        assert estado[caido[1]]["expulsado"]
+        assert not estado[sano[1]]["expulsado"]
+        print("✅ El backend caído fue expulsado del pool")
+    finally:
+        caido[0].shutdown()
+        sano[0].shutdown()
+
+
+def test_pool_sin_backends_disponibles():
+    """Si todo el pool está caído se devuelve un error sin esperar timeouts"""
+    print("\n🔍 Probando pool sin backends disponibles...")
+    pool = OllamaPoolLLMService(["http://127.0.0.1:9"], timeout_salud=0.5)
+
+    async def probar():
+        try:
+            try:
+                await pool.generar_respuesta("hola")
+                assert False, "Se esperaba LLMNoDisponibleError"
+            except LLMNoDisponibleError:
+                pass
+            return await pool.esta_disponible()
+        finally:
+            await pool.cerrar()
+
+    inicio = time.time()
+    disponible = asyncio.run(probar())
+
+    assert not disponible
+    print(f"✅ Error devuelto en {time.time() - inicio:.2f}s")
+
+
+def test_conexiones_reutilizadas():
+    """Chequeos y generaciones reutilizan la conexión keep-alive y se mide el primer token"""
+    print("\n🔍 Probando reutilización de conexiones...")
+    servidor, url, contador = iniciar_stub("stub", latencia=0.01)
+    try:
+        metricas = MetricasRegistradas()
+        # Sin caché de salud: cada generación hace también un chequeo
+        pool = OllamaPoolLLMService([url], ttl_salud=0, metricas=metricas)
+
+        async def lanzar():
+            try:
+                return [await pool.generar_respuesta("hola") for _ in range(10)]
+            finally:
+                await pool.cerrar()
+
+        respuestas = asyncio.run(lanzar())
+
+        assert respuestas == ["respuesta de stub"] * 10, respuestas
+        assert contador["generate"] == 10
+        assert len(contador["conexiones"]) == 1, contador["conexiones"]
+        assert metricas.etapas.count("llm_primer_token") == 10
+        print("✅ 20 peticiones (chequeos y generaciones) por una sola conexión")
+    finally:
+        servidor.shutdown()
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del pool de Ollama...")
+    print("=" * 50)
+
+    test_reparto_por_carga()
+    test_expulsion_backend_caido()
+    test_pool_sin_backends_disponibles()
+    test_conexiones_reutilizadas()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Pruebas de los plazos de las consultas y de su cancelación al desconectarse el cliente"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+from fastapi import HTTPException
+from starlette.requests import Request
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.application.dto.consulta_response import ConsultaRequest
+from proyecto_gestion_documental.application.use_cases.search_documents_use_case import SearchDocumentsUseCase
+from proyecto_gestion_documental.domain.services.metricas_service import MetricasNulas
+from proyecto_gestion_documental.domain.services.plazo import (
+    PlazoAgotadoError,
+    iniciar_plazo,
+    plazo_actual
+)
+from proyecto_gestion_documental.infrastructure.web.controllers.documento_controller import (
+    ESTADO_CLIENTE_DESCONECTADO,
+    ejecutar_cancelable
+)
+from proyecto_gestion_documental.utilidades_pruebas import EmbeddingsFalsos
+
+DIMENSION = 8
+
+
+class EmbeddingsLentos(EmbeddingsFalsos):
+    """Tarda `espera` segundos y guarda el plazo de la petición que lo llamó"""
+
+    def __init__(self, espera):
+        super().__init__(DIMENSION)
+        self.espera = espera
+        self.plazos = []
+
+    async def generar_embedding(self, texto):
+        self.plazos.append(plazo_actual())
+        await asyncio.sleep(self.espera)
+        return np.ones(DIMENSION, dtype=np.float32)
+
+
+class RepositorioVacio:
+    async def buscar_por_similitud(self, embedding, limite):
+        return []
+
+
+class MetricasRegistradas(MetricasNulas):
+    """Guarda las cancelaciones contadas por el caso de uso"""
+
+    def __init__(self):
+        self.cancelaciones = []
+
+    def incrementar(self, contador, valor=1.0, **etiquetas):
+        if contador == "cancelaciones":
+            self.cancelaciones.append(etiquetas)
+
+
+def crear_caso_de_uso(espera, timeout_por_defecto=None):
+    embeddings, metricas = EmbeddingsLentos(espera), MetricasRegistradas()
+    caso_de_uso = SearchDocumentsUseCase(
+        RepositorioVacio(), embeddings, None, metricas=metricas, timeout_por_defecto=timeout_por_defecto
+    )
+    return caso_de_uso, embeddings, metricas
+
+
+def crear_peticion(desconexion: asyncio.Event) -> Request:
+    """Petición HTTP cuyo cliente se desconecta al activarse `desconexion`"""
+
+    async def recibir():
+        await desconexion.wait()
+        return {"type": "http.disconnect"}
+
+    return Request({"type": "http", "method": "POST", "path": "/busqueda/", "headers": []}, recibir)
+
+
+def test_plazo():
+    """El plazo corta la espera, se marca como cancelado y es visible desde otros hilos"""
+    print("🔍 Probando Plazo.esperar...")
+
+    async def probar():
+        assert plazo_actual() is None
+        sin_limite = iniciar_plazo()
+        assert plazo_actual() is sin_limite and sin_limite.restante() is None
+        assert await sin_limite.esperar(asyncio.sleep(0.01, "hecho")) == "hecho"
+
+        plazo = iniciar_plazo(0.05)
+        inicio = time.perf_counter()
+        try:
+            await plazo.esperar(asyncio.sleep(5))
+            raise AssertionError("El plazo no se agotó")
+        except PlazoAgotadoError:
+            pass
+        transcurrido = time.perf_counter() - inicio
+        assert plazo.cancelado and plazo.agotado()
+
+        # El trabajo que espera en otro hilo ve la cancelación
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, plazo.comprobar)
+            raise AssertionError("El hilo no vio la cancelación")
+        except PlazoAgotadoError:
+            pass
+
+        # Con el plazo ya agotado la operación ni empieza
+        operacion = asyncio.sleep(5)
+        try:
+            await plazo.esperar(operacion)
+            raise AssertionError("Se esperó una operación fuera de plazo")
+        except PlazoAgotadoError:
+            pass
+        assert operacion.cr_frame is None
+        return transcurrido
+
+    transcurrido = asyncio.run(probar())
+    assert transcurrido < 0.5, transcurrido
+    print(f"✅ Plazo de 50 ms agotado en {transcurrido * 1000:.0f} ms")
+
+
+def test_plazo_de_la_consulta():
+    """Una búsqueda que agota su plazo se cuenta como cancelación por plazo"""
+    print("\n🔍 Probando el plazo de una búsqueda...")
+
+    async def probar():
+        caso_de_uso, embeddings, metricas = crear_caso_de_uso(espera=5, timeout_por_defecto=30)
+        try:
+            await caso_de_uso.buscar(ConsultaRequest(pregunta="¿plazo?", timeout=0.05))
+            raise AssertionError("La búsqueda no agotó el plazo")
+        except PlazoAgotadoError:
+            pass
+        assert metricas.cancelaciones == [{"operacion": "busqueda", "motivo": "plazo"}]
+        assert embeddings.plazos[0].cancelado
+
+        # Sin timeout en la petición vale el del servidor
+        caso_de_uso.timeout_por_defecto = 0.05
+        try:
+            await caso_de_uso.buscar(ConsultaRequest(pregunta="¿plazo?"))
+            raise AssertionError("La búsqueda no agotó el plazo por defecto")
+        except PlazoAgotadoError:
+            pass
+        assert len(metricas.cancelaciones) == 2
+
+    asyncio.run(probar())
+    print("✅ PlazoAgotadoError y cancelación por plazo contada")
+
+
+def test_desconexion_del_cliente():
+    """Si el cliente se desconecta la búsqueda se cancela, responde 499 y cuenta la desconexión"""
+    print("\n🔍 Probando ejecutar_cancelable...")
+
+    async def probar():
+        caso_de_uso, embeddings, metricas = crear_caso_de_uso(espera=5)
+        desconexion = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, desconexion.set)
+        inicio = time.perf_counter()
+        try:
+            await ejecutar_cancelable(
+                crear_peticion(desconexion), caso_de_uso.buscar(ConsultaRequest(pregunta="¿sigues?"))
+            )
+            raise AssertionError("La búsqueda no se canceló")
+        except HTTPException as e:
+            assert e.status_code == ESTADO_CLIENTE_DESCONECTADO
+        transcurrido = time.perf_counter() - inicio
+        assert metricas.cancelaciones == [{"operacion": "busqueda", "motivo": "desconexion"}]
+        # El plazo de la búsqueda queda cancelado para el trabajo en otros hilos
+        assert embeddings.plazos[0].cancelado
+
+        # Si el cliente sigue conectado se devuelve el resultado
+        caso_de_uso.embedding_service.espera = 0.01
+        respuesta = await ejecutar_cancelable(
+            crear_peticion(asyncio.Event()), caso_de_uso.buscar(ConsultaRequest(pregunta="¿sigues?"))
+        )
+        assert respuesta.documentos_relevantes == []
+        assert len(metricas.cancelaciones) == 1
+        return transcurrido
+
+    transcurrido = asyncio.run(probar())
+    assert transcurrido < 0.5, transcurrido
+    print(f"✅ Búsqueda cancelada {transcurrido * 1000:.0f} ms después de empezar, con 499")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas de plazos y cancelación...")
+    print("=" * 50)
+
+    test_plazo()
+    test_plazo_de_la_consulta()
+    test_desconexion_del_cliente()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
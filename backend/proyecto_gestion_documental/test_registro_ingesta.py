@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Pruebas del registro de ingesta: recuperación tras una caída y reproducción con checkpoint"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.application.use_cases.replay_ingest_log_use_case import ReplayIngestLogUseCase
+from proyecto_gestion_documental.domain.entities.documento import Documento
+from proyecto_gestion_documental.domain.entities.entrada_registro import (
+    EntradaRegistro,
+    OPERACION_ELIMINAR,
+    OPERACION_GUARDAR
+)
+from proyecto_gestion_documental.infrastructure.database.numpy_repository import NumpyDocumentoRepository
+from proyecto_gestion_documental.infrastructure.database.segmentos_registro_ingesta import SegmentosRegistroIngesta
+from proyecto_gestion_documental.utilidades_pruebas import EmbeddingsFalsos, vectores_aleatorios
+
+DIMENSION = 16
+MODELO = "falso"
+# Segmentos pequeños para que el registro ocupe varios
+TAMANO_SEGMENTO = 2048
+
+
+class RepositorioQueFalla(NumpyDocumentoRepository):
+    """Deja de escribir tras `escrituras` llamadas, como si el proceso se interrumpiera"""
+
+    def __init__(self, *args, escrituras: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.escrituras = escrituras
+
+    async def guardar_con_embeddings(self, documentos, embeddings):
+        if self.escrituras == 0:
+            raise Exception("interrumpido")
+        self.escrituras -= 1
+        return await super().guardar_con_embeddings(documentos, embeddings)
+
+
+def crear_entradas(cantidad, desde=0):
+    """Altas de documentos, con actualizaciones y bajas intercaladas"""
+    vectores = vectores_aleatorios(cantidad, DIMENSION, semilla=desde)
+    entradas = []
+    for i in range(cantidad):
+        documento_id = f"d{(desde + i) % 40}"
+        if i % 7 == 6:
+            entradas.append(EntradaRegistro(operacion=OPERACION_ELIMINAR, documento_id=documento_id))
+            continue
+        documento = Documento(
+            id=documento_id, titulo=f"Versión {desde + i}", contenido=f"contenido {desde + i}", tipo="normativo"
+        )
+        entradas.append(EntradaRegistro(
+            operacion=OPERACION_GUARDAR,
+            documento_id=documento_id,
+            documento=documento,
+            embedding=vectores[i],
+            modelo_embeddings=MODELO
+        ))
+    return entradas
+
+
+def estado_esperado(entradas):
+    """Título final de cada documento vivo según el orden del registro"""
+    estado = {}
+    for entrada in entradas:
+        if entrada.operacion == OPERACION_ELIMINAR:
+            estado.pop(entrada.documento_id, None)
+        else:
+            estado[entrada.documento_id] = entrada.documento.titulo
+    return estado
+
+
+async def leer_todo(registro, desde=0):
+    return [entrada async for lote in registro.leer(desde, 16) for entrada in lote]
+
+
+async def estado_indice(repositorio):
+    return {documento.id: documento.titulo for documento in await repositorio.obtener_todos()}
+
+
+def test_recuperacion_cola_incompleta():
+    """Al reabrir se recorta la entrada a medias del último segmento y se sigue numerando"""
+    print("🔍 Probando recuperación tras una escritura a medias...")
+
+    async def probar(directorio):
+        registro = SegmentosRegistroIngesta(directorio, tamano_segmento=TAMANO_SEGMENTO)
+        for inicio in range(0, 60, 10):
+            await registro.anexar(crear_entradas(10, inicio))
+        await registro.cerrar()
+        segmentos = registro._segmentos()
+        assert len(segmentos) > 2
+
+        # La última entrada quedó cortada y detrás hay basura
+        _, ultimo = segmentos[-1]
+        with open(ultimo, "rb") as archivo:
+            contenido = archivo.read()
+        entradas = await leer_todo(registro)
+        longitud_ultima = len(registro._serializar(entradas[-1]))
+        with open(ultimo, "wb") as archivo:
+            archivo.write(contenido[:-longitud_ultima // 2] + b"\x00\xff" * 7)
+
+        # Sin reabrir para escribir, la lectura se detiene en la última entrada completa
+        assert await registro.ultima_secuencia() == 59
+        assert [entrada.secuencia for entrada in await leer_todo(registro)] == list(range(1, 60))
+
+        reabierto = SegmentosRegistroIngesta(directorio, tamano_segmento=TAMANO_SEGMENTO)
+        await reabierto.abrir()
+        assert os.path.getsize(ultimo) == len(contenido) - longitud_ultima
+        assert await reabierto.ultima_secuencia() == 59
+        assert await reabierto.anexar(crear_entradas(1, 100)) == 60
+        await reabierto.cerrar()
+
+        leidas = await leer_todo(reabierto)
+        assert [entrada.secuencia for entrada in leidas] == list(range(1, 61))
+        assert leidas[-1].documento.titulo == "Versión 100"
+        assert [entrada.secuencia for entrada in await leer_todo(reabierto, 45)] == list(range(46, 61))
+
+        # Un segmento anterior dañado no se da por bueno
+        _, primero = reabierto._segmentos()[0]
+        with open(primero, "r+b") as archivo:
+            archivo.truncate(os.path.getsize(primero) - 3)
+        try:
+            await leer_todo(reabierto)
+            raise AssertionError("Se leyó un segmento intermedio dañado")
+        except ValueError:
+            pass
+        return len(reabierto._segmentos())
+
+    with tempfile.TemporaryDirectory() as directorio:
+        segmentos = asyncio.run(probar(directorio))
+
+    print(f"✅ Cola recortada y numeración continuada en {segmentos} segmentos")
+
+
+def test_checkpoints():
+    """Los checkpoints se guardan por destino y validan el nombre"""
+    print("\n🔍 Probando checkpoints...")
+
+    async def probar(directorio):
+        registro = SegmentosRegistroIngesta(directorio)
+        assert await registro.obtener_checkpoint("indice-a") == 0
+        await registro.guardar_checkpoint("indice-a", 25)
+        await registro.guardar_checkpoint("indice-b", 7)
+        await registro.guardar_checkpoint("indice-a", 30)
+
+        reabierto = SegmentosRegistroIngesta(directorio)
+        assert await reabierto.obtener_checkpoint("indice-a") == 30
+        assert await reabierto.obtener_checkpoint("indice-b") == 7
+        for nombre in ("../fuera", "", "a" * 101):
+            try:
+                await reabierto.guardar_checkpoint(nombre, 1)
+                raise AssertionError(f"Se aceptó el nombre {nombre!r}")
+            except ValueError:
+                pass
+
+    with tempfile.TemporaryDirectory() as directorio:
+        asyncio.run(probar(directorio))
+
+    print("✅ Checkpoints por destino")
+
+
+def test_reproduccion_continua_desde_checkpoint():
+    """Una reproducción interrumpida continúa desde su checkpoint y llega al mismo estado"""
+    print("\n🔍 Probando reproducción interrumpida...")
+    entradas = crear_entradas(120)
+    nuevas = crear_entradas(15, 500)
+
+    async def probar(directorio):
+        registro = SegmentosRegistroIngesta(os.path.join(directorio, "registro"), tamano_segmento=TAMANO_SEGMENTO)
+        await registro.anexar(entradas)
+        await registro.cerrar()
+        directorio_indice = os.path.join(directorio, "indice")
+
+        # Ventanas de 10 entradas: la tercera falla
+        interrumpido = RepositorioQueFalla(EmbeddingsFalsos(DIMENSION, MODELO), directorio_indice, escrituras=2)
+        try:
+            await ReplayIngestLogUseCase(registro, interrumpido, MODELO, tamano_lote=10, paralelismo=1).reproducir("indice")
+            raise AssertionError("La reproducción no se interrumpió")
+        except Exception as e:
+            assert "interrumpido" in str(e)
+        assert await registro.obtener_checkpoint("indice") == 20
+
+        repositorio = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION, MODELO), directorio_indice)
+        caso_de_uso = ReplayIngestLogUseCase(registro, repositorio, MODELO, tamano_lote=10, paralelismo=2)
+        progreso = []
+        aplicadas = await caso_de_uso.reproducir("indice", progreso=lambda hechas, total: progreso.append((hechas, total)))
+        assert aplicadas == 100
+        assert progreso[-1] == (100, 100)
+        assert await registro.obtener_checkpoint("indice") == 120
+        assert await estado_indice(repositorio) == estado_esperado(entradas)
+
+        # Más tarde solo se aplican las entradas nuevas
+        await registro.anexar(nuevas)
+        await registro.cerrar()
+        assert await caso_de_uso.reproducir("indice") == len(nuevas)
+        assert await caso_de_uso.reproducir("indice") == 0
+        assert await estado_indice(repositorio) == estado_esperado(entradas + nuevas)
+
+        # Desde cero sobre un índice nuevo se llega al mismo estado
+        otro = NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION, MODELO), os.path.join(directorio, "otro"))
+        await ReplayIngestLogUseCase(registro, otro, MODELO).reproducir("otro", desde_cero=True)
+        assert await estado_indice(otro) == await estado_indice(repositorio)
+        return len(await estado_indice(repositorio))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        documentos = asyncio.run(probar(directorio))
+
+    print(f"✅ Reproducción reanudada en la secuencia 20; {documentos} documentos como en el registro")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del registro de ingesta...")
+    print("=" * 50)
+
+    test_recuperacion_cola_incompleta()
+    test_checkpoints()
+    test_reproduccion_continua_desde_checkpoint()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Pruebas del respondedor extractivo: división en frases y unión de las frases cortas"""
+
+import os
+import sys
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.services.respondedor_extractivo import RespondedorExtractivo
+from proyecto_gestion_documental.utilidades_pruebas import EmbeddingsFalsos
+
+
+def frases(texto, longitud_minima=25):
+    """Textos de las frases en que se divide `texto`"""
+    respondedor = RespondedorExtractivo(EmbeddingsFalsos(8), longitud_minima=longitud_minima)
+    posiciones = respondedor.dividir_frases(texto)
+    for inicio, fin in posiciones:
+        assert texto[inicio:fin] == texto[inicio:fin].strip(), (inicio, fin)
+    return [texto[inicio:fin] for inicio, fin in posiciones]
+
+
+def test_division_en_frases():
+    """Se corta tras . ! ? ; seguidos de espacio y en los saltos de línea"""
+    print("🔍 Probando la división en frases...")
+    texto = (
+        "El plazo de presentación es de diez días hábiles.  ¿Se puede ampliar el plazo de entrega?\n"
+        "Solo por causa justificada y documentada; la solicitud se resuelve en cinco días!"
+    )
+    assert frases(texto) == [
+        "El plazo de presentación es de diez días hábiles.",
+        "¿Se puede ampliar el plazo de entrega?",
+        "Solo por causa justificada y documentada;",
+        "la solicitud se resuelve en cinco días!"
+    ]
+    # Un punto sin espacio detrás (decimales, abreviaturas pegadas) no corta
+    assert frases("La tasa asciende a 12.50 euros por cada solicitud presentada.") == [
+        "La tasa asciende a 12.50 euros por cada solicitud presentada."
+    ]
+    assert frases("") == [] and frases("  \n\n  ") == []
+    print("✅ Frases sin espacios en los extremos")
+
+
+def test_union_de_frases_cortas():
+    """Las frases más cortas que `longitud_minima` se unen a la siguiente (o a la última, al final)"""
+    print("\n🔍 Probando la unión de frases cortas...")
+    texto = (
+        "Artículo 5. El plazo de presentación es de diez días hábiles. Ver anexo.\n\n"
+        "Las solicitudes se presentan en el registro general. Fin."
+    )
+    assert frases(texto) == [
+        "Artículo 5. El plazo de presentación es de diez días hábiles.",
+        "Ver anexo.\n\nLas solicitudes se presentan en el registro general. Fin."
+    ]
+
+    # Varias cortas seguidas se acumulan hasta llegar juntas a la longitud mínima
+    assert frases("Título I. Capítulo 2. Sección 3. Las normas generales de este capítulo.") == [
+        "Título I. Capítulo 2. Sección 3.",
+        "Las normas generales de este capítulo."
+    ]
+    # Un texto hecho solo de frases cortas queda como una sola frase
+    assert frases("Sí. No. Quizá.  ") == ["Sí. No. Quizá."]
+    # Con longitud mínima 0 no se une nada
+    assert frases("Artículo 5. Ver anexo.", longitud_minima=0) == ["Artículo 5.", "Ver anexo."]
+    print("✅ Las frases cortas se unen a la siguiente sin perder texto")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del respondedor extractivo...")
+    print("=" * 50)
+
+    test_division_en_frases()
+    test_union_de_frases_cortas()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
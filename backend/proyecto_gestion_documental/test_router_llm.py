@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Pruebas del router de modelos LLM con servicios falsos (no requiere Ollama)"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Optional
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.services.llm_service import (
+    LLMService, LLMNoDisponibleError, SenalesConsulta
+)
+from proyecto_gestion_documental.infrastructure.external_services.router_llm_service import (
+    RouterLLMService, RutaLLM
+)
+
+
+class LLMFalso(LLMService):
+    """Modelo que responde tras una latencia fija"""
+
+    def __init__(self, modelo, latencia=0.0, disponible=True):
+        self.modelo = modelo
+        self.latencia = latencia
+        self.disponible = disponible
+        self.llamadas = 0
+
+    async def generar_respuesta(self, prompt, contexto=None, senales: Optional[SenalesConsulta] = None):
+        self.llamadas += 1
+        if not self.disponible:
+            raise LLMNoDisponibleError(f"{self.modelo} caído")
+        await asyncio.sleep(self.latencia)
+        return f"respuesta de {self.modelo}"
+
+    async def esta_disponible(self):
+        return self.disponible
+
+    def obtener_modelo_usado(self):
+        return self.modelo
+
+
+def crear_router(rapido, grande):
+    return RouterLLMService(
+        [RutaLLM("rapida", rapido, max_palabras=8, similitud_minima=0.6)],
+        RutaLLM("completa", grande)
+    )
+
+
+def test_enrutado_por_senales():
+    """Las preguntas cortas con un documento claro van al modelo rápido"""
+    print("🔍 Probando enrutado por señales...")
+    rapido, grande = LLMFalso("pequeno"), LLMFalso("grande")
+    router = crear_router(rapido, grande)
+
+    facil = SenalesConsulta(palabras_pregunta=5, similitud_maxima=0.8)
+    larga = SenalesConsulta(palabras_pregunta=30, similitud_maxima=0.8)
+    dudosa = SenalesConsulta(palabras_pregunta=5, similitud_maxima=0.4)
+
+    assert asyncio.run(router.generar_respuesta("p", senales=facil)) == "respuesta de pequeno"
+    assert asyncio.run(router.generar_respuesta("p", senales=larga)) == "respuesta de grande"
+    assert asyncio.run(router.generar_respuesta("p", senales=dudosa)) == "respuesta de grande"
+    assert asyncio.run(router.generar_respuesta("p")) == "respuesta de grande"
+    assert asyncio.run(router.generar_respuesta_con_modelo("p", senales=facil)).modelo == "pequeno"
+    assert router.obtener_modelo_usado() == "grande"
+    print(f"✅ Rápido: {rapido.llamadas}, grande: {grande.llamadas}")
+
+
+def test_respaldo_modelo_por_defecto():
+    """Si el modelo rápido no está disponible responde el grande"""
+    print("\n🔍 Probando respaldo al modelo por defecto...")
+    rapido, grande = LLMFalso("pequeno", disponible=False), LLMFalso("grande")
+    router = crear_router(rapido, grande)
+
+    respuesta = asyncio.run(router.generar_respuesta_con_modelo(
+        "p", senales=SenalesConsulta(palabras_pregunta=3, similitud_maxima=0.9)
+    ))
+
+    # Se informa del modelo que respondió, no del que se eligió
+    assert respuesta.texto == "respuesta de grande"
+    assert respuesta.modelo == "grande"
+    assert rapido.llamadas == 1 and grande.llamadas == 1
+    print("✅ El modelo grande respondió tras el fallo del rápido")
+
+
+def test_mediana_de_latencia():
+    """Con la mayoría de preguntas fáciles, la mediana baja sin tocar las difíciles"""
+    print("\n🔍 Probando mediana de latencia...")
+    router = crear_router(LLMFalso("pequeno", latencia=0.02), LLMFalso("grande", latencia=0.1))
+    senales = (
+        [SenalesConsulta(palabras_pregunta=5, similitud_maxima=0.8)] * 6 +
+        [SenalesConsulta(palabras_pregunta=20, similitud_maxima=0.5)] * 4
+    )
+
+    async def medir():
+        duraciones = []
+        for senal in senales:
+            inicio = time.perf_counter()
+            await router.generar_respuesta("p", senales=senal)
+            duraciones.append(time.perf_counter() - inicio)
+        return duraciones
+
+    mediana = statistics.median(asyncio.run(medir()))
+
+    assert mediana < 0.1, mediana
+    print(f"✅ Mediana: {mediana * 1000:.0f} ms (modelo grande: 100 ms)")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas del router de modelos...")
+    print("=" * 50)
+
+    test_enrutado_por_senales()
+    test_respaldo_modelo_por_defecto()
+    test_mediana_de_latencia()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Pruebas de la selección adaptativa de resultados: corte por similitud y MMR"""
+
+import os
+import sys
+
+import numpy as np
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.domain.services.seleccion_adaptativa import (
+    CORTE_CAIDA,
+    CORTE_LIMITE,
+    CORTE_SIMILITUD_MINIMA,
+    SelectorAdaptativo
+)
+from proyecto_gestion_documental.utilidades_pruebas import crear_documentos
+
+
+def con_similitudes(*similitudes):
+    """Documentos d0, d1... con las similitudes dadas, en ese orden"""
+    documentos = crear_documentos([f"d{i}" for i in range(len(similitudes))])
+    for documento, similitud in zip(documentos, similitudes):
+        documento.similitud = similitud
+    return documentos
+
+
+def ids(documentos):
+    return [documento.id for documento in documentos]
+
+
+def test_cortar():
+    """Se corta en la primera caída grande o por debajo del mínimo; si no, pasan todos"""
+    print("🔍 Probando el corte de resultados...")
+    selector = SelectorAdaptativo(similitud_minima=0.3, caida_maxima=0.1)
+
+    documentos, decision = selector.cortar(con_similitudes(0.9, 0.85, 0.8, 0.75))
+    assert ids(documentos) == ["d0", "d1", "d2", "d3"]
+    assert decision.motivo_corte == CORTE_LIMITE and decision.posicion_corte is None
+
+    documentos, decision = selector.cortar(con_similitudes(0.9, 0.85, 0.5, 0.45))
+    assert ids(documentos) == ["d0", "d1"]
+    assert decision.motivo_corte == CORTE_CAIDA and decision.posicion_corte == 2
+    assert abs(decision.caida - 0.35) < 1e-9
+    assert (decision.candidatos, decision.seleccionados) == (4, 2)
+
+    # Por debajo del mínimo se corta aunque el salto sea pequeño
+    documentos, decision = selector.cortar(con_similitudes(0.4, 0.35, 0.29, 0.28))
+    assert ids(documentos) == ["d0", "d1"]
+    assert decision.motivo_corte == CORTE_SIMILITUD_MINIMA and decision.caida is None
+
+    # Sin similitud (p. ej. otro motor) no se corta por ese resultado
+    documentos, decision = selector.cortar(con_similitudes(0.9, None, 0.85))
+    assert ids(documentos) == ["d0", "d1", "d2"] and decision.motivo_corte == CORTE_LIMITE
+
+    documentos, decision = selector.cortar([])
+    assert documentos == [] and decision.seleccionados == 0
+    print("✅ Corte por caída, por similitud mínima y sin corte")
+
+
+def test_minimo_resultados():
+    """Los primeros `minimo_resultados` se conservan aunque no pasen los umbrales"""
+    print("\n🔍 Probando minimo_resultados...")
+
+    # Con el mínimo por defecto (1) se conserva el primero aunque no llegue a la similitud mínima
+    documentos, decision = SelectorAdaptativo().cortar(con_similitudes(0.2, 0.15))
+    assert ids(documentos) == ["d0"] and decision.posicion_corte == 1
+
+    selector = SelectorAdaptativo(similitud_minima=0.3, caida_maxima=0.1, minimo_resultados=3)
+    documentos, decision = selector.cortar(con_similitudes(0.25, 0.1, 0.05, 0.02))
+    assert ids(documentos) == ["d0", "d1", "d2"]
+    assert decision.motivo_corte == CORTE_SIMILITUD_MINIMA and decision.posicion_corte == 3
+
+    # La caída se mide desde el último conservado, no desde el primero
+    documentos, decision = selector.cortar(con_similitudes(0.9, 0.4, 0.38, 0.36, 0.1))
+    assert ids(documentos) == ["d0", "d1", "d2", "d3"]
+    assert decision.motivo_corte == CORTE_SIMILITUD_MINIMA and decision.posicion_corte == 4
+
+    # Con menos resultados que el mínimo no se corta nada
+    documentos, decision = selector.cortar(con_similitudes(0.1, 0.05))
+    assert len(documentos) == 2 and decision.motivo_corte == CORTE_LIMITE
+
+    for argumentos in ({"minimo_resultados": 0}, {"mmr_lambda": 1.5}):
+        try:
+            SelectorAdaptativo(**argumentos)
+            raise AssertionError(f"Se aceptó {argumentos}")
+        except ValueError:
+            pass
+    print("✅ Se conservan siempre los primeros minimo_resultados")
+
+
+def test_diversificar():
+    """MMR descarta los casi duplicados y alterna entre temas"""
+    print("\n🔍 Probando diversificar...")
+    e1, e2 = np.eye(4, dtype=np.float32)[:2]
+    # d0 y d1 casi iguales (mismo fragmento solapado); d2 de otro tema y d3 a medio camino
+    embeddings = np.stack([e1 + 0.1 * e2, e1 + 0.13 * e2, e2, 0.8 * e1 + 0.6 * e2])
+    pregunta = e1 + 0.1 * e2
+    documentos = con_similitudes(0.99, 0.98, 0.1, 0.85)
+
+    selector = SelectorAdaptativo(mmr_lambda=0.3, umbral_redundancia=0.95)
+    assert selector.usa_mmr and not SelectorAdaptativo().usa_mmr
+    elegidos, redundantes = selector.diversificar(pregunta, documentos, embeddings)
+    assert redundantes == ["d1"], redundantes
+    # Tras el más relevante va el tema distinto antes que el parecido al primero
+    assert ids(elegidos) == ["d0", "d2", "d3"], ids(elegidos)
+
+    # Con lambda 1 solo cuenta la relevancia (pero los duplicados se siguen descartando)
+    elegidos, redundantes = SelectorAdaptativo(mmr_lambda=1.0).diversificar(pregunta, documentos, embeddings)
+    relevancia = embeddings @ pregunta / np.linalg.norm(embeddings, axis=1)
+    esperados = [f"d{i}" for i in np.argsort(-relevancia) if i != 1]
+    assert ids(elegidos) == esperados == ["d0", "d3", "d2"] and redundantes == ["d1"]
+
+    uno = con_similitudes(0.9)
+    assert selector.diversificar(pregunta, uno, embeddings[:1]) == (uno, [])
+    print(f"✅ Orden MMR {ids(selector.diversificar(pregunta, documentos, embeddings)[0])}, d1 descartado por redundante")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas de la selección adaptativa...")
+    print("=" * 50)
+
+    test_cortar()
+    test_minimo_resultados()
+    test_diversificar()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
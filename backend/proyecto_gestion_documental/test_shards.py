@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Pruebas del reparto en shards: rebalanceo al añadir un shard (no requiere el modelo)"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Permitir importar el paquete desde la carpeta del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proyecto_gestion_documental.infrastructure.database.numpy_repository import NumpyDocumentoRepository
+from proyecto_gestion_documental.infrastructure.database.sharded_repository import (
+    ShardedDocumentoRepository,
+    shard_de_id
+)
+from proyecto_gestion_documental.utilidades_pruebas import EmbeddingsFalsos, crear_documentos, vectores_aleatorios
+
+DIMENSION = 16
+
+
+def crear_shard(directorio, indice):
+    return NumpyDocumentoRepository(EmbeddingsFalsos(DIMENSION), os.path.join(directorio, f"shard_{indice}"))
+
+
+async def ids_por_shard(repositorio):
+    return [
+        {documento.id for documento in documentos}
+        for documentos in await asyncio.gather(*(
+            repositorio._enviar(i, shard.obtener_todos()) for i, shard in enumerate(repositorio.shards)
+        ))
+    ]
+
+
+def test_reparto_consistente():
+    """Al pasar de N a N+1 shards solo se mueve ~1/(N+1) de los IDs, y siempre al shard nuevo"""
+    print("🔍 Probando el hash de reparto...")
+    ids = [f"doc-{i}" for i in range(20000)]
+    for numero_shards in (1, 2, 3, 7):
+        cambiados = 0
+        for documento_id in ids:
+            antes, despues = shard_de_id(documento_id, numero_shards), shard_de_id(documento_id, numero_shards + 1)
+            assert 0 <= antes < numero_shards
+            if antes != despues:
+                assert despues == numero_shards
+                cambiados += 1
+        proporcion = cambiados / len(ids)
+        assert abs(proporcion - 1 / (numero_shards + 1)) < 0.02, (numero_shards, proporcion)
+        print(f"✅ {numero_shards} → {numero_shards + 1} shards: se mueve el {proporcion:.1%}")
+
+
+def test_agregar_shard_rebalancea():
+    """Tras añadir un shard cada documento está solo en el suyo, con su embedding, y las búsquedas no cambian"""
+    print("\n🔍 Probando agregar_shard...")
+    total = 3000
+    ids = [f"doc-{i}" for i in range(total)]
+    vectores = vectores_aleatorios(total, DIMENSION)
+    consultas = vectores_aleatorios(10, DIMENSION, semilla=1)
+
+    async def probar(directorio):
+        repositorio = ShardedDocumentoRepository([crear_shard(directorio, i) for i in range(2)])
+        try:
+            await repositorio.guardar_con_embeddings(crear_documentos(ids), vectores)
+            antes = await repositorio.buscar_por_similitud_batch(consultas, 10)
+
+            progreso = []
+            assert await repositorio.agregar_shard(crear_shard(directorio, 2), rebalancear=False) == 0
+            movidos = await repositorio.rebalancear(lambda revisados, total: progreso.append((revisados, total)))
+
+            assert progreso[-1] == (total, total), progreso
+            por_shard = await ids_por_shard(repositorio)
+            assert sum(len(conjunto) for conjunto in por_shard) == total
+            for indice, conjunto in enumerate(por_shard):
+                assert all(repositorio.shard_de(documento_id) == indice for documento_id in conjunto)
+            assert len(por_shard[2]) == movidos
+            assert await repositorio.contar_documentos() == total
+
+            embeddings = await repositorio.obtener_embeddings(ids)
+            assert np.allclose(np.stack([embeddings[documento_id] for documento_id in ids]), vectores, atol=1e-6)
+            despues = await repositorio.buscar_por_similitud_batch(consultas, 10)
+            assert [[d.id for d in lista] for lista in despues] == [[d.id for d in lista] for lista in antes]
+
+            # agregar_shard mueve al cuarto shard lo que le toca
+            movidos_cuarto = await repositorio.agregar_shard(crear_shard(directorio, 3))
+            por_shard = await ids_por_shard(repositorio)
+            assert len(por_shard[3]) == movidos_cuarto > 0
+            assert sum(len(conjunto) for conjunto in por_shard) == total
+            assert await repositorio.rebalancear() == 0
+            return movidos, movidos_cuarto
+        finally:
+            repositorio.cerrar()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        movidos, movidos_cuarto = asyncio.run(probar(directorio))
+
+    print(f"✅ {movidos} de {total} documentos movidos al tercer shard y {movidos_cuarto} al cuarto")
+
+
+def test_escrituras_durante_rebalanceo():
+    """Las escrituras hechas durante el rebalanceo no se pisan con la copia antigua"""
+    print("\n🔍 Probando escrituras durante el rebalanceo...")
+    total = 6000
+    ids = [f"doc-{i}" for i in range(total)]
+    vectores = vectores_aleatorios(total, DIMENSION, semilla=2)
+
+    async def probar(directorio):
+        repositorio = ShardedDocumentoRepository([crear_shard(directorio, 0)])
+        try:
+            await repositorio.guardar_con_embeddings(crear_documentos(ids), vectores)
+            # Documentos que pasan al shard nuevo: se actualizan o se eliminan mientras se mueven
+            moviles = [documento_id for documento_id in ids if shard_de_id(documento_id, 2) == 1]
+            actualizados, eliminados = moviles[::4], moviles[1::4]
+
+            rebalanceo = asyncio.create_task(repositorio.agregar_shard(crear_shard(directorio, 1)))
+            while repositorio._modificados is None:
+                await asyncio.sleep(0)
+            for inicio in range(0, len(actualizados), 50):
+                lote = actualizados[inicio:inicio + 50]
+                await repositorio.guardar_con_embeddings(crear_documentos(lote, version=1), -vectores[:len(lote)])
+                await asyncio.sleep(0)
+            for documento_id in eliminados:
+                assert await repositorio.eliminar(documento_id)
+            durante = not rebalanceo.done()
+            movidos = await rebalanceo
+
+            assert movidos == len(moviles)
+            por_shard = await ids_por_shard(repositorio)
+            assert por_shard[1] == set(moviles) - set(eliminados)
+            assert por_shard[0] == set(ids) - set(moviles)
+            for documento_id in actualizados[:50]:
+                documento = await repositorio.obtener_por_id(documento_id)
+                assert documento.titulo == f"{documento_id} v1", documento.titulo
+            for documento_id in eliminados:
+                assert await repositorio.obtener_por_id(documento_id) is None
+            return durante, len(actualizados), len(eliminados)
+        finally:
+            repositorio.cerrar()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        durante, actualizados, eliminados = asyncio.run(probar(directorio))
+
+    assert durante, "Las escrituras terminaron después del rebalanceo"
+    print(f"✅ {actualizados} actualizaciones y {eliminados} borrados durante el rebalanceo se conservan")
+
+
+def main():
+    """Ejecuta todas las pruebas"""
+    print("🚀 Iniciando pruebas de shards...")
+    print("=" * 50)
+
+    test_reparto_consistente()
+    test_agregar_shard_rebalancea()
+    test_escrituras_durante_rebalanceo()
+
+    print("\n" + "=" * 50)
+    print("🎉 Pruebas completadas!")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
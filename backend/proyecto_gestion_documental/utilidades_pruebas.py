@@ -0,0 +1,38 @@
+"""Utilidades compartidas por los scripts de prueba que trabajan con embeddings ya calculados"""
+
+import numpy as np
+
+from proyecto_gestion_documental.domain.entities.documento import Documento
+from proyecto_gestion_documental.domain.services.embedding_service import EmbeddingService
+
+
+class EmbeddingsFalsos(EmbeddingService):
+    """Las pruebas guardan con embeddings ya calculados: solo hace falta la dimensión y el modelo"""
+
+    def __init__(self, dimension: int, modelo: str = "falso"):
+        self.dimension = dimension
+        self.modelo = modelo
+
+    async def generar_embedding(self, texto):
+        raise NotImplementedError
+
+    async def generar_embeddings_batch(self, textos):
+        raise NotImplementedError
+
+    def obtener_dimension_embedding(self):
+        return self.dimension
+
+    def obtener_modelo_usado(self):
+        return self.modelo
+
+
+def crear_documentos(ids, version=0):
+    return [
+        Documento(id=documento_id, titulo=f"{documento_id} v{version}", contenido=f"contenido de {documento_id}", tipo="normativo")
+        for documento_id in ids
+    ]
+
+
+def vectores_aleatorios(cantidad, dimension, semilla=0):
+    vectores = np.random.default_rng(semilla).standard_normal((cantidad, dimension)).astype(np.float32)
+    return vectores / np.linalg.norm(vectores, axis=1, keepdims=True)
\ No newline at end of file